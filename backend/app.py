@@ -2,54 +2,95 @@ import os
 
 from flask import Flask, jsonify
 from flask_cors import CORS
-from sqlalchemy import event
-from sqlalchemy.engine import Engine
 
-from backend.database import db
-from backend.routes import all_blueprints
-from backend.schema import ensure_schema_upgrades
+from backend.database import (
+    db,
+    describe_database_settings,
+    install_sqlite_pragmas,
+    is_sqlite_memory_url,
+    resolve_database_profile,
+)
+from backend.exports import export_cli
+from backend.instrumentation import init_instrumentation
+from backend.json_provider import get_json_provider_class
+from backend.migrations import db_cli, ensure_schema_current
+from backend.query_budget import init_query_budgets
+from backend.routes import ROUTE_QUERY_BUDGETS, all_blueprints
 
 from pathlib import Path
 from dotenv import load_dotenv
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
-load_dotenv(PROJECT_ROOT / ".env")
 
 
-def create_app():
+def create_app(config: dict | None = None):
+    """
+    Build a configured Flask application.
+
+    Importing this module has no side effects; the Flask CLI finds this
+    factory through ``--app backend.app``.
+    """
+    load_dotenv(PROJECT_ROOT / ".env")
+
     app = Flask(__name__, instance_relative_config=True)
 
-    base_dir = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
-    default_db_path = os.path.join(base_dir, "instance", "cardfight.db")
-    os.makedirs(os.path.dirname(default_db_path), exist_ok=True)
+    database_url = os.getenv("DATABASE_URL")
 
-    app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv(
-        "DATABASE_URL",
-        f"sqlite:///{default_db_path}",
-    )
+    if not database_url:
+        default_db_path = PROJECT_ROOT / "instance" / "cardfight.db"
+        default_db_path.parent.mkdir(exist_ok=True)
+        database_url = f"sqlite:///{default_db_path}"
+
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_url
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
     app.config["JSON_SORT_KEYS"] = False
+    app.config["JSON_PROVIDER"] = os.getenv("CARDFIGHT_JSON_PROVIDER", "auto")
+    app.config["DATABASE_PROFILE"] = os.getenv("CARDFIGHT_DB_PROFILE", "development")
+    app.config["SLOW_REQUEST_MS"] = float(os.getenv("CARDFIGHT_SLOW_REQUEST_MS", "500"))
+    app.config["SIMULATION_WORKERS"] = int(
+        os.getenv("CARDFIGHT_SIMULATION_WORKERS", str(min(4, os.cpu_count() or 1)))
+    )
+
+    if config:
+        app.config.update(config)
+
+    # Development databases migrate themselves on startup; production ones
+    # are upgraded explicitly with `flask db upgrade`.
+    auto_migrate_default = "false" if app.config["DATABASE_PROFILE"] == "production" else "true"
+    app.config.setdefault(
+        "AUTO_MIGRATE",
+        os.getenv("CARDFIGHT_AUTO_MIGRATE", auto_migrate_default).lower() in {"1", "true", "yes"},
+    )
+
+    app.json = get_json_provider_class(app.config["JSON_PROVIDER"])(app)
+
+    database_profile = resolve_database_profile(app.config["DATABASE_PROFILE"])
+
+    # SQLite in-memory databases use a single-connection pool that does not
+    # accept sizing options.
+    if database_profile["pool"] and not is_sqlite_memory_url(app.config["SQLALCHEMY_DATABASE_URI"]):
+        app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", {}).update(database_profile["pool"])
 
     db.init_app(app)
     CORS(app)
 
-    @event.listens_for(Engine, "connect")
-    def set_sqlite_pragma(dbapi_connection, connection_record):
-        try:
-            cursor = dbapi_connection.cursor()
-            cursor.execute("PRAGMA foreign_keys=ON")
-            cursor.close()
-        except Exception:
-            pass
-
     with app.app_context():
-        db.create_all()
-        ensure_schema_upgrades()
+        install_sqlite_pragmas(db.engine, database_profile["pragmas"])
+        init_instrumentation(app, db.engine)
+        init_query_budgets(app, ROUTE_QUERY_BUDGETS)
+        ensure_schema_current(app)
+
+    app.cli.add_command(db_cli)
+    app.cli.add_command(export_cli)
 
     @app.get("/health")
     @app.get("/api/health")
     def health():
-        return jsonify(status="ok", service="cardfight-api")
+        return jsonify(
+            status="ok",
+            service="cardfight-api",
+            database=describe_database_settings(db.engine, database_profile),
+        )
 
     @app.errorhandler(400)
     def bad_request(error):
@@ -70,7 +111,5 @@ def create_app():
     return app
 
 
-app = create_app()
-
 if __name__ == "__main__":
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    create_app().run(debug=True, port=5000)
\ No newline at end of file
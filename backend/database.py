@@ -1,7 +1,142 @@
 """
 Database setup using SQLAlchemy.
-Includes the database instance for use in models and application setup.
+Includes the database instance for use in models and application setup,
+plus the SQLite connection profiles applied to every pooled connection.
 """
+import os
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect
+
+db = SQLAlchemy()
+
+
+def session_get(model, key):
+    """
+    ``Session.get`` that also finds rows added but not yet flushed.
+
+    Match aggregates run with autoflush off, so a row created for one side
+    of an update is still pending when the other side looks it up.
+    """
+    row = db.session.get(model, key)
+
+    if row is not None:
+        return row
+
+    key = list(key) if isinstance(key, tuple) else [key]
+    mapper = inspect(model)
+
+    for pending in db.session.new:
+        if isinstance(pending, model) and mapper.primary_key_from_instance(pending) == key:
+            return pending
+
+    return None
+
+
+# PRAGMAs run on every new DBAPI connection. Values are applied in order, so
+# journal_mode comes before settings that depend on it.
+DATABASE_PROFILES = {
+    "development": {
+        "pragmas": {
+            "foreign_keys": "ON",
+        },
+        "pool": {},
+    },
+    "production": {
+        "pragmas": {
+            "foreign_keys": "ON",
+            # Readers no longer block the match writer, and vice versa.
+            "journal_mode": "WAL",
+            # WAL keeps the database consistent with NORMAL; only the last
+            # transactions before a power loss can be lost.
+            "synchronous": "NORMAL",
+            # Negative cache_size is in KiB: a 64 MiB page cache per connection.
+            "cache_size": -64_000,
+            "mmap_size": 256 * 1024 * 1024,
+            "busy_timeout": 5_000,
+            "temp_store": "MEMORY",
+        },
+        "pool": {
+            "pool_size": 8,
+            "max_overflow": 4,
+            "pool_timeout": 30,
+        },
+    },
+}
+
+PRAGMA_ENV_OVERRIDES = {
+    "cache_size": "CARDFIGHT_DB_CACHE_SIZE_KB",
+    "mmap_size": "CARDFIGHT_DB_MMAP_SIZE",
+    "busy_timeout": "CARDFIGHT_DB_BUSY_TIMEOUT_MS",
+}
+
+POOL_ENV_OVERRIDES = {
+    "pool_size": "CARDFIGHT_DB_POOL_SIZE",
+    "max_overflow": "CARDFIGHT_DB_MAX_OVERFLOW",
+    "pool_timeout": "CARDFIGHT_DB_POOL_TIMEOUT",
+}
+
+
+def resolve_database_profile(name: str | None) -> dict:
+    """Return the PRAGMA and pool settings for ``name`` with env overrides applied."""
+    profile_name = (name or "development").strip().lower()
+
+    if profile_name not in DATABASE_PROFILES:
+        valid = ", ".join(sorted(DATABASE_PROFILES))
+        raise ValueError(f"CARDFIGHT_DB_PROFILE must be one of: {valid}")
+
+    profile = DATABASE_PROFILES[profile_name]
+    pragmas = dict(profile["pragmas"])
+    pool = dict(profile["pool"])
+
+    for key, env_name in PRAGMA_ENV_OVERRIDES.items():
+        value = os.getenv(env_name)
+        if value:
+            pragmas[key] = -abs(int(value)) if key == "cache_size" else int(value)
+
+    for key, env_name in POOL_ENV_OVERRIDES.items():
+        value = os.getenv(env_name)
+        if value and pool:
+            pool[key] = int(value)
+
+    return {"name": profile_name, "pragmas": pragmas, "pool": pool}
+
+
+def is_sqlite_memory_url(url: str) -> bool:
+    return url.startswith("sqlite") and (":memory:" in url or url.rstrip("/") == "sqlite:")
+
+
+def install_sqlite_pragmas(engine, pragmas: dict):
+    """Run ``pragmas`` on every new connection made by ``engine``."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for key, value in pragmas.items():
+                cursor.execute(f"PRAGMA {key}={value}")
+        finally:
+            cursor.close()
+
+
+def describe_database_settings(engine, profile: dict) -> dict:
+    """Report the PRAGMA values SQLite is actually using, plus pool sizing."""
+    settings = {
+        "profile": profile["name"],
+        "dialect": engine.dialect.name,
+        "pool": {
+            "class": type(engine.pool).__name__,
+            **profile["pool"],
+        },
+    }
+
+    if engine.dialect.name == "sqlite":
+        with engine.connect() as connection:
+            settings["pragmas"] = {
+                key: connection.exec_driver_sql(f"PRAGMA {key}").scalar()
+                for key in profile["pragmas"]
+            }
 
-db = SQLAlchemy()
\ No newline at end of file
+    return settings
@@ -0,0 +1,335 @@
+"""
+Arrow schemas, part writers, and readers behind ``backend.exports``.
+
+Kept apart so that importing the app (and the ``flask export`` commands)
+does not load pyarrow; ``run_export`` and ``read_export`` import this
+module on first use.
+"""
+
+from __future__ import annotations
+
+import shutil
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from sqlalchemy import DateTime, String, cast, func, select
+from sqlalchemy.sql import Select
+
+from backend.exports import EXPORT_CHUNK_SIZE, EXPORT_FORMATS
+from backend.models import Card, Deck, DeckCard, DeckVersion, Match
+
+
+def _text(column):
+    """Datetimes are read as their stored text and parsed by Arrow, not per row in Python."""
+    return cast(column, String)
+
+
+@dataclass(frozen=True)
+class ExportTable:
+    """
+    One exported table.
+
+    ``statement`` selects the columns in ``schema`` order. ``changed`` is the
+    last-change timestamp used for incremental runs; tables without one are
+    small and rewritten on every run.
+    """
+
+    name: str
+    schema: pa.Schema
+    statement: Callable[[], Select]
+    id_column: Callable[[], object]
+    changed: Callable[[], object] | None = None
+
+
+def _timestamp_fields(*names: str) -> list[pa.Field]:
+    return [pa.field(name, pa.timestamp("us")) for name in names]
+
+
+EXPORT_TABLES = {
+    table.name: table
+    for table in (
+        ExportTable(
+            name="match",
+            schema=pa.schema(
+                [
+                    pa.field("id", pa.int64(), nullable=False),
+                    pa.field("deck1_id", pa.int64(), nullable=False),
+                    pa.field("deck2_id", pa.int64(), nullable=False),
+                    pa.field("deck1_version_id", pa.int64()),
+                    pa.field("deck2_version_id", pa.int64()),
+                    pa.field("winner_id", pa.int64()),
+                    pa.field("first_player_id", pa.int64()),
+                    pa.field("format", pa.string()),
+                    *_timestamp_fields("date_played"),
+                    pa.field("notes", pa.string()),
+                    *_timestamp_fields("updated_at"),
+                ]
+            ),
+            statement=lambda: select(
+                Match.id,
+                Match.deck1_id,
+                Match.deck2_id,
+                Match.deck1_version_id,
+                Match.deck2_version_id,
+                Match.winner_id,
+                Match.first_player_id,
+                Match.format,
+                _text(Match.date_played),
+                Match.notes,
+                _text(Match.updated_at),
+            ),
+            id_column=lambda: Match.id,
+            changed=lambda: Match.updated_at,
+        ),
+        ExportTable(
+            name="deck",
+            schema=pa.schema(
+                [
+                    pa.field("id", pa.int64(), nullable=False),
+                    pa.field("name", pa.string()),
+                    pa.field("type", pa.string()),
+                    pa.field("nation", pa.string()),
+                    pa.field("wins", pa.int64()),
+                    pa.field("losses", pa.int64()),
+                    pa.field("active", pa.bool_()),
+                    pa.field("rating", pa.float64()),
+                    pa.field("rated_games", pa.int64()),
+                    *_timestamp_fields("created_at"),
+                ]
+            ),
+            statement=lambda: select(
+                Deck.id,
+                Deck.name,
+                Deck.type,
+                Deck.nation,
+                Deck.wins,
+                Deck.losses,
+                Deck.active,
+                Deck.rating,
+                Deck.rated_games,
+                _text(Deck.created_at),
+            ),
+            id_column=lambda: Deck.id,
+        ),
+        ExportTable(
+            name="deck_version",
+            schema=pa.schema(
+                [
+                    pa.field("id", pa.int64(), nullable=False),
+                    pa.field("deck_id", pa.int64()),
+                    pa.field("version_name", pa.string()),
+                    pa.field("notes", pa.string()),
+                    pa.field("is_active", pa.bool_()),
+                    pa.field("rating", pa.float64()),
+                    pa.field("rated_games", pa.int64()),
+                    *_timestamp_fields("created_at", "updated_at"),
+                ]
+            ),
+            statement=lambda: select(
+                DeckVersion.id,
+                DeckVersion.deck_id,
+                DeckVersion.version_name,
+                DeckVersion.notes,
+                DeckVersion.is_active,
+                DeckVersion.rating,
+                DeckVersion.rated_games,
+                _text(DeckVersion.created_at),
+                _text(DeckVersion.updated_at),
+            ),
+            id_column=lambda: DeckVersion.id,
+            # Rating writes move rated_at, not updated_at.
+            changed=lambda: func.max(
+                DeckVersion.updated_at,
+                func.coalesce(DeckVersion.rated_at, DeckVersion.updated_at),
+                type_=DateTime,
+            ),
+        ),
+        ExportTable(
+            name="deck_card",
+            schema=pa.schema(
+                [
+                    pa.field("id", pa.int64(), nullable=False),
+                    pa.field("deck_version_id", pa.int64()),
+                    pa.field("card_id", pa.int64()),
+                    pa.field("printing_id", pa.int64()),
+                    pa.field("quantity", pa.int64()),
+                    pa.field("zone", pa.string()),
+                    pa.field("sort_order", pa.int64()),
+                    pa.field("card_name", pa.string()),
+                    pa.field("grade", pa.int64()),
+                    pa.field("nation", pa.string()),
+                    pa.field("card_type", pa.string()),
+                    pa.field("clan", pa.string()),
+                    pa.field("race", pa.string()),
+                    pa.field("power", pa.int64()),
+                    pa.field("shield", pa.int64()),
+                    pa.field("critical", pa.int64()),
+                    pa.field("trigger_type", pa.string()),
+                    *_timestamp_fields("updated_at"),
+                ]
+            ),
+            statement=lambda: select(
+                DeckCard.id,
+                DeckCard.deck_version_id,
+                DeckCard.card_id,
+                DeckCard.printing_id,
+                DeckCard.quantity,
+                DeckCard.zone,
+                DeckCard.sort_order,
+                Card.name,
+                Card.grade,
+                Card.nation,
+                Card.card_type,
+                Card.clan,
+                Card.race,
+                Card.power,
+                Card.shield,
+                Card.critical,
+                Card.trigger_type,
+                _text(func.max(DeckCard.updated_at, Card.updated_at)),
+            ).join(Card, Card.id == DeckCard.card_id),
+            # An edit to the card changes the joined columns too.
+            id_column=lambda: DeckCard.id,
+            changed=lambda: func.max(DeckCard.updated_at, Card.updated_at),
+        ),
+    )
+}
+
+
+def _record_batch(schema: pa.Schema, rows) -> pa.RecordBatch:
+    arrays = []
+
+    for field, values in zip(schema, zip(*rows)):
+        if pa.types.is_timestamp(field.type):
+            arrays.append(pa.array(values, pa.string()).cast(field.type))
+        else:
+            arrays.append(pa.array(values, field.type))
+
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _PartWriter:
+    """Writes record batches to one Parquet or Arrow IPC file."""
+
+    def __init__(self, path: Path, schema: pa.Schema, export_format: str):
+        self.path = path
+        self.rows = 0
+
+        if export_format == "parquet":
+            self._writer = pq.ParquetWriter(path, schema)
+        else:
+            self._sink = pa.OSFile(str(path), "wb")
+            self._writer = ipc.new_file(self._sink, schema)
+
+    def write(self, batch: pa.RecordBatch):
+        self._writer.write_batch(batch)
+        self.rows += batch.num_rows
+
+    def close(self):
+        self._writer.close()
+
+        if hasattr(self, "_sink"):
+            self._sink.close()
+
+
+def _aggregate(connection, table: ExportTable, expression, *where):
+    statement = table.statement().with_only_columns(expression, maintain_column_froms=True)
+    return connection.execute(statement.where(*where)).scalar()
+
+
+def export_table(connection, table: ExportTable, directory: Path, export_format: str, state: dict | None, full=False) -> dict:
+    """
+    Write the rows of ``table`` that changed since ``state``.
+
+    Returns the table's new manifest entry. A full export replaces every
+    part; an incremental one adds a part only when there is something new.
+    """
+    table_dir = directory / table.name
+
+    rewrite = (
+        full
+        or state is None
+        or table.changed is None
+        or state.get("format") != export_format
+        # Deleted rows cannot be expressed as an appended part.
+        or _aggregate(connection, table, func.count(), table.id_column() <= state["last_id"]) < state["rows"]
+    )
+
+    if rewrite:
+        shutil.rmtree(table_dir, ignore_errors=True)
+        state = {"format": export_format, "parts": [], "rows": 0, "last_id": 0, "last_changed": None, "has_updates": False}
+
+    table_dir.mkdir(parents=True, exist_ok=True)
+
+    # Watermarks are read first and bound this run, so rows written while it
+    # streams are left for the next one instead of being half counted.
+    last_id = _aggregate(connection, table, func.max(table.id_column())) or 0
+    statement = table.statement().where(table.id_column() <= last_id)
+    last_changed = None
+
+    if table.changed is not None:
+        last_changed = _aggregate(connection, table, func.max(table.changed()))
+
+    if not rewrite:
+        new_rows = table.id_column() > state["last_id"]
+
+        # A table that was empty at the last export has no change marker yet.
+        if state["last_changed"] is not None:
+            new_rows |= table.changed() > datetime.fromisoformat(state["last_changed"])
+
+        statement = statement.where(new_rows)
+
+    part_name = f"part-{len(state['parts']) + 1:05d}.{EXPORT_FORMATS[export_format]}"
+    writer = _PartWriter(table_dir / part_name, table.schema, export_format)
+    appended_ids = 0
+
+    try:
+        result = connection.execution_options(yield_per=EXPORT_CHUNK_SIZE).execute(statement.order_by(table.id_column()))
+
+        for rows in result.partitions():
+            batch = _record_batch(table.schema, rows)
+            writer.write(batch)
+            appended_ids += pc.sum(pc.greater(batch.column(0), state["last_id"])).as_py() or 0
+    finally:
+        writer.close()
+
+    if writer.rows == 0 and state["parts"]:
+        writer.path.unlink()
+    else:
+        state["parts"].append(part_name)
+        state["has_updates"] = state["has_updates"] or appended_ids < writer.rows
+
+    state["rows"] += appended_ids
+    state["last_id"] = max(state["last_id"], last_id)
+
+    if last_changed is not None:
+        state["last_changed"] = last_changed.isoformat()
+
+    return state
+
+
+def _read_part(path: Path) -> pa.Table:
+    if path.suffix == ".parquet":
+        return pq.read_table(path, memory_map=True)
+
+    return ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+
+
+def read_parts(paths, has_updates: bool) -> pa.Table:
+    """Concatenate part files, keeping only the newest copy of each id if any were updated."""
+    table = pa.concat_tables(_read_part(path) for path in paths)
+
+    if not has_updates:
+        return table
+
+    ids = table.column("id").to_numpy()
+    # The last occurrence of each id is its newest copy.
+    _, reversed_first = np.unique(ids[::-1], return_index=True)
+    return table.take(np.sort(len(ids) - 1 - reversed_first))
@@ -0,0 +1,129 @@
+"""
+Columnar exports of matches and deck lists for notebooks.
+
+Each table is written as numbered part files under ``<directory>/<table>/``
+in Parquet or Arrow IPC format, plus a ``manifest.json`` that records the
+parts and the watermarks of the last run. Rows are streamed from the
+database in bounded chunks and written batch by batch, so memory use does
+not grow with the table.
+
+Later runs append a part with only the rows that are new (``id`` above the
+last exported id) or changed (``updated_at`` after the last run). When rows
+have disappeared, or the format changes, the table is rewritten. Read a
+table back with ``read_export``, which keeps the newest copy of each row.
+
+Run an export with:
+
+    python -m flask --app backend.app export run --format arrow
+
+Arrow IPC files are uncompressed and load zero-copy through a memory map;
+Parquet files are smaller but are decoded on read. The Arrow side lives in
+``backend.export_tables`` and is imported on first use, so loading the app
+and its CLI does not pull in pyarrow.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import click
+from flask.cli import AppGroup
+
+from backend.database import db
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+EXPORT_FORMATS = {"parquet": "parquet", "arrow": "arrow"}
+# The tables defined in ``backend.export_tables``, named here for the CLI.
+EXPORT_TABLE_NAMES = ("match", "deck", "deck_version", "deck_card")
+EXPORT_CHUNK_SIZE = 100_000
+MANIFEST_NAME = "manifest.json"
+DEFAULT_EXPORT_DIR = Path(__file__).resolve().parents[1] / "exports"
+
+
+def _read_manifest(directory: Path) -> dict:
+    path = directory / MANIFEST_NAME
+
+    if not path.exists():
+        return {"tables": {}}
+
+    return json.loads(path.read_text())
+
+
+def _write_manifest(directory: Path, manifest: dict):
+    path = directory / MANIFEST_NAME
+    staged = path.with_suffix(".tmp")
+    staged.write_text(json.dumps(manifest, indent=2))
+    staged.replace(path)
+
+
+def run_export(directory: Path | str = DEFAULT_EXPORT_DIR, export_format="parquet", tables=None, full=False) -> dict:
+    """Export the chosen tables (all by default) and update the manifest."""
+    from backend.export_tables import EXPORT_TABLES, export_table
+
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError("format must be parquet or arrow.")
+
+    names = list(tables or EXPORT_TABLES)
+    unknown = [name for name in names if name not in EXPORT_TABLES]
+
+    if unknown:
+        raise ValueError(f"Unknown export table: {', '.join(unknown)}.")
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = _read_manifest(directory)
+
+    with db.engine.connect() as connection:
+        for name in names:
+            manifest["tables"][name] = export_table(
+                connection,
+                EXPORT_TABLES[name],
+                directory,
+                export_format,
+                manifest["tables"].get(name),
+                full=full,
+            )
+            _write_manifest(directory, manifest)
+
+    return manifest
+
+
+def read_export(directory: Path | str, table_name: str) -> pa.Table:
+    """
+    One exported table as an Arrow table.
+
+    Arrow IPC parts are memory-mapped, so an append-only table is read
+    without copying. Once a run has appended changed rows, only the newest
+    copy of each id is kept.
+    """
+    from backend.export_tables import read_parts
+
+    directory = Path(directory)
+    state = _read_manifest(directory)["tables"].get(table_name)
+
+    if state is None:
+        raise LookupError(f"No export for table {table_name!r} in {directory}.")
+
+    return read_parts((directory / table_name / part for part in state["parts"]), state["has_updates"])
+
+
+export_cli = AppGroup("export", help="Write columnar exports for notebooks.")
+
+
+@export_cli.command("run")
+@click.option("--format", "export_format", type=click.Choice(sorted(EXPORT_FORMATS)), default="parquet")
+@click.option("--out", "directory", type=click.Path(file_okay=False, path_type=Path), default=DEFAULT_EXPORT_DIR)
+@click.option("--table", "tables", multiple=True, type=click.Choice(sorted(EXPORT_TABLE_NAMES)))
+@click.option("--full", is_flag=True, help="Rewrite every part instead of appending changes.")
+def run_command(export_format, directory, tables, full):
+    """Export matches and deck lists to Parquet or Arrow IPC files."""
+    manifest = run_export(directory, export_format, tables, full)
+
+    for name in tables or EXPORT_TABLE_NAMES:
+        state = manifest["tables"][name]
+        click.echo(f"{name}: {state['rows']} rows in {len(state['parts'])} part(s)")
@@ -0,0 +1,300 @@
+"""
+Per-request performance instrumentation.
+
+Every request records its wall time, the SQL statements it issued (through
+SQLAlchemy ``before/after_cursor_execute`` hooks), time spent in SQL, and the
+response size. The numbers feed per-route histograms exposed in Prometheus
+text format at ``/api/admin/metrics``, together with a count of SQLite
+"database is locked" errors. Requests slower than
+``SLOW_REQUEST_MS`` are logged with their most expensive statements.
+
+``record_queries()`` can also be used directly to capture the statements
+issued inside any block of code.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+RESPONSE_BYTE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+SLOW_REQUEST_TOP_QUERIES = 5
+
+SQLITE_LOCK_MESSAGES = ("database is locked", "database table is locked")
+
+
+@dataclass
+class QueryRecorder:
+    statements: list[tuple[str, float]] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(elapsed for _, elapsed in self.statements)
+
+    def slowest(self, limit: int = SLOW_REQUEST_TOP_QUERIES) -> list[tuple[str, float]]:
+        return sorted(self.statements, key=lambda item: item[1], reverse=True)[:limit]
+
+
+_active_recorders: ContextVar[tuple[QueryRecorder, ...]] = ContextVar(
+    "cardfight_query_recorders",
+    default=(),
+)
+
+
+def push_recorder(recorder: QueryRecorder):
+    return _active_recorders.set(_active_recorders.get() + (recorder,))
+
+
+def pop_recorder(token):
+    _active_recorders.reset(token)
+
+
+@contextmanager
+def record_queries():
+    """Collect every SQL statement executed inside the ``with`` block."""
+    recorder = QueryRecorder()
+    token = push_recorder(recorder)
+
+    try:
+        yield recorder
+    finally:
+        pop_recorder(token)
+
+
+def install_query_hooks(engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _active_recorders.get():
+            conn.info.setdefault("cardfight_query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        recorders = _active_recorders.get()
+        started = conn.info.get("cardfight_query_started")
+
+        if not recorders or not started:
+            return
+
+        elapsed = time.perf_counter() - started.pop()
+
+        for recorder in recorders:
+            recorder.statements.append((statement, elapsed))
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        connection = exception_context.connection
+        started = connection.info.get("cardfight_query_started") if connection is not None else None
+
+        if started:
+            started.pop()
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: tuple):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.series: dict[tuple, dict] = {}
+
+    def observe(self, labels: tuple, value: float):
+        series = self.series.setdefault(
+            labels,
+            {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0},
+        )
+
+        for index, upper_bound in enumerate(self.buckets):
+            if value <= upper_bound:
+                series["buckets"][index] += 1
+
+        series["sum"] += value
+        series["count"] += 1
+
+    def render(self, label_names: tuple[str, ...]) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+
+        for labels, series in sorted(self.series.items()):
+            base = _format_labels(label_names, labels)
+
+            for upper_bound, bucket_count in zip(self.buckets, series["buckets"]):
+                lines.append(f'{self.name}_bucket{{{base},le="{_format_bound(upper_bound)}"}} {bucket_count}')
+
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {series["count"]}')
+            lines.append(f"{self.name}_sum{{{base}}} {series['sum']:.6f}")
+            lines.append(f"{self.name}_count{{{base}}} {series['count']}")
+
+        return lines
+
+
+def _format_bound(upper_bound) -> str:
+    """Exact text for a bucket bound; ``:g`` would round 1048576 to 1.04858e+06."""
+    if isinstance(upper_bound, int):
+        return str(upper_bound)
+
+    return repr(float(upper_bound))
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(label_names: tuple[str, ...], labels: tuple) -> str:
+    return ",".join(f'{name}="{_escape_label(value)}"' for name, value in zip(label_names, labels))
+
+
+class MetricsRegistry:
+    ROUTE_LABELS = ("route", "method")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.duration = Histogram(
+            "cardfight_http_request_duration_seconds",
+            "Wall time per request.",
+            DURATION_BUCKETS,
+        )
+        self.sql_statements = Histogram(
+            "cardfight_http_request_sql_statements",
+            "SQL statements issued per request.",
+            SQL_STATEMENT_BUCKETS,
+        )
+        self.sql_seconds = Histogram(
+            "cardfight_http_request_sql_seconds",
+            "Time spent executing SQL per request.",
+            DURATION_BUCKETS,
+        )
+        self.response_bytes = Histogram(
+            "cardfight_http_response_bytes",
+            "Response body size per request.",
+            RESPONSE_BYTE_BUCKETS,
+        )
+        self.responses: dict[tuple, int] = {}
+        self.sqlite_lock_errors: dict[tuple, int] = {}
+
+    def observe(self, route, method, status, duration, recorder: QueryRecorder, response_bytes):
+        labels = (route, method)
+
+        with self._lock:
+            self.duration.observe(labels, duration)
+            self.sql_statements.observe(labels, recorder.count)
+            self.sql_seconds.observe(labels, recorder.total_seconds)
+            self.response_bytes.observe(labels, response_bytes)
+
+            status_key = (route, method, str(status))
+            self.responses[status_key] = self.responses.get(status_key, 0) + 1
+
+    def observe_lock_error(self, route):
+        with self._lock:
+            self.sqlite_lock_errors[(route,)] = self.sqlite_lock_errors.get((route,), 0) + 1
+
+    def render(self) -> str:
+        with self._lock:
+            lines = [
+                "# HELP cardfight_http_responses_total Responses by route and status code.",
+                "# TYPE cardfight_http_responses_total counter",
+            ]
+            lines.extend(
+                f"cardfight_http_responses_total{{{_format_labels(('route', 'method', 'status'), key)}}} {count}"
+                for key, count in sorted(self.responses.items())
+            )
+            lines.extend(
+                [
+                    "# HELP cardfight_sqlite_lock_errors_total SQLite busy/locked errors by route.",
+                    "# TYPE cardfight_sqlite_lock_errors_total counter",
+                ]
+            )
+            lines.extend(
+                f"cardfight_sqlite_lock_errors_total{{{_format_labels(('route',), key)}}} {count}"
+                for key, count in sorted(self.sqlite_lock_errors.items())
+            )
+
+            for histogram in (self.duration, self.sql_statements, self.sql_seconds, self.response_bytes):
+                lines.extend(histogram.render(self.ROUTE_LABELS))
+
+        return "\n".join(lines) + "\n"
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    return current_app.extensions["cardfight_metrics"]
+
+
+def _route_label() -> str:
+    if not has_request_context():
+        return "<no request>"
+
+    return request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+
+
+def is_sqlite_lock_error(exception) -> bool:
+    message = str(exception).lower()
+    return any(text in message for text in SQLITE_LOCK_MESSAGES)
+
+
+def init_instrumentation(app, engine):
+    registry = MetricsRegistry()
+    app.extensions["cardfight_metrics"] = registry
+    install_query_hooks(engine)
+
+    @event.listens_for(engine, "handle_error")
+    def count_sqlite_lock_errors(exception_context):
+        # Counted here rather than in an error handler so locks that a
+        # service catches and retries still show up.
+        if is_sqlite_lock_error(exception_context.original_exception):
+            registry.observe_lock_error(_route_label())
+
+    @app.before_request
+    def start_request_profile():
+        g.cardfight_recorder = QueryRecorder()
+        g.cardfight_recorder_token = push_recorder(g.cardfight_recorder)
+        g.cardfight_request_started = time.perf_counter()
+
+    @app.after_request
+    def finish_request_profile(response):
+        recorder = g.get("cardfight_recorder")
+
+        if recorder is None:
+            return response
+
+        pop_recorder(g.pop("cardfight_recorder_token"))
+        duration = time.perf_counter() - g.cardfight_request_started
+        route = _route_label()
+        response_bytes = response.calculate_content_length() or 0
+
+        registry.observe(route, request.method, response.status_code, duration, recorder, response_bytes)
+
+        if duration * 1000 >= app.config["SLOW_REQUEST_MS"]:
+            app.logger.warning(
+                "Slow request %s %s: %.1f ms, %d SQL statements (%.1f ms), %d bytes. Top queries:%s",
+                request.method,
+                route,
+                duration * 1000,
+                recorder.count,
+                recorder.total_seconds * 1000,
+                response_bytes,
+                "".join(
+                    f"\n  {elapsed * 1000:8.2f} ms  {' '.join(statement.split())[:500]}"
+                    for statement, elapsed in recorder.slowest()
+                ),
+            )
+
+        return response
+
+    @app.teardown_request
+    def discard_request_profile(error=None):
+        # after_request is skipped when a view raises; drop the recorder here.
+        token = g.pop("cardfight_recorder_token", None)
+
+        if token is not None:
+            pop_recorder(token)
@@ -0,0 +1,114 @@
+"""
+JSON providers for API responses.
+
+Serializers hand datetimes and dataclasses straight to the provider so the
+encoder formats them natively instead of every serializer calling
+``isoformat()`` per row. orjson is used when it is installed; otherwise the
+stdlib provider produces the same output.
+
+Select a provider with ``CARDFIGHT_JSON_PROVIDER=auto|orjson|stdlib``.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime, time
+
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class StdlibJSONProvider(JSONProvider):
+    """Provider built on :mod:`json` that renders datetimes as ISO 8601."""
+
+    name = "stdlib"
+    mimetype = "application/json"
+
+    @property
+    def sort_keys(self) -> bool:
+        return bool(self._app.config.get("JSON_SORT_KEYS", False))
+
+    def dumps(self, obj, **kwargs) -> str:
+        kwargs.setdefault("default", _default)
+        kwargs.setdefault("ensure_ascii", False)
+        kwargs.setdefault("sort_keys", self.sort_keys)
+        kwargs.setdefault("separators", (",", ":"))
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(f"{self.dumps(obj)}\n", mimetype=self.mimetype)
+
+
+class OrjsonJSONProvider(JSONProvider):
+    """Provider built on orjson, which encodes datetimes and dataclasses in C."""
+
+    name = "orjson"
+    mimetype = "application/json"
+
+    def _options(self) -> int:
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+
+        if self._app.config.get("JSON_SORT_KEYS", False):
+            options |= orjson.OPT_SORT_KEYS
+
+        return options
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=_default, option=self._options()).decode().rstrip("\n")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=self._options())
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+JSON_PROVIDERS = {
+    "stdlib": StdlibJSONProvider,
+    "orjson": OrjsonJSONProvider,
+}
+
+
+def get_json_provider_class(name: str | None = "auto") -> type[JSONProvider]:
+    normalized = (name or "auto").strip().lower()
+
+    if normalized == "auto":
+        return OrjsonJSONProvider if orjson is not None else StdlibJSONProvider
+
+    if normalized not in JSON_PROVIDERS:
+        valid = ", ".join(["auto", *sorted(JSON_PROVIDERS)])
+        raise ValueError(f"JSON provider must be one of: {valid}")
+
+    if normalized == "orjson" and orjson is None:
+        raise RuntimeError("CARDFIGHT_JSON_PROVIDER=orjson requires the orjson package")
+
+    return JSON_PROVIDERS[normalized]
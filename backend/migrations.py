@@ -0,0 +1,277 @@
+"""
+Versioned schema migrations.
+
+Each migration has an integer version and runs once; applied versions are
+recorded in the ``schema_version`` table. Application startup only reads the
+highest recorded version instead of reflecting every table.
+
+Run pending migrations explicitly with:
+
+    python -m flask --app backend.app db upgrade
+
+SQLite's driver commits DDL as soon as it runs, so every migration must be
+safe to re-run after a partial failure. The ``_create_table``,
+``_create_index``, and ``_add_column`` helpers check before changing
+anything.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from backend.database import db
+from backend.models import (
+    AggregateState,
+    Card,
+    CardPrinting,
+    Deck,
+    DeckCard,
+    DeckDailyResult,
+    DeckPairStat,
+    DeckTurnStat,
+    DeckVersion,
+    DeckVersionStat,
+    Match,
+    MatchupMonthStat,
+    SchemaVersion,
+)
+from backend.services.daily_results import rebuild_daily_results
+from backend.services.deck_summary import rebuild_version_summaries
+from backend.services.matchup_cube import rebuild_matchup_cube
+from backend.services.pair_stats import rebuild_pair_stats
+from backend.services.ratings import rebuild_ratings
+from backend.services.turn_order_stats import rebuild_turn_order_stats
+from backend.services.version_stats import rebuild_version_stats
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+MIGRATIONS: list[Migration] = []
+
+
+def migration(version: int, description: str):
+    def register(upgrade):
+        MIGRATIONS.append(Migration(version, description, upgrade))
+        MIGRATIONS.sort(key=lambda item: item.version)
+        return upgrade
+
+    return register
+
+
+def head_version() -> int:
+    return MIGRATIONS[-1].version if MIGRATIONS else 0
+
+
+def _create_table(connection, model):
+    model.__table__.create(bind=connection, checkfirst=True)
+
+
+def _create_index(connection, model, index_name: str):
+    index = next(index for index in model.__table__.indexes if index.name == index_name)
+    index.create(bind=connection, checkfirst=True)
+
+
+def _add_column(connection, table_name: str, column_name: str, ddl: str):
+    columns = {column["name"] for column in inspect(connection).get_columns(table_name)}
+
+    if column_name not in columns:
+        connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {ddl}"))
+
+
+@migration(1, "Baseline deck, card, deck builder, and match tables")
+def _baseline(connection):
+    for model in (Deck, Card, CardPrinting, DeckVersion, DeckCard, Match):
+        _create_table(connection, model)
+
+    # Columns added to local databases before migrations were versioned.
+    _add_column(connection, "deck", "nation", "VARCHAR(50)")
+    _add_column(connection, "deck", "nation_icon", "VARCHAR(100)")
+    _add_column(connection, "match", "deck1_version_id", "INTEGER")
+    _add_column(connection, "match", "deck2_version_id", "INTEGER")
+
+
+@migration(2, "Per-pair play counts for the matchup scheduler")
+def _deck_pair_stats(connection):
+    _create_table(connection, DeckPairStat)
+    rebuild_pair_stats(connection)
+
+
+@migration(3, "Elo ratings for decks and deck versions")
+def _ratings(connection):
+    _create_table(connection, AggregateState)
+
+    for table_name in ("deck", "deck_version"):
+        _add_column(connection, table_name, "rating", "FLOAT NOT NULL DEFAULT 1500")
+        _add_column(connection, table_name, "rated_games", "INTEGER NOT NULL DEFAULT 0")
+
+    _create_index(connection, Match, "ix_match_replay")
+    rebuild_ratings(connection)
+
+
+@migration(4, "Daily per-deck results for trend charts")
+def _deck_daily_results(connection):
+    _create_table(connection, DeckDailyResult)
+    rebuild_daily_results(connection)
+
+
+@migration(5, "Per-version results by opponent and turn order")
+def _deck_version_stats(connection):
+    _create_table(connection, DeckVersionStat)
+    rebuild_version_stats(connection)
+
+
+@migration(6, "Per-deck results by turn order for first-player analytics")
+def _deck_turn_stats(connection):
+    _create_table(connection, DeckTurnStat)
+    rebuild_turn_order_stats(connection)
+
+
+@migration(7, "Monthly matchup cube for filtered stats")
+def _matchup_month_stats(connection):
+    _create_table(connection, MatchupMonthStat)
+    rebuild_matchup_cube(connection)
+
+
+@migration(8, "Change counter for the in-memory match columns")
+def _aggregate_generation(connection):
+    _add_column(connection, "aggregate_state", "generation", "INTEGER NOT NULL DEFAULT 0")
+
+
+@migration(9, "Match edit timestamps for incremental exports")
+def _match_updated_at(connection):
+    _add_column(connection, "match", "updated_at", "DATETIME")
+    # Existing matches count as last changed when they were played.
+    connection.execute(text('UPDATE "match" SET updated_at = date_played WHERE updated_at IS NULL'))
+    _create_index(connection, Match, "ix_match_updated")
+
+
+@migration(10, "Stored card-count summaries for deck versions")
+def _deck_version_summary(connection):
+    _add_column(connection, "deck_version", "summary", "JSON")
+    rebuild_version_summaries(connection)
+
+
+@migration(11, "Optimistic lock counter for deck version edits")
+def _deck_version_lock(connection):
+    _add_column(connection, "deck_version", "lock_version", "INTEGER NOT NULL DEFAULT 1")
+
+
+@migration(12, "Client keys for idempotent match submission")
+def _match_client_id(connection):
+    _add_column(connection, "match", "client_match_id", "VARCHAR(64)")
+    _create_index(connection, Match, "ux_match_client_id")
+
+
+@migration(13, "Pair rows for decks added outside the API")
+def _missing_deck_pairs(connection):
+    # Seeded decks used to get no pair rows, which left the scheduler empty.
+    rebuild_pair_stats(connection)
+
+
+@migration(14, "Rating timestamps for deck versions")
+def _version_rated_at(connection):
+    _add_column(connection, "deck_version", "rated_at", "DATETIME")
+
+
+def current_version() -> int:
+    """Return the recorded schema version, or 0 for an unversioned database."""
+    with db.engine.connect() as connection:
+        try:
+            return int(
+                connection.execute(text("SELECT MAX(version) FROM schema_version")).scalar() or 0
+            )
+        except (OperationalError, ProgrammingError):
+            return 0
+
+
+def _record(connection, migration_item: Migration):
+    connection.execute(
+        SchemaVersion.__table__.insert().values(
+            version=migration_item.version,
+            description=migration_item.description,
+        )
+    )
+
+
+def upgrade_database() -> list[Migration]:
+    """Apply pending migrations and return the ones that ran."""
+    version = current_version()
+
+    if version == 0 and not inspect(db.engine).has_table("deck"):
+        # A brand-new database gets the current schema in one step.
+        db.create_all()
+
+        with db.engine.begin() as connection:
+            for migration_item in MIGRATIONS:
+                _record(connection, migration_item)
+
+        return list(MIGRATIONS)
+
+    applied = []
+
+    for migration_item in MIGRATIONS:
+        if migration_item.version <= version:
+            continue
+
+        with db.engine.begin() as connection:
+            _create_table(connection, SchemaVersion)
+            migration_item.upgrade(connection)
+            _record(connection, migration_item)
+
+        applied.append(migration_item)
+
+    return applied
+
+
+def ensure_schema_current(app) -> int:
+    """Check the schema version once at startup, migrating if allowed."""
+    version = current_version()
+
+    if version >= head_version():
+        return version
+
+    if app.config.get("AUTO_MIGRATE"):
+        upgrade_database()
+        return head_version()
+
+    app.logger.warning(
+        "Database schema is at version %s but version %s is required. "
+        "Run `python -m flask --app backend.app db upgrade`.",
+        version,
+        head_version(),
+    )
+    return version
+
+
+db_cli = AppGroup("db", help="Inspect and upgrade the database schema.")
+
+
+@db_cli.command("upgrade")
+def upgrade_command():
+    """Apply pending schema migrations."""
+    applied = upgrade_database()
+
+    if not applied:
+        click.echo(f"Database schema is already at version {current_version()}.")
+        return
+
+    for migration_item in applied:
+        click.echo(f"Applied {migration_item.version}: {migration_item.description}")
+
+
+@db_cli.command("current")
+def current_command():
+    """Show the recorded and latest schema versions."""
+    click.echo(f"Current schema version: {current_version()} (latest {head_version()})")
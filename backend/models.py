@@ -27,18 +27,22 @@ class Deck(db.Model):
     losses = db.Column(db.Integer, default=0, nullable=False)
     active = db.Column(db.Boolean, default=True, nullable=False)
 
+    # Elo rating maintained by backend/services/ratings.py.
+    rating = db.Column(db.Float, default=1500.0, nullable=False)
+    rated_games = db.Column(db.Integer, default=0, nullable=False)
+
     created_at = db.Column(db.DateTime, default=now_central, nullable=False)
 
     matches_as_1 = db.relationship(
         "Match",
         foreign_keys="Match.deck1_id",
-        backref="deck1",
+        back_populates="deck1",
         lazy="dynamic",
     )
     matches_as_2 = db.relationship(
         "Match",
         foreign_keys="Match.deck2_id",
-        backref="deck2",
+        back_populates="deck2",
         lazy="dynamic",
     )
 
@@ -86,7 +90,8 @@ class Match(db.Model):
     deck1_id = db.Column(db.Integer, db.ForeignKey("deck.id"), nullable=False)
     deck2_id = db.Column(db.Integer, db.ForeignKey("deck.id"), nullable=False)
 
-    # Optional future link to exact deck versions used in a match.
+    # Deck versions used in the match; create_match defaults each side to
+    # its deck's active version.
     deck1_version_id = db.Column(
         db.Integer,
         db.ForeignKey("deck_version.id"),
@@ -105,6 +110,29 @@ class Match(db.Model):
     date_played = db.Column(db.DateTime, default=now_central, nullable=False)
     notes = db.Column(db.Text, default="", nullable=False)
 
+    # Optional client-chosen key (``Idempotency-Key``); a retried submission
+    # with the same key returns the stored match instead of adding another.
+    client_match_id = db.Column(db.String(64), nullable=True)
+
+    # Lets incremental exports pick up edited matches, not just new ones.
+    updated_at = db.Column(
+        db.DateTime,
+        default=now_central,
+        onupdate=now_central,
+        nullable=False,
+    )
+
+    deck1 = db.relationship(
+        "Deck",
+        foreign_keys=[deck1_id],
+        back_populates="matches_as_1",
+    )
+    deck2 = db.relationship(
+        "Deck",
+        foreign_keys=[deck2_id],
+        back_populates="matches_as_2",
+    )
+
     deck1_version = db.relationship(
         "DeckVersion",
         foreign_keys=[deck1_version_id],
@@ -124,6 +152,19 @@ class Match(db.Model):
         db.Index("ix_match_winner", "winner_id"),
         db.Index("ix_match_d1_version", "deck1_version_id"),
         db.Index("ix_match_d2_version", "deck2_version_id"),
+        db.Index("ix_match_updated", "updated_at"),
+        db.Index("ux_match_client_id", "client_match_id", unique=True),
+        # Covers the rating replay, which reads every match in play order.
+        db.Index(
+            "ix_match_replay",
+            "date_played",
+            "id",
+            "winner_id",
+            "deck1_id",
+            "deck2_id",
+            "deck1_version_id",
+            "deck2_version_id",
+        ),
     )
 
     def to_dict(self):
@@ -268,6 +309,20 @@ class DeckVersion(db.Model):
 
     is_active = db.Column(db.Boolean, default=True, nullable=False)
 
+    # Elo rating from matches that recorded this exact version.
+    rating = db.Column(db.Float, default=1500.0, nullable=False)
+    rated_games = db.Column(db.Integer, default=0, nullable=False)
+    # Last rating write. Ratings leave ``updated_at`` alone, so exports
+    # check both to pick up new ratings.
+    rated_at = db.Column(db.DateTime, nullable=True)
+
+    # Card counts and deck-rule status, kept current by deck-builder writes
+    # (see ``backend/services/deck_summary.py``).
+    summary = db.Column(db.JSON)
+    # Optimistic lock for card changes: every one bumps it with a
+    # conditional update (see ``backend/services/deck_builder.py``).
+    lock_version = db.Column(db.Integer, default=1, nullable=False)
+
     created_at = db.Column(db.DateTime, default=now_central, nullable=False)
     updated_at = db.Column(
         db.DateTime,
@@ -344,4 +399,221 @@ class DeckCard(db.Model):
     )
 
     def __repr__(self):
-        return f"<DeckCard version={self.deck_version_id} card={self.card_id} qty={self.quantity}>"
\ No newline at end of file
+        return f"<DeckCard version={self.deck_version_id} card={self.card_id} qty={self.quantity}>"
+
+# --- Match Aggregates ---
+class DeckPairStat(db.Model):
+    """
+    Play counts for one unordered deck pair, kept in step with match writes.
+
+    Every pair of decks has a row, including pairs that have never played,
+    so the scheduler can find the least-played or most uncertain pairing
+    through an index instead of recounting matches.
+    """
+
+    __tablename__ = "deck_pair_stat"
+
+    deck_low_id = db.Column(
+        db.Integer,
+        db.ForeignKey("deck.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    deck_high_id = db.Column(
+        db.Integer,
+        db.ForeignKey("deck.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    games = db.Column(db.Integer, default=0, nullable=False)
+    low_wins = db.Column(db.Integer, default=0, nullable=False)
+    high_wins = db.Column(db.Integer, default=0, nullable=False)
+
+    # Posterior variance of the low deck's win rate; higher is less certain.
+    uncertainty = db.Column(db.Float, nullable=False)
+    # Random tie-breaker so equally ranked pairs are picked in varying order.
+    shuffle_key = db.Column(db.Integer, nullable=False)
+
+    __table_args__ = (
+        db.CheckConstraint("deck_low_id < deck_high_id", name="ck_deck_pair_ordered"),
+        db.Index("ix_deck_pair_games", "games", "shuffle_key"),
+        db.Index("ix_deck_pair_uncertainty", "uncertainty", "shuffle_key"),
+        db.Index("ix_deck_pair_high", "deck_high_id"),
+    )
+
+    def __repr__(self):
+        return f"<DeckPairStat {self.deck_low_id}-{self.deck_high_id} games={self.games}>"
+
+
+class DeckDailyResult(db.Model):
+    """
+    One deck's results for one day, split by opponent type and match format.
+
+    Trend charts sum these rows instead of scanning the match table. A match
+    without a recorded format is stored under ``format = ""``.
+    """
+
+    __tablename__ = "deck_daily_result"
+
+    deck_id = db.Column(
+        db.Integer,
+        db.ForeignKey("deck.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day = db.Column(db.Date, primary_key=True)
+    opponent_type = db.Column(db.String(20), primary_key=True)
+    format = db.Column(db.String(20), primary_key=True, default="")
+
+    wins = db.Column(db.Integer, default=0, nullable=False)
+    losses = db.Column(db.Integer, default=0, nullable=False)
+    undecided = db.Column(db.Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<DeckDailyResult deck={self.deck_id} day={self.day} {self.wins}-{self.losses}>"
+
+
+class DeckVersionStat(db.Model):
+    """
+    One deck version's results against one opponent deck, by turn order.
+
+    ``turn_order`` is ``first``, ``second``, or ``unknown`` when the match
+    did not record a first player. Version comparisons read these rows by
+    ``version_id`` instead of scanning matches.
+    """
+
+    __tablename__ = "deck_version_stat"
+
+    version_id = db.Column(
+        db.Integer,
+        db.ForeignKey("deck_version.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    opponent_deck_id = db.Column(
+        db.Integer,
+        db.ForeignKey("deck.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    turn_order = db.Column(db.String(10), primary_key=True)
+
+    wins = db.Column(db.Integer, default=0, nullable=False)
+    losses = db.Column(db.Integer, default=0, nullable=False)
+    undecided = db.Column(db.Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<DeckVersionStat version={self.version_id} vs={self.opponent_deck_id} {self.turn_order}>"
+
+
+class DeckTurnStat(db.Model):
+    """
+    One deck's results against one opponent deck in one format, by turn order.
+
+    ``turn_order`` is ``first`` or ``second``; matches without a recorded
+    first player are left out. Turn-order analytics group these rows
+    instead of the match table. A match without a format is stored under
+    ``format = ""``.
+    """
+
+    __tablename__ = "deck_turn_stat"
+
+    deck_id = db.Column(
+        db.Integer,
+        db.ForeignKey("deck.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    opponent_deck_id = db.Column(
+        db.Integer,
+        db.ForeignKey("deck.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    format = db.Column(db.String(20), primary_key=True, default="")
+    turn_order = db.Column(db.String(10), primary_key=True)
+
+    wins = db.Column(db.Integer, default=0, nullable=False)
+    losses = db.Column(db.Integer, default=0, nullable=False)
+    undecided = db.Column(db.Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_deck_turn_opponent", "opponent_deck_id"),
+        # Covers the per-deck and per-format rollup, so it never reads the table.
+        db.Index("ix_deck_turn_rollup", "deck_id", "format", "turn_order", "wins", "losses", "undecided"),
+    )
+
+    def __repr__(self):
+        return f"<DeckTurnStat deck={self.deck_id} vs={self.opponent_deck_id} {self.turn_order}>"
+
+
+class MatchupMonthStat(db.Model):
+    """
+    One cell of the stats cube: a deck's results against one opponent deck
+    in one format during one calendar month.
+
+    Every match adds a cell from each participant's side. The table, deck
+    versus, and matrix endpoints answer any format, month range, and
+    active-deck slice by summing cells. ``month`` is the first day of the
+    month; a match without a recorded format is stored under ``format = ""``.
+    The table is stored without a rowid, clustered on ``(deck_id,
+    opponent_deck_id, ...)``, so per-deck and per-pair sums read cells in
+    key order without a sort.
+    """
+
+    __tablename__ = "matchup_month_stat"
+
+    deck_id = db.Column(
+        db.Integer,
+        db.ForeignKey("deck.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    opponent_deck_id = db.Column(
+        db.Integer,
+        db.ForeignKey("deck.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    format = db.Column(db.String(20), primary_key=True, default="")
+    month = db.Column(db.Date, primary_key=True)
+
+    wins = db.Column(db.Integer, default=0, nullable=False)
+    losses = db.Column(db.Integer, default=0, nullable=False)
+    undecided = db.Column(db.Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_matchup_month_opponent", "opponent_deck_id"),
+        {"sqlite_with_rowid": False},
+    )
+
+    def __repr__(self):
+        return f"<MatchupMonthStat deck={self.deck_id} vs={self.opponent_deck_id} {self.month}>"
+
+
+class AggregateState(db.Model):
+    """
+    Bookkeeping for a derived table that is maintained incrementally.
+
+    ``watermark_at``/``watermark_id`` mark the newest match folded in.
+    ``stale`` is set when history changes in a way the incremental path
+    cannot apply, and cleared by the next rebuild. ``generation`` counts
+    changes for copies kept outside the database, such as the in-memory
+    match columns.
+    """
+
+    __tablename__ = "aggregate_state"
+
+    name = db.Column(db.String(80), primary_key=True)
+    stale = db.Column(db.Boolean, default=False, nullable=False)
+    watermark_at = db.Column(db.DateTime, nullable=True)
+    watermark_id = db.Column(db.Integer, nullable=True)
+    rebuilt_at = db.Column(db.DateTime, nullable=True)
+    generation = db.Column(db.Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<AggregateState {self.name} stale={self.stale}>"
+
+
+# --- Schema Migrations ---
+class SchemaVersion(db.Model):
+    __tablename__ = "schema_version"
+
+    version = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    description = db.Column(db.String(200), nullable=False)
+    applied_at = db.Column(db.DateTime, default=now_central, nullable=False)
+
+    def __repr__(self):
+        return f"<SchemaVersion {self.version}>"
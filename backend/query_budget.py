@@ -0,0 +1,64 @@
+"""
+SQL query-count budgets.
+
+``query_budget(limit)`` works as a context manager or decorator and checks
+how many statements ran inside it. Routes declare budgets by endpoint name
+in ``ROUTE_QUERY_BUDGETS`` (``backend/routes/__init__.py``), which are
+checked against the per-request recorder from ``backend.instrumentation``.
+
+A budget overrun raises ``QueryBudgetExceeded`` when the app is in testing
+mode and logs a warning otherwise.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+from flask import current_app, g, has_app_context, request
+
+from backend.instrumentation import QueryRecorder, record_queries
+
+
+class QueryBudgetExceeded(RuntimeError):
+    def __init__(self, label: str, limit: int, recorder: QueryRecorder):
+        statements = "".join(
+            f"\n  {' '.join(statement.split())[:200]}" for statement, _ in recorder.statements
+        )
+        super().__init__(
+            f"{label} issued {recorder.count} SQL statements (budget {limit}):{statements}"
+        )
+        self.label = label
+        self.limit = limit
+        self.count = recorder.count
+
+
+def report_budget_overrun(label: str, limit: int, recorder: QueryRecorder):
+    error = QueryBudgetExceeded(label, limit, recorder)
+
+    if has_app_context() and current_app.testing:
+        raise error
+
+    if has_app_context():
+        current_app.logger.warning(str(error))
+
+
+@contextmanager
+def query_budget(limit: int, label: str = "block"):
+    """Fail (testing) or warn (otherwise) if the block issues more than ``limit`` statements."""
+    with record_queries() as recorder:
+        yield recorder
+
+    if recorder.count > limit:
+        report_budget_overrun(label, limit, recorder)
+
+
+def init_query_budgets(app, budgets: dict[str, int]):
+    @app.after_request
+    def enforce_route_query_budget(response):
+        recorder = g.get("cardfight_recorder")
+        limit = budgets.get(request.endpoint)
+
+        if recorder is not None and limit is not None and recorder.count > limit:
+            report_budget_overrun(f"{request.method} {request.endpoint}", limit, recorder)
+
+        return response
@@ -17,4 +17,70 @@ all_blueprints = [
     bp_dashboard,
     bp_cards,
     bp_deck_builder,
-]
\ No newline at end of file
+]
+
+# Maximum SQL statements per request, keyed by endpoint. Checked after every
+# request by backend.query_budget; a route that starts issuing a query per row
+# fails tests/test_query_budgets.py instead of slowly degrading in production.
+# Budgets must not depend on how many rows a response returns.
+#
+# Reads that show ratings replay match history first when an edit or delete
+# left them stale (backend/services/ratings.py); that costs a fixed number
+# of statements regardless of history size.
+RATINGS_REPLAY_STATEMENTS = 9
+
+ROUTE_QUERY_BUDGETS = {
+    "health": 2,
+    # decks
+    "decks.list_decks": 2,
+    "decks.deck_options": 1,
+    "decks.get_deck": 2,
+    "decks.create_deck": 6,
+    "decks.update_deck": 11,
+    "decks.delete_deck": 8,
+    # matches
+    "matches.list_matches_route": 3,
+    "matches.get_match_route": 2,
+    "matches.create_match_route": 21,
+    "matches.bulk_create_matches_route": 21,
+    "matches.update_match_route": 20,
+    "matches.delete_match_route": 14,
+    # play, stats, dashboard
+    "play.random_matchup": 6 + RATINGS_REPLAY_STATEMENTS,
+    "play.matchup_queue": 5 + RATINGS_REPLAY_STATEMENTS,
+    "play.predict_matchup": 4 + RATINGS_REPLAY_STATEMENTS,
+    "play.tournament_route": 5 + RATINGS_REPLAY_STATEMENTS,
+    "stats.stats_table_route": 3 + RATINGS_REPLAY_STATEMENTS,
+    "stats.versus_route": 5,
+    "stats.matrix_route": 5,
+    "stats.trends_route": 3,
+    "stats.versions_route": 5 + RATINGS_REPLAY_STATEMENTS,
+    "stats.turn_order_route": 4,
+    "stats.rivalries_route": 3,
+    "stats.cards_route": 6,
+    "dashboard.dashboard_route": 4,
+    # admin
+    "admin.admin_recount": 34,
+    "admin.admin_metrics": 1,
+    # cards
+    "cards.card_form_options_route": 4,
+    "cards.search_cards_route": 3,
+    "cards.card_library_route": 4,
+    "cards.get_card_route": 3,
+    "cards.create_card_route": 6,
+    "cards.update_card_route": 8,
+    "cards.add_card_printing_route": 5,
+    "cards.update_card_printing_route": 6,
+    "cards.analyze_card_image_route": 1,
+    # deck builder
+    "deck_builder.list_deck_versions_route": 4,
+    "deck_builder.get_deck_version_route": 4,
+    "deck_builder.create_deck_version_route": 14,
+    "deck_builder.update_deck_version_route": 8,
+    "deck_builder.delete_deck_version_route": 6,
+    "deck_builder.simulate_deck_version_route": 3,
+    "deck_builder.optimize_deck_version_route": 4,
+    "deck_builder.add_card_to_deck_version_route": 10,
+    "deck_builder.update_deck_card_route": 10,
+    "deck_builder.remove_deck_card_route": 6,
+}
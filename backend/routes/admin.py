@@ -1,5 +1,6 @@
 from flask import Blueprint, jsonify
 
+from backend.instrumentation import get_metrics_registry
 from backend.services.admin import recount_deck_records
 
 
@@ -9,4 +10,13 @@ bp_admin = Blueprint("admin", __name__, url_prefix="/api/admin")
 @bp_admin.route("/recount", methods=["POST", "GET"])
 def admin_recount():
     summary = recount_deck_records()
-    return jsonify({"status": "ok", **summary}), 200
\ No newline at end of file
+    return jsonify({"status": "ok", **summary}), 200
+
+
+@bp_admin.get("/metrics")
+def admin_metrics():
+    return (
+        get_metrics_registry().render(),
+        200,
+        {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+    )
@@ -1,5 +1,4 @@
 from flask import Blueprint, current_app, jsonify, request
-from openai import APIError, AuthenticationError, RateLimitError
 
 from backend.services.cards import (
     DuplicateCardPrintingError,
@@ -12,7 +11,12 @@ from backend.services.cards import (
     update_card,
     update_card_printing,
 )
-from backend.services.serializers import serialize_card, serialize_card_printing
+from backend.services.deck_builder import DeckVersionConflict
+from backend.services.serializers import (
+    serialize_card,
+    serialize_card_printing,
+    serialize_cards,
+)
 from backend.services.card_image_analyzer import analyze_card_image
 
 
@@ -40,7 +44,7 @@ def search_cards_route():
         limit=request.args.get("limit", 50),
     )
 
-    return jsonify([serialize_card(card, include_printings=True) for card in cards])
+    return jsonify(serialize_cards(cards, include_printings=True))
 
 
 @bp_cards.post("")
@@ -74,10 +78,7 @@ def card_library_route():
 
     return jsonify(
         {
-            "items": [
-                serialize_card(card, include_printings=True)
-                for card in result["items"]
-            ],
+            "items": serialize_cards(result["items"], include_printings=True),
             "pagination": result["pagination"],
         }
     )
@@ -108,6 +109,8 @@ def update_card_route(card_id):
         return _json_error(str(exc), 404)
     except ValueError as exc:
         return _json_error(str(exc), 400)
+    except DeckVersionConflict as exc:
+        return _json_error(str(exc), 409)
 
     return jsonify(serialize_card(card))
 
@@ -150,19 +153,21 @@ def update_card_printing_route(printing_id):
     return jsonify(serialize_card_printing(printing))
 
 
-@bp_cards.post("/analyze-image")
-def analyze_card_image_route():
+def _analysis_error_response(exc):
+    """Translate an analyzer failure, importing the OpenAI SDK only once one occurs."""
     try:
-        result = analyze_card_image(request.files.get("image"))
-    except ValueError as exc:
-        return _json_error(str(exc), 400)
-    except AuthenticationError:
+        from openai import APIError, AuthenticationError, RateLimitError
+    except ImportError:
+        APIError = AuthenticationError = RateLimitError = ()
+
+    if isinstance(exc, AuthenticationError):
         current_app.logger.exception("Card image analysis authentication failed")
         return _json_error(
             "OpenAI authentication failed. Check OPENAI_API_KEY in your .env file.",
             401,
         )
-    except RateLimitError as exc:
+
+    if isinstance(exc, RateLimitError):
         current_app.logger.exception("Card image analysis quota/rate limit failed")
 
         error_code = None
@@ -188,11 +193,22 @@ def analyze_card_image_route():
             ),
             429,
         )
-    except APIError as exc:
+
+    if isinstance(exc, APIError):
         current_app.logger.exception("Card image analysis API failed")
         return _json_error(f"OpenAI API error: {exc}", 502)
+
+    current_app.logger.exception("Card image analysis failed")
+    return _json_error(f"Card image analysis failed: {exc}", 500)
+
+
+@bp_cards.post("/analyze-image")
+def analyze_card_image_route():
+    try:
+        result = analyze_card_image(request.files.get("image"))
+    except ValueError as exc:
+        return _json_error(str(exc), 400)
     except Exception as exc:
-        current_app.logger.exception("Card image analysis failed")
-        return _json_error(f"Card image analysis failed: {exc}", 500)
+        return _analysis_error_response(exc)
 
     return jsonify(result)
@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request
 
 from backend.services.deck_builder import (
+    DeckVersionConflict,
     add_card_to_deck_version,
     create_deck_version,
     delete_deck_version,
@@ -10,7 +11,9 @@ from backend.services.deck_builder import (
     update_deck_card,
     update_deck_version,
 )
+from backend.services.optimizer import optimize_deck_version
 from backend.services.serializers import serialize_deck_card, serialize_deck_version
+from backend.services.simulation import simulate_deck_version
 
 
 bp_deck_builder = Blueprint("deck_builder", __name__, url_prefix="/api")
@@ -64,12 +67,62 @@ def update_deck_version_route(version_id):
     return jsonify(serialize_deck_version(version))
 
 
+@bp_deck_builder.get("/deck-versions/<int:version_id>/simulate")
+def simulate_deck_version_route(version_id):
+    """
+    Opening-hand, ride, and trigger odds for a deck version.
+
+    Optional query params:
+    - trials=100000 (shuffles to simulate, up to 500000)
+    - turns=5 (up to 8)
+    - going=first | second
+    - seed (repeatable results)
+    """
+    try:
+        result = simulate_deck_version(
+            version_id,
+            trials=request.args.get("trials"),
+            turns=request.args.get("turns"),
+            going=request.args.get("going"),
+            seed=request.args.get("seed"),
+        )
+    except LookupError as exc:
+        return _json_error(str(exc), 404)
+    except ValueError as exc:
+        return _json_error(str(exc), 400)
+
+    return jsonify(result)
+
+
+@bp_deck_builder.post("/deck-versions/<int:version_id>/optimize")
+def optimize_deck_version_route(version_id):
+    """
+    Best main deck quantities for a set of candidate cards.
+
+    JSON body:
+    - card_ids (required, up to 8)
+    - max_copies=4, main_size=50, trigger_weight=1.0
+    - top=5, shortlist=24 (allocations to simulate)
+    - trials=20000, going=first | second, seed=0
+    """
+    try:
+        result = optimize_deck_version(version_id, request.get_json(silent=True) or {})
+    except LookupError as exc:
+        return _json_error(str(exc), 404)
+    except ValueError as exc:
+        return _json_error(str(exc), 400)
+
+    return jsonify(result)
+
+
 @bp_deck_builder.delete("/deck-versions/<int:version_id>")
 def delete_deck_version_route(version_id):
     try:
         delete_deck_version(version_id)
     except LookupError as exc:
         return _json_error(str(exc), 404)
+    except ValueError as exc:
+        return _json_error(str(exc), 409)
 
     return jsonify({"deleted": True, "id": version_id})
 
@@ -82,6 +135,8 @@ def add_card_to_deck_version_route(version_id):
         return _json_error(str(exc), 404)
     except ValueError as exc:
         return _json_error(str(exc), 400)
+    except DeckVersionConflict as exc:
+        return _json_error(str(exc), 409)
 
     return jsonify(serialize_deck_card(entry)), 201
 
@@ -94,6 +149,8 @@ def update_deck_card_route(deck_card_id):
         return _json_error(str(exc), 404)
     except ValueError as exc:
         return _json_error(str(exc), 400)
+    except DeckVersionConflict as exc:
+        return _json_error(str(exc), 409)
 
     return jsonify(serialize_deck_card(entry))
 
@@ -104,5 +161,7 @@ def remove_deck_card_route(deck_card_id):
         remove_deck_card(deck_card_id)
     except LookupError as exc:
         return _json_error(str(exc), 404)
+    except DeckVersionConflict as exc:
+        return _json_error(str(exc), 409)
 
     return jsonify({"deleted": True, "id": deck_card_id})
\ No newline at end of file
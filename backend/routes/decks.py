@@ -3,6 +3,7 @@ from sqlalchemy import or_
 
 from backend.database import db
 from backend.models import Deck, Match
+from backend.services.daily_results import refresh_results_against
 from backend.services.serializers import serialize_deck
 
 
@@ -140,7 +141,10 @@ def update_deck(deck_id: int):
         if deck_type not in VALID_DECK_TYPES:
             return jsonify(error="type must be Standard or Stride."), 400
 
-        deck.type = deck_type
+        if deck_type != deck.type:
+            deck.type = deck_type
+            # Opponents' trend rows are split by this deck's type.
+            refresh_results_against(deck.id)
 
     if "nation" in data:
         try:
@@ -1,7 +1,9 @@
 from flask import Blueprint, jsonify, request
 
 from backend.services.matches import (
-    create_match as svc_create_match,
+    ClientMatchIdReused,
+    record_match as svc_record_match,
+    record_matches as svc_record_matches,
     list_matches as svc_list_matches,
     get_match as svc_get_match,
     update_match as svc_update_match,
@@ -46,13 +48,46 @@ def get_match_route(match_id: int):
     return jsonify(svc_get_match(match_id))
 
 
+def _replay_headers(replayed: bool) -> dict:
+    return {"Idempotent-Replayed": "true"} if replayed else {}
+
+
 @bp_matches.post("")
 def create_match_route():
+    """
+    Log a match. An ``Idempotency-Key`` header (or ``client_match_id``
+    field) makes retries safe: a repeated key returns the stored match with
+    ``Idempotent-Replayed: true`` instead of logging it again.
+    """
     data = request.get_json(force=True, silent=True) or {}
 
     try:
-        row = svc_create_match(data)
-        return jsonify(row), 201
+        row, replayed = svc_record_match(data, request.headers.get("Idempotency-Key"))
+        return jsonify(row), 201, _replay_headers(replayed)
+    except ClientMatchIdReused as e:
+        return jsonify(error=str(e)), 409
+    except LookupError as e:
+        return jsonify(error=str(e)), 404
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+
+
+@bp_matches.post("/bulk")
+def bulk_create_matches_route():
+    """
+    Log up to 500 matches in one transaction: ``{"matches": [...]}``.
+
+    Items take the same fields as ``POST /api/matches``. With an
+    ``Idempotency-Key`` header, items without a ``client_match_id`` are keyed
+    ``<key>:<index>``, so retrying the whole batch replays it.
+    """
+    data = request.get_json(force=True, silent=True)
+
+    try:
+        result = svc_record_matches(data, request.headers.get("Idempotency-Key"))
+        return jsonify(result), 201, _replay_headers(result["created"] == 0)
+    except ClientMatchIdReused as e:
+        return jsonify(error=str(e)), 409
     except LookupError as e:
         return jsonify(error=str(e)), 404
     except ValueError as e:
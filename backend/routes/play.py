@@ -1,7 +1,7 @@
 from flask import Blueprint, jsonify, request
 
-from backend.models import Deck
-from backend.services.serializers import serialize_deck
+from backend.services.scheduler import build_session_queue, pick_matchup, predict
+from backend.services.tournament import tournament_odds
 
 
 bp_play = Blueprint("play", __name__, url_prefix="/api/play")
@@ -10,37 +10,78 @@ bp_play = Blueprint("play", __name__, url_prefix="/api/play")
 @bp_play.get("/random")
 def random_matchup():
     """
-    Return two random active decks.
+    Return two active decks to play next.
 
     Optional query params:
-    - format=Standard
-    - format=Stride
-    - format=Any
+    - format=Standard | Stride | Any
+    - schedule=random (default) | least_played | uncertain
     """
-    fmt = request.args.get("format", "Any")
+    try:
+        return jsonify(
+            pick_matchup(
+                request.args.get("format", "Any"),
+                request.args.get("schedule", "random"),
+            )
+        )
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
 
-    query = Deck.query.filter_by(active=True)
 
-    if fmt in ("Standard", "Stride"):
-        query = query.filter(Deck.type == fmt)
-    elif fmt not in ("Any", "", None):
-        return jsonify(error="format must be Standard, Stride, or Any."), 400
+@bp_play.get("/queue")
+def matchup_queue():
+    """
+    Return a session queue of matchups.
 
-    decks = query.all()
+    Optional query params:
+    - size=10 (1-100)
+    - strategy=round_robin (default) | weighted
+    - format=Standard | Stride | Any
+    """
+    try:
+        return jsonify(
+            build_session_queue(
+                size=request.args.get("size", 10),
+                strategy=request.args.get("strategy", "round_robin"),
+                fmt=request.args.get("format", "Any"),
+            )
+        )
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
 
-    if len(decks) < 2:
-        return jsonify(error="At least two active decks are required for a random matchup."), 400
 
-    import random
+@bp_play.get("/predict")
+def predict_matchup():
+    """
+    Return rating-based win odds for two decks.
 
-    deck1, deck2 = random.sample(decks, 2)
-    first_player = random.choice([deck1, deck2])
+    Query params:
+    - deck1_id
+    - deck2_id
+    """
+    try:
+        return jsonify(predict(request.args.get("deck1_id"), request.args.get("deck2_id")))
+    except LookupError as exc:
+        return jsonify(error=str(exc)), 404
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
 
-    return jsonify(
-        {
-            "deck1": serialize_deck(deck1),
-            "deck2": serialize_deck(deck2),
-            "first_player": serialize_deck(first_player),
-            "format": fmt,
-        }
-    )
\ No newline at end of file
+
+@bp_play.post("/tournament")
+def tournament_route():
+    """
+    Simulate a bracket for a field of decks and return each deck's odds.
+
+    JSON body:
+    - deck_ids (required, 2-256)
+    - bracket=single_elimination | swiss
+    - rounds (Swiss, default log2 of the field), top_cut=0 | 2 | 4 | 8 ...
+    - best_of=1 | 3 | 5
+    - trials=20000, seed, prior_games=4
+    - format, since, until (which games feed the matchup odds)
+    """
+    try:
+        return jsonify(tournament_odds(request.get_json(silent=True) or {}))
+    except LookupError as exc:
+        return jsonify(error=str(exc)), 404
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
@@ -1,7 +1,12 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 
+from backend.services.card_stats import card_lift
 from backend.services.stats import (
+    deck_trends,
+    rivalries,
+    turn_order_breakdown,
     stats_table as svc_stats_table,
+    version_comparison,
     versus_for,
     matrix as svc_matrix,
 )
@@ -10,16 +15,154 @@ from backend.services.stats import (
 bp_stats = Blueprint("stats", __name__, url_prefix="/api/stats")
 
 
+def _cube_args() -> dict:
+    """
+    Slice filters shared by the table, versus, and matrix endpoints.
+
+    Optional query params:
+    - format=Standard | Stride | Any
+    - since=YYYY-MM, until=YYYY-MM (whole months; a full date picks its month)
+    - active_only=true (only active decks, on both sides of each game)
+    """
+    return {
+        "fmt": request.args.get("format"),
+        "since": request.args.get("since"),
+        "until": request.args.get("until"),
+        "active_only": request.args.get("active_only"),
+    }
+
+
 @bp_stats.get("/table")
 def stats_table_route():
-    return jsonify(svc_stats_table())
+    try:
+        return jsonify(svc_stats_table(**_cube_args()))
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
 
 
 @bp_stats.get("/versus/<int:deck_id>")
 def versus_route(deck_id: int):
-    return jsonify(versus_for(deck_id))
+    try:
+        return jsonify(versus_for(deck_id, **_cube_args()))
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
 
 
 @bp_stats.get("/matrix")
 def matrix_route():
-    return jsonify(svc_matrix())
\ No newline at end of file
+    try:
+        return jsonify(svc_matrix(**_cube_args()))
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
+
+@bp_stats.get("/trends/<int:deck_id>")
+def trends_route(deck_id: int):
+    """
+    Daily results and rolling win rates for one deck.
+
+    Optional query params:
+    - windows=7,30,90 (trailing window sizes in days)
+    - days=90 (length of the daily series)
+    - until=YYYY-MM-DD (defaults to today)
+    - format=Standard | Stride | Any
+    - opponent_type=Standard | Stride
+    """
+    try:
+        return jsonify(
+            deck_trends(
+                deck_id,
+                windows=request.args.get("windows"),
+                days=request.args.get("days"),
+                fmt=request.args.get("format"),
+                opponent_type=request.args.get("opponent_type"),
+                until=request.args.get("until"),
+            )
+        )
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
+
+
+@bp_stats.get("/versions/<int:deck_id>")
+def versions_route(deck_id: int):
+    """
+    Side-by-side results for a deck's versions.
+
+    Optional query params:
+    - version_ids=6,7 (compare only these versions; defaults to all)
+    """
+    try:
+        return jsonify(version_comparison(deck_id, version_ids=request.args.get("version_ids")))
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
+
+
+@bp_stats.get("/turn-order")
+def turn_order_route():
+    """
+    First- and second-player win rates per deck, format, and matchup.
+
+    Optional query params:
+    - deck_id (also lists that deck's matchups)
+    - opponent_id
+    - format=Standard | Stride | Any
+    - opponent_type=Standard | Stride
+    - active_only=true (only decks that are still active, on both sides)
+    """
+    try:
+        return jsonify(
+            turn_order_breakdown(
+                deck_id=request.args.get("deck_id"),
+                opponent_id=request.args.get("opponent_id"),
+                fmt=request.args.get("format"),
+                opponent_type=request.args.get("opponent_type"),
+                active_only=request.args.get("active_only"),
+            )
+        )
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
+
+
+@bp_stats.get("/rivalries")
+def rivalries_route():
+    """
+    Head-to-head records for each pair of decks, busiest pairs first.
+
+    Optional query params:
+    - format=Standard | Stride | Any (count only games in that format)
+    - min_games=3 (leave out pairs with fewer games)
+    - limit=200 (at most 1000)
+    """
+    try:
+        return jsonify(
+            rivalries(
+                fmt=request.args.get("format"),
+                min_games=request.args.get("min_games"),
+                limit=request.args.get("limit"),
+            )
+        )
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
+
+
+@bp_stats.get("/cards")
+def cards_route():
+    """
+    Win rates of deck versions with and without each card, and the lift.
+
+    Optional query params:
+    - format=Standard | Stride | Any (count only games in that format)
+    - min_games=20 (decided games with the card)
+    - limit=100 (at most 1000)
+    - sort=lift | games
+    """
+    try:
+        return jsonify(
+            card_lift(
+                fmt=request.args.get("format"),
+                min_games=request.args.get("min_games"),
+                limit=request.args.get("limit"),
+                sort=request.args.get("sort"),
+            )
+        )
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
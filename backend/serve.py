@@ -0,0 +1,35 @@
+"""
+Serves the API with waitress, a production WSGI server.
+
+`python backend/app.py` starts Flask's single-process development server,
+which is not meant for concurrent traffic. This entry point runs the same
+app factory behind waitress's thread pool.
+
+Run:  python -m backend.serve --port 5000 --threads 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+
+from backend.app import create_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default=os.getenv("CARDFIGHT_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("CARDFIGHT_PORT", "5000")))
+    parser.add_argument("--threads", type=int, default=int(os.getenv("CARDFIGHT_THREADS", "8")))
+    args = parser.parse_args()
+
+    try:
+        from waitress import serve
+    except ImportError as exc:
+        raise SystemExit("waitress is not installed. Run `pip install -r requirements.txt`.") from exc
+
+    serve(create_app(), host=args.host, port=args.port, threads=args.threads, ident="cardfight-api")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,35 @@
 """
 Admin-related services.
 
-Mostly used for maintenance actions like recomputing deck records from match history.
+Mostly used for maintenance actions like recomputing deck records and the
+derived match tables from match history.
 """
 
 from backend.database import db
 from backend.models import Deck, Match
+from backend.services.aggregates import rebuild_match_aggregates
 
 
 def recount_deck_records() -> dict:
+    decks_by_id = {deck.id: deck for deck in Deck.query.all()}
+
     # Reset stored counters.
-    for deck in Deck.query.all():
+    for deck in decks_by_id.values():
         deck.wins = 0
         deck.losses = 0
 
     # Recompute from decided matches only.
-    for match in Match.query.all():
-        if match.winner_id is None:
-            continue
+    matches = db.session.query(Match.deck1_id, Match.deck2_id, Match.winner_id).filter(
+        Match.winner_id.isnot(None)
+    )
 
+    for match in matches:
         if match.winner_id == match.deck1_id:
-            winner = Deck.query.get(match.deck1_id)
-            loser = Deck.query.get(match.deck2_id)
+            winner = decks_by_id.get(match.deck1_id)
+            loser = decks_by_id.get(match.deck2_id)
         elif match.winner_id == match.deck2_id:
-            winner = Deck.query.get(match.deck2_id)
-            loser = Deck.query.get(match.deck1_id)
+            winner = decks_by_id.get(match.deck2_id)
+            loser = decks_by_id.get(match.deck1_id)
         else:
             # Defensive skip for invalid historical data.
             continue
@@ -35,12 +40,16 @@ def recount_deck_records() -> dict:
         if loser:
             loser.losses += 1
 
-    db.session.commit()
+    # Read totals before commit expires the rows.
+    total_wins = sum(deck.wins for deck in decks_by_id.values())
+    total_losses = sum(deck.losses for deck in decks_by_id.values())
 
-    total_wins = sum(deck.wins for deck in Deck.query.all())
-    total_losses = sum(deck.losses for deck in Deck.query.all())
+    rebuilt = rebuild_match_aggregates()
+
+    db.session.commit()
 
     return {
         "total_wins": total_wins,
         "total_losses": total_losses,
+        "rebuilt": rebuilt,
     }
\ No newline at end of file
@@ -0,0 +1,287 @@
+"""
+Derived tables maintained alongside match writes.
+
+Match services snapshot a match as ``MatchFacts`` and call
+``apply_match_aggregates`` with ``sign=1`` after inserting it and
+``sign=-1`` before deleting it; an update removes the old facts and applies
+the new ones. Each derived table registers a ``rebuild`` callback that
+recomputes it from match history (used by migrations, the admin recount,
+and bulk loads), and either an ``apply`` callback, which receives every
+``(facts, sign)`` pair of a write in order, or, for counter tables, a
+``count`` callback for one pair at a time.
+
+Counter tables (``CounterTable``) add their changes to a ``CounterChanges``
+instead of loading rows: the changes from every match in one write are
+netted per row and stored with a single ``INSERT ... ON CONFLICT DO
+UPDATE`` per table, which clamps each counter at zero.
+``rebuild_result_counts`` is the matching full recount.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from functools import cache
+from typing import Callable
+
+from sqlalchemy import bindparam, delete, func, insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from backend.database import db
+
+
+RESULT_COLUMNS = ("wins", "losses", "undecided")
+REBUILD_CHUNK_SIZE = 20_000
+
+
+def result_column(winner_id, deck_id: int, opponent_id: int) -> int | None:
+    """Index into ``RESULT_COLUMNS`` for ``deck_id``'s side of a match."""
+    if winner_id is None:
+        return 2
+
+    if winner_id == deck_id:
+        return 0
+
+    if winner_id == opponent_id:
+        return 1
+
+    return None
+
+
+# Compared by identity, so each table's statement is built once.
+@dataclass(frozen=True, eq=False)
+class CounterTable:
+    """
+    A derived table of counters keyed by its primary key.
+
+    ``derived`` maps the new counter values (numbers or SQL expressions) to
+    columns recomputed on every write; ``new_row`` gives the other columns
+    of a row that a write creates.
+    """
+
+    model: type
+    counters: tuple[str, ...] = RESULT_COLUMNS
+    derived: Callable[[dict], dict] | None = None
+    new_row: dict[str, Callable[[], object]] = field(default_factory=dict)
+
+    @property
+    def key_columns(self) -> list[str]:
+        return [column.name for column in self.model.__table__.primary_key.columns]
+
+
+@cache
+def _upsert_statement(table: CounterTable):
+    columns = table.model.__table__.c
+    inserted = {name: func.max(0, bindparam(f"change_{name}")) for name in table.counters}
+    updated = {name: func.max(0, columns[name] + bindparam(f"change_{name}")) for name in table.counters}
+    values = {name: bindparam(f"key_{name}") for name in table.key_columns}
+    values.update(inserted)
+    values.update({name: bindparam(f"new_{name}") for name in table.new_row})
+
+    if table.derived is not None:
+        values.update(table.derived(inserted))
+        updated.update(table.derived(updated))
+
+    return (
+        sqlite_insert(table.model.__table__)
+        .values(values)
+        .on_conflict_do_update(index_elements=table.key_columns, set_=updated)
+    )
+
+
+class CounterChanges:
+    """Net counter changes per row, from one or more match writes."""
+
+    def __init__(self):
+        self.tables: dict[CounterTable, dict[tuple, list[int]]] = {}
+
+    def add(self, table: CounterTable, key: tuple, column: int, sign: int):
+        rows = self.tables.setdefault(table, {})
+        changes = rows.get(key)
+
+        if changes is None:
+            changes = rows[key] = [0] * len(table.counters)
+
+        changes[column] += sign
+
+    def add_result(self, table: CounterTable, key: tuple, winner_id, deck_id: int, opponent_id: int, sign: int):
+        """Count one side of a match as a win, loss, or undecided game."""
+        column = result_column(winner_id, deck_id, opponent_id)
+
+        if column is not None:
+            self.add(table, key, column, sign)
+
+    def write(self):
+        """Store every change with one upsert per table."""
+        connection = db.session.connection()
+
+        for table, rows in self.tables.items():
+            parameters = [
+                {
+                    **{f"key_{name}": value for name, value in zip(table.key_columns, key)},
+                    **{f"change_{name}": change for name, change in zip(table.counters, changes)},
+                    **{f"new_{name}": make() for name, make in table.new_row.items()},
+                }
+                for key, changes in rows.items()
+                if any(changes)
+            ]
+
+            if parameters:
+                connection.execute(_upsert_statement(table), parameters)
+
+        self.tables.clear()
+
+
+def rebuild_result_counts(connection, table: CounterTable, statement, cells, where=None):
+    """
+    Recreate ``table`` (or its rows matching ``where``) from match history.
+
+    ``statement`` streams match rows, and ``cells(row)`` lists the ``(key,
+    result column)`` pairs a row counts toward. One streaming pass that
+    only hashes beats grouping in SQL, which has to sort every match.
+    """
+    totals = {}
+    result = connection.execution_options(yield_per=REBUILD_CHUNK_SIZE).execute(statement)
+
+    for rows in result.partitions():
+        for row in rows:
+            for key, column in cells(row):
+                counts = totals.get(key)
+
+                if counts is None:
+                    counts = totals[key] = [0, 0, 0]
+
+                counts[column] += 1
+
+    model = table.model
+    connection.execute(delete(model) if where is None else delete(model).where(where))
+    key_columns = table.key_columns
+    rows = []
+
+    # Primary-key order, which the rowid-less matchup cube needs.
+    for key in sorted(totals):
+        row = dict(zip(key_columns, key))
+        row.update(zip(RESULT_COLUMNS, totals[key]))
+        rows.append(row)
+
+        if len(rows) >= REBUILD_CHUNK_SIZE:
+            connection.execute(insert(model.__table__), rows)
+            rows = []
+
+    if rows:
+        connection.execute(insert(model.__table__), rows)
+
+
+@dataclass(frozen=True)
+class MatchFacts:
+    deck1_id: int
+    deck2_id: int
+    winner_id: int | None
+    first_player_id: int | None
+    format: str | None
+    date_played: datetime | None
+    deck1_version_id: int | None = None
+    deck2_version_id: int | None = None
+    match_id: int | None = None
+
+    @property
+    def played_on(self) -> date | None:
+        """Calendar day of the match as stored (SQLite keeps wall-clock time)."""
+        return self.date_played.date() if self.date_played is not None else None
+
+    @classmethod
+    def from_match(cls, match) -> "MatchFacts":
+        return cls(
+            deck1_id=match.deck1_id,
+            deck2_id=match.deck2_id,
+            winner_id=match.winner_id,
+            first_player_id=match.first_player_id,
+            format=match.format,
+            date_played=match.date_played,
+            deck1_version_id=match.deck1_version_id,
+            deck2_version_id=match.deck2_version_id,
+            match_id=match.id,
+        )
+
+
+@dataclass(frozen=True)
+class MatchAggregate:
+    name: str
+    rebuild: Callable
+    apply: Callable[[list[tuple[MatchFacts, int]]], None] | None = None
+    count: Callable[[MatchFacts, int, CounterChanges], None] | None = None
+
+
+@cache
+def match_aggregates() -> list[MatchAggregate]:
+    # Imported here: the derived-table modules use the helpers above.
+    from backend.services.daily_results import count_daily_results, rebuild_daily_results
+    from backend.services.match_columns import apply_columns_results, rebuild_match_columns
+    from backend.services.matchup_cube import count_cube_results, rebuild_matchup_cube
+    from backend.services.pair_stats import count_pair_result, rebuild_pair_stats
+    from backend.services.ratings import apply_rating_results, rebuild_ratings
+    from backend.services.turn_order_stats import count_turn_order_results, rebuild_turn_order_stats
+    from backend.services.version_stats import count_version_results, rebuild_version_stats
+
+    return [
+        MatchAggregate("deck_pair_stat", rebuild_pair_stats, count=count_pair_result),
+        MatchAggregate("ratings", rebuild_ratings, apply=apply_rating_results),
+        MatchAggregate("deck_daily_result", rebuild_daily_results, count=count_daily_results),
+        MatchAggregate("deck_version_stat", rebuild_version_stats, count=count_version_results),
+        MatchAggregate("deck_turn_stat", rebuild_turn_order_stats, count=count_turn_order_results),
+        MatchAggregate("matchup_month_stat", rebuild_matchup_cube, count=count_cube_results),
+        MatchAggregate("match_columns", rebuild_match_columns, apply=apply_columns_results),
+    ]
+
+
+def apply_match_changes(changes):
+    """
+    Apply ``(facts, sign)`` pairs in order. Counter tables are written once
+    at the end, with the changes of every pair netted per row, so a write
+    issues the same statements however many matches it carries.
+    """
+    changes = list(changes)
+    counters = CounterChanges()
+
+    # Without autoflush, ORM rows touched here (ratings, aggregate state)
+    # stay dirty until commit writes them once.
+    with db.session.no_autoflush:
+        for aggregate in match_aggregates():
+            if aggregate.apply is not None:
+                aggregate.apply(changes)
+
+            if aggregate.count is not None:
+                for facts, sign in changes:
+                    aggregate.count(facts, sign, counters)
+
+    counters.write()
+
+
+def apply_match_aggregates(facts: MatchFacts, sign: int):
+    apply_match_changes([(facts, sign)])
+
+
+def replace_match_aggregates(before: MatchFacts, after: MatchFacts):
+    if before == after:
+        return
+
+    apply_match_changes([(before, -1), (after, 1)])
+
+
+def rebuild_match_aggregates(connection=None) -> list[str]:
+    """Recompute every derived table from match history; returns their names."""
+    in_session = connection is None
+
+    if in_session:
+        # Rebuilds read and write through Core, so pending ORM changes go
+        # first and loaded rows are refreshed afterwards.
+        db.session.flush()
+        connection = db.session.connection()
+
+    for aggregate in match_aggregates():
+        aggregate.rebuild(connection)
+
+    if in_session:
+        db.session.expire_all()
+
+    return [aggregate.name for aggregate in match_aggregates()]
@@ -5,7 +5,6 @@ import re
 from io import BytesIO
 from pathlib import Path
 
-from PIL import Image, UnidentifiedImageError
 from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
 
@@ -76,6 +75,14 @@ def _make_bottom_crop_bytes(image_bytes: bytes):
     - copyright/year line
     - power/nameplate area
     """
+    # Pillow is only needed for image analysis, so keep it off the import path.
+    try:
+        from PIL import Image, UnidentifiedImageError
+    except ImportError as exc:
+        raise ValueError(
+            "Pillow is not installed. Run: pip install pillow"
+        ) from exc
+
     try:
         with Image.open(BytesIO(image_bytes)) as image:
             image = image.convert("RGB")
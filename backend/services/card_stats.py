@@ -0,0 +1,231 @@
+"""
+Which card inclusions go with winning, across deck versions.
+
+Every match side that recorded a deck version gives that version a win, a
+loss, or an undecided game (counted over the in-memory match columns).
+Deck lists form a sparse version x card inclusion matrix in coordinate
+form, one ``(version, card)`` entry per card a version plays in its main
+or ride deck. Multiplying its transpose by the per-version results, with
+``bincount``, gives each card's record in the versions that play it; the
+record without it is the rest of the population, meaning all versions
+that have a deck list and a decided game.
+
+``lift`` is the win rate with the card minus the win rate without it, with
+a normal-approximation 95% interval. Games are not independent across
+versions of one deck, and a card can simply sit in the stronger decks, so
+lift is a pointer for deck building, not a causal effect.
+
+Results are cached per process until a match write moves the match-columns
+generation or a deck list changes.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from itertools import chain
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import func, select
+
+from backend.database import db
+from backend.models import Card, DeckCard
+from backend.services.match_columns import FORMAT_CODES, MISSING, match_columns
+from backend.services.stats import VALID_STATS_FORMATS, _positive_int
+
+
+EXTENSION_KEY = "cardfight.card_stats"
+CACHE_SIZE = 8
+
+DEFAULT_MIN_GAMES = 20
+MAX_MIN_GAMES = 100_000
+DEFAULT_CARD_LIMIT = 100
+MAX_CARD_LIMIT = 1000
+CARD_SORTS = ("lift", "games")
+
+# Two-sided 95% normal quantile.
+Z_95 = 1.959964
+
+
+class _AnalysisCache:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.results: OrderedDict = OrderedDict()
+
+
+def _cache() -> _AnalysisCache:
+    return current_app.extensions.setdefault(EXTENSION_KEY, _AnalysisCache())
+
+
+def _deck_list_fingerprint() -> tuple:
+    """Changes whenever a deck-card row is added, removed, or edited."""
+    return tuple(
+        db.session.execute(
+            select(func.count(DeckCard.id), func.max(DeckCard.id), func.max(DeckCard.updated_at))
+        ).one()
+    )
+
+
+def _version_results(columns, fmt: str | None):
+    """Decided wins and losses per version id, over both sides of every match."""
+    winner = columns.column("winner_id")
+    selected = winner != MISSING
+
+    if fmt:
+        selected &= columns.column("format") == FORMAT_CODES[fmt]
+
+    winner = winner[selected]
+    sides = []
+
+    for deck_field, version_field in (("deck1_id", "deck1_version_id"), ("deck2_id", "deck2_version_id")):
+        versions = columns.column(version_field)[selected]
+        recorded = versions != MISSING
+        sides.append((versions[recorded], columns.column(deck_field)[selected][recorded] == winner[recorded]))
+
+    versions = np.concatenate([side[0] for side in sides])
+    won = np.concatenate([side[1] for side in sides])
+    size = int(versions.max(initial=0)) + 1
+
+    return np.bincount(versions[won], minlength=size), np.bincount(versions[~won], minlength=size)
+
+
+def _analyze(columns, fmt: str | None) -> dict:
+    wins, losses = _version_results(columns, fmt)
+
+    rows = db.session.connection().execute(
+        select(DeckCard.deck_version_id, DeckCard.card_id, func.sum(DeckCard.quantity))
+        .where(DeckCard.zone.in_(("main", "ride")))
+        .group_by(DeckCard.deck_version_id, DeckCard.card_id)
+    ).all()
+    # Flattened into ``fromiter``, as in ``match_columns``: far faster than from row objects.
+    version_ids, card_ids, copies = (
+        np.fromiter(chain.from_iterable(rows), dtype=np.int64, count=3 * len(rows)).reshape(-1, 3).T
+    )
+
+    # Versions outside the match columns (no games yet) have no results.
+    size = max(len(wins), int(version_ids.max(initial=0)) + 1)
+    wins = np.pad(wins, (0, size - len(wins)))
+    losses = np.pad(losses, (0, size - len(losses)))
+    decided = wins + losses
+
+    population = np.zeros(size, dtype=bool)
+    population[version_ids] = True
+    population &= decided > 0
+
+    played = population[version_ids]
+    version_ids, card_ids, copies = version_ids[played], card_ids[played], copies[played]
+    cards, card_index = np.unique(card_ids, return_inverse=True)
+
+    # Transpose of the inclusion matrix times each results vector.
+    card_wins = np.bincount(card_index, wins[version_ids], minlength=len(cards))
+    card_decided = np.bincount(card_index, decided[version_ids], minlength=len(cards))
+    weighted_copies = np.bincount(card_index, copies * decided[version_ids], minlength=len(cards))
+
+    return {
+        "versions": int(population.sum()),
+        "wins": int(wins[population].sum()),
+        "decided": int(decided[population].sum()),
+        "cards": cards,
+        "card_versions": np.bincount(card_index, minlength=len(cards)),
+        "card_wins": card_wins,
+        "card_decided": card_decided,
+        "card_copies": np.divide(weighted_copies, card_decided, out=np.zeros(len(cards)), where=card_decided > 0),
+    }
+
+
+def _cached_analysis(fmt: str | None) -> dict:
+    columns = match_columns()
+    key = (columns.generation, _deck_list_fingerprint(), fmt)
+    cache = _cache()
+
+    with cache.lock:
+        analysis = cache.results.get(key)
+
+        if analysis is not None:
+            cache.results.move_to_end(key)
+            return analysis
+
+        analysis = _analyze(columns, fmt)
+        cache.results[key] = analysis
+
+        while len(cache.results) > CACHE_SIZE:
+            cache.results.popitem(last=False)
+
+        return analysis
+
+
+def card_lift(fmt=None, min_games=None, limit=None, sort=None) -> dict:
+    """Per-card win rates with and without the card, and the lift between them."""
+    if fmt not in VALID_STATS_FORMATS:
+        raise ValueError("format must be Standard, Stride, or Any.")
+
+    min_games = _positive_int(min_games, "min_games", DEFAULT_MIN_GAMES, MAX_MIN_GAMES)
+    limit = _positive_int(limit, "limit", DEFAULT_CARD_LIMIT, MAX_CARD_LIMIT)
+    sort = sort or "lift"
+
+    if sort not in CARD_SORTS:
+        raise ValueError("sort must be lift or games.")
+
+    analysis = _cached_analysis(fmt or None)
+    with_wins, with_decided = analysis["card_wins"], analysis["card_decided"]
+    without_wins = analysis["wins"] - with_wins
+    without_decided = analysis["decided"] - with_decided
+
+    # A card needs games on both sides of the comparison.
+    qualifying = np.flatnonzero((with_decided >= min_games) & (without_decided > 0))
+    with_rate = with_wins[qualifying] / with_decided[qualifying]
+    without_rate = without_wins[qualifying] / without_decided[qualifying]
+    lift = with_rate - without_rate
+    margin = Z_95 * np.sqrt(
+        with_rate * (1 - with_rate) / with_decided[qualifying]
+        + without_rate * (1 - without_rate) / without_decided[qualifying]
+    )
+
+    if sort == "lift":
+        order = np.lexsort((-with_decided[qualifying], -lift))[:limit]
+    else:
+        order = np.lexsort((-lift, -with_decided[qualifying]))[:limit]
+
+    picked = qualifying[order]
+    cards_by_id = {
+        card.id: card for card in Card.query.filter(Card.id.in_([int(card_id) for card_id in analysis["cards"][picked]]))
+    }
+
+    rows = []
+
+    for position, card_position in zip(order, picked):
+        card = cards_by_id.get(int(analysis["cards"][card_position]))
+
+        if card is None:
+            continue
+
+        rows.append(
+            {
+                "card_id": card.id,
+                "card_name": card.name,
+                "grade": card.grade,
+                "card_type": card.card_type,
+                "versions": int(analysis["card_versions"][card_position]),
+                "decided_games": int(with_decided[card_position]),
+                "wins": int(with_wins[card_position]),
+                "average_copies": round(float(analysis["card_copies"][card_position]), 2),
+                "win_rate": round(float(with_rate[position]), 4),
+                "without_win_rate": round(float(without_rate[position]), 4),
+                "lift": round(float(lift[position]), 4),
+                "lift_low": round(float(lift[position] - margin[position]), 4),
+                "lift_high": round(float(lift[position] + margin[position]), 4),
+            }
+        )
+
+    return {
+        "filters": {"format": fmt or None, "min_games": min_games, "limit": limit, "sort": sort},
+        "summary": {
+            "versions": analysis["versions"],
+            "decided_games": analysis["decided"],
+            "win_rate": round(analysis["wins"] / analysis["decided"], 4) if analysis["decided"] else None,
+            "cards": len(analysis["cards"]),
+            "qualifying_cards": len(qualifying),
+        },
+        "cards": rows,
+    }
@@ -12,6 +12,7 @@ from sqlalchemy import or_
 from backend.database import db
 from backend.models import Card, CardPrinting, DeckCard
 from backend.services.card_set_names import SET_CODE_NAMES, lookup_set_name
+from backend.services.deck_builder import refresh_versions_using_card, run_deck_edit
 
 
 CARD_NATION_OPTIONS = [
@@ -462,6 +463,12 @@ def update_card(card_id, payload):
     if not isinstance(payload, dict):
         raise ValueError("Request body must be a JSON object")
 
+    # A grade or nation change rewrites the summaries of every deck version
+    # using the card, under the deck builder's optimistic locking.
+    return run_deck_edit(lambda: _update_card(card_id, payload))
+
+
+def _update_card(card_id, payload):
     card = get_card_or_raise(card_id)
 
     next_values = {}
@@ -497,10 +504,17 @@ def update_card(card_id, payload):
             exclude_printing_id=printing.id,
         )
 
+    moves_deck_rules = any(
+        field_name in next_values and next_values[field_name] != getattr(card, field_name)
+        for field_name in ("grade", "nation")
+    )
+
     for field_name, value in next_values.items():
         setattr(card, field_name, value)
 
-    db.session.commit()
+    if moves_deck_rules:
+        refresh_versions_using_card(card.id)
+
     return card
 
 
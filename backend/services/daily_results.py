@@ -0,0 +1,92 @@
+"""
+Daily per-deck results used by the trend charts.
+
+``deck_daily_result`` holds one row per deck, day, opponent type, and
+format. Every match touches two rows, one for each participant.
+``count_daily_results`` adds a match write's changes to those rows, and
+``rebuild_daily_results`` recomputes the table from match history. A deck
+that changes type moves its opponents' rows to the new opponent type
+through ``refresh_results_against``.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import func, or_, select
+
+from backend.database import db
+from backend.models import Deck, DeckDailyResult, Match
+from backend.services.aggregates import CounterTable, rebuild_result_counts, result_column
+
+
+DAILY_RESULTS = CounterTable(DeckDailyResult)
+
+
+def _format_key(value: str | None) -> str:
+    return value or ""
+
+
+def count_daily_results(facts, sign: int, counters):
+    """Add (sign=1) or remove (sign=-1) one match from both decks' day rows."""
+    day = facts.played_on
+
+    if day is None:
+        return
+
+    fmt = _format_key(facts.format)
+
+    for deck_id, opponent_id in ((facts.deck1_id, facts.deck2_id), (facts.deck2_id, facts.deck1_id)):
+        opponent = db.session.get(Deck, opponent_id)
+
+        if opponent is not None:
+            key = (deck_id, day, opponent.type, fmt)
+            counters.add_result(DAILY_RESULTS, key, facts.winner_id, deck_id, opponent_id, sign)
+
+
+def refresh_results_against(deck_id: int):
+    """Recount the day rows of every deck that played ``deck_id``, after its type changed."""
+    opponent_ids = db.session.scalars(
+        select(Match.deck2_id)
+        .where(Match.deck1_id == deck_id)
+        .union(select(Match.deck1_id).where(Match.deck2_id == deck_id))
+    ).all()
+
+    if opponent_ids:
+        db.session.flush()
+        rebuild_daily_results(db.session.connection(), opponent_ids)
+
+
+def rebuild_daily_results(connection, deck_ids=None):
+    """Recreate the day rows from the match table, for every deck or only ``deck_ids``."""
+    deck_types = dict(connection.execute(select(Deck.id, Deck.type)).all())
+    counted = deck_types if deck_ids is None else set(deck_ids) & set(deck_types)
+    days = {}
+    statement = select(
+        Match.deck1_id,
+        Match.deck2_id,
+        Match.winner_id,
+        func.date(Match.date_played),
+        func.coalesce(Match.format, ""),
+    ).where(Match.date_played.isnot(None))
+    where = None
+
+    if deck_ids is not None:
+        statement = statement.where(or_(Match.deck1_id.in_(counted), Match.deck2_id.in_(counted)))
+        where = DeckDailyResult.deck_id.in_(counted)
+
+    def cells(row):
+        deck1_id, deck2_id, winner_id, day, fmt = row
+        played_on = days.get(day)
+
+        if played_on is None:
+            played_on = days[day] = date.fromisoformat(day)
+
+        for deck_id, opponent_id in ((deck1_id, deck2_id), (deck2_id, deck1_id)):
+            opponent_type = deck_types.get(opponent_id)
+            column = result_column(winner_id, deck_id, opponent_id)
+
+            if opponent_type is not None and deck_id in counted and column is not None:
+                yield (deck_id, played_on, opponent_type, fmt), column
+
+    rebuild_result_counts(connection, DAILY_RESULTS, statement, cells, where)
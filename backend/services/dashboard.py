@@ -7,30 +7,35 @@ All stats here should be safe to display directly.
 
 from __future__ import annotations
 
-from collections import defaultdict
+import numpy as np
 
 from backend.models import Deck, Match
+from backend.services.match_columns import MISSING, MatchColumns, match_columns
+from backend.services.matches import match_query
 from backend.services.serializers import serialize_deck, serialize_match
 
 
 def get_dashboard_summary() -> dict:
     decks = Deck.query.order_by(Deck.name).all()
-    matches = Match.query.order_by(Match.date_played.desc()).all()
+    columns = match_columns()
 
     total_decks = len(decks)
     active_decks = sum(1 for deck in decks if deck.active)
     inactive_decks = total_decks - active_decks
 
-    total_matches = len(matches)
-    decided_matches = sum(1 for match in matches if match.winner_id is not None)
+    total_matches = len(columns)
+    decided_matches = int(np.count_nonzero(columns.column("winner_id") != MISSING))
     undecided_matches = total_matches - decided_matches
 
-    deck_stats = _calculate_deck_stats_from_matches(decks, matches)
+    deck_stats = _calculate_deck_stats(decks, columns)
 
     best_win_rate_deck = _best_win_rate(deck_stats)
     most_played_deck = _most_played(deck_stats)
 
-    recent_matches = [serialize_match(match) for match in matches[:8]]
+    recent_matches = [
+        serialize_match(match)
+        for match in match_query().order_by(Match.date_played.desc()).limit(8).all()
+    ]
 
     return {
         "summary": {
@@ -47,37 +52,40 @@ def get_dashboard_summary() -> dict:
     }
 
 
-def _calculate_deck_stats_from_matches(decks: list[Deck], matches: list[Match]) -> list[dict]:
+def _calculate_deck_stats(decks: list[Deck], columns: MatchColumns) -> list[dict]:
+    """Per-deck records counted with ``bincount`` over the match columns."""
+    size = max((deck.id for deck in decks), default=0) + 1
+    deck1 = columns.column("deck1_id")
+    deck2 = columns.column("deck2_id")
+    winner = columns.column("winner_id")
+
+    # Matches with a deck outside the list (none, normally) are left out.
+    known = np.zeros(size + 1, dtype=bool)
+    known[[deck.id for deck in decks]] = True
+    counted = known[np.minimum(deck1, size)] & known[np.minimum(deck2, size)]
+    deck1, deck2, winner = deck1[counted], deck2[counted], winner[counted]
+
+    undecided = winner == MISSING
+    logged = np.bincount(deck1, minlength=size) + np.bincount(deck2, minlength=size)
+    undecided_games = np.bincount(deck1[undecided], minlength=size) + np.bincount(
+        deck2[undecided], minlength=size
+    )
+    decided = ~undecided
+    wins = np.bincount(winner[decided], minlength=size)[:size]
+    # Winners are always participants, so every other decided game is a loss.
+    losses = logged - undecided_games - wins
+
     stats_by_id = {
         deck.id: {
             "deck": deck,
-            "wins": 0,
-            "losses": 0,
-            "undecided": 0,
-            "logged_games": 0,
+            "wins": int(wins[deck.id]),
+            "losses": int(losses[deck.id]),
+            "undecided": int(undecided_games[deck.id]),
+            "logged_games": int(logged[deck.id]),
         }
         for deck in decks
     }
 
-    for match in matches:
-        if match.deck1_id not in stats_by_id or match.deck2_id not in stats_by_id:
-            continue
-
-        stats_by_id[match.deck1_id]["logged_games"] += 1
-        stats_by_id[match.deck2_id]["logged_games"] += 1
-
-        if match.winner_id is None:
-            stats_by_id[match.deck1_id]["undecided"] += 1
-            stats_by_id[match.deck2_id]["undecided"] += 1
-            continue
-
-        if match.winner_id == match.deck1_id:
-            stats_by_id[match.deck1_id]["wins"] += 1
-            stats_by_id[match.deck2_id]["losses"] += 1
-        elif match.winner_id == match.deck2_id:
-            stats_by_id[match.deck2_id]["wins"] += 1
-            stats_by_id[match.deck1_id]["losses"] += 1
-
     rows = []
 
     for values in stats_by_id.values():
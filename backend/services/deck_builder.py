@@ -3,10 +3,26 @@ Shared API services for deck building.
 
 Functions in this module handle the creation, updating, and deletion of decks, deck versions, and deck cards. 
 They also provide validation and normalization of input data to ensure consistency and integrity in the database.
+
+Card changes use optimistic locking. Each edit reads the deck version's
+``lock_version``, validates the deck rules against what it read, and
+finishes with one conditional ``UPDATE`` that stores the new summary and
+bumps ``lock_version`` only if it is still the value that was read. If
+another edit committed in between, nothing is written, the transaction
+rolls back, and the edit runs again against the new state, so concurrent
+adds cannot both pass the 50-card or ride-grade checks.
 """
 
+from sqlalchemy import insert, or_, update
+from sqlalchemy.orm.attributes import set_committed_value
+
 from backend.database import db
-from backend.models import Card, CardPrinting, Deck, DeckCard, DeckVersion
+from backend.models import Card, CardPrinting, Deck, DeckCard, DeckVersion, Match, now_central
+from backend.services.deck_summary import (
+    fill_missing_summaries,
+    summarize_deck_cards,
+    version_summaries,
+)
 
 
 ALLOWED_ZONES = {"main", "ride", "g", "token", "other"}
@@ -15,6 +31,18 @@ RIDE_DECK_LIMIT = 4
 RIDE_DECK_GRADES = {0, 1, 2, 3}
 MAX_CARD_GRADE = 4
 
+# Attempts per edit. A conflict means another edit committed, so every
+# retry follows progress; the limit only bounds a pathological pile-up.
+MAX_EDIT_ATTEMPTS = 8
+
+
+class DeckVersionConflict(RuntimeError):
+    """Another edit kept changing the deck version until the retries ran out."""
+
+
+class _StaleDeckVersion(Exception):
+    """A conditional deck version update matched no row; the edit should run again."""
+
 
 def _clean_string(value):
     if value is None:
@@ -170,6 +198,57 @@ def _validate_deck_card_rules(
         raise ValueError("Ride deck cannot contain more than 4 cards")
 
 
+def _store_card_change(*versions):
+    """
+    Store fresh summaries and take the next ``lock_version`` for each
+    version, provided no other edit has taken it since it was read.
+    """
+    summaries = version_summaries([version.id for version in versions])
+    now = now_central()
+
+    for version in versions:
+        seen = version.lock_version
+        result = db.session.execute(
+            update(DeckVersion)
+            .where(DeckVersion.id == version.id, DeckVersion.lock_version == seen)
+            .values(summary=summaries[version.id], lock_version=seen + 1, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+
+        if result.rowcount != 1:
+            raise _StaleDeckVersion
+
+        set_committed_value(version, "summary", summaries[version.id])
+        set_committed_value(version, "lock_version", seen + 1)
+        set_committed_value(version, "updated_at", now)
+
+
+def run_deck_edit(edit):
+    """
+    Run ``edit`` and commit, running it again from a clean session when a
+    deck version it changed was changed by someone else first.
+    """
+    for _ in range(MAX_EDIT_ATTEMPTS):
+        try:
+            result = edit()
+            db.session.commit()
+            return result
+        except _StaleDeckVersion:
+            db.session.rollback()
+
+    raise DeckVersionConflict("The deck version is being edited elsewhere; try again")
+
+
+def refresh_versions_using_card(card_id):
+    """Store fresh summaries for every version that plays ``card_id``; the caller commits."""
+    versions = DeckVersion.query.filter(
+        DeckVersion.id.in_(db.select(DeckCard.deck_version_id).where(DeckCard.card_id == card_id))
+    ).all()
+
+    if versions:
+        _store_card_change(*versions)
+
+
 def _deactivate_other_versions(deck_id, except_version_id=None):
     query = DeckVersion.query.filter(
         DeckVersion.deck_id == deck_id,
@@ -186,10 +265,13 @@ def _deactivate_other_versions(deck_id, except_version_id=None):
 def list_deck_versions(deck_id):
     deck = _get_deck_or_raise(deck_id)
 
-    return deck.versions.order_by(
+    versions = deck.versions.order_by(
         DeckVersion.is_active.desc(),
         DeckVersion.created_at.desc(),
     ).all()
+    fill_missing_summaries(versions)
+
+    return versions
 
 
 def create_deck_version(deck_id, payload):
@@ -218,23 +300,29 @@ def create_deck_version(deck_id, payload):
         version_name=version_name,
         notes=_clean_string(payload.get("notes")) or "",
         is_active=is_active,
+        summary=summarize_deck_cards([]),
     )
 
     db.session.add(version)
     db.session.flush()
 
     if source_version:
-        for source_entry in source_version.cards.order_by(DeckCard.id.asc()).all():
-            db.session.add(
-                DeckCard(
-                    deck_version_id=version.id,
-                    card_id=source_entry.card_id,
-                    printing_id=source_entry.printing_id,
-                    quantity=source_entry.quantity,
-                    zone=source_entry.zone,
-                    sort_order=source_entry.sort_order,
-                )
-            )
+        # One executemany instead of an INSERT ... RETURNING per copied card.
+        copied_entries = [
+            {
+                "deck_version_id": version.id,
+                "card_id": source_entry.card_id,
+                "printing_id": source_entry.printing_id,
+                "quantity": source_entry.quantity,
+                "zone": source_entry.zone,
+                "sort_order": source_entry.sort_order,
+            }
+            for source_entry in source_version.cards.order_by(DeckCard.id.asc()).all()
+        ]
+
+        if copied_entries:
+            db.session.execute(insert(DeckCard), copied_entries)
+            version.summary = version_summaries([version.id])[version.id]
 
     db.session.commit()
 
@@ -267,6 +355,18 @@ def update_deck_version(version_id, payload):
 def delete_deck_version(version_id):
     version = get_deck_version_or_raise(version_id)
 
+    match_count = (
+        db.session.query(Match.id)
+        .filter(or_(Match.deck1_version_id == version_id, Match.deck2_version_id == version_id))
+        .count()
+    )
+
+    if match_count:
+        raise ValueError(
+            f"Cannot delete '{version.version_name}': {match_count} matches reference this version. "
+            "Set it inactive instead."
+        )
+
     db.session.delete(version)
     db.session.commit()
 
@@ -275,6 +375,10 @@ def add_card_to_deck_version(version_id, payload):
     if not isinstance(payload, dict):
         raise ValueError("Request body must be a JSON object")
 
+    return run_deck_edit(lambda: _add_card(version_id, payload))
+
+
+def _add_card(version_id, payload):
     version = get_deck_version_or_raise(version_id)
 
     card_id = _int_value(payload.get("card_id"), "card_id")
@@ -314,7 +418,7 @@ def add_card_to_deck_version(version_id, payload):
         if "sort_order" in payload:
             existing.sort_order = sort_order
 
-        db.session.commit()
+        _store_card_change(version)
         return existing
 
     _validate_deck_card_rules(version, card, quantity, zone)
@@ -329,7 +433,7 @@ def add_card_to_deck_version(version_id, payload):
     )
 
     db.session.add(entry)
-    db.session.commit()
+    _store_card_change(version)
 
     return entry
 
@@ -338,6 +442,10 @@ def update_deck_card(deck_card_id, payload):
     if not isinstance(payload, dict):
         raise ValueError("Request body must be a JSON object")
 
+    return run_deck_edit(lambda: _update_deck_card(deck_card_id, payload))
+
+
+def _update_deck_card(deck_card_id, payload):
     entry = get_deck_card_or_raise(deck_card_id)
 
     quantity = entry.quantity
@@ -374,13 +482,18 @@ def update_deck_card(deck_card_id, payload):
     entry.sort_order = sort_order
     entry.printing_id = printing_id
 
-    db.session.commit()
+    _store_card_change(entry.deck_version)
 
     return entry
 
 
 def remove_deck_card(deck_card_id):
+    run_deck_edit(lambda: _remove_deck_card(deck_card_id))
+
+
+def _remove_deck_card(deck_card_id):
     entry = get_deck_card_or_raise(deck_card_id)
+    version = entry.deck_version
 
     db.session.delete(entry)
-    db.session.commit()
+    _store_card_change(version)
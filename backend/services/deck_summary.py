@@ -0,0 +1,128 @@
+"""
+Stored card-count summaries for deck versions.
+
+``deck_version.summary`` holds a version's totals per zone, grade curve,
+ride grades, ride nations, and completeness, so the versions list can
+show real status without loading any cards. Deck-builder writes store a
+fresh summary from ``version_summaries`` in the same transaction as the
+card change (see ``deck_builder``), card edits that move a grade or
+nation refresh every version using the card, and
+``rebuild_version_summaries`` recomputes the column from ``deck_card``.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm.attributes import set_committed_value
+
+from backend.database import db
+from backend.models import Card, DeckCard, DeckVersion
+
+
+MAIN_DECK_SIZE = 50
+RIDE_DECK_SIZE = 4
+RIDE_GRADES = {0, 1, 2, 3}
+REBUILD_CHUNK_SIZE = 500
+
+
+def summarize_deck_cards(entries) -> dict:
+    """
+    Summarize ``(zone, quantity, grade, nation)`` rows for one version.
+
+    Rows should come in display order (zone, sort order, id), which is the
+    order ``ride_grades`` and ``ride_nations`` are listed in.
+    """
+    totals_by_zone = {}
+    grade_curve = {}
+    ride_grades = []
+    ride_nations = []
+    unique_card_count = 0
+
+    for zone, quantity, grade, nation in entries:
+        unique_card_count += 1
+        totals_by_zone[zone] = totals_by_zone.get(zone, 0) + quantity
+
+        if zone in ("main", "ride") and grade is not None:
+            grade_curve[str(grade)] = grade_curve.get(str(grade), 0) + quantity
+
+        if zone != "ride":
+            continue
+
+        ride_grades.extend([grade] * quantity)
+
+        for declared_nation in (nation or "").split(" / "):
+            cleaned_nation = declared_nation.strip()
+            if cleaned_nation and cleaned_nation not in ride_nations:
+                ride_nations.append(cleaned_nation)
+
+    return {
+        "card_count": sum(totals_by_zone.values()),
+        "unique_card_count": unique_card_count,
+        "totals_by_zone": totals_by_zone,
+        "grade_curve": dict(sorted(grade_curve.items(), key=lambda item: int(item[0]))),
+        "ride_grades": ride_grades,
+        "ride_nations": ride_nations,
+        "is_complete": (
+            totals_by_zone.get("main", 0) == MAIN_DECK_SIZE
+            and totals_by_zone.get("ride", 0) == RIDE_DECK_SIZE
+            and set(ride_grades) == RIDE_GRADES
+        ),
+    }
+
+
+def _summary_rows(version_ids):
+    return (
+        select(DeckCard.deck_version_id, DeckCard.zone, DeckCard.quantity, Card.grade, Card.nation)
+        .join(Card, Card.id == DeckCard.card_id)
+        .where(DeckCard.deck_version_id.in_(version_ids))
+        .order_by(DeckCard.deck_version_id, DeckCard.zone, DeckCard.sort_order, DeckCard.id)
+    )
+
+
+def _summaries(execute, version_ids) -> dict[int, dict]:
+    """Summaries for ``version_ids`` from one query; versions without cards get an empty summary."""
+    entries = {version_id: [] for version_id in version_ids}
+
+    for version_id, *entry in execute(_summary_rows(list(version_ids))):
+        entries[version_id].append(entry)
+
+    return {version_id: summarize_deck_cards(rows) for version_id, rows in entries.items()}
+
+
+def version_summaries(version_ids) -> dict[int, dict]:
+    """Current summaries for ``version_ids`` in the session's transaction, from one query."""
+    db.session.flush()
+    return _summaries(db.session.execute, version_ids)
+
+
+def fill_missing_summaries(versions):
+    """
+    Give versions without a stored summary (rows written outside the deck
+    builder) a computed one for this request only, with one query.
+    """
+    missing = [version for version in versions if version.summary is None]
+
+    if not missing:
+        return
+
+    summaries = _summaries(db.session.execute, [version.id for version in missing])
+
+    for version in missing:
+        set_committed_value(version, "summary", summaries[version.id])
+
+
+def rebuild_version_summaries(connection):
+    """Recompute the summary column for every version."""
+    table = DeckVersion.__table__
+    version_ids = connection.scalars(select(table.c.id).order_by(table.c.id)).all()
+
+    for start in range(0, len(version_ids), REBUILD_CHUNK_SIZE):
+        chunk = version_ids[start : start + REBUILD_CHUNK_SIZE]
+        summaries = _summaries(connection.execute, chunk)
+        # Keeps ``updated_at``: a backfill is not an edit.
+        connection.execute(
+            update(table)
+            .where(table.c.id == bindparam("version_id"))
+            .values(summary=bindparam("new_summary"), updated_at=table.c.updated_at),
+            [{"version_id": version_id, "new_summary": summary} for version_id, summary in summaries.items()],
+        )
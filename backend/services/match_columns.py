@@ -0,0 +1,241 @@
+"""
+Process-level columnar copy of the match table for vectorized analytics.
+
+``MatchColumns`` holds one int64 NumPy column per match field. Missing
+values (no winner, no first player, no version) are ``MISSING``, formats
+are small integer codes, and ``played_at`` is seconds since the epoch of
+the naive local timestamp.
+
+The copy is loaded on first use, per app, and is tagged with a generation
+counter kept in ``aggregate_state``. Every match write bumps the counter in
+the same transaction. A committed insert from this process is appended by
+swapping in a longer copy that shares the buffer; any other change (an edit, a delete, a rebuild, or a write from
+another process) leaves the copy behind the counter, and the next
+``match_columns()`` call reloads it. A ``MatchColumns`` never changes
+once handed out, so a reader sees one generation in all its columns
+while other requests commit.
+"""
+
+from __future__ import annotations
+
+import calendar
+import threading
+from itertools import chain
+
+import numpy as np
+from flask import current_app, has_app_context
+from sqlalchemy import Integer, case, cast, event, func, insert, select, update
+
+from backend.database import db, session_get
+from backend.models import AggregateState, Match
+
+
+COLUMNS_STATE = "match_columns"
+EXTENSION_KEY = "cardfight.match_columns"
+PENDING_KEY = "cardfight.match_columns.pending"
+
+MISSING = -1
+FORMATS = (None, "Standard", "Stride", "Any")
+FORMAT_CODES = {fmt: code for code, fmt in enumerate(FORMATS)}
+
+FIELDS = (
+    "id",
+    "deck1_id",
+    "deck2_id",
+    "winner_id",
+    "first_player_id",
+    "format",
+    "played_at",
+    "deck1_version_id",
+    "deck2_version_id",
+)
+LOAD_CHUNK_SIZE = 100_000
+MIN_CAPACITY = 1024
+
+
+class MatchColumns:
+    """Match fields as parallel int64 columns, in match id order; a fixed snapshot."""
+
+    def __init__(self, generation: int, data: np.ndarray, size: int):
+        self.generation = generation
+        self._data = data
+        self.size = size
+
+    @classmethod
+    def from_chunks(cls, generation: int, chunks: list[np.ndarray]) -> "MatchColumns":
+        size = sum(chunk.shape[1] for chunk in chunks)
+        data = np.empty((len(FIELDS), max(MIN_CAPACITY, size)), dtype=np.int64)
+        offset = 0
+
+        for chunk in chunks:
+            data[:, offset:offset + chunk.shape[1]] = chunk
+            offset += chunk.shape[1]
+
+        return cls(generation, data, size)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def column(self, field: str) -> np.ndarray:
+        """A read-only view of one column of this snapshot."""
+        view = self._data[FIELDS.index(field), :self.size]
+        view.flags.writeable = False
+        return view
+
+    def append(self, rows: list[tuple], generation: int) -> "MatchColumns":
+        """
+        A new snapshot with ``rows`` added. It writes past this snapshot's
+        ``size`` in the shared buffer, which this one never reads, so only
+        the newest snapshot may be appended to.
+        """
+        needed = self.size + len(rows)
+        data = self._data
+
+        if needed > data.shape[1]:
+            # Grow by doubling, so appends copy the columns rarely.
+            data = np.empty((len(FIELDS), max(needed, 2 * data.shape[1])), dtype=np.int64)
+            data[:, :self.size] = self._data[:, :self.size]
+
+        for offset, row in enumerate(rows):
+            data[:, self.size + offset] = row
+
+        return MatchColumns(generation, data, needed)
+
+
+class _ColumnCache:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.columns: MatchColumns | None = None
+
+
+def _cache() -> _ColumnCache:
+    return current_app.extensions.setdefault(EXTENSION_KEY, _ColumnCache())
+
+
+def _current_generation() -> int:
+    generation = db.session.scalar(
+        select(AggregateState.generation).where(AggregateState.name == COLUMNS_STATE)
+    )
+    return generation or 0
+
+
+def _epoch(value) -> int:
+    return calendar.timegm(value.timetuple()) if value is not None else MISSING
+
+
+def _row(facts) -> tuple:
+    return (
+        facts.match_id,
+        facts.deck1_id,
+        facts.deck2_id,
+        MISSING if facts.winner_id is None else facts.winner_id,
+        MISSING if facts.first_player_id is None else facts.first_player_id,
+        FORMAT_CODES.get(facts.format, 0),
+        _epoch(facts.date_played),
+        MISSING if facts.deck1_version_id is None else facts.deck1_version_id,
+        MISSING if facts.deck2_version_id is None else facts.deck2_version_id,
+    )
+
+
+def load_match_columns(connection, generation: int) -> MatchColumns:
+    """Read the match table in id order, one bounded chunk at a time."""
+    format_code = case(
+        *((Match.format == fmt, code) for fmt, code in FORMAT_CODES.items() if fmt is not None),
+        else_=0,
+    )
+
+    result = connection.execution_options(yield_per=LOAD_CHUNK_SIZE).execute(
+        select(
+            Match.id,
+            Match.deck1_id,
+            Match.deck2_id,
+            func.coalesce(Match.winner_id, MISSING),
+            func.coalesce(Match.first_player_id, MISSING),
+            format_code,
+            func.coalesce(cast(func.strftime("%s", Match.date_played), Integer), MISSING),
+            func.coalesce(Match.deck1_version_id, MISSING),
+            func.coalesce(Match.deck2_version_id, MISSING),
+        ).order_by(Match.id)
+    )
+
+    # Flattened values into ``fromiter``: building arrays from row objects
+    # directly is an order of magnitude slower.
+    chunks = [
+        np.fromiter(chain.from_iterable(rows), dtype=np.int64, count=len(rows) * len(FIELDS))
+        .reshape(len(rows), len(FIELDS))
+        .T
+        for rows in result.partitions()
+        if rows
+    ]
+    return MatchColumns.from_chunks(generation, chunks)
+
+
+def match_columns() -> MatchColumns:
+    """
+    The current columnar snapshot, reloaded if the generation moved on.
+    Later writes swap in a new snapshot instead of changing this one.
+    """
+    generation = _current_generation()
+    cache = _cache()
+
+    with cache.lock:
+        if cache.columns is None or cache.columns.generation != generation:
+            cache.columns = load_match_columns(db.session.connection(), generation)
+
+        return cache.columns
+
+
+def apply_columns_results(changes):
+    """Bump the generation once per write and remember inserts to append after commit."""
+    state = session_get(AggregateState, COLUMNS_STATE)
+
+    if state is None:
+        state = AggregateState(name=COLUMNS_STATE, stale=False, generation=0)
+        db.session.add(state)
+
+    pending = db.session.info.setdefault(
+        PENDING_KEY, {"base": state.generation, "rows": [], "appendable": True}
+    )
+    state.generation += 1
+    pending["generation"] = state.generation
+
+    for facts, sign in changes:
+        if sign > 0:
+            pending["rows"].append(_row(facts))
+        else:
+            pending["appendable"] = False
+
+
+def rebuild_match_columns(connection):
+    """History was rewritten in bulk, so every cached copy must reload."""
+    bumped = connection.execute(
+        update(AggregateState)
+        .where(AggregateState.name == COLUMNS_STATE)
+        .values(generation=AggregateState.generation + 1)
+    )
+
+    if not bumped.rowcount:
+        connection.execute(insert(AggregateState).values(name=COLUMNS_STATE, stale=False, generation=1))
+
+
+@event.listens_for(db.session, "after_commit")
+def _append_committed(session):
+    pending = session.info.pop(PENDING_KEY, None)
+
+    if not pending or not pending["appendable"] or not has_app_context():
+        return
+
+    cache = _cache()
+
+    with cache.lock:
+        columns = cache.columns
+
+        # Only a copy that was current before this transaction can catch up
+        # by appending; anything else reloads on its next read.
+        if columns is not None and columns.generation == pending["base"]:
+            cache.columns = columns.append(pending["rows"], pending["generation"])
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(PENDING_KEY, None)
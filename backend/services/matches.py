@@ -1,28 +1,367 @@
 """
 Service helpers for creating, listing, updating, and deleting matches.
+
+Match submissions can carry a client key (the ``Idempotency-Key`` header or
+a ``client_match_id`` field). The key is stored on the match under a unique
+index, so a retried submission returns the match it already created
+instead of logging it twice. Recent responses stay in a per-process TTL
+cache, which lets a replay skip the database entirely.
 """
 
 from __future__ import annotations
 
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import and_, or_
+from flask import current_app
+from sqlalchemy import and_, bindparam, case, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 
 from backend.database import db
-from backend.models import Deck, Match
+from backend.models import Deck, DeckVersion, Match, now_central
+from backend.services.aggregates import (
+    MatchFacts,
+    apply_match_aggregates,
+    apply_match_changes,
+    replace_match_aggregates,
+)
 from backend.services.serializers import serialize_match
 
 
 CT = ZoneInfo("America/Chicago")
 VALID_MATCH_FORMATS = {None, "Standard", "Stride", "Any"}
 
+CLIENT_MATCH_ID_MAX_LENGTH = 64
+MAX_BULK_MATCHES = 500
+REPLAY_CACHE_KEY = "cardfight.match_replays"
+REPLAY_CACHE_SIZE = 10_000
+REPLAY_CACHE_SECONDS = 300
+
+
+class ClientMatchIdReused(ValueError):
+    """A client key that already belongs to a different match."""
+
+
+class _ReplayCache:
+    """Recent responses by client key; edits and deletes in this process drop their entry."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Key -> (expires at, response), oldest first.
+        self.responses: OrderedDict = OrderedDict()
+
+    def get(self, key: str):
+        with self.lock:
+            entry = self.responses.get(key)
+
+            if entry is None:
+                return None
+
+            if entry[0] <= time.monotonic():
+                del self.responses[key]
+                return None
+
+            return entry[1]
+
+    def put(self, key: str, response: dict):
+        with self.lock:
+            now = time.monotonic()
+            self.responses.pop(key, None)
+            self.responses[key] = (now + REPLAY_CACHE_SECONDS, response)
+
+            while self.responses and (
+                len(self.responses) > REPLAY_CACHE_SIZE or next(iter(self.responses.values()))[0] <= now
+            ):
+                self.responses.popitem(last=False)
+
+    def drop(self, key: str | None):
+        with self.lock:
+            self.responses.pop(key, None)
+
+
+def _replays() -> _ReplayCache:
+    return current_app.extensions.setdefault(REPLAY_CACHE_KEY, _ReplayCache())
+
+
+def _client_match_id(value) -> str | None:
+    if value is None:
+        return None
+
+    key = str(value).strip()
+
+    if not key:
+        return None
+
+    if len(key) > CLIENT_MATCH_ID_MAX_LENGTH or not key.isprintable():
+        raise ValueError(f"client_match_id must be at most {CLIENT_MATCH_ID_MAX_LENGTH} printable characters.")
+
+    return key
+
+
+def _submission_key(payload: dict, idempotency_key: str | None) -> str | None:
+    body_key = _client_match_id(payload.get("client_match_id"))
+    header_key = _client_match_id(idempotency_key)
+
+    if body_key and header_key and body_key != header_key:
+        raise ValueError("Idempotency-Key and client_match_id must match when both are sent.")
+
+    return body_key or header_key
+
+
+def _check_same_match(key: str, response: dict, payload: dict):
+    """Reject a key replayed with a different pairing or winner."""
+    submitted = (
+        _optional_int(payload.get("deck1_id"), "deck1_id"),
+        _optional_int(payload.get("deck2_id"), "deck2_id"),
+        _optional_int(payload.get("winner_id"), "winner_id"),
+    )
+    stored = (response["deck1_id"], response["deck2_id"], response["winner_id"])
+
+    if submitted != stored:
+        raise ClientMatchIdReused(f"client_match_id '{key}' was already used for match {response['id']}.")
+
+
+def _replay(key: str | None, payload: dict) -> dict | None:
+    """The stored response for ``key``, from the cache or the unique index."""
+    if key is None:
+        return None
+
+    response = _replays().get(key)
+
+    if response is None:
+        match_id = db.session.query(Match.id).filter(Match.client_match_id == key).scalar()
+
+        if match_id is None:
+            return None
+
+        response = get_match(match_id)
+        _replays().put(key, response)
+
+    _check_same_match(key, response, payload)
+    return response
+
+
+def record_match(payload: dict, idempotency_key: str | None = None) -> tuple[dict, bool]:
+    """
+    Create a match, or replay the one already created with the same client
+    key. Returns the match and whether it was a replay.
+    """
+    key = _submission_key(payload, idempotency_key)
+
+    # A concurrent submission with the same key can win the unique index
+    # between the lookup and the insert; the second pass then replays it.
+    for attempt in range(2):
+        replayed = _replay(key, payload)
+
+        if replayed is not None:
+            return replayed, True
+
+        try:
+            match = _insert_matches([(None, payload, key)])[0]
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+
+            if key is None or attempt:
+                raise
+
+            continue
+
+        response = get_match(match.id)
+
+        if key is not None:
+            _replays().put(key, response)
+
+        return response, False
+
+
+def record_matches(payload, idempotency_key: str | None = None) -> dict:
+    """
+    Create a batch of matches in one transaction, replaying any whose client
+    key was already used. Items without their own ``client_match_id`` get
+    ``<Idempotency-Key>:<index>`` when the header is sent, so a retried batch
+    replays as a whole.
+    """
+    if not isinstance(payload, dict) or not isinstance(payload.get("matches"), list):
+        raise ValueError('Request body must be a JSON object with a "matches" list.')
+
+    items = payload["matches"]
+
+    if not 1 <= len(items) <= MAX_BULK_MATCHES:
+        raise ValueError(f"matches must hold between 1 and {MAX_BULK_MATCHES} items.")
+
+    batch_key = _client_match_id(idempotency_key)
+    keys = []
+
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise ValueError(f"matches[{index}] must be a JSON object.")
+
+        key = _submission_key(item, None) or (f"{batch_key}:{index}" if batch_key else None)
+
+        if key is not None and key in keys:
+            raise ValueError(f"matches[{index}]: client_match_id '{key}' is used twice in this batch.")
+
+        keys.append(key)
+
+    for attempt in range(2):
+        try:
+            stored = _stored_responses(items, keys)
+            submissions = [
+                (f"matches[{index}]", item, key)
+                for index, (item, key) in enumerate(zip(items, keys))
+                if key not in stored
+            ]
+            created_ids = [match.id for match in _insert_matches(submissions)] if submissions else []
+            db.session.commit()
+            break
+        except IntegrityError:
+            db.session.rollback()
+
+            if attempt:
+                raise
+        except Exception:
+            db.session.rollback()
+            raise
+
+    fresh = _match_responses(created_ids)
+    new_ids = iter(created_ids)
+    responses = []
+
+    for key in keys:
+        response = stored[key] if key in stored else fresh[next(new_ids)]
+
+        if key is not None:
+            _replays().put(key, response)
+
+        responses.append(response)
+
+    return {"created": len(created_ids), "replayed": len(items) - len(created_ids), "matches": responses}
+
+
+def _stored_responses(items: list, keys: list) -> dict[str, dict]:
+    """
+    Responses for the batch keys that were already used, from the cache or
+    one query on the unique index. Nothing is cached here, since the
+    caller's transaction may still roll back.
+    """
+    stored = {}
+
+    for key in keys:
+        response = _replays().get(key) if key is not None else None
+
+        if response is not None:
+            stored[key] = response
+
+    missing = [key for key in keys if key is not None and key not in stored]
+
+    if missing:
+        for match in match_query().filter(Match.client_match_id.in_(missing)):
+            stored[match.client_match_id] = serialize_match(match)
+
+    for index, (item, key) in enumerate(zip(items, keys)):
+        if key in stored:
+            with _labelled(f"matches[{index}]"):
+                _check_same_match(key, stored[key], item)
+
+    return stored
+
 
 def create_match(payload: dict) -> dict:
+    return record_match(payload)[0]
+
+
+@contextmanager
+def _labelled(label: str | None):
+    """Prefix validation errors raised inside the block with ``label``."""
+    try:
+        yield
+    except (LookupError, ValueError) as exc:
+        if label is None:
+            raise
+
+        raise type(exc)(f"{label}: {exc}") from exc
+
+
+def _insert_matches(submissions: list) -> list[Match]:
+    """
+    Add ``(label, payload, client_match_id)`` submissions as matches with
+    their counters and aggregates; the caller commits. Decks and versions
+    are looked up once for the whole list, and counters and aggregates are
+    written once per deck or cell, so a batch issues as many statements as
+    a single match.
+    """
+    deck_ids = set()
+    version_ids = set()
+    defaults_for = set()
+
+    for label, payload, _ in submissions:
+        with _labelled(label):
+            for deck_field, version_field in (("deck1_id", "deck1_version_id"), ("deck2_id", "deck2_version_id")):
+                deck_id = _required_int(payload.get(deck_field), deck_field)
+                deck_ids.add(deck_id)
+
+                if version_field in payload:
+                    version_ids.add(_optional_int(payload.get(version_field), version_field))
+                else:
+                    defaults_for.add(deck_id)
+
+    # Keep the decks and versions referenced, so the rating updates reuse
+    # them from the identity map and the counter updates refresh them.
+    version_ids.discard(None)
+    decks = Deck.query.filter(Deck.id.in_(deck_ids)).all()
+    known = (
+        {version.id: version for version in DeckVersion.query.filter(DeckVersion.id.in_(version_ids))}
+        if version_ids
+        else {}
+    )
+    active = _active_versions(defaults_for) if defaults_for else {}
+    loaded_ids = {deck.id for deck in decks}
+
+    matches = []
+
+    for label, payload, client_match_id in submissions:
+        with _labelled(label):
+            matches.append(_new_match(payload, client_match_id, loaded_ids, known, active))
+
+    # Aggregates order matches by id, so assign them before taking snapshots.
+    # SQLite cannot tie a multi-row RETURNING to its rows, so SQLAlchemy
+    # would insert a batch one statement per match. The first insert takes
+    # the write lock and the highest id; the rest take the ids after it and
+    # go out as one executemany.
+    first, *rest = matches
+    db.session.add(first)
+    db.session.flush()
+
+    for offset, match in enumerate(rest, start=1):
+        match.id = first.id + offset
+
+    db.session.add_all(rest)
+    db.session.flush()
+
+    counters = {}
+
+    for match in matches:
+        _count_winner(counters, match.deck1_id, match.deck2_id, match.winner_id, 1)
+
+    _write_winner_counters(counters)
+    apply_match_changes([(MatchFacts.from_match(match), 1) for match in matches])
+
+    return matches
+
+
+def _new_match(payload: dict, client_match_id: str | None, loaded_ids: set, known: dict, active: dict) -> Match:
     deck1_id = _required_int(payload.get("deck1_id"), "deck1_id")
     deck2_id = _required_int(payload.get("deck2_id"), "deck2_id")
 
-    _validate_participants(deck1_id, deck2_id)
+    _validate_participants(deck1_id, deck2_id, loaded_ids)
 
     winner_id = _optional_int(payload.get("winner_id"), "winner_id")
     first_player_id = _optional_int(payload.get("first_player_id"), "first_player_id")
@@ -33,26 +372,29 @@ def create_match(payload: dict) -> dict:
     _validate_optional_participant(winner_id, deck1_id, deck2_id, "winner_id")
     _validate_optional_participant(first_player_id, deck1_id, deck2_id, "first_player_id")
 
+    deck1_version_id, deck2_version_id, _ = _resolve_versions(payload, deck1_id, deck2_id, known=known, active=active)
+
     match = Match(
         deck1_id=deck1_id,
         deck2_id=deck2_id,
+        deck1_version_id=deck1_version_id,
+        deck2_version_id=deck2_version_id,
         winner_id=winner_id,
         first_player_id=first_player_id,
         format=match_format,
         notes=notes,
+        client_match_id=client_match_id,
     )
 
-    if date_played is not None:
-        match.date_played = date_played
+    # Set explicitly so aggregates see the same timestamp the row stores.
+    match.date_played = date_played or now_central()
 
-    db.session.add(match)
+    return match
 
-    if winner_id is not None:
-        _apply_winner_counter(deck1_id, deck2_id, winner_id)
 
-    db.session.commit()
-
-    return get_match(match.id)
+def match_query():
+    """Match query that loads both participating decks with the match row."""
+    return Match.query.options(joinedload(Match.deck1), joinedload(Match.deck2))
 
 
 def list_matches(
@@ -66,7 +408,7 @@ def list_matches(
     page: int | None = None,
     page_size: int | None = None,
 ):
-    query = Match.query
+    query = match_query()
 
     if fmt in ("Standard", "Stride", "Any"):
         query = query.filter(Match.format == fmt)
@@ -145,10 +487,26 @@ def list_matches(
 
 
 def get_match(match_id: int) -> dict:
-    match = Match.query.get_or_404(match_id)
+    # populate_existing makes an already-loaded (expired) match reload with its
+    # decks in one joined SELECT instead of lazy-loading each deck afterwards.
+    match = db.get_or_404(
+        Match,
+        match_id,
+        options=[joinedload(Match.deck1), joinedload(Match.deck2)],
+        populate_existing=True,
+    )
     return serialize_match(match)
 
 
+def _match_responses(match_ids: list[int]) -> dict[int, dict]:
+    """``get_match`` for many matches at once, keyed by id."""
+    if not match_ids:
+        return {}
+
+    matches = match_query().filter(Match.id.in_(match_ids)).populate_existing().all()
+    return {match.id: serialize_match(match) for match in matches}
+
+
 def update_match(match_id: int, payload: dict) -> dict:
     match = Match.query.get_or_404(match_id)
 
@@ -158,7 +516,13 @@ def update_match(match_id: int, payload: dict) -> dict:
     if new_deck1_id is None or new_deck2_id is None:
         raise ValueError("deck1_id and deck2_id cannot be null.")
 
-    _validate_participants(new_deck1_id, new_deck2_id)
+    # Load old and new participants at once and keep them referenced, so the
+    # lookups below hit the session's (weak-referencing) identity map.
+    participants = Deck.query.filter(
+        Deck.id.in_({match.deck1_id, match.deck2_id, new_deck1_id, new_deck2_id})
+    ).all()
+
+    _validate_participants(new_deck1_id, new_deck2_id, {deck.id for deck in participants})
 
     new_winner_id = (
         _optional_int(payload.get("winner_id"), "winner_id")
@@ -181,12 +545,24 @@ def update_match(match_id: int, payload: dict) -> dict:
     _validate_optional_participant(new_winner_id, new_deck1_id, new_deck2_id, "winner_id")
     _validate_optional_participant(new_first_player_id, new_deck1_id, new_deck2_id, "first_player_id")
 
+    new_deck1_version_id, new_deck2_version_id, versions = _resolve_versions(
+        payload,
+        new_deck1_id,
+        new_deck2_id,
+        current={match.deck1_id: match.deck1_version_id, match.deck2_id: match.deck2_version_id},
+    )
+
+    previous_facts = MatchFacts.from_match(match)
+
     # Revert the old winner from the old participants, then apply the new winner
     # against the new participants. This handles edits to participants and winner.
-    _revert_winner_counter(match.deck1_id, match.deck2_id, match.winner_id)
+    counters = {}
+    _count_winner(counters, match.deck1_id, match.deck2_id, match.winner_id, -1)
 
     match.deck1_id = new_deck1_id
     match.deck2_id = new_deck2_id
+    match.deck1_version_id = new_deck1_version_id
+    match.deck2_version_id = new_deck2_version_id
     match.winner_id = new_winner_id
     match.first_player_id = new_first_player_id
     match.format = new_format
@@ -199,20 +575,29 @@ def update_match(match_id: int, payload: dict) -> dict:
         if parsed_date is not None:
             match.date_played = parsed_date
 
-    _apply_winner_counter(match.deck1_id, match.deck2_id, match.winner_id)
+    _count_winner(counters, match.deck1_id, match.deck2_id, match.winner_id, 1)
+    _write_winner_counters(counters)
+    replace_match_aggregates(previous_facts, MatchFacts.from_match(match))
 
     db.session.commit()
+    _replays().drop(match.client_match_id)
 
     return get_match(match.id)
 
 
 def delete_match(match_id: int):
-    match = Match.query.get_or_404(match_id)
+    # Joined decks stay referenced by the match, so the rating updates reuse them.
+    match = db.get_or_404(Match, match_id, options=[joinedload(Match.deck1), joinedload(Match.deck2)])
 
-    _revert_winner_counter(match.deck1_id, match.deck2_id, match.winner_id)
+    counters = {}
+    _count_winner(counters, match.deck1_id, match.deck2_id, match.winner_id, -1)
+    _write_winner_counters(counters)
+    apply_match_aggregates(MatchFacts.from_match(match), -1)
 
+    client_match_id = match.client_match_id
     db.session.delete(match)
     db.session.commit()
+    _replays().drop(client_match_id)
 
 
 def _required_int(value, field_name: str) -> int:
@@ -266,14 +651,12 @@ def _parse_date_required(value, field_name: str) -> datetime:
     return parsed
 
 
-def _validate_participants(deck1_id: int, deck2_id: int):
+def _validate_participants(deck1_id: int, deck2_id: int, loaded_ids: set):
+    """Check both decks against the ids of the already loaded decks."""
     if deck1_id == deck2_id:
         raise ValueError("deck1_id and deck2_id must be different.")
 
-    deck1_exists = Deck.query.get(deck1_id) is not None
-    deck2_exists = Deck.query.get(deck2_id) is not None
-
-    if not deck1_exists or not deck2_exists:
+    if deck1_id not in loaded_ids or deck2_id not in loaded_ids:
         raise LookupError("One or both deck IDs do not exist.")
 
 
@@ -285,37 +668,126 @@ def _validate_optional_participant(value: int | None, deck1_id: int, deck2_id: i
         raise ValueError(f"{field_name} must be either deck1_id or deck2_id.")
 
 
-def _apply_winner_counter(deck1_id: int, deck2_id: int, winner_id: int | None):
-    if winner_id is None:
-        return
+def _resolve_versions(
+    payload: dict,
+    deck1_id: int,
+    deck2_id: int,
+    current: dict | None = None,
+    known: dict | None = None,
+    active: dict | None = None,
+):
+    """
+    Deck versions for both sides of a match.
+
+    An explicit ``deckN_version_id`` (or null) wins. Otherwise a deck that
+    was already in the match keeps its recorded version, and a newly added
+    deck gets its active version, if it has one. Callers that already
+    loaded the explicit versions (``known``, by id) or the active ones
+    (``active``, by deck id) pass them in. Returns both version ids and
+    the versions loaded along the way, which callers keep referenced for
+    the rating updates.
+    """
+    current = current or {}
+    resolved = []
+    loaded = []
+    defaults = active
+
+    for deck_id, field_name in ((deck1_id, "deck1_version_id"), (deck2_id, "deck2_version_id")):
+        if field_name in payload:
+            version_id = _optional_int(payload.get(field_name), field_name)
+            loaded.append(_validate_version(version_id, deck_id, field_name, known))
+        elif deck_id in current:
+            version_id = current[deck_id]
+        else:
+            if defaults is None:
+                defaults = _active_versions({deck1_id, deck2_id} - set(current))
+            version = defaults.get(deck_id)
+            version_id = version.id if version else None
+            loaded.append(version)
+
+        resolved.append(version_id)
+
+    return resolved[0], resolved[1], [version for version in loaded if version is not None]
+
+
+def _active_versions(deck_ids) -> dict[int, DeckVersion]:
+    versions = DeckVersion.query.filter(
+        DeckVersion.deck_id.in_(deck_ids), DeckVersion.is_active.is_(True)
+    ).all()
+    return {version.deck_id: version for version in versions}
+
+
+def _validate_version(
+    version_id: int | None, deck_id: int, field_name: str, known: dict | None = None
+) -> DeckVersion | None:
+    if version_id is None:
+        return None
 
-    deck1 = Deck.query.get(deck1_id)
-    deck2 = Deck.query.get(deck2_id)
+    version = known.get(version_id) if known is not None else db.session.get(DeckVersion, version_id)
+
+    if version is None:
+        raise LookupError(f"{field_name} does not exist.")
+
+    if version.deck_id != deck_id:
+        raise ValueError(f"{field_name} must be a version of the same deck.")
+
+    return version
 
-    if not deck1 or not deck2:
-        return
 
+def _count_winner(deltas: dict, deck1_id: int, deck2_id: int, winner_id: int | None, sign: int):
+    """Add (sign=1) or remove (sign=-1) one result to the per-deck counter changes in ``deltas``."""
     if winner_id == deck1_id:
-        deck1.wins += 1
-        deck2.losses += 1
+        loser_id = deck2_id
     elif winner_id == deck2_id:
-        deck2.wins += 1
-        deck1.losses += 1
+        loser_id = deck1_id
+    else:
+        return
 
+    deltas.setdefault(winner_id, [0, 0])[0] += sign
+    deltas.setdefault(loser_id, [0, 0])[1] += sign
+
+
+def _clamped_add(column, delta: int):
+    return case((column + delta < 0, 0), else_=column + delta)
 
-def _revert_winner_counter(deck1_id: int, deck2_id: int, winner_id: int | None):
-    if winner_id is None:
-        return
 
-    deck1 = Deck.query.get(deck1_id)
-    deck2 = Deck.query.get(deck2_id)
+def _write_winner_counters(deltas: dict):
+    """
+    Apply counter changes with one executemany ``UPDATE deck SET wins =
+    wins + :d ...``, so concurrent match writes never overwrite each
+    other's counts. Decks already in the session then reload the stored
+    values instead of going stale.
+    """
+    changes = [
+        {"deck_id": deck_id, "wins_change": wins, "losses_change": losses}
+        for deck_id, (wins, losses) in sorted(deltas.items())
+        if wins or losses
+    ]
 
-    if not deck1 or not deck2:
+    if not changes:
         return
 
-    if winner_id == deck1_id:
-        deck1.wins = max(0, deck1.wins - 1)
-        deck2.losses = max(0, deck2.losses - 1)
-    elif winner_id == deck2_id:
-        deck2.wins = max(0, deck2.wins - 1)
-        deck1.losses = max(0, deck1.losses - 1)
\ No newline at end of file
+    table = Deck.__table__
+    connection = db.session.connection()
+    connection.execute(
+        update(table)
+        .where(table.c.id == bindparam("deck_id"))
+        .values(
+            wins=_clamped_add(table.c.wins, bindparam("wins_change")),
+            losses=_clamped_add(table.c.losses, bindparam("losses_change")),
+        ),
+        changes,
+    )
+
+    loaded = {}
+
+    for change in changes:
+        deck = db.session.identity_map.get(identity_key(Deck, change["deck_id"]))
+
+        if deck is not None:
+            loaded[change["deck_id"]] = deck
+
+    if loaded:
+        for row in connection.execute(select(table.c.id, table.c.wins, table.c.losses).where(table.c.id.in_(loaded))):
+            set_committed_value(loaded[row.id], "wins", row.wins)
+            set_committed_value(loaded[row.id], "losses", row.losses)
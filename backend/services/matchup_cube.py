@@ -0,0 +1,70 @@
+"""
+Monthly matchup cube behind the filtered stats endpoints.
+
+``matchup_month_stat`` has one cell per deck, format, month, and opponent
+deck. Every match touches two cells, one from each participant's side.
+``count_cube_results`` adds a match write's changes to those cells, and
+``rebuild_matchup_cube`` recomputes the table from match history.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import func, select
+
+from backend.models import Deck, Match, MatchupMonthStat
+from backend.services.aggregates import CounterTable, rebuild_result_counts, result_column
+
+
+CUBE_RESULTS = CounterTable(MatchupMonthStat)
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def count_cube_results(facts, sign: int, counters):
+    """Add (sign=1) or remove (sign=-1) one match from both decks' cells."""
+    day = facts.played_on
+
+    if day is None or facts.deck1_id == facts.deck2_id:
+        return
+
+    month = month_start(day)
+    fmt = facts.format or ""
+
+    for deck_id, opponent_id in ((facts.deck1_id, facts.deck2_id), (facts.deck2_id, facts.deck1_id)):
+        counters.add_result(CUBE_RESULTS, (deck_id, opponent_id, fmt, month), facts.winner_id, deck_id, opponent_id, sign)
+
+
+def rebuild_matchup_cube(connection):
+    """Recreate every cube cell from the match table."""
+    deck_ids = set(connection.scalars(select(Deck.id)))
+    months = {}
+    statement = select(
+        Match.deck1_id,
+        Match.deck2_id,
+        Match.winner_id,
+        func.strftime("%Y-%m-01", Match.date_played),
+        func.coalesce(Match.format, ""),
+    ).where(Match.date_played.isnot(None))
+
+    def cells(row):
+        deck1_id, deck2_id, winner_id, month, fmt = row
+
+        if deck1_id == deck2_id or deck1_id not in deck_ids or deck2_id not in deck_ids:
+            return
+
+        first_day = months.get(month)
+
+        if first_day is None:
+            first_day = months[month] = date.fromisoformat(month)
+
+        for deck_id, opponent_id in ((deck1_id, deck2_id), (deck2_id, deck1_id)):
+            column = result_column(winner_id, deck_id, opponent_id)
+
+            if column is not None:
+                yield (deck_id, opponent_id, fmt, first_day), column
+
+    rebuild_result_counts(connection, CUBE_RESULTS, statement, cells)
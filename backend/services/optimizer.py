@@ -0,0 +1,333 @@
+"""
+Search main deck quantity allocations over a set of candidate cards.
+
+The ride deck and every main deck card outside the candidates stay as they
+are. The search covers each allocation of 0 to ``max_copies`` copies per
+candidate that brings the main deck to ``main_size`` cards, in two stages:
+
+- Every allocation is scored with exact odds: the chance that the opening
+  hand plus the first three draws include each ride grade the ride deck
+  does not cover, plus ``trigger_weight`` times the trigger share.
+- The best ``shortlist`` of those, and the current build, are simulated
+  with the draw simulator and ranked by the chance to ride on curve every
+  turn plus ``trigger_weight`` times the triggers per drive check.
+
+Every simulation uses the same seed, so allocations are compared on the
+same shuffles. The simulations run in the shared simulation pool (see
+``workers``) when one is configured.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from itertools import repeat
+from math import comb
+
+import numpy as np
+
+from backend.models import Card, DeckCard
+from backend.services.deck_builder import MAIN_DECK_LIMIT, MAX_CARD_GRADE, get_deck_version_or_raise
+from backend.services.simulation import (
+    GOING_ORDERS,
+    OPENING_HAND,
+    RIDE_GRADES,
+    _bounded_int,
+    run_simulation,
+    trigger_name,
+)
+from backend.services.workers import map_tasks
+
+
+MAX_CANDIDATES = 8
+DEFAULT_MAX_COPIES = 4
+MAX_ALLOCATIONS = 400_000
+DEFAULT_SHORTLIST = 24
+MAX_SHORTLIST = 64
+DEFAULT_TOP = 5
+DEFAULT_TRIALS = 20_000
+MAX_TRIALS = 100_000
+DEFAULT_TRIGGER_WEIGHT = 1.0
+
+# Turn 3 rides grade 3 and twin drives, which is all the score reads.
+SIMULATED_TURNS = 3
+CARDS_SEEN = OPENING_HAND + 3
+
+
+def _simulate_all(profiles: list[dict], trials: int, going: str, seed: int) -> list[dict]:
+    return map_tasks(run_simulation, profiles, repeat(trials), repeat(SIMULATED_TURNS), repeat(going), repeat(seed))
+
+
+def _candidate_ids(value) -> list[int]:
+    if not isinstance(value, list) or not value:
+        raise ValueError("card_ids must be a non-empty list.")
+
+    try:
+        card_ids = list(dict.fromkeys(int(card_id) for card_id in value))
+    except (TypeError, ValueError) as exc:
+        raise ValueError("card_ids must be integers.") from exc
+
+    if len(card_ids) > MAX_CANDIDATES:
+        raise ValueError(f"At most {MAX_CANDIDATES} candidate cards can be optimized at once.")
+
+    return card_ids
+
+
+def _trigger_weight(value) -> float:
+    if value in (None, ""):
+        return DEFAULT_TRIGGER_WEIGHT
+
+    try:
+        weight = float(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("trigger_weight must be a number.") from exc
+
+    if not 0 <= weight <= 10:
+        raise ValueError("trigger_weight must be between 0 and 10.")
+
+    return weight
+
+
+def _allocations(count: int, max_copies: int, total: int) -> np.ndarray:
+    """Every row of ``count`` quantities in 0..max_copies that adds up to ``total``."""
+    base = max_copies + 1
+
+    if base**count > MAX_ALLOCATIONS:
+        raise ValueError("Too many allocations to search; use fewer candidates or a lower max_copies.")
+
+    grid = np.stack(np.unravel_index(np.arange(base**count), (base,) * count), axis=1)
+    return grid[grid.sum(axis=1) == total]
+
+
+def _proxy_scores(grid, candidates, fixed, main_size, needed, trigger_weight) -> np.ndarray:
+    """Exact ride-line odds over the first cards seen, plus the weighted trigger share."""
+    grades = np.array([card.grade for card in candidates])
+    triggers = np.array([trigger_name(card.card_type, card.trigger_type) is not None for card in candidates])
+
+    # chance[m] = C(main_size - m, seen) / C(main_size, seen): none of m cards seen.
+    seen = min(CARDS_SEEN, main_size)
+    chance = np.array([comb(main_size - missing, seen) / comb(main_size, seen) for missing in range(main_size + 1)])
+    counts = {
+        grade: fixed["grades"][grade] + grid @ (grades == grade).astype(np.int64) for grade in needed
+    }
+
+    ride_line = np.zeros(len(grid))
+    for mask in range(1 << len(needed)):
+        missing = sum(
+            (counts[grade] for index, grade in enumerate(needed) if mask >> index & 1),
+            np.zeros(len(grid), dtype=np.int64),
+        )
+        sign = -1 if bin(mask).count("1") % 2 else 1
+        ride_line += sign * chance[missing]
+
+    trigger_share = (fixed["triggers"] + grid @ triggers.astype(np.int64)) / main_size
+    return ride_line + trigger_weight * trigger_share
+
+
+def _profile(fixed_main: Counter, candidates: list[Card], quantities, ride_grades: set) -> dict:
+    """The simulator's deck profile for one allocation (see ``deck_profile``)."""
+    main = Counter(fixed_main)
+
+    for card, quantity in zip(candidates, quantities):
+        if quantity:
+            main[(card.grade, trigger_name(card.card_type, card.trigger_type) or "")] += int(quantity)
+
+    return {
+        "main": sorted([grade, trigger, count] for (grade, trigger), count in main.items()),
+        "ride_grades": sorted(grade for grade in ride_grades if grade in RIDE_GRADES),
+    }
+
+
+def _score(result: dict, trigger_weight: float) -> dict:
+    drive_rate = result["drive_trigger_rate"] or 0.0
+
+    return {
+        "score": round(result["ride_all_rate"] + trigger_weight * drive_rate, 4),
+        "ride_all_rate": result["ride_all_rate"],
+        "drive_trigger_rate": result["drive_trigger_rate"],
+    }
+
+
+def _operations(version_id: int, card_id: int, entries: list[DeckCard], target: int) -> list[dict]:
+    """API requests that move one card from its current main deck quantity to ``target``."""
+    current = sum(entry.quantity for entry in entries)
+
+    if target > current:
+        if entries:
+            first = entries[0]
+            return [
+                {
+                    "method": "PATCH",
+                    "path": f"/api/deck-cards/{first.id}",
+                    "body": {"quantity": first.quantity + target - current},
+                }
+            ]
+
+        return [
+            {
+                "method": "POST",
+                "path": f"/api/deck-versions/{version_id}/cards",
+                "body": {"card_id": card_id, "quantity": target, "zone": "main"},
+            }
+        ]
+
+    operations = []
+    cut = current - target
+
+    for entry in reversed(entries):
+        if not cut:
+            break
+
+        removed = min(entry.quantity, cut)
+        cut -= removed
+
+        if removed == entry.quantity:
+            operations.append({"method": "DELETE", "path": f"/api/deck-cards/{entry.id}"})
+        else:
+            operations.append(
+                {"method": "PATCH", "path": f"/api/deck-cards/{entry.id}", "body": {"quantity": entry.quantity - removed}}
+            )
+
+    return operations
+
+
+def optimize_deck_version(version_id: int, payload) -> dict:
+    """Rank candidate quantity allocations for a deck version and return them as deltas."""
+    if not isinstance(payload, dict):
+        raise ValueError("Request body must be a JSON object")
+
+    card_ids = _candidate_ids(payload.get("card_ids"))
+    max_copies = _bounded_int(payload.get("max_copies"), "max_copies", DEFAULT_MAX_COPIES, 1, MAIN_DECK_LIMIT)
+    main_size = _bounded_int(payload.get("main_size"), "main_size", MAIN_DECK_LIMIT, 1, MAIN_DECK_LIMIT)
+    shortlist = _bounded_int(payload.get("shortlist"), "shortlist", DEFAULT_SHORTLIST, 1, MAX_SHORTLIST)
+    top = _bounded_int(payload.get("top"), "top", DEFAULT_TOP, 1, MAX_SHORTLIST)
+    trials = _bounded_int(payload.get("trials"), "trials", DEFAULT_TRIALS, 1_000, MAX_TRIALS)
+    seed = _bounded_int(payload.get("seed"), "seed", 0, 0, 2**32 - 1)
+    trigger_weight = _trigger_weight(payload.get("trigger_weight"))
+    going = payload.get("going") or "first"
+
+    if going not in GOING_ORDERS:
+        raise ValueError("going must be first or second.")
+
+    version = get_deck_version_or_raise(version_id)
+    cards = {card.id: card for card in Card.query.filter(Card.id.in_(card_ids)).all()}
+
+    for card_id in card_ids:
+        if card_id not in cards:
+            raise LookupError(f"Card {card_id} not found")
+
+        grade = cards[card_id].grade
+
+        if grade is None or not 0 <= grade <= MAX_CARD_GRADE:
+            raise ValueError(f"{cards[card_id].name} cannot be in the main deck")
+
+    candidates = [cards[card_id] for card_id in card_ids]
+    entries = (
+        DeckCard.query.join(Card, Card.id == DeckCard.card_id)
+        .add_columns(Card.grade, Card.card_type, Card.trigger_type)
+        .filter(DeckCard.deck_version_id == version.id, DeckCard.zone.in_(("main", "ride")))
+        .order_by(DeckCard.id)
+        .all()
+    )
+
+    fixed_main = Counter()
+    candidate_entries = {card_id: [] for card_id in card_ids}
+    ride_grades = set()
+
+    for entry, grade, card_type, trigger_type in entries:
+        if entry.zone == "ride":
+            ride_grades.add(grade)
+        elif entry.card_id in candidate_entries:
+            candidate_entries[entry.card_id].append(entry)
+        else:
+            fixed_main[(grade, trigger_name(card_type, trigger_type) or "")] += entry.quantity
+
+    fixed_total = sum(fixed_main.values())
+    open_slots = main_size - fixed_total
+
+    if open_slots < 0:
+        raise ValueError(f"The {fixed_total} main deck cards outside the candidates already exceed main_size.")
+
+    if open_slots > len(candidates) * max_copies:
+        raise ValueError(
+            f"{len(candidates)} candidates with at most {max_copies} copies cannot fill {open_slots} main deck slots."
+        )
+
+    needed = [grade for grade in RIDE_GRADES if grade not in ride_grades]
+    fixed = {
+        "grades": Counter({grade: 0 for grade in RIDE_GRADES}),
+        "triggers": sum(count for (_, trigger), count in fixed_main.items() if trigger),
+    }
+    for (grade, _), count in fixed_main.items():
+        fixed["grades"][grade] += count
+
+    grid = _allocations(len(candidates), max_copies, open_slots)
+    proxy = _proxy_scores(grid, candidates, fixed, main_size, needed, trigger_weight)
+    # Stable, so ties keep enumeration order and results are repeatable.
+    chosen = grid[np.argsort(-proxy, kind="stable")[:shortlist]]
+
+    current_quantities = [sum(entry.quantity for entry in candidate_entries[card.id]) for card in candidates]
+    current_total = fixed_total + sum(current_quantities)
+    profiles = [_profile(fixed_main, candidates, row, ride_grades) for row in chosen]
+    simulate_current = current_total == main_size and not (chosen == current_quantities).all(axis=1).any()
+
+    if simulate_current:
+        profiles.append(_profile(fixed_main, candidates, current_quantities, ride_grades))
+
+    scores = [_score(result, trigger_weight) for result in _simulate_all(profiles, trials, going, seed)]
+    chosen = chosen.tolist()
+
+    if simulate_current:
+        current_score = scores.pop()
+    else:
+        current_score = next(
+            (score for quantities, score in zip(chosen, scores) if quantities == current_quantities), None
+        )
+
+    ranked = sorted(zip(chosen, scores), key=lambda item: -item[1]["score"])
+
+    allocations = []
+    for quantities, score in ranked:
+        changes = [
+            {
+                "card_id": card.id,
+                "card_name": card.name,
+                "grade": card.grade,
+                "trigger": trigger_name(card.card_type, card.trigger_type),
+                "from": before,
+                "to": after,
+                "delta": after - before,
+                "operations": _operations(version.id, card.id, candidate_entries[card.id], after),
+            }
+            for card, before, after in zip(candidates, current_quantities, quantities)
+            if after != before
+        ]
+        # Cuts first, so applying the operations in order never overfills the deck.
+        changes.sort(key=lambda change: change["delta"])
+        allocations.append(
+            {
+                **score,
+                "quantities": {str(card.id): quantity for card, quantity in zip(candidates, quantities)},
+                "changes": changes,
+            }
+        )
+
+    return {
+        "version_id": version.id,
+        "parameters": {
+            "card_ids": card_ids,
+            "max_copies": max_copies,
+            "main_size": main_size,
+            "trigger_weight": trigger_weight,
+            "trials": trials,
+            "going": going,
+            "seed": seed,
+        },
+        "searched": len(grid),
+        "simulated": len(profiles),
+        "current": {
+            "quantities": {str(card.id): quantity for card, quantity in zip(candidates, current_quantities)},
+            "main_cards": current_total,
+            **(current_score or {"score": None, "ride_all_rate": None, "drive_trigger_rate": None}),
+        },
+        "allocations": allocations[:top],
+    }
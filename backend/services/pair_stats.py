@@ -0,0 +1,121 @@
+"""
+Per-pair play counts used by the matchup scheduler.
+
+``deck_pair_stat`` has one row per unordered pair of decks. Inserting a
+deck adds its rows, however the deck is added (API, seed, or script);
+match writes adjust a single row through ``count_pair_result``;
+``rebuild_pair_stats`` recomputes the whole table from match history.
+"""
+
+from __future__ import annotations
+
+import random
+from itertools import combinations
+
+from sqlalchemy import case, delete, event, func, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from backend.models import Deck, DeckPairStat, Match
+from backend.services.aggregates import REBUILD_CHUNK_SIZE, CounterTable
+
+
+SHUFFLE_KEY_RANGE = 1_000_000_000
+
+
+def pair_key(deck1_id: int, deck2_id: int) -> tuple[int, int]:
+    return (deck1_id, deck2_id) if deck1_id < deck2_id else (deck2_id, deck1_id)
+
+
+def pair_uncertainty(low_wins, high_wins):
+    """
+    Variance of a Beta(low_wins + 1, high_wins + 1) win-rate estimate.
+    Also builds the same value as a SQL expression from counter columns.
+    """
+    alpha = low_wins + 1.0
+    beta = high_wins + 1.0
+    total = alpha + beta
+    return (alpha * beta) / (total * total * (total + 1.0))
+
+
+PAIR_COUNTS = CounterTable(
+    DeckPairStat,
+    counters=("games", "low_wins", "high_wins"),
+    derived=lambda counts: {"uncertainty": pair_uncertainty(counts["low_wins"], counts["high_wins"])},
+    new_row={"shuffle_key": lambda: random.randrange(SHUFFLE_KEY_RANGE)},
+)
+
+
+def _new_pair_row(low_id: int, high_id: int, rng=random) -> dict:
+    return {
+        "deck_low_id": low_id,
+        "deck_high_id": high_id,
+        "games": 0,
+        "low_wins": 0,
+        "high_wins": 0,
+        "uncertainty": pair_uncertainty(0, 0),
+        "shuffle_key": rng.randrange(SHUFFLE_KEY_RANGE),
+    }
+
+
+@event.listens_for(Deck, "after_insert")
+def _add_deck_pairs(mapper, connection, deck):
+    """Add the pair rows for a newly inserted deck."""
+    other_ids = connection.scalars(select(Deck.id).where(Deck.id != deck.id)).all()
+
+    if other_ids:
+        # Decks flushed together each see the others, so skip pairs already added.
+        connection.execute(
+            sqlite_insert(DeckPairStat).on_conflict_do_nothing(),
+            [_new_pair_row(*pair_key(deck.id, other_id)) for other_id in other_ids],
+        )
+
+
+def count_pair_result(facts, sign: int, counters):
+    """Add (sign=1) or remove (sign=-1) one match from its pair's counts."""
+    low_id, high_id = pair_key(facts.deck1_id, facts.deck2_id)
+    counters.add(PAIR_COUNTS, (low_id, high_id), 0, sign)
+
+    if facts.winner_id == low_id:
+        counters.add(PAIR_COUNTS, (low_id, high_id), 1, sign)
+    elif facts.winner_id == high_id:
+        counters.add(PAIR_COUNTS, (low_id, high_id), 2, sign)
+
+
+def rebuild_pair_stats(connection):
+    """Recreate every pair row from the deck and match tables."""
+    low = case((Match.deck1_id < Match.deck2_id, Match.deck1_id), else_=Match.deck2_id)
+    high = case((Match.deck1_id < Match.deck2_id, Match.deck2_id), else_=Match.deck1_id)
+    counts = {
+        (row.low, row.high): row
+        for row in connection.execute(
+            select(
+                low.label("low"),
+                high.label("high"),
+                func.count().label("games"),
+                func.sum(case((Match.winner_id == low, 1), else_=0)).label("low_wins"),
+                func.sum(case((Match.winner_id == high, 1), else_=0)).label("high_wins"),
+            ).group_by(low, high)
+        )
+    }
+
+    deck_ids = connection.scalars(select(Deck.id).order_by(Deck.id)).all()
+    rows = []
+
+    connection.execute(delete(DeckPairStat))
+
+    for low_id, high_id in combinations(deck_ids, 2):
+        row = _new_pair_row(low_id, high_id)
+        played = counts.get((low_id, high_id))
+
+        if played is not None:
+            row.update(games=played.games, low_wins=played.low_wins, high_wins=played.high_wins)
+            row["uncertainty"] = pair_uncertainty(played.low_wins, played.high_wins)
+
+        rows.append(row)
+
+        if len(rows) >= REBUILD_CHUNK_SIZE:
+            connection.execute(insert(DeckPairStat), rows)
+            rows = []
+
+    if rows:
+        connection.execute(insert(DeckPairStat), rows)
@@ -0,0 +1,266 @@
+"""
+Elo ratings for decks and deck versions.
+
+``create_match`` folds each new match into both decks' ratings in O(1)
+through ``apply_rating_results``. Elo depends on match order, so an edit,
+a delete, or a match dated before the newest rated one cannot be applied
+incrementally; those mark the ratings stale instead, and the next read
+replays the whole history with ``rebuild_ratings``.
+
+The replay streams only the id columns of decided matches in
+``(date_played, id)`` order, runs the updates over plain dicts, and writes
+every rating back with one executemany per table.
+
+Version ratings only count matches where both sides recorded a version.
+Undecided matches do not change ratings.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.orm.attributes import set_committed_value
+
+from backend.database import db, session_get
+from backend.models import AggregateState, Deck, DeckVersion, Match, now_central
+
+
+RATINGS_STATE = "ratings"
+INITIAL_RATING = 1500.0
+
+# New decks move faster until they have a few results behind them.
+ELO_K = 20.0
+ELO_K_PROVISIONAL = 40.0
+PROVISIONAL_GAMES = 20
+
+REPLAY_CHUNK_SIZE = 50_000
+
+
+def expected_score(rating: float, opponent_rating: float) -> float:
+    """Probability that a deck rated ``rating`` beats one rated ``opponent_rating``."""
+    return 1.0 / (1.0 + 10.0 ** ((opponent_rating - rating) / 400.0))
+
+
+def elo_step(rating1, games1, rating2, games2, score1) -> tuple[float, float]:
+    """New ratings after one game; ``score1`` is 1.0 if side 1 won, else 0.0."""
+    delta = score1 - expected_score(rating1, rating2)
+    k1 = ELO_K_PROVISIONAL if games1 < PROVISIONAL_GAMES else ELO_K
+    k2 = ELO_K_PROVISIONAL if games2 < PROVISIONAL_GAMES else ELO_K
+    return rating1 + k1 * delta, rating2 - k2 * delta
+
+
+def _naive(value: datetime | None) -> datetime | None:
+    # SQLite stores wall-clock time without an offset.
+    return value.replace(tzinfo=None) if value is not None else None
+
+
+def _ratings_state(match_ids) -> AggregateState:
+    state = session_get(AggregateState, RATINGS_STATE)
+
+    if state is None:
+        # Without a recorded state, the stored ratings are only trustworthy
+        # if these are the first matches ever.
+        older_match = db.session.scalar(select(Match.id).where(Match.id.notin_(match_ids)).limit(1))
+        state = AggregateState(name=RATINGS_STATE, stale=older_match is not None)
+        db.session.add(state)
+
+    return state
+
+
+def _rate_pair(first, second, score1):
+    first.rating, second.rating = elo_step(
+        first.rating, first.rated_games, second.rating, second.rated_games, score1
+    )
+    first.rated_games += 1
+    second.rated_games += 1
+
+
+def _rate_versions(first, second, score1):
+    # Stored by _write_version_ratings, not the flush, which would also
+    # move updated_at.
+    rating1, rating2 = elo_step(first.rating, first.rated_games, second.rating, second.rated_games, score1)
+
+    for version, rating in ((first, rating1), (second, rating2)):
+        set_committed_value(version, "rating", rating)
+        set_committed_value(version, "rated_games", version.rated_games + 1)
+
+
+def _write_version_ratings(versions):
+    """
+    Store version ratings with one statement that keeps ``updated_at``,
+    which tracks edits to the list rather than games played.
+    """
+    _write_ratings(
+        db.session.connection(),
+        DeckVersion.__table__,
+        {version.id: version.rating for version in versions},
+        {version.id: version.rated_games for version in versions},
+    )
+
+
+def _apply_rating_result(state, facts, sign: int, rated_versions: dict):
+    if state.stale:
+        return
+
+    played_at = _naive(facts.date_played)
+    is_newest = state.watermark_at is None or (played_at, facts.match_id or 0) > (
+        state.watermark_at,
+        state.watermark_id or 0,
+    )
+
+    if sign < 0 or not is_newest:
+        state.stale = True
+        return
+
+    state.watermark_at = played_at
+    state.watermark_id = facts.match_id
+
+    if facts.winner_id == facts.deck1_id:
+        score1 = 1.0
+    elif facts.winner_id == facts.deck2_id:
+        score1 = 0.0
+    else:
+        return
+
+    deck1 = db.session.get(Deck, facts.deck1_id)
+    deck2 = db.session.get(Deck, facts.deck2_id)
+
+    if deck1 is not None and deck2 is not None:
+        _rate_pair(deck1, deck2, score1)
+
+    if facts.deck1_version_id is not None and facts.deck2_version_id is not None:
+        version1 = db.session.get(DeckVersion, facts.deck1_version_id)
+        version2 = db.session.get(DeckVersion, facts.deck2_version_id)
+
+        if version1 is not None and version2 is not None:
+            _rate_versions(version1, version2, score1)
+            rated_versions[version1.id] = version1
+            rated_versions[version2.id] = version2
+
+
+def apply_rating_results(changes):
+    """Fold new matches into the ratings in order, or mark them for a replay."""
+    if not changes:
+        return
+
+    state = _ratings_state([facts.match_id for facts, _ in changes])
+    rated_versions = {}
+
+    for facts, sign in changes:
+        _apply_rating_result(state, facts, sign, rated_versions)
+
+    _write_version_ratings(rated_versions.values())
+
+
+def _replay(partitions, deck_ids, version_ids):
+    # elo_step inlined: this loop runs once per decided match in history.
+    k_full, k_provisional, provisional_games = ELO_K, ELO_K_PROVISIONAL, PROVISIONAL_GAMES
+    deck_ratings = dict.fromkeys(deck_ids, INITIAL_RATING)
+    deck_games = dict.fromkeys(deck_ids, 0)
+    version_ratings = dict.fromkeys(version_ids, INITIAL_RATING)
+    version_games = dict.fromkeys(version_ids, 0)
+    sides = ((deck_ratings, deck_games, 0, 1), (version_ratings, version_games, 3, 4))
+
+    for rows in partitions:
+        for row in rows:
+            winner_id = row[2]
+
+            if winner_id == row[0]:
+                score1 = 1.0
+            elif winner_id == row[1]:
+                score1 = 0.0
+            else:
+                continue
+
+            for ratings, games, first, second in sides:
+                id1 = row[first]
+                id2 = row[second]
+
+                if id1 not in ratings or id2 not in ratings:
+                    continue
+
+                rating1 = ratings[id1]
+                rating2 = ratings[id2]
+                games1 = games[id1]
+                games2 = games[id2]
+                delta = score1 - 1.0 / (1.0 + 10.0 ** ((rating2 - rating1) / 400.0))
+                ratings[id1] = rating1 + (k_provisional if games1 < provisional_games else k_full) * delta
+                ratings[id2] = rating2 - (k_provisional if games2 < provisional_games else k_full) * delta
+                games[id1] = games1 + 1
+                games[id2] = games2 + 1
+
+    return (deck_ratings, deck_games), (version_ratings, version_games)
+
+
+def _write_ratings(connection, table, ratings, games):
+    if not ratings:
+        return
+
+    # Ratings are not edits: keep ``updated_at`` on tables that track one,
+    # and stamp ``rated_at`` instead where there is one.
+    timestamps = {"updated_at": table.c.updated_at} if "updated_at" in table.c else {}
+
+    if "rated_at" in table.c:
+        timestamps["rated_at"] = now_central()
+
+    connection.execute(
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values(rating=bindparam("row_rating"), rated_games=bindparam("row_games"), **timestamps),
+        [
+            {"row_id": row_id, "row_rating": rating, "row_games": games[row_id]}
+            for row_id, rating in ratings.items()
+        ],
+    )
+
+
+def rebuild_ratings(connection):
+    """Replay every decided match in order and store the resulting ratings."""
+    deck_ids = connection.scalars(select(Deck.id)).all()
+    version_ids = connection.scalars(select(DeckVersion.id)).all()
+
+    result = connection.execution_options(yield_per=REPLAY_CHUNK_SIZE).execute(
+        select(
+            Match.deck1_id,
+            Match.deck2_id,
+            Match.winner_id,
+            Match.deck1_version_id,
+            Match.deck2_version_id,
+        )
+        .where(Match.winner_id.isnot(None))
+        .order_by(Match.date_played, Match.id)
+    )
+    decks, versions = _replay(result.partitions(), deck_ids, version_ids)
+
+    _write_ratings(connection, Deck.__table__, *decks)
+    _write_ratings(connection, DeckVersion.__table__, *versions)
+
+    newest = connection.execute(
+        select(Match.date_played, Match.id)
+        .order_by(Match.date_played.desc(), Match.id.desc())
+        .limit(1)
+    ).first()
+
+    connection.execute(delete(AggregateState).where(AggregateState.name == RATINGS_STATE))
+    connection.execute(
+        insert(AggregateState).values(
+            name=RATINGS_STATE,
+            stale=False,
+            watermark_at=_naive(newest.date_played) if newest else None,
+            watermark_id=newest.id if newest else None,
+            rebuilt_at=_naive(now_central()),
+        )
+    )
+
+
+def ensure_ratings_current():
+    """Replay the ratings if a match edit or delete left them stale."""
+    state = db.session.get(AggregateState, RATINGS_STATE)
+
+    if state is not None and not state.stale:
+        return
+
+    rebuild_ratings(db.session.connection())
+    db.session.commit()
+
@@ -0,0 +1,260 @@
+"""
+Matchup scheduling for Play Lab.
+
+``random`` picks two active decks uniformly. ``least_played`` and
+``uncertain`` read ``deck_pair_stat`` through its ``(games, shuffle_key)``
+and ``(uncertainty, shuffle_key)`` indexes: one lookup finds the best
+priority value, a second picks a random pair among the pairs tied at that
+value. Neither recounts matches.
+
+``build_session_queue`` returns N matchups at once, either round-robin over
+the least-played pairs or sampled by uncertainty.
+
+Every matchup carries a ``prediction`` with both decks' Elo ratings and
+Bradley-Terry win probabilities (``backend/services/strength.py``).
+"""
+
+from __future__ import annotations
+
+import heapq
+import random
+
+from sqlalchemy.orm import aliased
+
+from backend.models import Deck, DeckPairStat
+from backend.services.pair_stats import SHUFFLE_KEY_RANGE
+from backend.services.ratings import ensure_ratings_current
+from backend.services.serializers import serialize_deck
+from backend.services.strength import predict_matchup, strength_fit
+
+
+SCHEDULE_MODES = ("random", "least_played", "uncertain")
+QUEUE_STRATEGIES = ("round_robin", "weighted")
+MAX_QUEUE_SIZE = 100
+
+# Weighted queues sample from this many times the requested size of the
+# most uncertain pairs.
+WEIGHTED_POOL_FACTOR = 4
+
+
+def _normalize_format(fmt):
+    fmt = fmt or "Any"
+
+    if fmt not in ("Any", "Standard", "Stride"):
+        raise ValueError("format must be Standard, Stride, or Any.")
+
+    return fmt
+
+
+def _eligible_pairs(fmt: str):
+    low_deck = aliased(Deck)
+    high_deck = aliased(Deck)
+
+    query = (
+        DeckPairStat.query
+        .join(low_deck, low_deck.id == DeckPairStat.deck_low_id)
+        .join(high_deck, high_deck.id == DeckPairStat.deck_high_id)
+        .filter(low_deck.active.is_(True), high_deck.active.is_(True))
+    )
+
+    if fmt in ("Standard", "Stride"):
+        query = query.filter(low_deck.type == fmt, high_deck.type == fmt)
+
+    return query
+
+
+def _priority(mode: str):
+    """(column, ordering) that puts the preferred pairs first."""
+    if mode == "least_played":
+        return DeckPairStat.games, DeckPairStat.games.asc()
+
+    return DeckPairStat.uncertainty, DeckPairStat.uncertainty.desc()
+
+
+def _pick_pair(fmt: str, mode: str, rng) -> DeckPairStat | None:
+    column, ordering = _priority(mode)
+    eligible = _eligible_pairs(fmt)
+
+    best = eligible.with_entities(column).order_by(ordering).limit(1).scalar()
+
+    if best is None:
+        return None
+
+    tied = eligible.filter(column == best)
+    start = rng.randrange(SHUFFLE_KEY_RANGE)
+
+    return (
+        tied.filter(DeckPairStat.shuffle_key >= start).order_by(DeckPairStat.shuffle_key).first()
+        or tied.order_by(DeckPairStat.shuffle_key).first()
+    )
+
+
+def _pair_summary(stat: DeckPairStat, deck1_id: int) -> dict:
+    deck1_is_low = deck1_id == stat.deck_low_id
+
+    return {
+        "games": stat.games,
+        "deck1_wins": stat.low_wins if deck1_is_low else stat.high_wins,
+        "deck2_wins": stat.high_wins if deck1_is_low else stat.low_wins,
+        "uncertainty": round(stat.uncertainty, 5),
+    }
+
+
+def _matchup(deck1, deck2, fmt, rng, fit, stat=None) -> dict:
+    if rng.random() < 0.5:
+        deck1, deck2 = deck2, deck1
+
+    first_player = rng.choice([deck1, deck2])
+    matchup = {
+        "deck1": serialize_deck(deck1),
+        "deck2": serialize_deck(deck2),
+        "first_player": serialize_deck(first_player),
+        "format": fmt,
+        "prediction": predict_matchup(deck1, deck2, fit),
+    }
+
+    if stat is not None:
+        matchup["pair"] = _pair_summary(stat, deck1.id)
+
+    return matchup
+
+
+def _random_matchup(fmt: str, rng, fit) -> dict:
+    query = Deck.query.filter_by(active=True)
+
+    if fmt in ("Standard", "Stride"):
+        query = query.filter(Deck.type == fmt)
+
+    decks = query.all()
+
+    if len(decks) < 2:
+        raise ValueError("At least two active decks are required for a random matchup.")
+
+    return _matchup(*rng.sample(decks, 2), fmt, rng, fit)
+
+
+def pick_matchup(fmt="Any", mode="random", rng=None) -> dict:
+    fmt = _normalize_format(fmt)
+    rng = rng or random.Random()
+
+    if mode not in SCHEDULE_MODES:
+        raise ValueError(f"schedule must be one of: {', '.join(SCHEDULE_MODES)}.")
+
+    ensure_ratings_current()
+    fit = strength_fit()
+
+    if mode == "random":
+        return {**_random_matchup(fmt, rng, fit), "schedule": mode}
+
+    stat = _pick_pair(fmt, mode, rng)
+
+    if stat is None:
+        raise ValueError("At least two active decks are required for a scheduled matchup.")
+
+    decks_by_id = {
+        deck.id: deck
+        for deck in Deck.query.filter(Deck.id.in_((stat.deck_low_id, stat.deck_high_id)))
+    }
+
+    return {
+        **_matchup(decks_by_id[stat.deck_low_id], decks_by_id[stat.deck_high_id], fmt, rng, fit, stat),
+        "schedule": mode,
+    }
+
+
+def predict(deck1_id, deck2_id) -> dict:
+    """Bradley-Terry odds for a chosen pair of decks."""
+    try:
+        deck1_id, deck2_id = int(deck1_id), int(deck2_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("deck1_id and deck2_id must be integers.") from exc
+
+    if deck1_id == deck2_id:
+        raise ValueError("deck1_id and deck2_id must be different.")
+
+    ensure_ratings_current()
+    decks_by_id = {deck.id: deck for deck in Deck.query.filter(Deck.id.in_((deck1_id, deck2_id)))}
+
+    if len(decks_by_id) < 2:
+        raise LookupError("One or both deck IDs do not exist.")
+
+    deck1, deck2 = decks_by_id[deck1_id], decks_by_id[deck2_id]
+
+    return {
+        "deck1": serialize_deck(deck1),
+        "deck2": serialize_deck(deck2),
+        "prediction": predict_matchup(deck1, deck2),
+    }
+
+
+def _round_robin(eligible, size: int, rng) -> list[DeckPairStat]:
+    """Play the least-played pairs first, counting queued games as played."""
+    candidates = (
+        eligible.order_by(DeckPairStat.games.asc(), DeckPairStat.shuffle_key.asc())
+        .limit(size)
+        .all()
+    )
+    heap = [(stat.games, rng.random(), index) for index, stat in enumerate(candidates)]
+    heapq.heapify(heap)
+    queue = []
+
+    while heap and len(queue) < size:
+        games, _, index = heapq.heappop(heap)
+        queue.append(candidates[index])
+        heapq.heappush(heap, (games + 1, rng.random(), index))
+
+    return queue
+
+
+def _weighted(eligible, size: int, rng) -> list[DeckPairStat]:
+    """Sample pairs in proportion to uncertainty, without repeats while possible."""
+    pool = (
+        eligible.order_by(DeckPairStat.uncertainty.desc(), DeckPairStat.shuffle_key.desc())
+        .limit(max(size * WEIGHTED_POOL_FACTOR, 32))
+        .all()
+    )
+
+    if not pool:
+        return []
+
+    # Efraimidis-Spirakis keys give a weighted sample without replacement.
+    ordered = sorted(pool, key=lambda stat: rng.random() ** (1.0 / stat.uncertainty), reverse=True)
+
+    return [ordered[index % len(ordered)] for index in range(size)]
+
+
+def build_session_queue(size=10, strategy="round_robin", fmt="Any", rng=None) -> dict:
+    fmt = _normalize_format(fmt)
+    rng = rng or random.Random()
+
+    if strategy not in QUEUE_STRATEGIES:
+        raise ValueError(f"strategy must be one of: {', '.join(QUEUE_STRATEGIES)}.")
+
+    try:
+        size = int(size)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("size must be an integer.") from exc
+
+    if size < 1 or size > MAX_QUEUE_SIZE:
+        raise ValueError(f"size must be between 1 and {MAX_QUEUE_SIZE}.")
+
+    ensure_ratings_current()
+
+    eligible = _eligible_pairs(fmt)
+    pairs = _round_robin(eligible, size, rng) if strategy == "round_robin" else _weighted(eligible, size, rng)
+
+    if not pairs:
+        raise ValueError("At least two active decks are required for a matchup queue.")
+
+    fit = strength_fit()
+    deck_ids = {stat.deck_low_id for stat in pairs} | {stat.deck_high_id for stat in pairs}
+    decks_by_id = {deck.id: deck for deck in Deck.query.filter(Deck.id.in_(deck_ids))}
+
+    return {
+        "strategy": strategy,
+        "format": fmt,
+        "matchups": [
+            _matchup(decks_by_id[stat.deck_low_id], decks_by_id[stat.deck_high_id], fmt, rng, fit, stat)
+            for stat in pairs
+        ],
+    }
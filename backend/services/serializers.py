@@ -3,31 +3,34 @@ Shared API serializers.
 
 This module contains functions to serialize various database models into dictionaries suitable for JSON responses in the API. 
 Each function takes a model instance as input and returns a dictionary representation of that instance, including related data where appropriate.
+
+Datetime fields are returned as ``datetime`` objects; the app JSON provider
+(``backend/json_provider.py``) encodes them as ISO 8601 strings.
 """
 
+from sqlalchemy.orm import joinedload
+
 from backend.database import db
 from backend.models import CardPrinting, Deck, DeckCard
+from backend.services.deck_summary import summarize_deck_cards
 
 
-def _deck_rule_summary(cards, totals_by_zone):
-    main_count = totals_by_zone.get("main", 0)
-    ride_count = totals_by_zone.get("ride", 0)
-    core_count = main_count + ride_count
-    ride_grades = []
-    ride_nations = []
+def format_display_datetime(value):
+    """Format ``value`` as ``06/09/2026 07:30 PM`` without the cost of strftime."""
+    if value is None:
+        return None
 
-    for entry in cards:
-        if entry["zone"] != "ride":
-            continue
+    hour = value.hour % 12 or 12
+    meridiem = "PM" if value.hour >= 12 else "AM"
+    return f"{value.month:02d}/{value.day:02d}/{value.year:04d} {hour:02d}:{value.minute:02d} {meridiem}"
 
-        grade = entry["card"]["grade"] if entry.get("card") else None
-        ride_grades.extend([grade] * entry["quantity"])
 
-        nation = entry["card"].get("nation") if entry.get("card") else None
-        for declared_nation in (nation or "").split(" / "):
-            cleaned_nation = declared_nation.strip()
-            if cleaned_nation and cleaned_nation not in ride_nations:
-                ride_nations.append(cleaned_nation)
+def _deck_rule_summary(summary):
+    totals_by_zone = summary["totals_by_zone"]
+    main_count = totals_by_zone.get("main", 0)
+    ride_count = totals_by_zone.get("ride", 0)
+    core_count = main_count + ride_count
+    ride_grades = summary["ride_grades"]
 
     issues = []
 
@@ -61,12 +64,8 @@ def _deck_rule_summary(cards, totals_by_zone):
         "main_deck_count": main_count,
         "ride_deck_count": ride_count,
         "ride_grades": ride_grades,
-        "ride_nations": ride_nations,
-        "is_complete": (
-            main_count == 50
-            and ride_count == 4
-            and set(ride_grades) == {0, 1, 2, 3}
-        ),
+        "ride_nations": summary["ride_nations"],
+        "is_complete": summary["is_complete"],
         "issues": issues,
     }
 
@@ -89,8 +88,10 @@ def serialize_deck(deck):
         "games": games,
         "decided_games": games,
         "win_pct": round(win_pct, 3),
+        "rating": round(deck.rating, 1),
+        "rated_games": deck.rated_games,
         "active": deck.active,
-        "created_at": deck.created_at.isoformat() if deck.created_at else None,
+        "created_at": deck.created_at,
     }
 
 
@@ -104,8 +105,8 @@ def serialize_deck_version_summary(version):
         "version_name": version.version_name,
         "notes": version.notes,
         "is_active": version.is_active,
-        "created_at": version.created_at.isoformat() if version.created_at else None,
-        "updated_at": version.updated_at.isoformat() if version.updated_at else None,
+        "created_at": version.created_at,
+        "updated_at": version.updated_at,
     }
 
 
@@ -113,10 +114,14 @@ def serialize_match(match):
     deck1 = serialize_deck(match.deck1) if match.deck1 else None
     deck2 = serialize_deck(match.deck2) if match.deck2 else None
 
-    winner = db.session.get(Deck, match.winner_id) if match.winner_id else None
-    first_player = (
-        db.session.get(Deck, match.first_player_id) if match.first_player_id else None
-    )
+    # Winners and first players are normally one of the participants, so reuse
+    # those rows and their serialized form instead of loading them again.
+    participants = {
+        match.deck1_id: (match.deck1, deck1),
+        match.deck2_id: (match.deck2, deck2),
+    }
+    winner, winner_payload = _match_deck(match.winner_id, participants)
+    first_player, first_player_payload = _match_deck(match.first_player_id, participants)
 
     is_undecided = match.winner_id is None
     is_valid_winner = match.winner_id in {match.deck1_id, match.deck2_id}
@@ -137,13 +142,14 @@ def serialize_match(match):
         "winner_id": match.winner_id,
         "first_player_id": match.first_player_id,
         "format": match.format,
-        "date_played": match.date_played.strftime("%m/%d/%Y %I:%M %p"),
-        "date_played_iso": match.date_played.isoformat(),
+        "date_played": format_display_datetime(match.date_played),
+        "date_played_iso": match.date_played,
         "notes": match.notes,
+        "client_match_id": match.client_match_id,
         "deck1": deck1,
         "deck2": deck2,
-        "winner": serialize_deck(winner),
-        "first_player": serialize_deck(first_player),
+        "winner": winner_payload,
+        "first_player": first_player_payload,
         "deck1_version": serialize_deck_version_summary(match.deck1_version),
         "deck2_version": serialize_deck_version_summary(match.deck2_version),
         "deck1_name": deck1["name"] if deck1 else "Unknown deck",
@@ -156,6 +162,17 @@ def serialize_match(match):
     }
 
 
+def _match_deck(deck_id, participants):
+    if deck_id is None:
+        return None, None
+
+    if deck_id in participants:
+        return participants[deck_id]
+
+    deck = db.session.get(Deck, deck_id)
+    return deck, serialize_deck(deck)
+
+
 def serialize_card_printing(printing):
     if not printing:
         return None
@@ -171,22 +188,25 @@ def serialize_card_printing(printing):
         "product_url": printing.product_url,
         "source": printing.source,
         "external_id": printing.external_id,
-        "created_at": printing.created_at.isoformat() if printing.created_at else None,
-        "updated_at": printing.updated_at.isoformat() if printing.updated_at else None,
+        "created_at": printing.created_at,
+        "updated_at": printing.updated_at,
     }
 
 
-def serialize_card(card, include_printings=True):
+def serialize_card(card, include_printings=True, printings=None):
+    """
+    Serialize a card. Pass ``printings`` when they were already loaded (see
+    ``serialize_cards``) to avoid one printings query per card.
+    """
     if not card:
         return None
 
-    printings = []
+    if not include_printings:
+        printings = []
+    elif printings is None:
+        printings = card.printings.order_by(CardPrinting.id.asc()).all()
 
-    if include_printings:
-        printings = [
-            serialize_card_printing(printing)
-            for printing in card.printings.order_by(CardPrinting.id.asc()).all()
-        ]
+    printings = [serialize_card_printing(printing) for printing in printings]
 
     primary_printing = printings[0] if printings else None
 
@@ -208,11 +228,36 @@ def serialize_card(card, include_printings=True):
         "external_id": card.external_id,
         "primary_printing": primary_printing,
         "printings": printings,
-        "created_at": card.created_at.isoformat() if card.created_at else None,
-        "updated_at": card.updated_at.isoformat() if card.updated_at else None,
+        "created_at": card.created_at,
+        "updated_at": card.updated_at,
     }
 
 
+def serialize_cards(cards, include_printings=True):
+    """Serialize a list of cards, loading every printing in a single query."""
+    printings_by_card = {}
+
+    if include_printings and cards:
+        printings = (
+            CardPrinting.query
+            .filter(CardPrinting.card_id.in_([card.id for card in cards]))
+            .order_by(CardPrinting.card_id.asc(), CardPrinting.id.asc())
+            .all()
+        )
+
+        for printing in printings:
+            printings_by_card.setdefault(printing.card_id, []).append(printing)
+
+    return [
+        serialize_card(
+            card,
+            include_printings=include_printings,
+            printings=printings_by_card.get(card.id, []),
+        )
+        for card in cards
+    ]
+
+
 def serialize_deck_card(entry):
     if not entry:
         return None
@@ -227,8 +272,8 @@ def serialize_deck_card(entry):
         "sort_order": entry.sort_order,
         "card": serialize_card(entry.card, include_printings=False),
         "printing": serialize_card_printing(entry.printing),
-        "created_at": entry.created_at.isoformat() if entry.created_at else None,
-        "updated_at": entry.updated_at.isoformat() if entry.updated_at else None,
+        "created_at": entry.created_at,
+        "updated_at": entry.updated_at,
     }
 
 
@@ -237,22 +282,30 @@ def serialize_deck_version(version, include_cards=True):
         return None
 
     cards = []
+    # The stored summary; see ``backend/services/deck_summary.py``.
+    summary = version.summary or summarize_deck_cards([])
 
     if include_cards:
         cards = [
             serialize_deck_card(entry)
-            for entry in version.cards.order_by(
+            for entry in version.cards.options(
+                joinedload(DeckCard.card),
+                joinedload(DeckCard.printing),
+            ).order_by(
                 DeckCard.zone.asc(),
                 DeckCard.sort_order.asc(),
                 DeckCard.id.asc(),
             ).all()
         ]
-
-    totals_by_zone = {}
-
-    for entry in cards:
-        zone = entry["zone"]
-        totals_by_zone[zone] = totals_by_zone.get(zone, 0) + entry["quantity"]
+        summary = summarize_deck_cards(
+            (
+                entry["zone"],
+                entry["quantity"],
+                entry["card"]["grade"] if entry["card"] else None,
+                entry["card"]["nation"] if entry["card"] else None,
+            )
+            for entry in cards
+        )
 
     return {
         "id": version.id,
@@ -262,10 +315,11 @@ def serialize_deck_version(version, include_cards=True):
         "is_active": version.is_active,
         "deck": serialize_deck(version.deck),
         "cards": cards,
-        "card_count": sum(entry["quantity"] for entry in cards),
-        "unique_card_count": len(cards),
-        "totals_by_zone": totals_by_zone,
-        "deck_rules": _deck_rule_summary(cards, totals_by_zone),
-        "created_at": version.created_at.isoformat() if version.created_at else None,
-        "updated_at": version.updated_at.isoformat() if version.updated_at else None,
+        "card_count": summary["card_count"],
+        "unique_card_count": summary["unique_card_count"],
+        "totals_by_zone": summary["totals_by_zone"],
+        "grade_curve": summary["grade_curve"],
+        "deck_rules": _deck_rule_summary(summary),
+        "created_at": version.created_at,
+        "updated_at": version.updated_at,
     }
@@ -0,0 +1,449 @@
+"""
+Monte Carlo consistency checks for deck versions.
+
+Shuffles the main deck many times at once, as rows of a NumPy array, and
+plays out the opening turns of each shuffle:
+
+- Draw a five-card opening hand, then mulligan: keep the first non-trigger
+  card of each ride grade the ride deck does not cover, and redraw the
+  rest. With a full ride deck there is nothing to dig for and the hand is
+  kept.
+- Each turn, draw (not on the first player's first turn), then ride the
+  next grade from the ride deck or the hand. When neither has it, use grade
+  assist: look at the top five cards, take one of that grade if there is
+  one, and shuffle.
+- Attack with the vanguard (not on the first player's first turn) and
+  drive check once, or twice with a grade 3 vanguard.
+
+Hand size and discards are not tracked. A card counts as a trigger when it
+has a ``trigger_type`` or is a Trigger Unit.
+
+Opening-hand odds also have exact hypergeometric values, which are
+reported next to the simulated ones. Results are cached per process by a
+hash of what the simulation reads (grades, triggers, and ride deck grades),
+so repeat views and identical builds cost one deck-list query.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import Counter, OrderedDict
+from math import comb
+
+import numpy as np
+from flask import current_app
+
+from backend.database import db
+from backend.models import Card, DeckCard
+from backend.services.deck_builder import get_deck_version_or_raise
+
+
+OPENING_HAND = 5
+RIDE_GRADES = (1, 2, 3)
+ASSIST_LOOKAHEAD = 5
+GOING_ORDERS = ("first", "second")
+
+DEFAULT_TRIALS = 100_000
+MAX_TRIALS = 500_000
+DEFAULT_TURNS = 5
+MAX_TURNS = 8
+BATCH_SIZE = 25_000
+DENSITY_BINS = 100
+
+CACHE_SIZE = 128
+EXTENSION_KEY = "cardfight.simulation_cache"
+
+
+def _bounded_int(value, field_name: str, default: int | None, low: int, high: int) -> int | None:
+    if value in (None, ""):
+        return default
+
+    try:
+        parsed = int(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"{field_name} must be an integer.") from exc
+
+    if parsed < low or parsed > high:
+        raise ValueError(f"{field_name} must be between {low} and {high}.")
+
+    return parsed
+
+
+def trigger_name(card_type, trigger_type) -> str | None:
+    name = (trigger_type or "").strip()
+
+    if name:
+        return name.title()
+
+    return "Trigger" if card_type == "Trigger Unit" else None
+
+
+def deck_profile(version_id: int) -> dict:
+    """Grade and trigger counts for the main deck, plus the ride deck grades."""
+    rows = (
+        db.session.query(DeckCard.zone, DeckCard.quantity, Card.grade, Card.card_type, Card.trigger_type)
+        .join(Card, Card.id == DeckCard.card_id)
+        .filter(DeckCard.deck_version_id == version_id, DeckCard.zone.in_(("main", "ride")))
+        .all()
+    )
+
+    main = Counter()
+    ride_grades = set()
+
+    for zone, quantity, grade, card_type, trigger_type in rows:
+        if zone == "ride":
+            ride_grades.add(grade)
+        else:
+            main[(grade, trigger_name(card_type, trigger_type) or "")] += quantity
+
+    return {
+        "main": sorted([grade, trigger, count] for (grade, trigger), count in main.items()),
+        "ride_grades": sorted(grade for grade in ride_grades if grade in RIDE_GRADES),
+    }
+
+
+def content_hash(profile: dict) -> str:
+    return hashlib.sha256(json.dumps(profile, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class _ResultCache:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.results: OrderedDict = OrderedDict()
+
+
+def _cache() -> _ResultCache:
+    return current_app.extensions.setdefault(EXTENSION_KEY, _ResultCache())
+
+
+def _exact_at_least_one(total: int, copies: int, drawn: int) -> float:
+    return 1 - comb(total - copies, drawn) / comb(total, drawn)
+
+
+def _exact_all_of(total: int, copies: list[int], drawn: int) -> float:
+    """Chance that ``drawn`` cards include at least one of every group, by inclusion-exclusion."""
+    probability = 0.0
+
+    for mask in range(1 << len(copies)):
+        missing = sum(count for index, count in enumerate(copies) if mask >> index & 1)
+        sign = -1 if bin(mask).count("1") % 2 else 1
+        probability += sign * comb(total - missing, drawn) / comb(total, drawn)
+
+    return probability
+
+
+class _Totals:
+    """Running sums over every simulated batch."""
+
+    def __init__(self, turns: int, trigger_types: int):
+        self.trials = 0
+        self.opening_triggers = np.zeros(OPENING_HAND + 1, dtype=np.int64)
+        self.opening_grades = Counter()
+        self.opening_line = 0
+        self.mulligan_returned = 0
+        self.mulligan_grades = Counter()
+        self.mulligan_line = 0
+        self.ride = np.zeros(turns, dtype=np.int64)
+        self.ride_all = 0
+        self.assist_needed = np.zeros(turns, dtype=np.int64)
+        self.assist_hits = np.zeros(turns, dtype=np.int64)
+        self.drive_checks = np.zeros(turns, dtype=np.int64)
+        self.drive_triggers = np.zeros(turns, dtype=np.int64)
+        self.any_trigger = np.zeros(turns, dtype=np.int64)
+        self.drive_by_type = np.zeros((turns, trigger_types), dtype=np.int64)
+        self.density = np.zeros((turns, DENSITY_BINS + 1), dtype=np.int64)
+
+
+def _first_position(mask: np.ndarray) -> np.ndarray:
+    """Column of the first ``True`` in each row, or the row length if there is none."""
+    return np.where(mask.any(axis=1), mask.argmax(axis=1), mask.shape[1])
+
+
+def _shuffle_undrawn(rng, order: np.ndarray, rows: np.ndarray, top: np.ndarray):
+    """Shuffle each selected row from its ``top`` onward, leaving drawn cards in place."""
+    block = order[rows]
+    positions = np.arange(block.shape[1])
+    keys = np.where(positions < top[rows, None], positions - block.shape[1], rng.random(block.shape))
+    order[rows] = np.take_along_axis(block, keys.argsort(axis=1), axis=1)
+
+
+def _simulate_batch(rng, size, grades, trigger_codes, needed, ride_grades, turns, going_first, totals):
+    deck_size = len(grades)
+    is_trigger = trigger_codes >= 0
+    order = rng.permuted(np.tile(np.arange(deck_size), (size, 1)), axis=1)
+
+    hand_grades = grades[order[:, :OPENING_HAND]]
+    hand_triggers = is_trigger[order[:, :OPENING_HAND]]
+    totals.opening_triggers += np.bincount(hand_triggers.sum(axis=1), minlength=OPENING_HAND + 1)
+
+    keep = np.zeros(hand_grades.shape, dtype=bool)
+    line = np.ones(size, dtype=bool)
+
+    for grade in RIDE_GRADES:
+        has_grade = (hand_grades == grade).any(axis=1)
+        totals.opening_grades[grade] += int(has_grade.sum())
+
+        if grade in needed:
+            line &= has_grade
+            wanted = (hand_grades == grade) & ~hand_triggers
+            keep |= wanted & (np.cumsum(wanted, axis=1) == 1)
+
+    totals.opening_line += int(line.sum())
+
+    if needed:
+        # Swap each returned card with the next card of the deck, then
+        # shuffle the returned cards back into the rest.
+        returned = ~keep
+        rows, columns = np.nonzero(returned)
+        targets = OPENING_HAND + (np.cumsum(returned, axis=1) - 1)[rows, columns]
+        order[rows, columns], order[rows, targets] = order[rows, targets], order[rows, columns]
+        order[:, OPENING_HAND:] = rng.permuted(order[:, OPENING_HAND:], axis=1)
+        totals.mulligan_returned += int(returned.sum())
+
+    line = np.ones(size, dtype=bool)
+
+    for grade in RIDE_GRADES:
+        has_grade = (grades[order[:, :OPENING_HAND]] == grade).any(axis=1)
+        totals.mulligan_grades[grade] += int(has_grade.sum())
+
+        if grade in needed:
+            line &= has_grade
+
+    totals.mulligan_line += int(line.sum())
+
+    top = np.full(size, OPENING_HAND)
+    vanguard = np.zeros(size, dtype=np.int64)
+    rode_every_turn = np.ones(size, dtype=bool)
+    all_rows = np.arange(size)
+    trigger_total = int(is_trigger.sum())
+
+    for turn in range(1, turns + 1):
+        index = turn - 1
+        opening_turn = going_first and turn == 1
+
+        if not opening_turn:
+            top += 1
+
+        grade = turn if turn in RIDE_GRADES else None
+
+        if grade is not None:
+            if grade in ride_grades:
+                ridden = np.ones(size, dtype=bool)
+            else:
+                in_hand = _first_position(grades[order] == grade) < top
+                window = np.take_along_axis(order, top[:, None] + np.arange(ASSIST_LOOKAHEAD), axis=1)
+                found = grades[window] == grade
+                hits = ~in_hand & found.any(axis=1)
+
+                hit_rows = all_rows[hits]
+                positions = top[hits] + found[hits].argmax(axis=1)
+                order[hit_rows, positions], order[hit_rows, top[hits]] = (
+                    order[hit_rows, top[hits]],
+                    order[hit_rows, positions],
+                )
+                top[hits] += 1
+                _shuffle_undrawn(rng, order, hit_rows, top)
+
+                ridden = in_hand | hits
+                totals.assist_needed[index] += int((~in_hand).sum())
+                totals.assist_hits[index] += int(hits.sum())
+
+            vanguard[ridden] = grade
+            rode_every_turn &= ridden
+            totals.ride[index] += int(ridden.sum())
+
+        if opening_turn:
+            continue
+
+        seen = np.take_along_axis(np.cumsum(is_trigger[order], axis=1), (top - 1)[:, None], axis=1)[:, 0]
+        density = (trigger_total - seen) / (deck_size - top)
+        totals.density[index] += np.bincount(
+            np.rint(density * DENSITY_BINS).astype(np.int64), minlength=DENSITY_BINS + 1
+        )
+
+        drives = np.where(vanguard >= 3, 2, 1)
+        checked = trigger_codes[np.take_along_axis(order, top[:, None] + np.arange(2), axis=1)]
+        checked[drives == 1, 1] = -1
+        revealed = (checked >= 0).sum(axis=1)
+
+        totals.drive_checks[index] += int(drives.sum())
+        totals.drive_triggers[index] += int(revealed.sum())
+        totals.any_trigger[index] += int((revealed > 0).sum())
+        totals.drive_by_type[index] += np.bincount(checked[checked >= 0], minlength=totals.drive_by_type.shape[1])
+        top += drives
+
+    totals.ride_all += int(rode_every_turn.sum())
+    totals.trials += size
+
+
+def _density_summary(histogram: np.ndarray) -> dict | None:
+    count = histogram.sum()
+
+    if not count:
+        return None
+
+    values = np.arange(len(histogram)) / DENSITY_BINS
+    cumulative = np.cumsum(histogram) / count
+
+    return {
+        "mean": round(float((values * histogram).sum() / count), 4),
+        "p10": float(values[np.searchsorted(cumulative, 0.1)]),
+        "p90": float(values[np.searchsorted(cumulative, 0.9)]),
+    }
+
+
+def _rate(count, trials) -> float | None:
+    return round(float(count) / float(trials), 4) if trials else None
+
+
+def run_simulation(profile: dict, trials: int, turns: int, going: str, seed: int | None) -> dict:
+    """Simulate a deck profile (see ``deck_profile``); safe to run in a worker process."""
+    grades = []
+    trigger_names = sorted({trigger for _, trigger, _ in profile["main"] if trigger})
+    trigger_codes = []
+
+    for grade, trigger, count in profile["main"]:
+        grades.extend([grade] * count)
+        trigger_codes.extend([trigger_names.index(trigger) if trigger else -1] * count)
+
+    grades = np.array(grades, dtype=np.int64)
+    trigger_codes = np.array(trigger_codes, dtype=np.int64)
+    deck_size = len(grades)
+    needed_cards = OPENING_HAND + 4 * turns + ASSIST_LOOKAHEAD
+
+    if deck_size < needed_cards:
+        raise ValueError(
+            f"The main deck has {deck_size} cards; simulating {turns} turns needs at least {needed_cards}."
+        )
+
+    ride_grades = set(profile["ride_grades"])
+    needed = [grade for grade in RIDE_GRADES if grade not in ride_grades]
+    trigger_total = int((trigger_codes >= 0).sum())
+    grade_counts = {grade: int((grades == grade).sum()) for grade in RIDE_GRADES}
+
+    rng = np.random.default_rng(seed)
+    totals = _Totals(turns, len(trigger_names))
+
+    for start in range(0, trials, BATCH_SIZE):
+        _simulate_batch(
+            rng,
+            min(BATCH_SIZE, trials - start),
+            grades,
+            trigger_codes,
+            needed,
+            ride_grades,
+            turns,
+            going == "first",
+            totals,
+        )
+
+    return {
+        "parameters": {"trials": trials, "turns": turns, "going": going, "seed": seed},
+        "deck": {
+            "main_cards": deck_size,
+            "triggers": trigger_total,
+            "trigger_types": {
+                name: int((trigger_codes == code).sum()) for code, name in enumerate(trigger_names)
+            },
+            "grades": {str(grade): int(count) for grade, count in sorted(Counter(grades.tolist()).items())},
+            "ride_deck_grades": profile["ride_grades"],
+        },
+        "opening_hand": {
+            "triggers": [
+                {
+                    "count": count,
+                    "simulated": _rate(totals.opening_triggers[count], trials),
+                    "exact": round(
+                        comb(trigger_total, count)
+                        * comb(deck_size - trigger_total, OPENING_HAND - count)
+                        / comb(deck_size, OPENING_HAND),
+                        4,
+                    ),
+                }
+                for count in range(OPENING_HAND + 1)
+            ],
+            "grades": [
+                {
+                    "grade": grade,
+                    "simulated": _rate(totals.opening_grades[grade], trials),
+                    "exact": round(_exact_at_least_one(deck_size, grade_counts[grade], OPENING_HAND), 4),
+                }
+                for grade in RIDE_GRADES
+            ],
+            "ride_line": {
+                "grades": needed,
+                "simulated": _rate(totals.opening_line, trials),
+                "exact": round(
+                    _exact_all_of(deck_size, [grade_counts[grade] for grade in needed], OPENING_HAND), 4
+                ),
+            },
+        },
+        "after_mulligan": {
+            "cards_returned": round(totals.mulligan_returned / trials, 3),
+            "grades": [
+                {"grade": grade, "simulated": _rate(totals.mulligan_grades[grade], trials)}
+                for grade in RIDE_GRADES
+            ],
+            "ride_line": _rate(totals.mulligan_line, trials),
+        },
+        "turns": [
+            {
+                "turn": turn,
+                "ride_grade": turn if turn in RIDE_GRADES else None,
+                "ride_rate": _rate(totals.ride[index], trials) if turn in RIDE_GRADES else None,
+                "assist_rate": _rate(totals.assist_needed[index], trials) if turn in RIDE_GRADES else None,
+                "assist_hit_rate": _rate(totals.assist_hits[index], totals.assist_needed[index]),
+                "drive_checks": _rate(totals.drive_checks[index], trials),
+                "drive_triggers": _rate(totals.drive_triggers[index], trials),
+                "any_trigger": _rate(totals.any_trigger[index], trials),
+                "drive_triggers_by_type": {
+                    name: _rate(totals.drive_by_type[index, code], trials)
+                    for code, name in enumerate(trigger_names)
+                },
+                "deck_trigger_density": _density_summary(totals.density[index]),
+            }
+            for index, turn in enumerate(range(1, turns + 1))
+        ],
+        "ride_all_rate": _rate(totals.ride_all, trials),
+        "drive_trigger_rate": _rate(totals.drive_triggers.sum(), totals.drive_checks.sum()),
+        "exact_trigger_rate": round(trigger_total / deck_size, 4),
+    }
+
+
+def simulate_deck_version(version_id: int, trials=None, turns=None, going=None, seed=None) -> dict:
+    """Simulated and exact consistency numbers for one deck version, cached by content."""
+    trials = _bounded_int(trials, "trials", DEFAULT_TRIALS, 1_000, MAX_TRIALS)
+    turns = _bounded_int(turns, "turns", DEFAULT_TURNS, 1, MAX_TURNS)
+    seed = _bounded_int(seed, "seed", None, 0, 2**32 - 1)
+    going = going or "first"
+
+    if going not in GOING_ORDERS:
+        raise ValueError("going must be first or second.")
+
+    version = get_deck_version_or_raise(version_id)
+    profile = deck_profile(version.id)
+    digest = content_hash(profile)
+    key = (digest, trials, turns, going, seed)
+    cache = _cache()
+
+    with cache.lock:
+        result = cache.results.get(key)
+
+        if result is not None:
+            cache.results.move_to_end(key)
+
+    cached = result is not None
+
+    if not cached:
+        # Simulated outside the lock; two first views of one build both run it.
+        result = run_simulation(profile, trials, turns, going, seed)
+
+        with cache.lock:
+            cache.results[key] = result
+
+            while len(cache.results) > CACHE_SIZE:
+                cache.results.popitem(last=False)
+
+    return {"version_id": version.id, "content_hash": digest, "cached": cached, **result}
@@ -2,7 +2,8 @@
 Service functions for API stats.
 
 Important:
-- Match history is treated as the source of truth.
+- Match history is treated as the source of truth. Endpoints read derived
+  tables that match writes keep in step with it (see ``aggregates``).
 - Undecided matches are counted as logged games.
 - Undecided matches do not count as wins or losses.
 - Win percentage is based on decided games only.
@@ -10,56 +11,182 @@ Important:
 
 from __future__ import annotations
 
-from sqlalchemy import or_, case, func
+from dataclasses import dataclass, replace
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import aliased
 
 from backend.database import db
-from backend.models import Deck, Match
-from backend.services.serializers import serialize_deck
+from backend.models import (
+    Deck,
+    DeckDailyResult,
+    DeckTurnStat,
+    DeckVersion,
+    DeckVersionStat,
+    Match,
+    MatchupMonthStat,
+    now_central,
+)
+from backend.services.match_columns import FORMAT_CODES, FORMATS, MISSING, match_columns
+from backend.services.matches import match_query
+from backend.services.matchup_cube import month_start
+from backend.services.ratings import ensure_ratings_current
+from backend.services.serializers import serialize_deck, serialize_deck_version_summary, serialize_match
+from backend.services.strength import strength_fit
+from backend.services.version_stats import TURN_ORDERS
+
+
+VALID_STATS_FORMATS = (None, "", "Standard", "Stride", "Any")
+
+
+def _flag(value) -> bool:
+    return str(value or "").lower() in {"1", "true", "yes"}
+
+
+def _month(value, field_name: str) -> date | None:
+    if value in (None, ""):
+        return None
+
+    text = str(value)
+
+    try:
+        parsed = date.fromisoformat(f"{text}-01" if len(text) == 7 else text)
+    except ValueError as exc:
+        raise ValueError(f"{field_name} must be a month or date, e.g. 2026-06 or 2026-06-09.") from exc
+
+    return month_start(parsed)
+
+
+@dataclass(frozen=True)
+class CubeFilters:
+    """
+    A slice of the matchup cube.
+
+    ``since`` and ``until`` are whole months: a date selects the month it
+    falls in. ``active_only`` keeps only active decks on both sides.
+    """
+
+    format: str | None = None
+    since: date | None = None
+    until: date | None = None
+    active_only: bool = False
+
+    @classmethod
+    def parse(cls, fmt=None, since=None, until=None, active_only=None) -> "CubeFilters":
+        if fmt not in VALID_STATS_FORMATS:
+            raise ValueError("format must be Standard, Stride, or Any.")
+
+        filters = cls(
+            format=fmt or None,
+            since=_month(since, "since"),
+            until=_month(until, "until"),
+            active_only=_flag(active_only),
+        )
+
+        if filters.since and filters.until and filters.since > filters.until:
+            raise ValueError("since must not be after until.")
+
+        return filters
 
+    def apply(self, query, active_ids=None):
+        """Narrow a ``MatchupMonthStat`` query to this slice."""
+        if self.format:
+            query = query.filter(MatchupMonthStat.format == self.format)
+
+        if self.since:
+            query = query.filter(MatchupMonthStat.month >= self.since)
+
+        if self.until:
+            query = query.filter(MatchupMonthStat.month <= self.until)
+
+        if self.active_only:
+            query = query.filter(
+                MatchupMonthStat.deck_id.in_(active_ids),
+                MatchupMonthStat.opponent_deck_id.in_(active_ids),
+            )
 
-def stats_table() -> list[dict]:
-    decks = Deck.query.order_by(Deck.name).all()
-    matches = Match.query.all()
+        return query
 
-    stats_by_id = {
-        deck.id: {
-            "deck": deck,
-            "wins": 0,
-            "losses": 0,
-            "undecided": 0,
-            "logged_games": 0,
+    def apply_to_matches(self, query):
+        """The same slice over the match table, for listings of single matches."""
+        if self.format:
+            query = query.filter(Match.format == self.format)
+
+        if self.since:
+            query = query.filter(Match.date_played >= datetime.combine(self.since, time.min))
+
+        if self.until:
+            next_month = (self.until + timedelta(days=32)).replace(day=1)
+            query = query.filter(Match.date_played < datetime.combine(next_month, time.min))
+
+        return query
+
+    def to_dict(self) -> dict:
+        return {
+            "format": self.format,
+            "since": self.since.strftime("%Y-%m") if self.since else None,
+            "until": self.until.strftime("%Y-%m") if self.until else None,
+            "active_only": self.active_only,
         }
-        for deck in decks
+
+
+def _cube_totals(filters: CubeFilters, *group_by, active_ids=None, **where):
+    """Summed wins, losses, and undecided games per ``group_by`` key."""
+    query = select(
+        *group_by,
+        func.sum(MatchupMonthStat.wins),
+        func.sum(MatchupMonthStat.losses),
+        func.sum(MatchupMonthStat.undecided),
+    )
+
+    for column_name, value in where.items():
+        query = query.filter(getattr(MatchupMonthStat, column_name) == value)
+
+    # Plain rows rather than ORM query results: the matrix can sum one row
+    # per deck pair, and result-row overhead dominates there.
+    result = db.session.connection().execute(filters.apply(query, active_ids).group_by(*group_by))
+
+    return {
+        tuple(keys) if len(keys) > 1 else keys[0]: (int(wins), int(losses), int(undecided))
+        for *keys, wins, losses, undecided in result
     }
 
-    for match in matches:
-        if match.deck1_id not in stats_by_id or match.deck2_id not in stats_by_id:
-            continue
 
-        stats_by_id[match.deck1_id]["logged_games"] += 1
-        stats_by_id[match.deck2_id]["logged_games"] += 1
+def pair_totals(filters: CubeFilters, deck_ids) -> dict:
+    """Wins, losses, and undecided games per ordered ``(deck, opponent)`` pair within ``deck_ids``."""
+    # The active-only filter keeps both sides of each game in the given ids.
+    return _cube_totals(
+        replace(filters, active_only=True),
+        MatchupMonthStat.deck_id,
+        MatchupMonthStat.opponent_deck_id,
+        active_ids=list(deck_ids),
+    )
 
-        if match.winner_id is None:
-            stats_by_id[match.deck1_id]["undecided"] += 1
-            stats_by_id[match.deck2_id]["undecided"] += 1
-            continue
 
-        if match.winner_id == match.deck1_id:
-            stats_by_id[match.deck1_id]["wins"] += 1
-            stats_by_id[match.deck2_id]["losses"] += 1
-        elif match.winner_id == match.deck2_id:
-            stats_by_id[match.deck2_id]["wins"] += 1
-            stats_by_id[match.deck1_id]["losses"] += 1
+def stats_table(fmt=None, since=None, until=None, active_only=None) -> list[dict]:
+    filters = CubeFilters.parse(fmt, since, until, active_only)
+    ensure_ratings_current()
+
+    query = Deck.query.order_by(Deck.name)
+
+    if filters.active_only:
+        query = query.filter(Deck.active.is_(True))
+
+    decks = query.all()
+    totals = _cube_totals(
+        filters,
+        MatchupMonthStat.deck_id,
+        active_ids=[deck.id for deck in decks],
+    )
 
     rows = []
 
-    for values in stats_by_id.values():
-        deck = values["deck"]
-        wins = values["wins"]
-        losses = values["losses"]
-        undecided = values["undecided"]
-        logged_games = values["logged_games"]
+    for deck in decks:
+        wins, losses, undecided = totals.get(deck.id, (0, 0, 0))
         decided_games = wins + losses
+        logged_games = decided_games + undecided
         win_pct = (wins / decided_games) if decided_games else 0.0
 
         rows.append(
@@ -76,6 +203,8 @@ def stats_table() -> list[dict]:
                 "decided_games": decided_games,
                 "logged_games": logged_games,
                 "win_pct": round(win_pct, 3),
+                "rating": round(deck.rating, 1),
+                "rated_games": deck.rated_games,
                 "deck": serialize_deck(deck),
             }
         )
@@ -92,71 +221,30 @@ def stats_table() -> list[dict]:
     )
 
 
-def versus_for(deck_id: int):
-    subject = Deck.query.get_or_404(deck_id)
+def versus_for(deck_id: int, fmt=None, since=None, until=None, active_only=None):
+    filters = CubeFilters.parse(fmt, since, until, active_only)
+    subject = db.get_or_404(Deck, deck_id)
+    decks_by_id = {deck.id: deck for deck in Deck.query.all()}
+    active_ids = [deck.id for deck in decks_by_id.values() if deck.active]
 
-    base_query = Match.query.filter(
-        or_(
-            Match.deck1_id == deck_id,
-            Match.deck2_id == deck_id,
-        )
-    )
-
-    opponent_id = case(
-        (Match.deck1_id == deck_id, Match.deck2_id),
-        else_=Match.deck1_id,
-    ).label("opponent_id")
-
-    subject_win = case(
-        (Match.winner_id == deck_id, 1),
-        else_=0,
-    ).label("subject_win")
-
-    subject_loss = case(
-        (
-            (Match.winner_id.isnot(None)) & (Match.winner_id != deck_id),
-            1,
-        ),
-        else_=0,
-    ).label("subject_loss")
-
-    undecided = case(
-        (Match.winner_id.is_(None), 1),
-        else_=0,
-    ).label("undecided")
-
-    rows = (
-        db.session.query(
-            opponent_id,
-            func.count().label("logged_games"),
-            func.sum(subject_win).label("wins"),
-            func.sum(subject_loss).label("losses"),
-            func.sum(undecided).label("undecided"),
-        )
-        .filter(
-            or_(
-                Match.deck1_id == deck_id,
-                Match.deck2_id == deck_id,
-            )
-        )
-        .group_by(opponent_id)
-        .all()
+    totals = _cube_totals(
+        filters,
+        MatchupMonthStat.opponent_deck_id,
+        active_ids=active_ids,
+        deck_id=deck_id,
     )
 
     versus = []
     type_totals = {}
 
-    for row in rows:
-        opponent = Deck.query.get(row.opponent_id)
+    for opponent_id, (wins, losses, undecided_count) in totals.items():
+        opponent = decks_by_id.get(opponent_id)
 
         if not opponent:
             continue
 
-        wins = int(row.wins or 0)
-        losses = int(row.losses or 0)
-        undecided_count = int(row.undecided or 0)
-        logged_games = int(row.logged_games or 0)
         decided_games = wins + losses
+        logged_games = decided_games + undecided_count
         win_pct = (wins / decided_games) if decided_games else 0.0
 
         versus.append(
@@ -213,13 +301,28 @@ def versus_for(deck_id: int):
             }
         )
 
-    recent_matches = base_query.order_by(Match.date_played.desc()).limit(50).all()
+    recent_query = filters.apply_to_matches(
+        Match.query.filter(
+            or_(
+                Match.deck1_id == deck_id,
+                Match.deck2_id == deck_id,
+            )
+        )
+    )
+
+    if filters.active_only:
+        recent_query = recent_query.filter(
+            Match.deck1_id.in_(active_ids),
+            Match.deck2_id.in_(active_ids),
+        )
+
+    recent_matches = recent_query.order_by(Match.date_played.desc()).limit(50).all()
 
     recent_payload = []
 
     for match in recent_matches:
         opponent_id_value = match.deck2_id if match.deck1_id == deck_id else match.deck1_id
-        opponent = Deck.query.get(opponent_id_value)
+        opponent = decks_by_id.get(opponent_id_value)
 
         if match.winner_id == deck_id:
             result = "W"
@@ -232,7 +335,7 @@ def versus_for(deck_id: int):
             {
                 "match_id": match.id,
                 "id": match.id,
-                "date_played": match.date_played.isoformat() if match.date_played else None,
+                "date_played": match.date_played,
                 "opponent_id": opponent.id if opponent else opponent_id_value,
                 "opponent_name": opponent.name if opponent else f"#{opponent_id_value}",
                 "opponent_type": opponent.type if opponent else "",
@@ -244,6 +347,7 @@ def versus_for(deck_id: int):
 
     return {
         "deck": serialize_deck(subject),
+        "filters": filters.to_dict(),
         "versus": sorted(versus, key=lambda item: item["opponent_name"].lower()),
         "by_opponent_type": sorted(
             type_breakdown,
@@ -253,65 +357,24 @@ def versus_for(deck_id: int):
     }
 
 
-def matrix():
-    decks = Deck.query.order_by(Deck.id).all()
-    deck_ids = [deck.id for deck in decks]
-    deck_by_id = {deck.id: deck for deck in decks}
-
-    all_matches = Match.query.all()
-
-    wins = {
-        (deck_a, deck_b): 0
-        for deck_a in deck_ids
-        for deck_b in deck_ids
-        if deck_a != deck_b
-    }
-
-    losses = {
-        (deck_a, deck_b): 0
-        for deck_a in deck_ids
-        for deck_b in deck_ids
-        if deck_a != deck_b
-    }
-
-    logged_games = {
-        (deck_a, deck_b): 0
-        for deck_a in deck_ids
-        for deck_b in deck_ids
-        if deck_a != deck_b
-    }
-
-    undecided = {
-        (deck_a, deck_b): 0
-        for deck_a in deck_ids
-        for deck_b in deck_ids
-        if deck_a != deck_b
-    }
-
-    for match in all_matches:
-        deck1_id = match.deck1_id
-        deck2_id = match.deck2_id
+def matrix(fmt=None, since=None, until=None, active_only=None):
+    filters = CubeFilters.parse(fmt, since, until, active_only)
 
-        if deck1_id == deck2_id:
-            continue
-
-        if deck1_id not in deck_by_id or deck2_id not in deck_by_id:
-            continue
+    query = Deck.query.order_by(Deck.id)
 
-        logged_games[(deck1_id, deck2_id)] += 1
-        logged_games[(deck2_id, deck1_id)] += 1
+    if filters.active_only:
+        query = query.filter(Deck.active.is_(True))
 
-        if match.winner_id is None:
-            undecided[(deck1_id, deck2_id)] += 1
-            undecided[(deck2_id, deck1_id)] += 1
-            continue
+    decks = query.all()
+    deck_ids = [deck.id for deck in decks]
+    deck_by_id = {deck.id: deck for deck in decks}
 
-        if match.winner_id == deck1_id:
-            wins[(deck1_id, deck2_id)] += 1
-            losses[(deck2_id, deck1_id)] += 1
-        elif match.winner_id == deck2_id:
-            wins[(deck2_id, deck1_id)] += 1
-            losses[(deck1_id, deck2_id)] += 1
+    totals = _cube_totals(
+        filters,
+        MatchupMonthStat.deck_id,
+        MatchupMonthStat.opponent_deck_id,
+        active_ids=deck_ids,
+    )
 
     table = []
 
@@ -326,8 +389,7 @@ def matrix():
                 row[str(col_deck_id)] = None
                 continue
 
-            matchup_wins = wins[(row_deck_id, col_deck_id)]
-            matchup_losses = losses[(row_deck_id, col_deck_id)]
+            matchup_wins, matchup_losses, _ = totals.get((row_deck_id, col_deck_id), (0, 0, 0))
             decided_games = matchup_wins + matchup_losses
 
             row[str(col_deck_id)] = (
@@ -338,6 +400,10 @@ def matrix():
 
         table.append(row)
 
+    # Observed cells only exist for pairs that have played; the model fills
+    # every cell from the whole history, whatever the filters.
+    predicted = np.round(strength_fit().probabilities(deck_ids), 3)
+
     return {
         "decks": [
             {
@@ -348,5 +414,506 @@ def matrix():
             }
             for deck in decks
         ],
+        "filters": filters.to_dict(),
         "matrix": table,
-    }
\ No newline at end of file
+        "predicted": [
+            {
+                "deck_id": row_deck_id,
+                **{
+                    str(col_deck_id): None if row_deck_id == col_deck_id else float(predicted[row, col])
+                    for col, col_deck_id in enumerate(deck_ids)
+                },
+            }
+            for row, row_deck_id in enumerate(deck_ids)
+        ],
+    }
+
+DEFAULT_TREND_WINDOWS = (7, 30, 90)
+MAX_TREND_WINDOW = 365
+MAX_TREND_DAYS = 3650
+
+
+def _trend_windows(value) -> list[int]:
+    if value in (None, ""):
+        return list(DEFAULT_TREND_WINDOWS)
+
+    try:
+        windows = sorted({int(part) for part in str(value).split(",") if part.strip()})
+    except ValueError as exc:
+        raise ValueError("windows must be a comma-separated list of day counts.") from exc
+
+    if not windows or windows[0] < 1 or windows[-1] > MAX_TREND_WINDOW or len(windows) > 5:
+        raise ValueError(f"windows must list 1-5 day counts between 1 and {MAX_TREND_WINDOW}.")
+
+    return windows
+
+
+def _trend_days(value) -> int:
+    try:
+        days = int(value) if value not in (None, "") else 90
+    except ValueError as exc:
+        raise ValueError("days must be an integer.") from exc
+
+    if days < 1 or days > MAX_TREND_DAYS:
+        raise ValueError(f"days must be between 1 and {MAX_TREND_DAYS}.")
+
+    return days
+
+
+def _window_summary(wins: int, losses: int, undecided: int) -> dict:
+    decided_games = wins + losses
+
+    return {
+        "wins": wins,
+        "losses": losses,
+        "undecided": undecided,
+        "decided_games": decided_games,
+        "logged_games": decided_games + undecided,
+        "win_pct": round(wins / decided_games, 3) if decided_games else None,
+    }
+
+
+def deck_trends(deck_id: int, windows=None, days=None, fmt=None, opponent_type=None, until=None):
+    """
+    Daily results and trailing-window win rates for one deck.
+
+    Reads ``deck_daily_result`` through its ``(deck_id, day, ...)`` primary
+    key, so the cost depends on the requested range, not on history size.
+    Rolling win rates are ``None`` while a window has no decided games.
+    """
+    subject = db.get_or_404(Deck, deck_id)
+    windows = _trend_windows(windows)
+    days = _trend_days(days)
+
+    if fmt not in (None, "", "Standard", "Stride", "Any"):
+        raise ValueError("format must be Standard, Stride, or Any.")
+
+    if opponent_type not in (None, "", "Standard", "Stride"):
+        raise ValueError("opponent_type must be Standard or Stride.")
+
+    try:
+        end = date.fromisoformat(until) if until else now_central().date()
+    except ValueError as exc:
+        raise ValueError("until must be a date, e.g. 2026-06-09.") from exc
+
+    start = end - timedelta(days=days - 1)
+    lookback_start = start - timedelta(days=windows[-1] - 1)
+
+    query = (
+        db.session.query(
+            DeckDailyResult.day,
+            func.sum(DeckDailyResult.wins).label("wins"),
+            func.sum(DeckDailyResult.losses).label("losses"),
+            func.sum(DeckDailyResult.undecided).label("undecided"),
+        )
+        .filter(
+            DeckDailyResult.deck_id == deck_id,
+            DeckDailyResult.day >= lookback_start,
+            DeckDailyResult.day <= end,
+        )
+        .group_by(DeckDailyResult.day)
+    )
+
+    if fmt:
+        query = query.filter(DeckDailyResult.format == fmt)
+
+    if opponent_type:
+        query = query.filter(DeckDailyResult.opponent_type == opponent_type)
+
+    span = (end - lookback_start).days + 1
+    daily = [(0, 0, 0)] * span
+
+    for row in query:
+        daily[(row.day - lookback_start).days] = (int(row.wins), int(row.losses), int(row.undecided))
+
+    # Prefix sums make every trailing window a subtraction.
+    prefix = [(0, 0, 0)]
+
+    for wins, losses, undecided in daily:
+        last = prefix[-1]
+        prefix.append((last[0] + wins, last[1] + losses, last[2] + undecided))
+
+    def window_totals(index: int, window: int):
+        upper = prefix[index + 1]
+        lower = prefix[max(0, index + 1 - window)]
+        return upper[0] - lower[0], upper[1] - lower[1], upper[2] - lower[2]
+
+    offset = (start - lookback_start).days
+    series = []
+
+    for index in range(offset, span):
+        wins, losses, undecided = daily[index]
+        rolling = {}
+
+        for window in windows:
+            window_wins, window_losses, _ = window_totals(index, window)
+            decided_games = window_wins + window_losses
+            rolling[str(window)] = round(window_wins / decided_games, 3) if decided_games else None
+
+        series.append(
+            {
+                "day": lookback_start + timedelta(days=index),
+                "wins": wins,
+                "losses": losses,
+                "undecided": undecided,
+                "rolling_win_pct": rolling,
+            }
+        )
+
+    return {
+        "deck": serialize_deck(subject),
+        "since": start,
+        "until": end,
+        "windows": windows,
+        "filters": {"format": fmt or None, "opponent_type": opponent_type or None},
+        "summary": {
+            str(window): _window_summary(*window_totals(span - 1, window))
+            for window in windows
+        },
+        "series": series,
+    }
+
+
+def _version_ids(value) -> list[int] | None:
+    if value in (None, ""):
+        return None
+
+    try:
+        return sorted({int(part) for part in str(value).split(",") if part.strip()})
+    except ValueError as exc:
+        raise ValueError("version_ids must be a comma-separated list of version ids.") from exc
+
+
+def version_comparison(deck_id: int, version_ids=None):
+    """
+    Side-by-side results for the versions of one deck.
+
+    Reads ``deck_version_stat`` by version id, so the match table is never
+    scanned. Each version gets its overall record, a first/second player
+    split, and a record against every opponent it has faced. Matches that
+    did not record a version are not counted.
+    """
+    wanted = _version_ids(version_ids)
+    ensure_ratings_current()
+    subject = db.get_or_404(Deck, deck_id)
+
+    query = DeckVersion.query.filter(DeckVersion.deck_id == deck_id)
+
+    if wanted is not None:
+        query = query.filter(DeckVersion.id.in_(wanted))
+
+    versions = query.order_by(DeckVersion.created_at.asc(), DeckVersion.id.asc()).all()
+
+    if wanted is not None and len(versions) != len(wanted):
+        raise ValueError("version_ids must belong to this deck.")
+
+    totals = {version.id: [0, 0, 0] for version in versions}
+    turn_orders = {version.id: {order: [0, 0, 0] for order in TURN_ORDERS} for version in versions}
+    by_opponent = {}
+
+    rows = (
+        DeckVersionStat.query.filter(DeckVersionStat.version_id.in_(list(totals))).all()
+        if totals
+        else []
+    )
+
+    for row in rows:
+        counts = (row.wins, row.losses, row.undecided)
+
+        for target in (
+            totals[row.version_id],
+            turn_orders[row.version_id][row.turn_order],
+            by_opponent.setdefault(row.opponent_deck_id, {}).setdefault(row.version_id, [0, 0, 0]),
+        ):
+            for index, value in enumerate(counts):
+                target[index] += value
+
+    opponents = (
+        Deck.query.filter(Deck.id.in_(list(by_opponent))).order_by(Deck.name.asc()).all()
+        if by_opponent
+        else []
+    )
+
+    return {
+        "deck": serialize_deck(subject),
+        "versions": [
+            {
+                **serialize_deck_version_summary(version),
+                "rating": round(version.rating, 1),
+                "rated_games": version.rated_games,
+                "record": _window_summary(*totals[version.id]),
+                "turn_order": {
+                    order: _window_summary(*counts)
+                    for order, counts in turn_orders[version.id].items()
+                },
+            }
+            for version in versions
+        ],
+        "opponents": [
+            {
+                "opponent_id": opponent.id,
+                "opponent_name": opponent.name,
+                "opponent_type": opponent.type,
+                "by_version": {
+                    str(version_id): _window_summary(*counts)
+                    for version_id, counts in by_opponent[opponent.id].items()
+                },
+            }
+            for opponent in opponents
+        ],
+    }
+
+
+def _optional_id(value, field_name: str) -> int | None:
+    if value in (None, ""):
+        return None
+
+    try:
+        return int(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"{field_name} must be an integer.") from exc
+
+
+def _turn_split(first: tuple, second: tuple) -> dict:
+    first_summary = _window_summary(*first)
+    second_summary = _window_summary(*second)
+    advantage = None
+
+    if first_summary["win_pct"] is not None and second_summary["win_pct"] is not None:
+        advantage = round(first_summary["win_pct"] - second_summary["win_pct"], 3)
+
+    return {"first": first_summary, "second": second_summary, "advantage": advantage}
+
+
+def turn_order_breakdown(deck_id=None, opponent_id=None, fmt=None, opponent_type=None, active_only=False):
+    """
+    First- and second-player results per deck, per format, and per matchup.
+
+    Groups ``deck_turn_stat`` in SQL, so the cost follows the number of
+    deck pairs that have met, not match history; a ``deck_id`` filter reads
+    only that deck's primary-key range. Matchups are listed for the
+    filtered deck only. ``advantage`` is the first-player win rate minus
+    the second-player win rate, or ``None`` when either side has no
+    decided games.
+    """
+    deck_id = _optional_id(deck_id, "deck_id")
+    opponent_id = _optional_id(opponent_id, "opponent_id")
+    active_only = _flag(active_only)
+
+    if fmt not in (None, "", "Standard", "Stride", "Any"):
+        raise ValueError("format must be Standard, Stride, or Any.")
+
+    if opponent_type not in (None, "", "Standard", "Stride"):
+        raise ValueError("opponent_type must be Standard or Stride.")
+
+    if deck_id is not None:
+        db.get_or_404(Deck, deck_id)
+
+    if opponent_id is not None:
+        db.get_or_404(Deck, opponent_id)
+
+    decks_by_id = {deck.id: deck for deck in Deck.query.all()}
+    opponent = aliased(Deck)
+
+    def grouped(key_column):
+        query = db.session.query(
+            key_column,
+            DeckTurnStat.format,
+            DeckTurnStat.turn_order,
+            func.sum(DeckTurnStat.wins),
+            func.sum(DeckTurnStat.losses),
+            func.sum(DeckTurnStat.undecided),
+        ).group_by(key_column, DeckTurnStat.format, DeckTurnStat.turn_order)
+
+        if deck_id is not None:
+            query = query.filter(DeckTurnStat.deck_id == deck_id)
+
+        if opponent_id is not None:
+            query = query.filter(DeckTurnStat.opponent_deck_id == opponent_id)
+
+        if fmt:
+            query = query.filter(DeckTurnStat.format == fmt)
+
+        if opponent_type or active_only:
+            query = query.join(opponent, opponent.id == DeckTurnStat.opponent_deck_id)
+
+        if opponent_type:
+            query = query.filter(opponent.type == opponent_type)
+
+        if active_only:
+            query = query.filter(
+                opponent.active.is_(True),
+                DeckTurnStat.deck_id.in_([deck.id for deck in decks_by_id.values() if deck.active]),
+            )
+
+        return query.all()
+
+    def add(splits, key, order, counts):
+        split = splits.setdefault(key, {"first": [0, 0, 0], "second": [0, 0, 0]})
+
+        for index, value in enumerate(counts):
+            split[order][index] += int(value)
+
+    by_deck = {}
+    by_format = {}
+
+    # One pass grouped by deck and format answers both breakdowns.
+    for key, row_format, order, *counts in grouped(DeckTurnStat.deck_id):
+        add(by_deck, key, order, counts)
+        add(by_format, row_format, order, counts)
+
+    by_opponent = {}
+
+    if deck_id is not None:
+        for key, _, order, *counts in grouped(DeckTurnStat.opponent_deck_id):
+            add(by_opponent, key, order, counts)
+
+    # Every match adds one "first" row and one "second" row, so the first
+    # rows alone count each game exactly once from the first player's side.
+    overall = [0, 0, 0]
+    for split in by_format.values():
+        for index, value in enumerate(split["first"]):
+            overall[index] += value
+
+    def deck_rows(splits, prefix):
+        rows = [
+            {
+                f"{prefix}_id": key,
+                f"{prefix}_name": decks_by_id[key].name,
+                f"{prefix}_type": decks_by_id[key].type,
+                **_turn_split(**split),
+            }
+            for key, split in splits.items()
+            if key in decks_by_id
+        ]
+        return sorted(rows, key=lambda row: row[f"{prefix}_name"].lower())
+
+    return {
+        "filters": {
+            "deck_id": deck_id,
+            "opponent_id": opponent_id,
+            "format": fmt or None,
+            "opponent_type": opponent_type or None,
+            "active_only": active_only,
+        },
+        "overall": _window_summary(*overall),
+        "decks": deck_rows(by_deck, "deck"),
+        "formats": sorted(
+            ({"format": key or None, **_turn_split(**split)} for key, split in by_format.items()),
+            key=lambda row: row["format"] or "",
+        ),
+        "matchups": deck_rows(by_opponent, "opponent"),
+    }
+
+
+DEFAULT_RIVALRY_LIMIT = 200
+MAX_RIVALRY_LIMIT = 1000
+
+
+def _positive_int(value, field_name: str, default: int, maximum: int) -> int:
+    if value in (None, ""):
+        return default
+
+    try:
+        parsed = int(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"{field_name} must be an integer.") from exc
+
+    if parsed < 1 or parsed > maximum:
+        raise ValueError(f"{field_name} must be between 1 and {maximum}.")
+
+    return parsed
+
+
+def rivalries(fmt=None, min_games=None, limit=None) -> dict:
+    """
+    Head-to-head records for every pair of decks that has met.
+
+    Counted over the in-memory match columns: pairs are keyed by their
+    lower and higher deck id and tallied with ``bincount``. Pairs are ranked
+    by games played, then by their latest match, which is loaded in full.
+    """
+    if fmt not in VALID_STATS_FORMATS:
+        raise ValueError("format must be Standard, Stride, or Any.")
+
+    min_games = _positive_int(min_games, "min_games", 1, MAX_RIVALRY_LIMIT)
+    limit = _positive_int(limit, "limit", DEFAULT_RIVALRY_LIMIT, MAX_RIVALRY_LIMIT)
+
+    columns = match_columns()
+    match_ids = columns.column("id")
+    deck1 = columns.column("deck1_id")
+    deck2 = columns.column("deck2_id")
+    winner = columns.column("winner_id")
+    formats = columns.column("format")
+    played_at = columns.column("played_at")
+
+    if fmt:
+        selected = formats == FORMAT_CODES[fmt]
+        match_ids, deck1, deck2, winner, formats, played_at = (
+            column[selected] for column in (match_ids, deck1, deck2, winner, formats, played_at)
+        )
+
+    low = np.minimum(deck1, deck2)
+    high = np.maximum(deck1, deck2)
+    # One integer key per pair; a 1-D ``unique`` is much faster than one over rows.
+    stride = int(high.max(initial=0)) + 1
+    pair_keys, pair_index = np.unique(low * stride + high, return_inverse=True)
+    pair_count = len(pair_keys)
+
+    totals = np.bincount(pair_index, minlength=pair_count)
+    low_wins = np.bincount(pair_index[winner == low], minlength=pair_count)
+    high_wins = np.bincount(pair_index[winner == high], minlength=pair_count)
+    undecided = np.bincount(pair_index[winner == MISSING], minlength=pair_count)
+
+    played_formats = np.zeros((pair_count, len(FORMATS)), dtype=bool)
+    played_formats[pair_index, formats] = True
+
+    # Sorted by pair, then date, then id: each pair's last row is its latest match.
+    order = np.lexsort((match_ids, played_at, pair_index))
+    last_rows = order[np.flatnonzero(np.diff(pair_index[order], append=pair_count))]
+    last_match_ids = match_ids[last_rows]
+    last_played = played_at[last_rows]
+
+    qualifying = np.flatnonzero(totals >= min_games)
+    ranked = qualifying[np.lexsort((-last_played[qualifying], -totals[qualifying]))][:limit]
+
+    last_matches = {
+        match.id: match
+        for match in match_query().filter(Match.id.in_([int(last_match_ids[pair]) for pair in ranked])).all()
+    }
+
+    rows = []
+
+    for pair in ranked:
+        match = last_matches[int(last_match_ids[pair])]
+        last_match = serialize_match(match)
+        deck_a, deck_b = (
+            (last_match["deck1"], last_match["deck2"])
+            if match.deck1_id == pair_keys[pair] // stride
+            else (last_match["deck2"], last_match["deck1"])
+        )
+
+        rows.append(
+            {
+                "deck_a": deck_a,
+                "deck_b": deck_b,
+                "deck_a_wins": int(low_wins[pair]),
+                "deck_b_wins": int(high_wins[pair]),
+                "undecided": int(undecided[pair]),
+                "decided": int(totals[pair] - undecided[pair]),
+                "total": int(totals[pair]),
+                "formats": [FORMATS[code] for code in np.flatnonzero(played_formats[pair]) if FORMATS[code]],
+                "last_played": last_match["date_played_iso"],
+                "last_match": last_match,
+            }
+        )
+
+    return {
+        "filters": {"format": fmt or None, "min_games": min_games, "limit": limit},
+        "summary": {
+            "pairings": pair_count,
+            "qualifying": len(qualifying),
+            "logged_matches": len(match_ids),
+        },
+        "rivalries": rows,
+    }
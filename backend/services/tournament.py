@@ -0,0 +1,308 @@
+"""
+Monte Carlo odds for a field of decks through a tournament bracket.
+
+Each pairing's win probability comes from the matchup cube (the numbers
+behind ``stats.matrix``), smoothed toward the Bradley-Terry prediction
+(``strength``):
+
+    p = (wins + prior_games * predicted) / (decided_games + prior_games)
+
+so a pairing with few games leans on the model, and one with no games
+uses it outright. Best-of-three or best-of-five series turn a game
+probability into a series probability before the bracket is played.
+
+Brackets:
+
+- ``single_elimination``: a random draw each trial, with byes to fill the
+  bracket to a power of two.
+- ``swiss``: ``rounds`` rounds paired by record (random order within a
+  record, a bye win for the odd deck out; rematches are not avoided),
+  then a seeded single-elimination ``top_cut``. Ties in the standings are
+  broken at random. Without a cut the top standing wins the event.
+
+Trials run as rows of NumPy arrays in fixed-size chunks with independent
+seeds, so a seeded run gives the same answer inline or in the simulation
+pool; large fields go to the pool (see ``workers``).
+"""
+
+from __future__ import annotations
+
+from itertools import repeat
+from math import ceil, comb, log2
+
+import numpy as np
+
+from backend.models import Deck
+from backend.services.ratings import ensure_ratings_current
+from backend.services.simulation import _bounded_int
+from backend.services.stats import CubeFilters, pair_totals
+from backend.services.strength import strength_fit
+from backend.services.workers import map_tasks
+
+
+BRACKETS = ("single_elimination", "swiss")
+SERIES_LENGTHS = (1, 3, 5)
+
+MIN_FIELD = 2
+MAX_FIELD = 256
+DEFAULT_TRIALS = 20_000
+MAX_TRIALS = 200_000
+CHUNK_TRIALS = 10_000
+MAX_SWISS_ROUNDS = 15
+DEFAULT_PRIOR_GAMES = 4.0
+MAX_PRIOR_GAMES = 100.0
+
+# Below this many deck-trials, starting work in the pool costs more than it saves.
+PARALLEL_MIN_WORK = 2_000_000
+
+
+def _deck_ids(value) -> list[int]:
+    if not isinstance(value, list):
+        raise ValueError("deck_ids must be a list.")
+
+    try:
+        deck_ids = list(dict.fromkeys(int(deck_id) for deck_id in value))
+    except (TypeError, ValueError) as exc:
+        raise ValueError("deck_ids must be integers.") from exc
+
+    if not MIN_FIELD <= len(deck_ids) <= MAX_FIELD:
+        raise ValueError(f"A field needs between {MIN_FIELD} and {MAX_FIELD} different decks.")
+
+    return deck_ids
+
+
+def _prior_games(value) -> float:
+    if value in (None, ""):
+        return DEFAULT_PRIOR_GAMES
+
+    try:
+        prior = float(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("prior_games must be a number.") from exc
+
+    if not 0 <= prior <= MAX_PRIOR_GAMES:
+        raise ValueError(f"prior_games must be between 0 and {MAX_PRIOR_GAMES:g}.")
+
+    return prior
+
+
+def series_probability(game_probability, best_of: int):
+    """Chance to win a best-of-``best_of`` series, game by game independent."""
+    needed = best_of // 2 + 1
+    loss_probability = 1 - game_probability
+
+    return sum(
+        comb(best_of, wins) * game_probability**wins * loss_probability ** (best_of - wins)
+        for wins in range(needed, best_of + 1)
+    )
+
+
+def _win_probabilities(decks: list[Deck], filters: CubeFilters, prior_games: float) -> tuple[np.ndarray, np.ndarray]:
+    """Smoothed game win probabilities, row deck over column deck, and the decided games behind them."""
+    index = {deck.id: position for position, deck in enumerate(decks)}
+    wins = np.zeros((len(decks), len(decks)))
+    losses = np.zeros_like(wins)
+
+    for (deck_id, opponent_id), (pair_wins, pair_losses, _) in pair_totals(filters, index).items():
+        wins[index[deck_id], index[opponent_id]] = pair_wins
+        losses[index[deck_id], index[opponent_id]] = pair_losses
+
+    expected = strength_fit().probabilities(list(index))
+    decided = wins + losses
+
+    with np.errstate(invalid="ignore"):
+        probabilities = np.where(
+            decided + prior_games > 0,
+            (wins + prior_games * expected) / (decided + prior_games),
+            expected,
+        )
+
+    np.fill_diagonal(probabilities, 0.5)
+    return probabilities, decided
+
+
+def _bracket_order(size: int) -> np.ndarray:
+    """Seed positions for a bracket, so seed 1 meets seed ``size`` first and seeds 1 and 2 only in the final."""
+    order = [0]
+
+    while len(order) < size:
+        order = [seed for top in order for seed in (top, 2 * len(order) - 1 - top)]
+
+    return np.array(order)
+
+
+def _knockout(rng, probabilities, slots, reached):
+    """Play out a bracket; ``slots`` pairs columns 0-1, 2-3, ... and may hold the bye index."""
+    field = probabilities.shape[0] - 1
+
+    while slots.shape[1] > 1:
+        first, second = slots[:, 0::2], slots[:, 1::2]
+        first_wins = rng.random(first.shape) < probabilities[first, second]
+        slots = np.where(first_wins, first, second)
+        reached[slots.shape[1]] = reached.get(slots.shape[1], 0) + np.bincount(
+            slots.ravel(), minlength=field + 1
+        )[:field]
+
+
+def simulate_tournament(probabilities, bracket: str, rounds: int, top_cut: int, trials: int, seed) -> dict:
+    """
+    Count outcomes over ``trials`` events; safe to run in a worker process.
+
+    ``probabilities`` holds series win probabilities for the field plus a
+    final row and column for a bye, which always loses.
+    """
+    rng = np.random.default_rng(seed)
+    field = probabilities.shape[0] - 1
+    rows = np.arange(trials)[:, None]
+    counts = {"reached": {}, "swiss_wins": np.zeros(field, dtype=np.int64), "top_cut": np.zeros(field, dtype=np.int64)}
+
+    if bracket == "single_elimination":
+        size = 1 << ceil(log2(field))
+        byes = size - field
+        draw = rng.permuted(np.tile(np.arange(field), (trials, 1)), axis=1)
+        slots = np.full((trials, size), field)
+        # Each bye sits opposite a real deck, so no first round pairs two byes.
+        slots[:, 0 : 2 * byes : 2] = draw[:, :byes]
+        slots[:, 2 * byes :] = draw[:, byes:]
+    else:
+        points = np.zeros((trials, field), dtype=np.int64)
+
+        for _ in range(rounds):
+            standings = np.argsort(-(points + rng.random(points.shape)), axis=1)
+            paired = standings[:, : field - field % 2]
+            first, second = paired[:, 0::2], paired[:, 1::2]
+            first_wins = rng.random(first.shape) < probabilities[first, second]
+            points[rows, first] += first_wins
+            points[rows, second] += ~first_wins
+
+            if field % 2:
+                points[rows[:, 0], standings[:, -1]] += 1
+
+        counts["swiss_wins"] = points.sum(axis=0)
+        standings = np.argsort(-(points + rng.random(points.shape)), axis=1)
+        cut = top_cut or 1
+        counts["top_cut"] = np.bincount(standings[:, :cut].ravel(), minlength=field)
+        slots = standings[:, _bracket_order(cut)]
+
+    if slots.shape[1] == 1:
+        counts["reached"][1] = np.bincount(slots.ravel(), minlength=field)
+    else:
+        _knockout(rng, probabilities, slots, counts["reached"])
+
+    return counts
+
+
+def _merge(chunks: list[dict]) -> dict:
+    total = {"reached": {}, "swiss_wins": 0, "top_cut": 0}
+
+    for counts in chunks:
+        total["swiss_wins"] = total["swiss_wins"] + counts["swiss_wins"]
+        total["top_cut"] = total["top_cut"] + counts["top_cut"]
+
+        for size, reached in counts["reached"].items():
+            total["reached"][size] = total["reached"].get(size, 0) + reached
+
+    return total
+
+
+def tournament_odds(payload) -> dict:
+    """Per-deck odds to advance through a bracket, from smoothed matchup probabilities."""
+    if not isinstance(payload, dict):
+        raise ValueError("Request body must be a JSON object")
+
+    deck_ids = _deck_ids(payload.get("deck_ids"))
+    field = len(deck_ids)
+    bracket = payload.get("bracket") or "single_elimination"
+
+    if bracket not in BRACKETS:
+        raise ValueError("bracket must be single_elimination or swiss.")
+
+    best_of = _bounded_int(payload.get("best_of"), "best_of", 1, 1, max(SERIES_LENGTHS))
+
+    if best_of not in SERIES_LENGTHS:
+        raise ValueError("best_of must be 1, 3, or 5.")
+
+    rounds = top_cut = 0
+
+    if bracket == "swiss":
+        rounds = _bounded_int(
+            payload.get("rounds"), "rounds", min(ceil(log2(field)), MAX_SWISS_ROUNDS), 1, MAX_SWISS_ROUNDS
+        )
+        top_cut = _bounded_int(payload.get("top_cut"), "top_cut", 0, 0, field)
+
+        if top_cut and (top_cut < 2 or top_cut & (top_cut - 1)):
+            raise ValueError("top_cut must be 0 or a power of two no larger than the field.")
+
+    trials = _bounded_int(payload.get("trials"), "trials", DEFAULT_TRIALS, 1_000, MAX_TRIALS)
+    seed = _bounded_int(payload.get("seed"), "seed", None, 0, 2**32 - 1)
+    prior_games = _prior_games(payload.get("prior_games"))
+    filters = CubeFilters.parse(payload.get("format"), payload.get("since"), payload.get("until"))
+
+    ensure_ratings_current()
+    decks_by_id = {deck.id: deck for deck in Deck.query.filter(Deck.id.in_(deck_ids))}
+    missing = [deck_id for deck_id in deck_ids if deck_id not in decks_by_id]
+
+    if missing:
+        raise LookupError(f"Deck {missing[0]} not found")
+
+    decks = [decks_by_id[deck_id] for deck_id in deck_ids]
+    game_probabilities, decided = _win_probabilities(decks, filters, prior_games)
+
+    # One extra row and column for a bye, which every deck beats.
+    probabilities = np.zeros((field + 1, field + 1))
+    probabilities[:field, :field] = series_probability(game_probabilities, best_of)
+    probabilities[:field, field] = 1.0
+    probabilities[field, field] = 0.5
+
+    sizes = [min(CHUNK_TRIALS, trials - start) for start in range(0, trials, CHUNK_TRIALS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    run = map_tasks if trials * field >= PARALLEL_MIN_WORK else lambda *args: list(map(*args))
+    totals = _merge(
+        run(simulate_tournament, repeat(probabilities), repeat(bracket), repeat(rounds), repeat(top_cut), sizes, seeds)
+    )
+
+    rows = []
+
+    for position, deck in enumerate(decks):
+        row = {
+            "deck_id": deck.id,
+            "deck_name": deck.name,
+            "rating": round(deck.rating, 1),
+            "decided_games_in_field": int(decided[position].sum()),
+            "reached": {
+                str(size): round(float(totals["reached"][size][position]) / trials, 4)
+                for size in sorted(totals["reached"], reverse=True)
+                if size > 1
+            },
+            "champion": round(float(totals["reached"][1][position]) / trials, 4),
+        }
+
+        if bracket == "swiss":
+            row["expected_wins"] = round(float(totals["swiss_wins"][position]) / trials, 3)
+            row["top_cut"] = round(float(totals["top_cut"][position]) / trials, 4) if top_cut else None
+
+        rows.append(row)
+
+    rows.sort(key=lambda row: (-row["champion"], row["deck_name"].lower()))
+
+    return {
+        "parameters": {
+            "deck_ids": deck_ids,
+            "bracket": bracket,
+            "rounds": rounds or None,
+            "top_cut": top_cut or None,
+            "best_of": best_of,
+            "trials": trials,
+            "seed": seed,
+            "prior_games": prior_games,
+        },
+        "filters": filters.to_dict(),
+        "decks": rows,
+        "matrix": [
+            {
+                "deck_id": deck.id,
+                **{str(other.id): round(float(game_probabilities[row, column]), 3) for column, other in enumerate(decks)},
+            }
+            for row, deck in enumerate(decks)
+        ],
+    }
@@ -0,0 +1,63 @@
+"""
+Per-deck results by turn order, kept in step with match writes.
+
+``deck_turn_stat`` has one row per deck, opponent deck, format, and turn
+order. Every match with a recorded first player touches two rows: the
+first player's ``first`` row and the other deck's ``second`` row.
+``count_turn_order_results`` adds a match write's changes to those rows,
+and ``rebuild_turn_order_stats`` recomputes the table from match history.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import func, select
+
+from backend.models import Deck, DeckTurnStat, Match
+from backend.services.aggregates import CounterTable, rebuild_result_counts, result_column
+
+
+TURN_RESULTS = CounterTable(DeckTurnStat)
+
+
+def _sides(deck1_id, deck2_id, first_player_id):
+    if first_player_id == deck1_id:
+        return ((deck1_id, deck2_id, "first"), (deck2_id, deck1_id, "second"))
+
+    if first_player_id == deck2_id:
+        return ((deck2_id, deck1_id, "first"), (deck1_id, deck2_id, "second"))
+
+    return ()
+
+
+def count_turn_order_results(facts, sign: int, counters):
+    """Add (sign=1) or remove (sign=-1) one match from both decks' rows."""
+    fmt = facts.format or ""
+
+    for deck_id, opponent_id, order in _sides(facts.deck1_id, facts.deck2_id, facts.first_player_id):
+        counters.add_result(TURN_RESULTS, (deck_id, opponent_id, fmt, order), facts.winner_id, deck_id, opponent_id, sign)
+
+
+def rebuild_turn_order_stats(connection):
+    """Recreate every turn-order row from matches that recorded a first player."""
+    deck_ids = set(connection.scalars(select(Deck.id)))
+    statement = select(
+        Match.deck1_id,
+        Match.deck2_id,
+        Match.winner_id,
+        Match.first_player_id,
+        func.coalesce(Match.format, ""),
+    ).where(Match.first_player_id.isnot(None))
+
+    def cells(row):
+        deck1_id, deck2_id, winner_id, first_player_id, fmt = row
+
+        if deck1_id not in deck_ids or deck2_id not in deck_ids:
+            return
+
+        for deck_id, opponent_id, order in _sides(deck1_id, deck2_id, first_player_id):
+            column = result_column(winner_id, deck_id, opponent_id)
+
+            if column is not None:
+                yield (deck_id, opponent_id, fmt, order), column
+
+    rebuild_result_counts(connection, TURN_RESULTS, statement, cells)
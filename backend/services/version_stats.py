@@ -0,0 +1,70 @@
+"""
+Per-version match results, kept in step with match writes.
+
+``deck_version_stat`` has one row per deck version, opponent deck, and
+turn order. Matches only count for the sides that recorded a version.
+``count_version_results`` adds a match write's changes to those rows, and
+``rebuild_version_stats`` recomputes the table from match history.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import or_, select
+
+from backend.models import DeckVersion, DeckVersionStat, Match
+from backend.services.aggregates import CounterTable, rebuild_result_counts, result_column
+
+
+TURN_ORDERS = ("first", "second", "unknown")
+VERSION_RESULTS = CounterTable(DeckVersionStat)
+
+
+def turn_order(first_player_id, deck_id: int, opponent_id: int) -> str:
+    if first_player_id == deck_id:
+        return "first"
+
+    if first_player_id == opponent_id:
+        return "second"
+
+    return "unknown"
+
+
+def _sides(deck1_id, deck2_id, deck1_version_id, deck2_version_id):
+    if deck1_version_id is not None:
+        yield deck1_version_id, deck1_id, deck2_id
+
+    if deck2_version_id is not None:
+        yield deck2_version_id, deck2_id, deck1_id
+
+
+def count_version_results(facts, sign: int, counters):
+    """Add (sign=1) or remove (sign=-1) one match from its versions' rows."""
+    for version_id, deck_id, opponent_id in _sides(
+        facts.deck1_id, facts.deck2_id, facts.deck1_version_id, facts.deck2_version_id
+    ):
+        key = (version_id, opponent_id, turn_order(facts.first_player_id, deck_id, opponent_id))
+        counters.add_result(VERSION_RESULTS, key, facts.winner_id, deck_id, opponent_id, sign)
+
+
+def rebuild_version_stats(connection):
+    """Recreate every version row from matches that recorded a version."""
+    version_ids = set(connection.scalars(select(DeckVersion.id)))
+    statement = select(
+        Match.deck1_id,
+        Match.deck2_id,
+        Match.deck1_version_id,
+        Match.deck2_version_id,
+        Match.winner_id,
+        Match.first_player_id,
+    ).where(or_(Match.deck1_version_id.isnot(None), Match.deck2_version_id.isnot(None)))
+
+    def cells(row):
+        deck1_id, deck2_id, deck1_version_id, deck2_version_id, winner_id, first_player_id = row
+
+        for version_id, deck_id, opponent_id in _sides(deck1_id, deck2_id, deck1_version_id, deck2_version_id):
+            column = result_column(winner_id, deck_id, opponent_id)
+
+            if version_id in version_ids and column is not None:
+                yield (version_id, opponent_id, turn_order(first_player_id, deck_id, opponent_id)), column
+
+    rebuild_result_counts(connection, VERSION_RESULTS, statement, cells)
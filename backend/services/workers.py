@@ -0,0 +1,50 @@
+"""
+A process pool for CPU-heavy simulations.
+
+NumPy releases the GIL for only part of a simulation, so threads do not
+help much; separate processes do. The pool is created on first use, lives
+for the life of the app, and uses the ``spawn`` start method so workers do
+not inherit the app's database connections. ``SIMULATION_WORKERS`` (set
+from ``CARDFIGHT_SIMULATION_WORKERS``) sizes it; at 1 or below, work runs
+inline in the request.
+
+Tasks must be module-level functions over plain, picklable arguments.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import current_app
+
+
+EXTENSION_KEY = "cardfight.simulation_pool"
+_POOL_LOCK = threading.Lock()
+
+
+def simulation_pool() -> ProcessPoolExecutor | None:
+    workers = current_app.config.get("SIMULATION_WORKERS", 1)
+
+    if workers <= 1:
+        return None
+
+    with _POOL_LOCK:
+        executor = current_app.extensions.get(EXTENSION_KEY)
+
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            current_app.extensions[EXTENSION_KEY] = executor
+
+    return executor
+
+
+def map_tasks(function, *iterables) -> list:
+    """``map`` over the simulation pool, or inline without one; results keep input order."""
+    executor = simulation_pool()
+
+    if executor is None:
+        return list(map(function, *iterables))
+
+    return list(executor.map(function, *iterables))
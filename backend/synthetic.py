@@ -0,0 +1,339 @@
+"""
+Generates a synthetic dataset at production scale.
+
+Decks, deck versions, cards, printings, deck cards, and matches are written
+with chunked bulk inserts instead of going through the ORM one row at a time. Deck win/loss counters
+are rebuilt from the generated matches at the end.
+
+Run:  python -m backend.synthetic --preset production --reset
+      python -m backend.synthetic --decks 200 --cards 10000 --matches 250000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from sqlalchemy import func, insert, select
+
+from backend.database import db
+from backend.models import Card, CardPrinting, Deck, DeckCard, DeckVersion, Match
+from backend.services.admin import recount_deck_records
+from backend.services.card_set_names import SET_CODE_NAMES
+from backend.services.cards import CARD_NATION_OPTIONS, CARD_TYPE_OPTIONS
+
+
+INSERT_CHUNK_SIZE = 20_000
+
+# Grades 0-3 fill the ride deck; the main deck is 12 playsets plus one pair.
+RIDE_DECK_GRADES = (0, 1, 2, 3)
+MAIN_DECK_QUANTITIES = (4,) * 12 + (2,)
+
+RARITIES = ("C", "R", "RR", "RRR", "SP")
+
+UNDECIDED_MATCH_SHARE = 0.04
+
+
+@dataclass(frozen=True)
+class DatasetSize:
+    decks: int
+    versions_per_deck: int
+    cards: int
+    printings_per_card: int
+    matches: int
+    days: int = 365
+
+
+DATASET_PRESETS = {
+    "small": DatasetSize(decks=40, versions_per_deck=2, cards=2_000, printings_per_card=2, matches=20_000),
+    "medium": DatasetSize(decks=150, versions_per_deck=3, cards=10_000, printings_per_card=2, matches=200_000),
+    "production": DatasetSize(decks=500, versions_per_deck=3, cards=50_000, printings_per_card=2, matches=1_000_000),
+}
+
+
+def _insert_chunked(model, rows):
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        db.session.execute(insert(model), rows[start:start + INSERT_CHUNK_SIZE])
+
+
+def _new_ids(model, previous_max_id: int) -> list[int]:
+    return list(
+        db.session.scalars(select(model.id).where(model.id > previous_max_id).order_by(model.id))
+    )
+
+
+def _max_id(model) -> int:
+    return db.session.scalar(select(func.max(model.id))) or 0
+
+
+def _generate_decks(rng, size: DatasetSize, created_at: datetime) -> list[dict]:
+    previous_max_id = _max_id(Deck)
+    _insert_chunked(
+        Deck,
+        [
+            {
+                "name": f"Synthetic Deck {previous_max_id + index + 1:05d}",
+                "type": rng.choice(("Standard", "Stride")),
+                "nation": rng.choice(CARD_NATION_OPTIONS),
+                "created_at": created_at,
+            }
+            for index in range(size.decks)
+        ],
+    )
+
+    return [
+        {"id": deck_id, "type": deck_type}
+        for deck_id, deck_type in db.session.execute(
+            select(Deck.id, Deck.type).where(Deck.id > previous_max_id).order_by(Deck.id)
+        )
+    ]
+
+
+def _generate_cards(rng, size: DatasetSize) -> dict[int, list[int]]:
+    """Insert cards and printings; returns card ids grouped by grade."""
+    previous_max_id = _max_id(Card)
+    grades = [rng.randrange(5) for _ in range(size.cards)]
+    _insert_chunked(
+        Card,
+        [
+            {
+                "name": f"Synthetic Unit {previous_max_id + index + 1:06d}",
+                "grade": grade,
+                "nation": rng.choice(CARD_NATION_OPTIONS),
+                "card_type": rng.choice(CARD_TYPE_OPTIONS),
+                "power": 5000 + grade * 3000,
+                "shield": 10000 if grade < 3 else None,
+                "critical": 1,
+                "skill_text": "",
+                "source": "synthetic",
+            }
+            for index, grade in enumerate(grades)
+        ],
+    )
+    card_ids = _new_ids(Card, previous_max_id)
+
+    set_codes = sorted(SET_CODE_NAMES)
+    printing_rows = []
+    for card_id in card_ids:
+        for _ in range(size.printings_per_card):
+            set_code = rng.choice(set_codes)
+            printing_rows.append(
+                {
+                    "card_id": card_id,
+                    "set_code": set_code,
+                    "set_name": SET_CODE_NAMES[set_code],
+                    "card_number": f"{card_id:06d}",
+                    "rarity": rng.choice(RARITIES),
+                    "source": "synthetic",
+                }
+            )
+    _insert_chunked(CardPrinting, printing_rows)
+
+    by_grade: dict[int, list[int]] = {grade: [] for grade in range(5)}
+    for card_id, grade in zip(card_ids, grades):
+        by_grade[grade].append(card_id)
+
+    return by_grade
+
+
+def _generate_versions(rng, size: DatasetSize, decks: list[dict], cards_by_grade, created_at: datetime) -> dict[int, list[int]]:
+    """Insert deck versions with ride and main decks; returns version ids per deck."""
+    previous_max_id = _max_id(DeckVersion)
+    _insert_chunked(
+        DeckVersion,
+        [
+            {
+                "deck_id": deck["id"],
+                "version_name": f"Version {number}",
+                "notes": "",
+                "is_active": number == size.versions_per_deck,
+                "created_at": created_at + timedelta(days=number * size.days // (size.versions_per_deck + 1)),
+            }
+            for deck in decks
+            for number in range(1, size.versions_per_deck + 1)
+        ],
+    )
+
+    versions_by_deck: dict[int, list[int]] = {}
+    for version_id, deck_id in db.session.execute(
+        select(DeckVersion.id, DeckVersion.deck_id)
+        .where(DeckVersion.id > previous_max_id)
+        .order_by(DeckVersion.id)
+    ):
+        versions_by_deck.setdefault(deck_id, []).append(version_id)
+
+    main_pool = [card_id for grade_ids in cards_by_grade.values() for card_id in grade_ids]
+    can_build = main_pool and all(cards_by_grade[grade] for grade in RIDE_DECK_GRADES)
+    deck_card_rows = []
+
+    for version_ids in versions_by_deck.values() if can_build else ():
+        for version_id in version_ids:
+            for sort_order, grade in enumerate(RIDE_DECK_GRADES):
+                deck_card_rows.append(
+                    {
+                        "deck_version_id": version_id,
+                        "card_id": rng.choice(cards_by_grade[grade]),
+                        "quantity": 1,
+                        "zone": "ride",
+                        "sort_order": sort_order,
+                    }
+                )
+
+            main_cards = rng.sample(main_pool, min(len(MAIN_DECK_QUANTITIES), len(main_pool)))
+            for sort_order, (card_id, quantity) in enumerate(zip(main_cards, MAIN_DECK_QUANTITIES)):
+                deck_card_rows.append(
+                    {
+                        "deck_version_id": version_id,
+                        "card_id": card_id,
+                        "quantity": quantity,
+                        "zone": "main",
+                        "sort_order": sort_order,
+                    }
+                )
+
+    _insert_chunked(DeckCard, deck_card_rows)
+
+    return versions_by_deck
+
+
+def _pick_winner(rng, deck1_id: int, deck2_id: int) -> int | None:
+    roll = rng.random()
+
+    if roll < UNDECIDED_MATCH_SHARE:
+        return None
+
+    return deck1_id if roll < (1 + UNDECIDED_MATCH_SHARE) / 2 else deck2_id
+
+
+def _generate_matches(rng, size: DatasetSize, decks: list[dict], versions_by_deck, started_at: datetime) -> int:
+    if len(decks) < 2:
+        return 0
+
+    # A few decks are played far more than others, like a real playgroup.
+    cum_weights = list(accumulate(1.0 / (rank + 1) ** 0.6 for rank in range(len(decks))))
+    span_minutes = size.days * 24 * 60
+    rows = []
+
+    for _ in range(size.matches):
+        deck1, deck2 = rng.choices(decks, cum_weights=cum_weights, k=2)
+        while deck2["id"] == deck1["id"]:
+            deck2 = rng.choice(decks)
+
+        played_at = started_at + timedelta(minutes=rng.randrange(span_minutes))
+        # Later versions were built later; pick the newest version on or before the match.
+        version_index = min(
+            int((played_at - started_at).days * (size.versions_per_deck + 1) / size.days) - 1,
+            size.versions_per_deck - 1,
+        )
+        version_index = max(version_index, 0)
+        deck1_versions = versions_by_deck.get(deck1["id"]) or [None]
+        deck2_versions = versions_by_deck.get(deck2["id"]) or [None]
+
+        rows.append(
+            {
+                "deck1_id": deck1["id"],
+                "deck2_id": deck2["id"],
+                "deck1_version_id": deck1_versions[min(version_index, len(deck1_versions) - 1)],
+                "deck2_version_id": deck2_versions[min(version_index, len(deck2_versions) - 1)],
+                "winner_id": _pick_winner(rng, deck1["id"], deck2["id"]),
+                "first_player_id": rng.choice((deck1["id"], deck2["id"])),
+                "format": deck1["type"] if deck1["type"] == deck2["type"] else "Any",
+                "date_played": played_at,
+                "notes": "",
+            }
+        )
+
+        if len(rows) >= INSERT_CHUNK_SIZE:
+            _insert_chunked(Match, rows)
+            rows = []
+
+    _insert_chunked(Match, rows)
+
+    return size.matches
+
+
+def generate_dataset(size: DatasetSize, seed: int = 2024, now: datetime | None = None) -> dict:
+    """Bulk-insert a synthetic dataset and rebuild derived counters. Returns row counts."""
+    rng = random.Random(seed)
+    started_at = (now or datetime.now()).replace(second=0, microsecond=0) - timedelta(days=size.days)
+
+    decks = _generate_decks(rng, size, started_at)
+    cards_by_grade = _generate_cards(rng, size)
+    versions_by_deck = _generate_versions(rng, size, decks, cards_by_grade, started_at)
+    db.session.commit()
+
+    match_count = _generate_matches(rng, size, decks, versions_by_deck, started_at)
+    db.session.commit()
+
+    recount_deck_records()
+
+    return {
+        "decks": len(decks),
+        "deck_versions": sum(len(version_ids) for version_ids in versions_by_deck.values()),
+        "cards": sum(len(card_ids) for card_ids in cards_by_grade.values()),
+        "card_printings": sum(len(card_ids) for card_ids in cards_by_grade.values()) * size.printings_per_card,
+        "matches": match_count,
+    }
+
+
+def ensure_dataset(size: DatasetSize, seed: int = 2024) -> dict | None:
+    """Generate ``size`` only when the database has no decks yet."""
+    if db.session.scalar(select(func.count()).select_from(Deck)):
+        return None
+
+    return generate_dataset(size, seed=seed)
+
+
+def dataset_size_from_args(args) -> DatasetSize:
+    size = DATASET_PRESETS[args.preset]
+    overrides = {
+        field_name: getattr(args, field_name)
+        for field_name in ("decks", "versions_per_deck", "cards", "printings_per_card", "matches", "days")
+        if getattr(args, field_name, None) is not None
+    }
+    return replace(size, **overrides)
+
+
+def add_dataset_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--preset", choices=sorted(DATASET_PRESETS), default="small")
+    parser.add_argument("--decks", type=int)
+    parser.add_argument("--versions-per-deck", dest="versions_per_deck", type=int)
+    parser.add_argument("--cards", type=int)
+    parser.add_argument("--printings-per-card", dest="printings_per_card", type=int)
+    parser.add_argument("--matches", type=int)
+    parser.add_argument("--days", type=int, help="spread match dates over this many days")
+    parser.add_argument("--seed", type=int, default=2024)
+
+
+def main():
+    from backend.app import create_app
+    from backend.migrations import upgrade_database
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_dataset_arguments(parser)
+    parser.add_argument("--database", help="SQLite file to fill (defaults to DATABASE_URL)")
+    parser.add_argument("--reset", action="store_true", help="drop every table first")
+    args = parser.parse_args()
+
+    config = {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{args.database}"} if args.database else None
+    app = create_app(config)
+
+    with app.app_context():
+        if args.reset:
+            db.drop_all()
+        upgrade_database()
+
+        started = time.perf_counter()
+        counts = generate_dataset(dataset_size_from_args(args), seed=args.seed)
+        elapsed = time.perf_counter() - started
+
+    print(", ".join(f"{count:,} {name.replace('_', ' ')}" for name, count in counts.items()))
+    print(f"Generated in {elapsed:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Performance benchmarks for the Cardfight Lab backend.
+
+Run benchmarks as modules from the repository root, for example:
+
+    python -m benchmarks.serialization
+"""
@@ -0,0 +1,96 @@
+"""
+Import-time budget for backend entry points, measured with ``-X importtime``.
+
+Each entry point is imported in a fresh interpreter. The script reports the
+cumulative import time, the slowest modules, and fails when an entry point
+exceeds its budget or pulls in a dependency that should load lazily.
+
+Run:  python -m benchmarks.import_time [--budget-scale 1.5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Cumulative import time budgets in milliseconds.
+IMPORT_BUDGETS_MS = {
+    "backend.app": 600,
+    "backend.seed": 600,
+    "backend.services.card_image_analyzer": 150,
+}
+
+# Optional analyzer dependencies and the export writers, which must only load on first use.
+LAZY_MODULES = ("openai", "PIL", "pyarrow")
+
+
+def measure(module: str) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    modules = {}
+
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        parts = line[len("import time:"):].split("|")
+        self_us, cumulative_us, name = int(parts[0]), int(parts[1]), parts[2].strip()
+        modules[name] = {"self_ms": self_us / 1000, "cumulative_ms": cumulative_us / 1000}
+
+    return {
+        "module": module,
+        "total_ms": modules.get(module, {"cumulative_ms": 0.0})["cumulative_ms"],
+        "modules": modules,
+        "lazy_violations": sorted(
+            name for name in modules if name.split(".")[0] in LAZY_MODULES
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="median of this many runs")
+    parser.add_argument("--top", type=int, default=8, help="slowest modules to list")
+    parser.add_argument("--budget-scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    failures = []
+
+    for module, budget_ms in IMPORT_BUDGETS_MS.items():
+        runs = [measure(module) for _ in range(args.runs)]
+        total_ms = statistics.median(run["total_ms"] for run in runs)
+        scaled_budget = budget_ms * args.budget_scale
+        status = "ok" if total_ms <= scaled_budget else "OVER BUDGET"
+
+        print(f"{module:<42} {total_ms:8.1f} ms  (budget {scaled_budget:.0f} ms)  {status}")
+
+        slowest = sorted(
+            runs[-1]["modules"].items(),
+            key=lambda item: item[1]["self_ms"],
+            reverse=True,
+        )[: args.top]
+        for name, timing in slowest:
+            print(f"    {name:<50} self {timing['self_ms']:7.1f} ms")
+
+        if total_ms > scaled_budget:
+            failures.append(f"{module} took {total_ms:.1f} ms")
+
+        if runs[-1]["lazy_violations"]:
+            failures.append(f"{module} imported {', '.join(runs[-1]['lazy_violations'])}")
+
+    if failures:
+        print("\nImport budget failures:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+"""
+HTTP load test against the API served by waitress.
+
+Fills (or reuses) a SQLite file with ``backend.synthetic``, starts
+``backend.serve`` in a subprocess, and drives it with a weighted mix of
+dashboard loads, match logging, deck edits and card searches from
+concurrent client threads. Reports requests per second, p50/p95/p99 per
+operation, and SQLite lock errors read from ``/api/admin/metrics``.
+Everything runs locally; no network access is needed.
+
+Run:  python -m benchmarks.load_test --concurrency 16 --duration 20
+      python -m benchmarks.load_test --database /tmp/prod.db --scenario write-heavy
+      python -m benchmarks.load_test --mix dashboard=1,log_match=3 --server-threads 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from sqlalchemy import select  # noqa: E402
+
+from backend.app import create_app  # noqa: E402
+from backend.database import db  # noqa: E402
+from backend.migrations import upgrade_database  # noqa: E402
+from backend.models import Card, Deck, DeckVersion  # noqa: E402
+from backend.synthetic import add_dataset_arguments, dataset_size_from_args, ensure_dataset  # noqa: E402
+from benchmarks.services import RESULTS_DIR, dataset_counts, environment  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Operation weights per scenario. Weights are relative, not percentages.
+SCENARIOS = {
+    "mixed": {
+        "dashboard": 15,
+        "stats_table": 10,
+        "list_matches": 15,
+        "log_match": 20,
+        "edit_deck": 10,
+        "search_cards": 20,
+        "deck_version": 10,
+    },
+    "read-heavy": {
+        "dashboard": 25,
+        "stats_table": 20,
+        "list_matches": 20,
+        "log_match": 5,
+        "search_cards": 20,
+        "deck_version": 10,
+    },
+    "write-heavy": {
+        "dashboard": 10,
+        "list_matches": 10,
+        "log_match": 60,
+        "edit_deck": 20,
+    },
+}
+
+LOCK_METRIC = re.compile(r'^cardfight_sqlite_lock_errors_total\{route="([^"]*)"\} (\d+)$', re.MULTILINE)
+
+
+class Fixtures:
+    """Ids the operations pick from, read from the database before the run."""
+
+    def __init__(self, deck_ids, version_ids, card_names):
+        self.deck_ids = deck_ids
+        self.version_ids = version_ids
+        self.search_terms = sorted({name.split()[-1][:4] for name in card_names} | {"Unit"})
+
+    @classmethod
+    def load(cls):
+        return cls(
+            list(db.session.scalars(select(Deck.id).where(Deck.active.is_(True)))),
+            list(db.session.scalars(select(DeckVersion.id))),
+            list(db.session.scalars(select(Card.name).limit(500))),
+        )
+
+
+def build_operations(fixtures: Fixtures) -> dict:
+    """Operation name -> callable(rng) returning (method, path, json body or None)."""
+
+    def log_match(rng):
+        deck1_id, deck2_id = rng.sample(fixtures.deck_ids, 2)
+        return (
+            "POST",
+            "/api/matches",
+            {
+                "deck1_id": deck1_id,
+                "deck2_id": deck2_id,
+                "winner_id": rng.choice((deck1_id, deck2_id)),
+                "first_player_id": rng.choice((deck1_id, deck2_id)),
+                "notes": "load test",
+            },
+        )
+
+    def edit_deck(rng):
+        return (
+            "PATCH",
+            f"/api/deck-versions/{rng.choice(fixtures.version_ids)}",
+            {"notes": f"load test edit {rng.randrange(1_000_000)}"},
+        )
+
+    return {
+        "dashboard": lambda rng: ("GET", "/api/dashboard", None),
+        "stats_table": lambda rng: ("GET", "/api/stats/table", None),
+        "list_matches": lambda rng: ("GET", f"/api/matches?page={rng.randint(1, 20)}&page_size=25", None),
+        "log_match": log_match,
+        "edit_deck": edit_deck,
+        "search_cards": lambda rng: ("GET", f"/api/cards/search?q={rng.choice(fixtures.search_terms)}", None),
+        "deck_version": lambda rng: ("GET", f"/api/deck-versions/{rng.choice(fixtures.version_ids)}", None),
+    }
+
+
+def parse_mix(value: str) -> dict:
+    mix = {}
+
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+
+    return mix
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+
+    rank = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: dict[str, list[float]] = {}
+        self.statuses: dict[str, dict[str, int]] = {}
+
+    def record(self, operation: str, status: str, elapsed_ms: float):
+        with self._lock:
+            self.latencies.setdefault(operation, []).append(elapsed_ms)
+            counts = self.statuses.setdefault(operation, {})
+            counts[status] = counts.get(status, 0) + 1
+
+    def summary(self, seconds: float) -> dict:
+        operations = {}
+
+        for operation, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            statuses = self.statuses[operation]
+            operations[operation] = {
+                "requests": len(values),
+                "rps": round(len(values) / seconds, 2),
+                "p50_ms": round(percentile(values, 0.50), 2),
+                "p95_ms": round(percentile(values, 0.95), 2),
+                "p99_ms": round(percentile(values, 0.99), 2),
+                "max_ms": round(values[-1], 2),
+                "errors": sum(count for status, count in statuses.items() if not status.startswith(("2", "3"))),
+                "statuses": dict(sorted(statuses.items())),
+            }
+
+        total = sum(result["requests"] for result in operations.values())
+        return {
+            "requests": total,
+            "rps": round(total / seconds, 2),
+            "errors": sum(result["errors"] for result in operations.values()),
+            "operations": operations,
+        }
+
+
+def _worker(host, port, operations, names, weights, deadline, measure_from, recorder, seed):
+    rng = random.Random(seed)
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+
+    while time.perf_counter() < deadline:
+        operation = rng.choices(names, cum_weights=weights)[0]
+        method, path, body = operations[operation](rng)
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+        started = time.perf_counter()
+
+        try:
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            status = str(response.status)
+        except (OSError, http.client.HTTPException) as exc:
+            status = type(exc).__name__
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=30)
+
+        if started >= measure_from:
+            recorder.record(operation, status, (time.perf_counter() - started) * 1000)
+
+    connection.close()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get(host, port, path) -> tuple[int, str]:
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        return response.status, response.read().decode()
+    finally:
+        connection.close()
+
+
+def lock_errors(metrics_text: str) -> dict:
+    return {route: int(count) for route, count in LOCK_METRIC.findall(metrics_text)}
+
+
+def start_server(database: Path, profile: str, threads: int, port: int, log_file):
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{database}",
+        CARDFIGHT_DB_PROFILE=profile,
+        CARDFIGHT_AUTO_MIGRATE="false",
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "backend.serve", "--port", str(port), "--threads", str(threads)],
+        cwd=REPO_ROOT,
+        env=env,
+        stdout=log_file,
+        stderr=subprocess.STDOUT,
+    )
+
+    deadline = time.perf_counter() + 30
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}; see {log_file.name}")
+
+        try:
+            if _get("127.0.0.1", port, "/api/health")[0] == 200:
+                return process
+        except OSError:
+            time.sleep(0.1)
+
+    process.terminate()
+    raise RuntimeError("Server did not become healthy within 30 seconds")
+
+
+def prepare_database(database: Path, args) -> Fixtures:
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{database}", "DATABASE_PROFILE": args.profile})
+
+    with app.app_context():
+        upgrade_database()
+
+        started = time.perf_counter()
+        if ensure_dataset(dataset_size_from_args(args), seed=args.seed):
+            print(f"Generated dataset in {time.perf_counter() - started:.1f} s")
+
+        fixtures = Fixtures.load()
+        counts = dataset_counts()
+        db.session.remove()
+        db.engine.dispose()
+
+    print(", ".join(f"{count:,} {table}" for table, count in counts.items()))
+    return fixtures
+
+
+def run(database: Path, args) -> dict:
+    mix = parse_mix(args.mix) if args.mix else SCENARIOS[args.scenario]
+    fixtures = prepare_database(database, args)
+    operations = build_operations(fixtures)
+
+    unknown = sorted(set(mix) - set(operations))
+    if unknown:
+        raise SystemExit(f"Unknown operations: {', '.join(unknown)}. Choose from {', '.join(operations)}.")
+
+    names = list(mix)
+    cum_weights = []
+    for name in names:
+        cum_weights.append((cum_weights[-1] if cum_weights else 0) + mix[name])
+
+    port = args.port or _free_port()
+    recorder = Recorder()
+
+    with tempfile.NamedTemporaryFile("w+", prefix="cardfight-serve-", suffix=".log", delete=False) as log_file:
+        server = start_server(database, args.profile, args.server_threads, port, log_file)
+
+        try:
+            baseline_locks = lock_errors(_get("127.0.0.1", port, "/api/admin/metrics")[1])
+            measure_from = time.perf_counter() + args.warmup
+            deadline = measure_from + args.duration
+            threads = [
+                threading.Thread(
+                    target=_worker,
+                    args=("127.0.0.1", port, operations, names, cum_weights, deadline, measure_from, recorder, index),
+                )
+                for index in range(args.concurrency)
+            ]
+
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            final_locks = lock_errors(_get("127.0.0.1", port, "/api/admin/metrics")[1])
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    locks = {
+        route: count - baseline_locks.get(route, 0)
+        for route, count in final_locks.items()
+        if count - baseline_locks.get(route, 0)
+    }
+
+    return {
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(),
+        "profile": args.profile,
+        "server_threads": args.server_threads,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "mix": mix,
+        "server_log": log_file.name,
+        "sqlite_lock_errors": locks,
+        **recorder.summary(args.duration),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_dataset_arguments(parser)
+    parser.add_argument("--database", type=Path, help="reuse (or create) this SQLite file")
+    parser.add_argument("--profile", default="production", help="database profile for the server")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="mixed")
+    parser.add_argument("--mix", help="custom weights, e.g. dashboard=2,log_match=1 (overrides --scenario)")
+    parser.add_argument("--concurrency", type=int, default=8, help="client threads")
+    parser.add_argument("--server-threads", type=int, default=8, help="waitress worker threads")
+    parser.add_argument("--duration", type=float, default=15.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before the run")
+    parser.add_argument("--port", type=int, help="defaults to a free local port")
+    parser.add_argument("--output", type=Path, help="JSON results path")
+    parser.add_argument("--fail-on-lock-errors", action="store_true")
+    args = parser.parse_args()
+
+    if args.database:
+        result = run(args.database, args)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            result = run(Path(directory) / "load.db", args)
+
+    print(
+        f"\n{result['requests']:,} requests in {result['duration_s']:.0f} s "
+        f"({result['rps']:.1f} req/s) at concurrency {result['concurrency']}, "
+        f"{result['errors']} errors"
+    )
+    print(f"{'operation':<16} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'errors':>7}")
+    for name, stats in result["operations"].items():
+        print(
+            f"{name:<16} {stats['rps']:>8.1f} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} "
+            f"{stats['p99_ms']:>9.1f} {stats['max_ms']:>9.1f} {stats['errors']:>7}"
+        )
+
+    if result["sqlite_lock_errors"]:
+        print("\nSQLite lock errors by route:")
+        for route, count in sorted(result["sqlite_lock_errors"].items()):
+            print(f"  {route:<40} {count}")
+        print(f"Server log: {result['server_log']}")
+    else:
+        print("\nNo SQLite lock errors.")
+
+    output = args.output
+    if output is None:
+        commit = (result["environment"]["commit"] or "nocommit")[:12]
+        output = RESULTS_DIR / f"load-{args.scenario}-{commit}-{result['recorded_at'].replace(':', '')}.json"
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2) + "\n")
+    print(f"Results written to {output}")
+
+    if args.fail_on_lock_errors and result["sqlite_lock_errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
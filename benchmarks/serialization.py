@@ -0,0 +1,177 @@
+"""
+Per-request JSON serialization cost for large match and card-library responses.
+
+Compares the previous behaviour (serializers pre-formatting every datetime,
+then Flask's default provider) with the stdlib and orjson providers in
+``backend/json_provider.py``. The legacy timing leaves out the per-row
+``isoformat()`` calls, so it understates the old cost.
+
+Run:  python -m benchmarks.serialization --matches 5000 --cards 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from backend.app import create_app  # noqa: E402
+from backend.database import db  # noqa: E402
+from backend.json_provider import JSON_PROVIDERS, orjson  # noqa: E402
+from backend.models import Card, CardPrinting, Deck, Match  # noqa: E402
+from backend.services.cards import list_cards_page  # noqa: E402
+from backend.services.matches import list_matches  # noqa: E402
+from backend.services.serializers import serialize_card  # noqa: E402
+
+
+def _populate(match_count: int, card_count: int, seed: int = 7):
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, 9, 0)
+
+    db.session.execute(
+        insert(Deck),
+        [
+            {"name": f"Deck {index}", "type": rng.choice(["Standard", "Stride"])}
+            for index in range(40)
+        ],
+    )
+
+    match_rows = []
+    for _ in range(match_count):
+        deck1_id, deck2_id = rng.sample(range(1, 41), 2)
+        match_rows.append(
+            {
+                "deck1_id": deck1_id,
+                "deck2_id": deck2_id,
+                "winner_id": rng.choice([deck1_id, deck2_id, None]),
+                "first_player_id": rng.choice([deck1_id, deck2_id]),
+                "format": "Standard",
+                "date_played": start + timedelta(minutes=rng.randrange(500_000)),
+                "notes": "",
+            }
+        )
+    db.session.execute(insert(Match), match_rows)
+
+    db.session.execute(
+        insert(Card),
+        [
+            {
+                "name": f"Card {index:05d}",
+                "grade": rng.randrange(5),
+                "nation": "Brandt Gate",
+                "card_type": "Normal Unit",
+            }
+            for index in range(card_count)
+        ],
+    )
+    db.session.execute(
+        insert(CardPrinting),
+        [
+            {"card_id": card_id, "set_code": "DZ-BT01", "card_number": f"{card_id:03d}"}
+            for card_id in range(1, card_count + 1)
+        ],
+    )
+    db.session.commit()
+
+
+def _legacy_strings(value):
+    """Mimic the old serializers, which formatted every datetime up front."""
+    if isinstance(value, dict):
+        return {key: _legacy_strings(item) for key, item in value.items()}
+
+    if isinstance(value, list):
+        return [_legacy_strings(item) for item in value]
+
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+
+    return value
+
+
+def _time_ms(callback, repeat: int) -> float:
+    samples = []
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        callback()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    return statistics.median(samples)
+
+
+def run(match_count: int, card_count: int, repeat: int) -> dict:
+    app = create_app()
+    results = {}
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        _populate(match_count, card_count)
+
+        payloads = {
+            "/api/matches": list_matches(),
+            "/api/cards/library": {
+                "items": [
+                    serialize_card(card)
+                    for card in list_cards_page(page_size=500)["items"]
+                ],
+            },
+        }
+
+        # Flask's default provider ignores JSON_SORT_KEYS and sorts keys.
+        legacy_provider = DefaultJSONProvider(app)
+        encoders = {"legacy (flask default, no formatting)": None}
+        encoders.update(
+            {
+                name: provider_class(app)
+                for name, provider_class in JSON_PROVIDERS.items()
+                if name != "orjson" or orjson is not None
+            }
+        )
+
+        for route, payload in payloads.items():
+            route_results = {}
+            legacy_payload = _legacy_strings(payload)
+
+            for name, provider in encoders.items():
+                if provider is None:
+                    route_results[name] = _time_ms(
+                        lambda: legacy_provider.response(legacy_payload).get_data(),
+                        repeat,
+                    )
+                else:
+                    route_results[name] = _time_ms(
+                        lambda provider=provider: provider.response(payload).get_data(),
+                        repeat,
+                    )
+
+            results[route] = route_results
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--matches", type=int, default=5000)
+    parser.add_argument("--cards", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+
+    results = run(args.matches, args.cards, args.repeat)
+
+    for route, timings in results.items():
+        print(route)
+        for name, elapsed_ms in timings.items():
+            print(f"  {name:<42} {elapsed_ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
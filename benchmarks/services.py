@@ -0,0 +1,238 @@
+"""
+Service-layer timings against a synthetic dataset, recorded as JSON.
+
+Fills a SQLite file with ``backend.synthetic`` (or reuses one given with
+``--database``), times each service function, and writes the results with
+the current commit so regressions can be compared across commits.
+
+Run:  python -m benchmarks.services --preset medium
+      python -m benchmarks.services --database /tmp/prod.db --compare benchmarks/results/<old>.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import sqlalchemy  # noqa: E402
+from sqlalchemy import func, select  # noqa: E402
+
+from backend.app import create_app  # noqa: E402
+from backend.database import db  # noqa: E402
+from backend.instrumentation import record_queries  # noqa: E402
+from backend.migrations import upgrade_database  # noqa: E402
+from backend.models import Deck, DeckCard, DeckVersion, Match  # noqa: E402
+from backend.services.cards import list_cards_page  # noqa: E402
+from backend.services.dashboard import get_dashboard_summary  # noqa: E402
+from backend.services.matches import list_matches  # noqa: E402
+from backend.services.ratings import rebuild_ratings  # noqa: E402
+from backend.services.serializers import serialize_cards, serialize_deck_version  # noqa: E402
+from backend.services.stats import matrix, stats_table, versus_for  # noqa: E402
+from backend.synthetic import add_dataset_arguments, dataset_size_from_args, ensure_dataset  # noqa: E402
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _busiest_deck_id() -> int:
+    deck1_counts = (
+        select(Match.deck1_id.label("deck_id"), func.count().label("games"))
+        .group_by(Match.deck1_id)
+        .order_by(func.count().desc())
+        .limit(1)
+    )
+    return db.session.execute(deck1_counts).first().deck_id
+
+
+def _largest_version_id() -> int:
+    return db.session.scalar(
+        select(DeckCard.deck_version_id)
+        .group_by(DeckCard.deck_version_id)
+        .order_by(func.count().desc())
+        .limit(1)
+    ) or db.session.scalar(select(func.min(DeckVersion.id)))
+
+
+def service_cases(deck_id: int, version_id: int) -> dict:
+    """Name -> zero-argument callable. Every case serializes what its route would return."""
+    return {
+        "stats_table": stats_table,
+        "matrix": matrix,
+        "versus_for": lambda: versus_for(deck_id),
+        "get_dashboard_summary": get_dashboard_summary,
+        "list_matches[page=1,page_size=50]": lambda: list_matches(page=1, page_size=50),
+        "list_matches[deck,limit=500]": lambda: list_matches(deck_id=deck_id, limit=500),
+        "list_cards_page[page_size=100]": lambda: serialize_cards(list_cards_page(page_size=100)["items"]),
+        "list_cards_page[q,page_size=100]": lambda: serialize_cards(
+            list_cards_page(q="Unit 01", page_size=100)["items"]
+        ),
+        "serialize_deck_version": lambda: serialize_deck_version(db.session.get(DeckVersion, version_id)),
+        # Full history replay; rolled back so every run starts from the same data.
+        "rebuild_ratings": lambda: (rebuild_ratings(db.session.connection()), db.session.rollback()),
+    }
+
+
+def time_case(callback, repeat: int) -> dict:
+    samples = []
+    statements = 0
+
+    for _ in range(repeat):
+        # Start every run with an empty identity map, like a new request.
+        db.session.remove()
+
+        with record_queries() as recorder:
+            started = time.perf_counter()
+            callback()
+            samples.append((time.perf_counter() - started) * 1000)
+
+        statements = recorder.count
+
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "min_ms": round(min(samples), 3),
+        "max_ms": round(max(samples), 3),
+        "runs": repeat,
+        "sql_statements": statements,
+    }
+
+
+def _git(*args) -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", *args],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return completed.stdout.strip()
+
+
+def environment() -> dict:
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "sqlite": __import__("sqlite3").sqlite_version,
+        "machine": platform.machine(),
+    }
+
+
+def dataset_counts() -> dict:
+    return {
+        model.__tablename__: db.session.scalar(select(func.count()).select_from(model))
+        for model in (Deck, DeckVersion, DeckCard, Match)
+    }
+
+
+def run(database: Path, args, cases: list[str] | None = None) -> dict:
+    app = create_app(
+        {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{database}",
+            "DATABASE_PROFILE": args.profile,
+        }
+    )
+
+    with app.app_context():
+        upgrade_database()
+
+        started = time.perf_counter()
+        if ensure_dataset(dataset_size_from_args(args), seed=args.seed):
+            print(f"Generated dataset in {time.perf_counter() - started:.1f} s")
+
+        selected = service_cases(_busiest_deck_id(), _largest_version_id())
+        if cases:
+            selected = {name: callback for name, callback in selected.items() if name in cases}
+
+        results = {}
+        for name, callback in selected.items():
+            # One untimed call warms SQLite's page cache and SQLAlchemy's statement cache.
+            callback()
+            results[name] = time_case(callback, args.repeat)
+
+        payload = {
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "environment": environment(),
+            "profile": args.profile,
+            "dataset": dataset_counts(),
+            "results": results,
+        }
+
+        db.session.remove()
+        db.engine.dispose()
+
+    return payload
+
+
+def compare(current: dict, baseline: dict) -> list[str]:
+    lines = [f"Compared with {(baseline['environment'].get('commit') or 'unknown')[:12]}:"]
+
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+
+        if not previous:
+            lines.append(f"  {name:<38} new")
+            continue
+
+        change = (result["median_ms"] - previous["median_ms"]) / previous["median_ms"] * 100 if previous["median_ms"] else 0.0
+        lines.append(
+            f"  {name:<38} {previous['median_ms']:9.2f} -> {result['median_ms']:9.2f} ms  ({change:+6.1f}%)"
+        )
+
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_dataset_arguments(parser)
+    parser.add_argument("--database", type=Path, help="reuse (or create) this SQLite file")
+    parser.add_argument("--profile", default="production", help="database profile to benchmark under")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--case", action="append", dest="cases", help="only run this case (repeatable)")
+    parser.add_argument("--output", type=Path, help="JSON results path (default benchmarks/results/)")
+    parser.add_argument("--compare", type=Path, help="earlier results file to diff against")
+    args = parser.parse_args()
+
+    if args.database:
+        payload = run(args.database, args, args.cases)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            payload = run(Path(directory) / "bench.db", args, args.cases)
+
+    print(", ".join(f"{count:,} {table}" for table, count in payload["dataset"].items()))
+    for name, result in payload["results"].items():
+        print(
+            f"{name:<40} median {result['median_ms']:9.2f} ms  "
+            f"min {result['min_ms']:9.2f} ms  {result['sql_statements']:3d} SQL"
+        )
+
+    output = args.output
+    if output is None:
+        commit = (payload["environment"]["commit"] or "nocommit")[:12]
+        suffix = "-dirty" if payload["environment"]["dirty"] else ""
+        output = RESULTS_DIR / f"services-{commit}{suffix}-{payload['recorded_at'].replace(':', '')}.json"
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(payload, indent=2) + "\n")
+    print(f"Results written to {output}")
+
+    if args.compare:
+        print("\n".join(compare(payload, json.loads(args.compare.read_text()))))
+
+
+if __name__ == "__main__":
+    main()
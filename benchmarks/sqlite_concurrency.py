@@ -0,0 +1,135 @@
+"""
+Analytics read throughput while matches are being logged, per database profile.
+
+Each profile gets a fresh SQLite file. One thread logs matches through
+``create_match`` while reader threads call ``stats_table`` for a fixed time.
+
+Run:  python -m benchmarks.sqlite_concurrency --seconds 5 --readers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from backend.app import create_app  # noqa: E402
+from backend.database import DATABASE_PROFILES, db  # noqa: E402
+from backend.migrations import upgrade_database  # noqa: E402
+from backend.models import Deck, Match  # noqa: E402
+from backend.services.matches import create_match  # noqa: E402
+from backend.services.stats import stats_table  # noqa: E402
+
+
+def _populate(deck_count: int, match_count: int, seed: int = 11):
+    rng = random.Random(seed)
+    db.session.execute(
+        insert(Deck),
+        [{"name": f"Deck {index}", "type": "Standard"} for index in range(deck_count)],
+    )
+    rows = []
+    for _ in range(match_count):
+        deck1_id, deck2_id = rng.sample(range(1, deck_count + 1), 2)
+        rows.append(
+            {
+                "deck1_id": deck1_id,
+                "deck2_id": deck2_id,
+                "winner_id": rng.choice([deck1_id, deck2_id, None]),
+                "notes": "",
+            }
+        )
+    db.session.execute(insert(Match), rows)
+    db.session.commit()
+
+
+def run_profile(profile: str, seconds: float, readers: int, deck_count: int, match_count: int) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        app = create_app(
+            {
+                "SQLALCHEMY_DATABASE_URI": f"sqlite:///{Path(directory) / 'bench.db'}",
+                "DATABASE_PROFILE": profile,
+            }
+        )
+
+        with app.app_context():
+            upgrade_database()
+            _populate(deck_count, match_count)
+
+        deadline = time.perf_counter() + seconds
+        counts = {"reads": 0, "writes": 0, "lock_errors": 0}
+        lock = threading.Lock()
+
+        def count(key: str):
+            with lock:
+                counts[key] += 1
+
+        def reader():
+            with app.app_context():
+                while time.perf_counter() < deadline:
+                    try:
+                        stats_table()
+                        count("reads")
+                    except OperationalError:
+                        db.session.rollback()
+                        count("lock_errors")
+                db.session.remove()
+
+        def writer():
+            rng = random.Random(3)
+            with app.app_context():
+                while time.perf_counter() < deadline:
+                    deck1_id, deck2_id = rng.sample(range(1, deck_count + 1), 2)
+                    try:
+                        create_match({"deck1_id": deck1_id, "deck2_id": deck2_id, "winner_id": deck1_id})
+                        count("writes")
+                    except OperationalError:
+                        db.session.rollback()
+                        count("lock_errors")
+                db.session.remove()
+
+        threads = [threading.Thread(target=writer)]
+        threads += [threading.Thread(target=reader) for _ in range(readers)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with app.app_context():
+            db.engine.dispose()
+
+    return {
+        "profile": profile,
+        "reads_per_sec": round(counts["reads"] / seconds, 1),
+        "writes_per_sec": round(counts["writes"] / seconds, 1),
+        "lock_errors": counts["lock_errors"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--decks", type=int, default=40)
+    parser.add_argument("--matches", type=int, default=20_000)
+    args = parser.parse_args()
+
+    for profile in DATABASE_PROFILES:
+        result = run_profile(profile, args.seconds, args.readers, args.decks, args.matches)
+        print(
+            f"{result['profile']:<12} reads/s {result['reads_per_sec']:>8}  "
+            f"writes/s {result['writes_per_sec']:>8}  lock errors {result['lock_errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
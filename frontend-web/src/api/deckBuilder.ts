@@ -3,6 +3,9 @@ import type {
   AddDeckCardPayload,
   CreateDeckVersionPayload,
   DeckCardEntry,
+  DeckOptimizePayload,
+  DeckOptimizeResponse,
+  DeckSimulationResponse,
   DeckVersion,
   DeckVersionSummary,
   UpdateDeckCardPayload,
@@ -73,4 +76,26 @@ export function removeDeckCard(deckCardId: number) {
       method: "DELETE",
     },
   );
-}
\ No newline at end of file
+}
+export type DeckSimulationOptions = {
+  going?: "first" | "second";
+  turns?: number;
+  trials?: number;
+};
+
+export function simulateDeckVersion(versionId: number, options: DeckSimulationOptions = {}) {
+  const params = new URLSearchParams();
+
+  if (options.going) params.set("going", options.going);
+  if (options.turns) params.set("turns", String(options.turns));
+  if (options.trials) params.set("trials", String(options.trials));
+
+  return apiRequest<DeckSimulationResponse>(`/api/deck-versions/${versionId}/simulate?${params}`);
+}
+
+export function optimizeDeckVersion(versionId: number, payload: DeckOptimizePayload) {
+  return apiRequest<DeckOptimizeResponse>(`/api/deck-versions/${versionId}/optimize`, {
+    method: "POST",
+    body: JSON.stringify(payload),
+  });
+}
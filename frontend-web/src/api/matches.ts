@@ -1,5 +1,6 @@
 import { apiRequest } from "./client";
 import type {
+  BulkCreateMatchesResponse,
   CreateMatchPayload,
   Match,
   PaginatedMatchesResponse,
@@ -47,13 +48,27 @@ export async function getMatchesPage(page = 1, pageSize = 12) {
   };
 }
 
-export function createMatch(payload: CreateMatchPayload) {
+function idempotencyHeaders(idempotencyKey?: string): HeadersInit {
+  return idempotencyKey ? { "Idempotency-Key": idempotencyKey } : {};
+}
+
+// Resending with the same key returns the match saved the first time.
+export function createMatch(payload: CreateMatchPayload, idempotencyKey?: string) {
   return apiRequest<Match>("/api/matches", {
     method: "POST",
+    headers: idempotencyHeaders(idempotencyKey),
     body: JSON.stringify(payload),
   });
 }
 
+export function createMatches(matches: CreateMatchPayload[], idempotencyKey?: string) {
+  return apiRequest<BulkCreateMatchesResponse>("/api/matches/bulk", {
+    method: "POST",
+    headers: idempotencyHeaders(idempotencyKey),
+    body: JSON.stringify({ matches }),
+  });
+}
+
 export function deleteMatch(matchId: number) {
   return apiRequest<void>(`/api/matches/${matchId}`, {
     method: "DELETE",
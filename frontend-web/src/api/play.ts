@@ -1,8 +1,46 @@
 import { apiRequest } from "./client";
-import type { MatchFormat, RandomMatchupResponse } from "../types/api";
+import type {
+  MatchFormat,
+  MatchupPredictionResponse,
+  MatchupQueueResponse,
+  MatchupQueueStrategy,
+  MatchupSchedule,
+  RandomMatchupResponse,
+  TournamentPayload,
+  TournamentResponse,
+} from "../types/api";
 
-export function getRandomMatchup(format: MatchFormat = "Any") {
-  return apiRequest<RandomMatchupResponse>(
-    `/api/play/random?format=${encodeURIComponent(format)}`,
-  );
-}
\ No newline at end of file
+export function getRandomMatchup(
+  format: MatchFormat = "Any",
+  schedule: MatchupSchedule = "random",
+) {
+  const params = new URLSearchParams({ format, schedule });
+
+  return apiRequest<RandomMatchupResponse>(`/api/play/random?${params}`);
+}
+
+export function getMatchupQueue(
+  size = 10,
+  strategy: MatchupQueueStrategy = "round_robin",
+  format: MatchFormat = "Any",
+) {
+  const params = new URLSearchParams({ size: String(size), strategy, format });
+
+  return apiRequest<MatchupQueueResponse>(`/api/play/queue?${params}`);
+}
+
+export function getMatchupPrediction(deck1Id: number, deck2Id: number) {
+  const params = new URLSearchParams({
+    deck1_id: String(deck1Id),
+    deck2_id: String(deck2Id),
+  });
+
+  return apiRequest<MatchupPredictionResponse>(`/api/play/predict?${params}`);
+}
+
+export function simulateTournament(payload: TournamentPayload) {
+  return apiRequest<TournamentResponse>("/api/play/tournament", {
+    method: "POST",
+    body: JSON.stringify(payload),
+  });
+}
@@ -1,6 +1,113 @@
 import { apiRequest } from "./client";
-import type { StatsRow } from "../types/api";
+import type {
+  CardLiftResponse,
+  DeckTrendsResponse,
+  DeckType,
+  DeckVersionComparisonResponse,
+  MatchFormat,
+  RivalriesResponse,
+  StatsRow,
+  TurnOrderResponse,
+} from "../types/api";
 
-export function getStatsTable() {
-  return apiRequest<StatsRow[]>("/api/stats/table");
-}
\ No newline at end of file
+export type StatsSliceOptions = {
+  format?: MatchFormat;
+  since?: string;
+  until?: string;
+  activeOnly?: boolean;
+};
+
+function sliceParams(options: StatsSliceOptions) {
+  const params = new URLSearchParams();
+
+  if (options.format) params.set("format", options.format);
+  if (options.since) params.set("since", options.since);
+  if (options.until) params.set("until", options.until);
+  if (options.activeOnly) params.set("active_only", "true");
+
+  return params;
+}
+
+export function getStatsTable(options: StatsSliceOptions = {}) {
+  return apiRequest<StatsRow[]>(`/api/stats/table?${sliceParams(options)}`);
+}
+
+export type DeckTrendsOptions = {
+  days?: number;
+  windows?: number[];
+  format?: MatchFormat;
+  opponentType?: DeckType;
+};
+
+export function getDeckTrends(deckId: number, options: DeckTrendsOptions = {}) {
+  const params = new URLSearchParams();
+
+  if (options.days) params.set("days", String(options.days));
+  if (options.windows?.length) params.set("windows", options.windows.join(","));
+  if (options.format) params.set("format", options.format);
+  if (options.opponentType) params.set("opponent_type", options.opponentType);
+
+  return apiRequest<DeckTrendsResponse>(`/api/stats/trends/${deckId}?${params}`);
+}
+
+export function getVersionComparison(deckId: number, versionIds: number[] = []) {
+  const params = new URLSearchParams();
+
+  if (versionIds.length) params.set("version_ids", versionIds.join(","));
+
+  return apiRequest<DeckVersionComparisonResponse>(`/api/stats/versions/${deckId}?${params}`);
+}
+
+export type TurnOrderOptions = {
+  deckId?: number;
+  opponentId?: number;
+  format?: MatchFormat;
+  opponentType?: DeckType;
+  activeOnly?: boolean;
+};
+
+export function getTurnOrderStats(options: TurnOrderOptions = {}) {
+  const params = new URLSearchParams();
+
+  if (options.deckId) params.set("deck_id", String(options.deckId));
+  if (options.opponentId) params.set("opponent_id", String(options.opponentId));
+  if (options.format) params.set("format", options.format);
+  if (options.opponentType) params.set("opponent_type", options.opponentType);
+  if (options.activeOnly) params.set("active_only", "true");
+
+  return apiRequest<TurnOrderResponse>(`/api/stats/turn-order?${params}`);
+}
+
+export type RivalriesOptions = {
+  format?: MatchFormat;
+  minGames?: number;
+  limit?: number;
+};
+
+export function getRivalries(options: RivalriesOptions = {}) {
+  const params = new URLSearchParams();
+
+  if (options.format) params.set("format", options.format);
+  if (options.minGames) params.set("min_games", String(options.minGames));
+  if (options.limit) params.set("limit", String(options.limit));
+
+  return apiRequest<RivalriesResponse>(`/api/stats/rivalries?${params}`);
+}
+
+export type CardLiftOptions = {
+  format?: MatchFormat;
+  minGames?: number;
+  limit?: number;
+  sort?: "lift" | "games";
+};
+
+export function getCardLift(options: CardLiftOptions = {}) {
+  const params = new URLSearchParams();
+
+  if (options.format) params.set("format", options.format);
+  if (options.minGames) params.set("min_games", String(options.minGames));
+  if (options.limit) params.set("limit", String(options.limit));
+  if (options.sort) params.set("sort", options.sort);
+
+  return apiRequest<CardLiftResponse>(`/api/stats/cards?${params}`);
+}
@@ -0,0 +1,166 @@
+import { useEffect, useMemo, useState } from "react";
+import {
+  CartesianGrid,
+  Line,
+  LineChart,
+  ResponsiveContainer,
+  Tooltip,
+  XAxis,
+  YAxis,
+} from "recharts";
+
+import { getDeckTrends } from "../../api/stats";
+import type { DeckTrendsResponse, StatsRow } from "../../types/api";
+import { formatPercent } from "../../utils/format";
+
+const RANGE_OPTIONS = [90, 180, 365] as const;
+const WINDOW_COLORS: Record<string, string> = {
+  "7": "#7dd3fc",
+  "30": "#c4b5fd",
+  "90": "#6ee7b7",
+};
+
+type DeckTrendPanelProps = {
+  rows: StatsRow[];
+  onError: (message: string) => void;
+};
+
+export function DeckTrendPanel({ rows, onError }: DeckTrendPanelProps) {
+  const [deckId, setDeckId] = useState<number | null>(null);
+  const [days, setDays] = useState<number>(90);
+  const [trends, setTrends] = useState<DeckTrendsResponse | null>(null);
+
+  const selectedDeckId = deckId ?? rows[0]?.id ?? null;
+
+  useEffect(() => {
+    if (selectedDeckId === null) return;
+
+    getDeckTrends(selectedDeckId, { days })
+      .then(setTrends)
+      .catch((err) =>
+        onError(err instanceof Error ? err.message : "Failed to load deck trends"),
+      );
+  }, [selectedDeckId, days, onError]);
+
+  const chartRows = useMemo(() => {
+    if (!trends) return [];
+
+    return trends.series.map((point) => {
+      const values: Record<string, string | number | null> = { day: point.day };
+
+      for (const window of trends.windows) {
+        const value = point.rolling_win_pct[String(window)];
+        values[`w${window}`] = value === null ? null : Number((value * 100).toFixed(1));
+      }
+
+      return values;
+    });
+  }, [trends]);
+
+  return (
+    <section className="mt-6 rounded-[2rem] border border-white/10 bg-slate-950/45 p-6">
+      <div className="mb-6 flex flex-wrap items-end justify-between gap-3">
+        <div>
+          <h3 className="text-xl font-bold">Win rate over time</h3>
+          <p className="mt-1 text-sm text-slate-500">
+            Rolling win rates over the trailing 7, 30, and 90 days.
+          </p>
+        </div>
+
+        <div className="flex flex-wrap gap-2">
+          <select
+            value={selectedDeckId ?? ""}
+            onChange={(event) => setDeckId(Number(event.target.value))}
+            className="rounded-2xl border border-white/10 bg-black/30 px-4 py-3 text-sm font-semibold text-slate-100 outline-none focus:border-cyan-300/50"
+          >
+            {rows.map((row) => (
+              <option key={row.id} value={row.id}>
+                {row.name}
+              </option>
+            ))}
+          </select>
+
+          <select
+            value={days}
+            onChange={(event) => setDays(Number(event.target.value))}
+            className="rounded-2xl border border-white/10 bg-black/30 px-4 py-3 text-sm font-semibold text-slate-100 outline-none focus:border-cyan-300/50"
+          >
+            {RANGE_OPTIONS.map((option) => (
+              <option key={option} value={option}>
+                Last {option} days
+              </option>
+            ))}
+          </select>
+        </div>
+      </div>
+
+      {trends ? (
+        <>
+          <div className="mb-6 grid gap-3 md:grid-cols-3">
+            {trends.windows.map((window) => {
+              const summary = trends.summary[String(window)];
+
+              return (
+                <div
+                  key={window}
+                  className="rounded-2xl border border-white/10 bg-white/[0.04] p-4"
+                >
+                  <p className="text-xs text-slate-500">Last {window} days</p>
+                  <p className="mt-1 text-xl font-bold">
+                    {summary.win_pct === null ? "—" : formatPercent(summary.win_pct)}
+                  </p>
+                  <p className="mt-1 text-xs text-slate-500">
+                    {summary.decided_games} decided · {summary.undecided} undecided
+                  </p>
+                </div>
+              );
+            })}
+          </div>
+
+          <div className="h-[20rem]">
+            <ResponsiveContainer width="100%" height="100%">
+              <LineChart data={chartRows} margin={{ top: 8, right: 24, bottom: 8, left: 0 }}>
+                <CartesianGrid strokeDasharray="3 3" stroke="rgba(255,255,255,0.08)" />
+                <XAxis
+                  dataKey="day"
+                  tick={{ fill: "#94a3b8", fontSize: 12 }}
+                  stroke="rgba(255,255,255,0.15)"
+                  minTickGap={32}
+                />
+                <YAxis
+                  domain={[0, 100]}
+                  tick={{ fill: "#94a3b8", fontSize: 12 }}
+                  tickFormatter={(value) => `${value}%`}
+                  stroke="rgba(255,255,255,0.15)"
+                />
+                <Tooltip
+                  contentStyle={{
+                    background: "#020617",
+                    border: "1px solid rgba(255,255,255,0.12)",
+                    borderRadius: "16px",
+                    color: "#f8fafc",
+                  }}
+                  formatter={(value, name) => [`${value}%`, `${String(name).slice(1)}-day`]}
+                />
+                {trends.windows.map((window) => (
+                  <Line
+                    key={window}
+                    type="monotone"
+                    dataKey={`w${window}`}
+                    stroke={WINDOW_COLORS[String(window)] ?? "#f8fafc"}
+                    dot={false}
+                    connectNulls={false}
+                  />
+                ))}
+              </LineChart>
+            </ResponsiveContainer>
+          </div>
+        </>
+      ) : (
+        <div className="rounded-3xl border border-dashed border-white/15 bg-white/[0.025] p-10 text-center text-slate-500">
+          Choose a deck to see its trend.
+        </div>
+      )}
+    </section>
+  );
+}
@@ -0,0 +1,97 @@
+import { useEffect, useState } from "react";
+
+import { getTurnOrderStats } from "../../api/stats";
+import type { TrendWindowSummary, TurnOrderResponse, TurnOrderSplit } from "../../types/api";
+import { formatPercent } from "../../utils/format";
+
+type TurnOrderPanelProps = {
+  activeOnly: boolean;
+  onError: (message: string) => void;
+};
+
+function formatRate(summary: TrendWindowSummary) {
+  return summary.win_pct === null ? "—" : formatPercent(summary.win_pct);
+}
+
+function formatAdvantage(split: TurnOrderSplit) {
+  if (split.advantage === null) return "—";
+
+  const points = Math.round(split.advantage * 1000) / 10;
+  return `${points > 0 ? "+" : ""}${points} pts`;
+}
+
+export function TurnOrderPanel({ activeOnly, onError }: TurnOrderPanelProps) {
+  const [report, setReport] = useState<TurnOrderResponse | null>(null);
+
+  useEffect(() => {
+    getTurnOrderStats({ activeOnly })
+      .then(setReport)
+      .catch((err) =>
+        onError(err instanceof Error ? err.message : "Failed to load turn order stats"),
+      );
+  }, [activeOnly, onError]);
+
+  const decks = (report?.decks ?? []).filter(
+    (row) => row.first.decided_games + row.second.decided_games > 0,
+  );
+
+  return (
+    <section className="mt-6 rounded-[2rem] border border-white/10 bg-white/[0.04] p-5">
+      <div className="flex flex-wrap items-end justify-between gap-3">
+        <div>
+          <h3 className="text-xl font-bold">Going first vs second</h3>
+          <p className="mt-1 text-sm text-slate-500">
+            Games with a recorded first player.
+          </p>
+        </div>
+
+        {report ? (
+          <div className="flex flex-wrap gap-2 text-sm">
+            <span className="rounded-full border border-white/10 bg-black/20 px-3 py-1">
+              First player wins {formatRate(report.overall)}
+            </span>
+            {report.formats.map((row) => (
+              <span
+                key={row.format ?? "none"}
+                className="rounded-full border border-white/10 bg-black/20 px-3 py-1 text-slate-400"
+              >
+                {row.format ?? "No format"}: {formatRate(row.first)}
+              </span>
+            ))}
+          </div>
+        ) : null}
+      </div>
+
+      {decks.length ? (
+        <div className="mt-4 overflow-x-auto">
+          <table className="w-full min-w-[640px] border-separate border-spacing-y-2 text-left text-sm">
+            <thead>
+              <tr className="text-xs uppercase tracking-[0.18em] text-slate-500">
+                <th className="px-4 py-2">Deck</th>
+                <th className="px-4 py-2">Going first</th>
+                <th className="px-4 py-2">Going second</th>
+                <th className="px-4 py-2">Advantage</th>
+              </tr>
+            </thead>
+            <tbody>
+              {decks.map((row) => (
+                <tr key={row.deck_id} className="bg-white/[0.035]">
+                  <td className="rounded-l-2xl px-4 py-3 font-semibold">{row.deck_name}</td>
+                  <td className="px-4 py-3">
+                    {row.first.wins}-{row.first.losses} · {formatRate(row.first)}
+                  </td>
+                  <td className="px-4 py-3">
+                    {row.second.wins}-{row.second.losses} · {formatRate(row.second)}
+                  </td>
+                  <td className="rounded-r-2xl px-4 py-3">{formatAdvantage(row)}</td>
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        </div>
+      ) : (
+        <p className="mt-4 text-slate-500">No games with a recorded first player yet.</p>
+      )}
+    </section>
+  );
+}
@@ -0,0 +1,147 @@
+import { useEffect, useState } from "react";
+
+import { getVersionComparison } from "../../api/stats";
+import type {
+  DeckVersionComparisonResponse,
+  StatsRow,
+  TrendWindowSummary,
+  VersionTurnOrder,
+} from "../../types/api";
+import { formatPercent } from "../../utils/format";
+
+const TURN_ORDER_LABELS: Record<VersionTurnOrder, string> = {
+  first: "Going first",
+  second: "Going second",
+  unknown: "Unrecorded",
+};
+
+const OPPONENT_LIMIT = 12;
+
+type VersionComparisonPanelProps = {
+  rows: StatsRow[];
+  onError: (message: string) => void;
+};
+
+function formatRecord(summary: TrendWindowSummary | undefined) {
+  if (!summary || summary.logged_games === 0) return "—";
+
+  const rate = summary.win_pct === null ? "—" : formatPercent(summary.win_pct);
+  return `${summary.wins}-${summary.losses} · ${rate}`;
+}
+
+export function VersionComparisonPanel({ rows, onError }: VersionComparisonPanelProps) {
+  const [deckId, setDeckId] = useState<number | null>(null);
+  const [comparison, setComparison] = useState<DeckVersionComparisonResponse | null>(null);
+
+  const selectedDeckId = deckId ?? rows[0]?.id ?? null;
+
+  useEffect(() => {
+    if (selectedDeckId === null) return;
+
+    getVersionComparison(selectedDeckId)
+      .then(setComparison)
+      .catch((err) =>
+        onError(err instanceof Error ? err.message : "Failed to load version stats"),
+      );
+  }, [selectedDeckId, onError]);
+
+  const versions = comparison?.versions ?? [];
+  const opponents = [...(comparison?.opponents ?? [])]
+    .sort((left, right) => {
+      const games = (entry: typeof left) =>
+        Object.values(entry.by_version).reduce((total, record) => total + record.logged_games, 0);
+      return games(right) - games(left);
+    })
+    .slice(0, OPPONENT_LIMIT);
+
+  return (
+    <section className="mt-6 rounded-[2rem] border border-white/10 bg-slate-950/45 p-6">
+      <div className="mb-6 flex flex-wrap items-end justify-between gap-3">
+        <div>
+          <h3 className="text-xl font-bold">Version comparison</h3>
+          <p className="mt-1 text-sm text-slate-500">
+            Results for each saved version, from matches that recorded it.
+          </p>
+        </div>
+
+        <select
+          value={selectedDeckId ?? ""}
+          onChange={(event) => setDeckId(Number(event.target.value))}
+          className="rounded-2xl border border-white/10 bg-black/30 px-4 py-3 text-sm font-semibold text-slate-100 outline-none focus:border-cyan-300/50"
+        >
+          {rows.map((row) => (
+            <option key={row.id} value={row.id}>
+              {row.name}
+            </option>
+          ))}
+        </select>
+      </div>
+
+      {versions.length ? (
+        <div className="overflow-x-auto">
+          <table className="w-full min-w-[640px] border-separate border-spacing-y-2 text-left text-sm">
+            <thead>
+              <tr className="text-xs uppercase tracking-[0.18em] text-slate-500">
+                <th className="px-4 py-2" />
+                {versions.map((version) => (
+                  <th key={version.id} className="px-4 py-2">
+                    {version.version_name}
+                    {version.is_active ? (
+                      <span className="ml-2 text-[0.65rem] text-emerald-300">Active</span>
+                    ) : null}
+                  </th>
+                ))}
+              </tr>
+            </thead>
+            <tbody>
+              <tr className="bg-white/[0.035]">
+                <td className="rounded-l-2xl px-4 py-3 font-semibold">Overall</td>
+                {versions.map((version) => (
+                  <td key={version.id} className="px-4 py-3 last:rounded-r-2xl">
+                    {formatRecord(version.record)}
+                  </td>
+                ))}
+              </tr>
+              <tr className="bg-white/[0.035]">
+                <td className="rounded-l-2xl px-4 py-3 font-semibold">Rating</td>
+                {versions.map((version) => (
+                  <td key={version.id} className="px-4 py-3 last:rounded-r-2xl">
+                    {version.rated_games ? Math.round(version.rating) : "—"}
+                  </td>
+                ))}
+              </tr>
+              {(Object.keys(TURN_ORDER_LABELS) as VersionTurnOrder[]).map((order) => (
+                <tr key={order} className="bg-white/[0.035]">
+                  <td className="rounded-l-2xl px-4 py-3 text-slate-400">
+                    {TURN_ORDER_LABELS[order]}
+                  </td>
+                  {versions.map((version) => (
+                    <td key={version.id} className="px-4 py-3 last:rounded-r-2xl">
+                      {formatRecord(version.turn_order[order])}
+                    </td>
+                  ))}
+                </tr>
+              ))}
+              {opponents.map((opponent) => (
+                <tr key={opponent.opponent_id} className="bg-white/[0.035]">
+                  <td className="rounded-l-2xl px-4 py-3 text-slate-400">
+                    vs {opponent.opponent_name}
+                  </td>
+                  {versions.map((version) => (
+                    <td key={version.id} className="px-4 py-3 last:rounded-r-2xl">
+                      {formatRecord(opponent.by_version[String(version.id)])}
+                    </td>
+                  ))}
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        </div>
+      ) : (
+        <div className="rounded-3xl border border-dashed border-white/15 bg-white/[0.025] p-10 text-center text-slate-500">
+          This deck has no saved versions yet.
+        </div>
+      )}
+    </section>
+  );
+}
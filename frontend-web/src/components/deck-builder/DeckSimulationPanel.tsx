@@ -0,0 +1,133 @@
+import { useEffect, useState } from "react";
+import { Dices } from "lucide-react";
+
+import { simulateDeckVersion } from "../../api/deckBuilder";
+import type { DeckSimulationResponse, DeckVersion } from "../../types/api";
+import { formatPercent } from "../../utils/format";
+
+type GoingOrder = "first" | "second";
+
+type DeckSimulationPanelProps = {
+  currentVersion: DeckVersion | null;
+};
+
+function formatRate(value: number | null | undefined) {
+  return value === null || value === undefined ? "—" : formatPercent(value);
+}
+
+export function DeckSimulationPanel({ currentVersion }: DeckSimulationPanelProps) {
+  const [going, setGoing] = useState<GoingOrder>("first");
+  const [report, setReport] = useState<DeckSimulationResponse | null>(null);
+  const [message, setMessage] = useState<string | null>(null);
+
+  const versionId = currentVersion?.id ?? null;
+  // Card edits change the totals, which re-runs the simulation.
+  const contentKey = JSON.stringify(currentVersion?.totals_by_zone ?? {});
+
+  useEffect(() => {
+    if (versionId === null) return;
+
+    setMessage(null);
+    simulateDeckVersion(versionId, { going })
+      .then(setReport)
+      .catch((err) => {
+        setReport(null);
+        setMessage(err instanceof Error ? err.message : "Failed to simulate this deck");
+      });
+  }, [versionId, going, contentKey]);
+
+  if (!currentVersion) return null;
+
+  return (
+    <section className="rounded-[2rem] border border-white/10 bg-slate-950/45 p-6">
+      <div className="mb-5 flex flex-wrap items-end justify-between gap-3">
+        <div>
+          <h3 className="flex items-center gap-2 text-xl font-bold">
+            <Dices className="h-5 w-5 text-cyan-200" />
+            Consistency check
+          </h3>
+          <p className="mt-1 text-sm text-slate-500">
+            {report
+              ? `${report.parameters.trials.toLocaleString()} simulated shuffles of the main deck.`
+              : "Simulated shuffles of the main deck."}
+          </p>
+        </div>
+
+        <select
+          value={going}
+          onChange={(event) => setGoing(event.target.value as GoingOrder)}
+          className="rounded-2xl border border-white/10 bg-black/30 px-4 py-3 text-sm font-semibold text-slate-100 outline-none focus:border-cyan-300/50"
+        >
+          <option value="first">Going first</option>
+          <option value="second">Going second</option>
+        </select>
+      </div>
+
+      {message ? <p className="text-sm text-slate-500">{message}</p> : null}
+
+      {report ? (
+        <>
+          <div className="grid gap-3 text-sm md:grid-cols-3">
+            <div className="rounded-3xl border border-white/10 bg-white/[0.04] p-4">
+              <p className="text-slate-500">Ride line in opening hand</p>
+              <p className="mt-1 text-2xl font-black">
+                {formatRate(report.opening_hand.ride_line.exact)}
+              </p>
+              <p className="text-slate-500">
+                {formatRate(report.after_mulligan.ride_line)} after mulligan
+              </p>
+            </div>
+            <div className="rounded-3xl border border-white/10 bg-white/[0.04] p-4">
+              <p className="text-slate-500">Triggers</p>
+              <p className="mt-1 text-2xl font-black">
+                {report.deck.triggers} / {report.deck.main_cards}
+              </p>
+              <p className="text-slate-500">
+                {formatRate(report.exact_trigger_rate)} per drive check
+              </p>
+            </div>
+            <div className="rounded-3xl border border-white/10 bg-white/[0.04] p-4">
+              <p className="text-slate-500">No trigger in opening hand</p>
+              <p className="mt-1 text-2xl font-black">
+                {formatRate(report.opening_hand.triggers[0]?.exact)}
+              </p>
+            </div>
+          </div>
+
+          <div className="mt-4 overflow-x-auto">
+            <table className="w-full min-w-[560px] border-separate border-spacing-y-2 text-left text-sm">
+              <thead>
+                <tr className="text-xs uppercase tracking-[0.18em] text-slate-500">
+                  <th className="px-4 py-2">Turn</th>
+                  <th className="px-4 py-2">Ride</th>
+                  <th className="px-4 py-2">Grade assist</th>
+                  <th className="px-4 py-2">Drive triggers</th>
+                  <th className="px-4 py-2">Any trigger</th>
+                </tr>
+              </thead>
+              <tbody>
+                {report.turns.map((turn) => (
+                  <tr key={turn.turn} className="bg-white/[0.035]">
+                    <td className="rounded-l-2xl px-4 py-3 font-semibold">{turn.turn}</td>
+                    <td className="px-4 py-3">
+                      {turn.ride_grade === null
+                        ? "—"
+                        : `G${turn.ride_grade} · ${formatRate(turn.ride_rate)}`}
+                    </td>
+                    <td className="px-4 py-3">
+                      {turn.assist_rate
+                        ? `${formatRate(turn.assist_rate)} · hits ${formatRate(turn.assist_hit_rate)}`
+                        : "—"}
+                    </td>
+                    <td className="px-4 py-3">{turn.drive_triggers.toFixed(2)}</td>
+                    <td className="rounded-r-2xl px-4 py-3">{formatRate(turn.any_trigger)}</td>
+                  </tr>
+                ))}
+              </tbody>
+            </table>
+          </div>
+        </>
+      ) : null}
+    </section>
+  );
+}
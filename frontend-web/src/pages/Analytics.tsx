@@ -10,12 +10,15 @@ import {
 } from "recharts";
 
 import { getStatsTable } from "../api/stats";
+import { DeckTrendPanel } from "../components/analytics/DeckTrendPanel";
+import { TurnOrderPanel } from "../components/analytics/TurnOrderPanel";
+import { VersionComparisonPanel } from "../components/analytics/VersionComparisonPanel";
 import { FormatBadge } from "../components/badges/FormatBadge";
 import { StatusBadge } from "../components/badges/StatusBadge";
 import { StatCard } from "../components/cards/StatCard";
 import { useToast } from "../components/feedback/useToast";
 import { PageHeader } from "../components/layout/PageHeader";
-import type { DeckType, StatsRow } from "../types/api";
+import type { DeckType, MatchFormat, StatsRow } from "../types/api";
 import { formatPercent, formatRecord } from "../utils/format";
 
 type FormatFilter = "All" | DeckType;
@@ -24,6 +27,9 @@ export function Analytics() {
   const [rows, setRows] = useState<StatsRow[]>([]);
   const [format, setFormat] = useState<FormatFilter>("All");
   const [activeOnly, setActiveOnly] = useState(false);
+  const [matchFormat, setMatchFormat] = useState<MatchFormat | "">("");
+  const [since, setSince] = useState("");
+  const [until, setUntil] = useState("");
   const [error, setError] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
   const toast = useToast();
@@ -35,13 +41,18 @@ export function Analytics() {
   }, [error, toast]);
 
   useEffect(() => {
-    getStatsTable()
+    getStatsTable({
+      format: matchFormat || undefined,
+      since: since || undefined,
+      until: until || undefined,
+      activeOnly,
+    })
       .then(setRows)
       .catch((err) =>
         setError(err instanceof Error ? err.message : "Failed to load analytics"),
       )
       .finally(() => setLoading(false));
-  }, []);
+  }, [matchFormat, since, until, activeOnly]);
 
   const filteredRows = useMemo(() => {
     return rows.filter((row) => {
@@ -131,6 +142,34 @@ export function Analytics() {
             >
               Active only
             </button>
+
+            <select
+              value={matchFormat}
+              onChange={(event) => setMatchFormat(event.target.value as MatchFormat | "")}
+              className="rounded-full border border-white/10 bg-black/30 px-4 py-2 text-sm font-semibold text-slate-100 outline-none focus:border-cyan-300/50"
+            >
+              <option value="">Every match format</option>
+              <option value="Standard">Standard matches</option>
+              <option value="Stride">Stride matches</option>
+              <option value="Any">Any-format matches</option>
+            </select>
+
+            <input
+              type="month"
+              value={since}
+              max={until || undefined}
+              onChange={(event) => setSince(event.target.value)}
+              aria-label="From month"
+              className="rounded-full border border-white/10 bg-black/30 px-4 py-2 text-sm text-slate-100 outline-none focus:border-cyan-300/50"
+            />
+            <input
+              type="month"
+              value={until}
+              min={since || undefined}
+              onChange={(event) => setUntil(event.target.value)}
+              aria-label="To month"
+              className="rounded-full border border-white/10 bg-black/30 px-4 py-2 text-sm text-slate-100 outline-none focus:border-cyan-300/50"
+            />
           </div>
         </div>
       </section>
@@ -247,6 +286,10 @@ export function Analytics() {
             </div>
           </section>
 
+          <DeckTrendPanel rows={filteredRows} onError={setError} />
+          <VersionComparisonPanel rows={filteredRows} onError={setError} />
+          <TurnOrderPanel activeOnly={activeOnly} onError={setError} />
+
           <section className="mt-6 rounded-[2rem] border border-white/10 bg-white/[0.04] p-5">
             <h3 className="text-xl font-bold">Deck table</h3>
 
@@ -259,6 +302,7 @@ export function Analytics() {
                     <th className="px-4 py-2">Status</th>
                     <th className="px-4 py-2">Record</th>
                     <th className="px-4 py-2">Win rate</th>
+                    <th className="px-4 py-2">Rating</th>
                     <th className="px-4 py-2">Logged</th>
                     <th className="px-4 py-2">Undecided</th>
                   </tr>
@@ -281,6 +325,9 @@ export function Analytics() {
                       <td className="px-4 py-3 text-slate-300">
                         {formatPercent(row.win_pct)}
                       </td>
+                      <td className="px-4 py-3 text-slate-300">
+                        {Math.round(row.rating)}
+                      </td>
                       <td className="px-4 py-3 text-slate-300">{row.logged_games}</td>
                       <td className="rounded-r-2xl px-4 py-3 text-slate-300">
                         {row.undecided}
@@ -25,6 +25,7 @@ import { CardCatalogPanel } from "../components/deck-builder/CardCatalogPanel";
 import { DeckBuilderSetup } from "../components/deck-builder/DeckBuilderSetup";
 import { DeckVersionComparison } from "../components/deck-builder/DeckVersionComparison";
 import { DeckVersionContents } from "../components/deck-builder/DeckVersionContents";
+import { DeckSimulationPanel } from "../components/deck-builder/DeckSimulationPanel";
 import { useToast } from "../components/feedback/useToast";
 import {
   DEFAULT_CARD_FORM_OPTIONS,
@@ -699,6 +700,8 @@ export function DeckBuilder() {
           onSelectedBaselineIdChange={setComparisonBaselineId}
         />
 
+        <DeckSimulationPanel currentVersion={currentVersion} />
+
         <div className="grid gap-6 xl:grid-cols-[0.9fr_1.1fr] xl:items-start">
           <CardCatalogPanel
             cardSearch={cardSearch}
@@ -3,16 +3,27 @@ import { Dices, RefreshCcw, Save, Shuffle, Swords } from "lucide-react";
 
 import { getDecks } from "../api/decks";
 import { createMatch } from "../api/matches";
-import { getRandomMatchup } from "../api/play";
+import { getMatchupPrediction, getRandomMatchup } from "../api/play";
 import { usePlayLabReveal } from "../animations/usePlayLabReveal";
 import { FormatBadge } from "../components/badges/FormatBadge";
 import { useToast } from "../components/feedback/useToast";
 import { PageHeader } from "../components/layout/PageHeader";
-import type { Deck, MatchFormat, RandomMatchupResponse } from "../types/api";
+import type {
+  Deck,
+  MatchFormat,
+  MatchupSchedule,
+  RandomMatchupResponse,
+} from "../types/api";
 import { formatPercent, formatRecord } from "../utils/format";
 
 type MatchupMode = "random" | "custom";
 
+const SCHEDULE_LABELS: Record<MatchupSchedule, string> = {
+  random: "Any pair",
+  least_played: "Least played",
+  uncertain: "Most uncertain",
+};
+
 function MatchupDeckPanel({
   deck,
   selected,
@@ -68,7 +79,8 @@ function MatchupDeckPanel({
               {deck.nation ?? "No nation"}
             </p>
             <p className="mt-2 text-sm text-slate-400">
-              {formatRecord(deck.wins, deck.losses)} · {formatPercent(deck.win_pct)}
+              {formatRecord(deck.wins, deck.losses)} · {formatPercent(deck.win_pct)} ·{" "}
+              {Math.round(deck.rating)} Elo
             </p>
           </div>
         </div>
@@ -98,6 +110,7 @@ export function PlayLab() {
   const [decks, setDecks] = useState<Deck[]>([]);
   const [mode, setMode] = useState<MatchupMode>("random");
   const [format, setFormat] = useState<MatchFormat>("Any");
+  const [schedule, setSchedule] = useState<MatchupSchedule>("random");
 
   const [customDeck1Id, setCustomDeck1Id] = useState<number | "">("");
   const [customDeck2Id, setCustomDeck2Id] = useState<number | "">("");
@@ -115,6 +128,8 @@ export function PlayLab() {
   const toast = useToast();
 
   const matchupStageRef = useRef<HTMLElement | null>(null);
+  // One key per matchup, so retrying a save after a dropped response does not log it twice.
+  const saveKeyRef = useRef<string | null>(null);
   const [revealTrigger, setRevealTrigger] = useState(0);
 
   usePlayLabReveal(matchupStageRef, revealTrigger);
@@ -179,9 +194,10 @@ export function PlayLab() {
     setRolling(true);
 
     try {
-      const result = await getRandomMatchup(format);
+      const result = await getRandomMatchup(format, schedule);
 
       setMatchup(result);
+      saveKeyRef.current = null;
       setWinnerId(null);
       setFirstPlayerId(result.first_player.id);
       setNotes("");
@@ -193,7 +209,7 @@ export function PlayLab() {
     }
   }
 
-  function buildCustomMatchup() {
+  async function buildCustomMatchup() {
     setError(null);
     setMessage(null);
 
@@ -207,12 +223,19 @@ export function PlayLab() {
       return;
     }
 
+    // The prediction is optional; a custom matchup still works without it.
+    const predicted = await getMatchupPrediction(customDeck1.id, customDeck2.id).catch(
+      () => null,
+    );
+
     setMatchup({
-      deck1: customDeck1,
-      deck2: customDeck2,
+      deck1: predicted?.deck1 ?? customDeck1,
+      deck2: predicted?.deck2 ?? customDeck2,
       first_player: customDeck1,
       format,
+      prediction: predicted?.prediction,
     });
+    saveKeyRef.current = null;
 
     setWinnerId(null);
     setFirstPlayerId(customDeck1.id);
@@ -226,6 +249,7 @@ export function PlayLab() {
     setError(null);
     setMessage(null);
     setSaving(true);
+    saveKeyRef.current ??= crypto.randomUUID();
 
     try {
       await createMatch({
@@ -235,8 +259,9 @@ export function PlayLab() {
         first_player_id: firstPlayerId,
         format,
         notes,
-      });
+      }, saveKeyRef.current);
 
+      saveKeyRef.current = null;
       setMessage("Match saved. The records are updated and the battle is logged.");
       setMatchup(null);
       setWinnerId(null);
@@ -313,12 +338,40 @@ export function PlayLab() {
 
           {mode === "random" ? (
             <div className="mt-5 flex flex-wrap items-center justify-between gap-4 rounded-3xl border border-white/10 bg-black/20 p-4">
-              <p className="text-sm text-slate-400">
-                Eligible active decks:{" "}
-                <span className="font-bold text-slate-100">
-                  {eligibleDeckCount}
-                </span>
-              </p>
+              <div className="grid gap-3">
+                <p className="text-sm text-slate-400">
+                  Eligible active decks:{" "}
+                  <span className="font-bold text-slate-100">
+                    {eligibleDeckCount}
+                  </span>
+                </p>
+
+                <div className="flex flex-wrap gap-2">
+                  {(Object.keys(SCHEDULE_LABELS) as MatchupSchedule[]).map((item) => (
+                    <button
+                      key={item}
+                      type="button"
+                      onClick={() => setSchedule(item)}
+                      className={[
+                        "rounded-full border px-3 py-1.5 text-xs font-semibold transition",
+                        schedule === item
+                          ? "border-cyan-300/50 bg-cyan-300/15 text-cyan-100"
+                          : "border-white/10 bg-white/[0.04] text-slate-300 hover:bg-white/[0.08]",
+                      ].join(" ")}
+                    >
+                      {SCHEDULE_LABELS[item]}
+                    </button>
+                  ))}
+                </div>
+
+                {matchup?.pair ? (
+                  <p className="text-xs text-slate-500">
+                    This pairing has {matchup.pair.games} logged game
+                    {matchup.pair.games === 1 ? "" : "s"} ({matchup.pair.deck1_wins}-
+                    {matchup.pair.deck2_wins}).
+                  </p>
+                ) : null}
+              </div>
 
               <button
                 type="button"
@@ -441,8 +494,17 @@ export function PlayLab() {
               data-anime="vs-badge"
               className="flex items-center justify-center will-change-transform"
             >
-              <div className="rounded-full border border-white/10 bg-white/[0.05] px-5 py-3 text-sm font-black text-slate-300">
-                VS
+              <div className="flex flex-col items-center gap-2">
+                <div className="rounded-full border border-white/10 bg-white/[0.05] px-5 py-3 text-sm font-black text-slate-300">
+                  VS
+                </div>
+                {matchup.prediction ? (
+                  <p className="text-center text-xs font-semibold text-slate-400">
+                    {formatPercent(matchup.prediction.deck1_win_probability)} ·{" "}
+                    {formatPercent(matchup.prediction.deck2_win_probability)}
+                    <span className="block text-slate-500">Predicted odds</span>
+                  </p>
+                ) : null}
               </div>
             </div>
 
@@ -1,101 +1,42 @@
-import { useEffect, useMemo, useState } from "react";
+import { useCallback, useEffect, useMemo, useState } from "react";
 import { RefreshCcw, Search } from "lucide-react";
 
-import { getMatches } from "../api/matches";
+import { getRivalries } from "../api/stats";
 import {
   RivalryCard,
   type RivalryRow,
 } from "../components/cards/RivalryCard";
 import { useToast } from "../components/feedback/useToast";
 import { PageHeader } from "../components/layout/PageHeader";
-import type { Match, MatchFormat } from "../types/api";
+import type { MatchFormat, RivalriesResponse, RivalryPair } from "../types/api";
 
 type FormatFilter = "All" | MatchFormat;
 type MinGamesFilter = 1 | 2 | 3 | 5 | 10;
 
 const MIN_GAME_OPTIONS: MinGamesFilter[] = [1, 2, 3, 5, 10];
 
-function makePairKey(deck1Id: number, deck2Id: number) {
-  return [deck1Id, deck2Id].sort((a, b) => a - b).join("-");
-}
-
-function buildRivalries(matches: Match[]) {
-  const map = new Map<string, RivalryRow>();
-
-  for (const match of matches) {
-    const key = makePairKey(match.deck1_id, match.deck2_id);
-    const existing = map.get(key);
-
-    const deckAIsDeck1 = match.deck1_id < match.deck2_id;
-
-    const deckAId = deckAIsDeck1 ? match.deck1_id : match.deck2_id;
-    const deckBId = deckAIsDeck1 ? match.deck2_id : match.deck1_id;
-
-    const deckAName = deckAIsDeck1 ? match.deck1_name : match.deck2_name;
-    const deckBName = deckAIsDeck1 ? match.deck2_name : match.deck1_name;
-
-    const deckA = deckAIsDeck1 ? match.deck1 : match.deck2;
-    const deckB = deckAIsDeck1 ? match.deck2 : match.deck1;
-
-    const row =
-      existing ??
-      ({
-        key,
-        deckAId,
-        deckBId,
-        deckAName,
-        deckBName,
-        deckA,
-        deckB,
-        deckAWins: 0,
-        deckBWins: 0,
-        undecided: 0,
-        total: 0,
-        decided: 0,
-        lastPlayedIso: null,
-        lastMatch: null,
-        formats: new Set<string>(),
-      } satisfies RivalryRow);
-
-    row.total += 1;
-
-    if (match.format) {
-      row.formats.add(match.format);
-    }
-
-    if (match.is_undecided || match.winner_id === null) {
-      row.undecided += 1;
-    } else {
-      row.decided += 1;
-
-      if (match.winner_id === row.deckAId) {
-        row.deckAWins += 1;
-      } else if (match.winner_id === row.deckBId) {
-        row.deckBWins += 1;
-      }
-    }
-
-    const matchDate = match.date_played_iso;
-
-    if (
-      matchDate &&
-      (!row.lastPlayedIso || new Date(matchDate) > new Date(row.lastPlayedIso))
-    ) {
-      row.lastPlayedIso = matchDate;
-      row.lastMatch = match;
-    }
-
-    map.set(key, row);
-  }
-
-  return Array.from(map.values()).sort((a, b) => {
-    if (b.total !== a.total) return b.total - a.total;
-    return (b.lastPlayedIso ?? "").localeCompare(a.lastPlayedIso ?? "");
-  });
+function toRivalryRow(pair: RivalryPair): RivalryRow {
+  return {
+    key: `${pair.deck_a.id}-${pair.deck_b.id}`,
+    deckAId: pair.deck_a.id,
+    deckBId: pair.deck_b.id,
+    deckAName: pair.deck_a.name,
+    deckBName: pair.deck_b.name,
+    deckA: pair.deck_a,
+    deckB: pair.deck_b,
+    deckAWins: pair.deck_a_wins,
+    deckBWins: pair.deck_b_wins,
+    undecided: pair.undecided,
+    total: pair.total,
+    decided: pair.decided,
+    lastPlayedIso: pair.last_played,
+    lastMatch: pair.last_match,
+    formats: new Set<string>(pair.formats),
+  };
 }
 
 export function Rivalries() {
-  const [matches, setMatches] = useState<Match[]>([]);
+  const [report, setReport] = useState<RivalriesResponse | null>(null);
   const [search, setSearch] = useState("");
   const [format, setFormat] = useState<FormatFilter>("All");
   const [minGames, setMinGames] = useState<MinGamesFilter>(1);
@@ -109,47 +50,49 @@ export function Rivalries() {
     setError(null);
   }, [error, toast]);
 
-  async function loadMatches() {
+  const loadRivalries = useCallback(async () => {
     setError(null);
     setLoading(true);
 
     try {
-      const rows = await getMatches();
-      setMatches(rows);
+      const response = await getRivalries({
+        format: format === "All" ? undefined : format,
+        minGames,
+      });
+      setReport(response);
     } catch (err) {
       setError(err instanceof Error ? err.message : "Failed to load rivalries");
     } finally {
       setLoading(false);
     }
-  }
+  }, [format, minGames]);
 
   useEffect(() => {
-    loadMatches();
-  }, []);
+    loadRivalries();
+  }, [loadRivalries]);
 
-  const rivalryRows = useMemo(() => buildRivalries(matches), [matches]);
+  const rivalryRows = useMemo(
+    () => (report?.rivalries ?? []).map(toRivalryRow),
+    [report],
+  );
 
   const filteredRows = useMemo(() => {
     const needle = search.trim().toLowerCase();
 
-    return rivalryRows.filter((row) => {
-      const matchesSearch =
-        !needle ||
+    if (!needle) return rivalryRows;
+
+    return rivalryRows.filter(
+      (row) =>
         row.deckAName.toLowerCase().includes(needle) ||
         row.deckBName.toLowerCase().includes(needle) ||
         (row.deckA?.nation ?? "").toLowerCase().includes(needle) ||
-        (row.deckB?.nation ?? "").toLowerCase().includes(needle);
-
-      const matchesFormat = format === "All" || row.formats.has(format);
-      const matchesMinGames = row.total >= minGames;
-
-      return matchesSearch && matchesFormat && matchesMinGames;
-    });
-  }, [rivalryRows, search, format, minGames]);
+        (row.deckB?.nation ?? "").toLowerCase().includes(needle),
+    );
+  }, [rivalryRows, search]);
 
   const topRivalry = rivalryRows[0] ?? null;
-  const totalPairings = rivalryRows.length;
-  const totalLogged = matches.length;
+  const totalPairings = report?.summary.pairings ?? 0;
+  const totalLogged = report?.summary.logged_matches ?? 0;
 
   return (
     <>
@@ -222,7 +165,7 @@ export function Rivalries() {
 
           <button
             type="button"
-            onClick={loadMatches}
+            onClick={loadRivalries}
             className="inline-flex items-center justify-center gap-2 rounded-2xl border border-white/10 bg-white/[0.05] px-5 py-3 text-sm font-bold text-slate-200 transition hover:bg-white/[0.09]"
           >
             <RefreshCcw className="h-4 w-4" />
@@ -233,7 +176,7 @@ export function Rivalries() {
         <div className="mt-4 flex flex-wrap gap-3 text-sm text-slate-500">
           <span>{filteredRows.length} rivalries shown</span>
           <span>•</span>
-          <span>{rivalryRows.length} total pairings</span>
+          <span>{totalPairings} total pairings</span>
         </div>
       </section>
 
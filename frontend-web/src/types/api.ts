@@ -12,6 +12,8 @@ export type Deck = {
   games: number;
   decided_games: number;
   win_pct: number;
+  rating: number;
+  rated_games: number;
   active: boolean;
   created_at?: string | null;
 };
@@ -43,6 +45,7 @@ export type Match = {
   result_status: MatchResultStatus;
   is_decided: boolean;
   is_undecided: boolean;
+  client_match_id?: string | null;
 };
 
 export type CreateMatchPayload = {
@@ -54,6 +57,34 @@ export type CreateMatchPayload = {
   first_player_id?: number | null;
   format?: MatchFormat | null;
   notes?: string;
+  client_match_id?: string | null;
+};
+
+export type BulkCreateMatchesResponse = {
+  created: number;
+  replayed: number;
+  matches: Match[];
+};
+
+export type MatchupSchedule = "random" | "least_played" | "uncertain";
+
+export type MatchupQueueStrategy = "round_robin" | "weighted";
+
+export type MatchupPairSummary = {
+  games: number;
+  deck1_wins: number;
+  deck2_wins: number;
+  uncertainty: number;
+};
+
+export type MatchupPrediction = {
+  model: "bradley_terry";
+  deck1_rating: number;
+  deck2_rating: number;
+  deck1_strength: number;
+  deck2_strength: number;
+  deck1_win_probability: number;
+  deck2_win_probability: number;
 };
 
 export type RandomMatchupResponse = {
@@ -61,6 +92,102 @@ export type RandomMatchupResponse = {
   deck2: Deck;
   first_player: Deck;
   format: MatchFormat;
+  schedule?: MatchupSchedule;
+  pair?: MatchupPairSummary;
+  prediction?: MatchupPrediction;
+};
+
+export type MatchupPredictionResponse = {
+  deck1: Deck;
+  deck2: Deck;
+  prediction: MatchupPrediction;
+};
+
+export type CardLiftRow = {
+  card_id: number;
+  card_name: string;
+  grade: number | null;
+  card_type: string | null;
+  versions: number;
+  decided_games: number;
+  wins: number;
+  average_copies: number;
+  win_rate: number;
+  without_win_rate: number;
+  lift: number;
+  lift_low: number;
+  lift_high: number;
+};
+
+export type CardLiftResponse = {
+  filters: {
+    format: MatchFormat | null;
+    min_games: number;
+    limit: number;
+    sort: "lift" | "games";
+  };
+  summary: {
+    versions: number;
+    decided_games: number;
+    win_rate: number | null;
+    cards: number;
+    qualifying_cards: number;
+  };
+  cards: CardLiftRow[];
+};
+
+export type TournamentBracket = "single_elimination" | "swiss";
+
+export type TournamentPayload = {
+  deck_ids: number[];
+  bracket?: TournamentBracket;
+  rounds?: number;
+  top_cut?: number;
+  best_of?: 1 | 3 | 5;
+  trials?: number;
+  seed?: number;
+  prior_games?: number;
+  format?: MatchFormat;
+  since?: string;
+  until?: string;
+};
+
+export type TournamentDeckOdds = {
+  deck_id: number;
+  deck_name: string;
+  rating: number;
+  decided_games_in_field: number;
+  reached: Record<string, number>;
+  champion: number;
+  expected_wins?: number;
+  top_cut?: number | null;
+};
+
+export type TournamentResponse = {
+  parameters: {
+    deck_ids: number[];
+    bracket: TournamentBracket;
+    rounds: number | null;
+    top_cut: number | null;
+    best_of: number;
+    trials: number;
+    seed: number | null;
+    prior_games: number;
+  };
+  filters: {
+    format: MatchFormat | null;
+    since: string | null;
+    until: string | null;
+    active_only: boolean;
+  };
+  decks: TournamentDeckOdds[];
+  matrix: ({ deck_id: number } & Record<string, number>)[];
+};
+
+export type MatchupQueueResponse = {
+  strategy: MatchupQueueStrategy;
+  format: MatchFormat;
+  matchups: RandomMatchupResponse[];
 };
 
 export type StatsRow = {
@@ -76,7 +203,120 @@ export type StatsRow = {
   decided_games: number;
   logged_games: number;
   win_pct: number;
+  rating: number;
+  rated_games: number;
+  deck: Deck;
+};
+
+export type TrendWindowSummary = {
+  wins: number;
+  losses: number;
+  undecided: number;
+  decided_games: number;
+  logged_games: number;
+  win_pct: number | null;
+};
+
+export type DeckTrendPoint = {
+  day: string;
+  wins: number;
+  losses: number;
+  undecided: number;
+  rolling_win_pct: Record<string, number | null>;
+};
+
+export type DeckTrendsResponse = {
   deck: Deck;
+  since: string;
+  until: string;
+  windows: number[];
+  filters: {
+    format: MatchFormat | null;
+    opponent_type: DeckType | null;
+  };
+  summary: Record<string, TrendWindowSummary>;
+  series: DeckTrendPoint[];
+};
+
+export type VersionTurnOrder = "first" | "second" | "unknown";
+
+export type VersionPerformance = DeckVersionSummary & {
+  rating: number;
+  rated_games: number;
+  record: TrendWindowSummary;
+  turn_order: Record<VersionTurnOrder, TrendWindowSummary>;
+};
+
+export type VersionOpponentRecord = {
+  opponent_id: number;
+  opponent_name: string;
+  opponent_type: DeckType;
+  by_version: Record<string, TrendWindowSummary>;
+};
+
+export type DeckVersionComparisonResponse = {
+  deck: Deck;
+  versions: VersionPerformance[];
+  opponents: VersionOpponentRecord[];
+};
+
+export type TurnOrderSplit = {
+  first: TrendWindowSummary;
+  second: TrendWindowSummary;
+  advantage: number | null;
+};
+
+export type TurnOrderDeckRow = TurnOrderSplit & {
+  deck_id: number;
+  deck_name: string;
+  deck_type: DeckType;
+};
+
+export type TurnOrderMatchupRow = TurnOrderSplit & {
+  opponent_id: number;
+  opponent_name: string;
+  opponent_type: DeckType;
+};
+
+export type TurnOrderResponse = {
+  filters: {
+    deck_id: number | null;
+    opponent_id: number | null;
+    format: MatchFormat | null;
+    opponent_type: DeckType | null;
+    active_only: boolean;
+  };
+  overall: TrendWindowSummary;
+  decks: TurnOrderDeckRow[];
+  formats: (TurnOrderSplit & { format: MatchFormat | null })[];
+  matchups: TurnOrderMatchupRow[];
+};
+
+export type RivalryPair = {
+  deck_a: Deck;
+  deck_b: Deck;
+  deck_a_wins: number;
+  deck_b_wins: number;
+  undecided: number;
+  decided: number;
+  total: number;
+  formats: MatchFormat[];
+  last_played: string;
+  last_match: Match;
+};
+
+export type RivalriesResponse = {
+  filters: {
+    format: MatchFormat | null;
+    min_games: number;
+    limit: number;
+  };
+  summary: {
+    pairings: number;
+    qualifying: number;
+    logged_matches: number;
+  };
+  rivalries: RivalryPair[];
 };
 
 export type DashboardDeckSummary = {
@@ -252,6 +492,7 @@ export type DeckVersion = {
   card_count: number;
   unique_card_count: number;
   totals_by_zone: Partial<Record<DeckCardZone, number>>;
+  grade_curve: Record<string, number>;
   deck_rules: {
     required_total: number;
     main_deck_limit: number;
@@ -342,3 +583,107 @@ export type CardFormOptions = {
     name: string;
   }[];
 };
+
+export type SimulatedRate = {
+  simulated: number;
+  exact: number;
+};
+
+export type DeckSimulationTurn = {
+  turn: number;
+  ride_grade: number | null;
+  ride_rate: number | null;
+  assist_rate: number | null;
+  assist_hit_rate: number | null;
+  drive_checks: number;
+  drive_triggers: number;
+  any_trigger: number;
+  drive_triggers_by_type: Record<string, number>;
+  deck_trigger_density: { mean: number; p10: number; p90: number } | null;
+};
+
+export type DeckSimulationResponse = {
+  version_id: number;
+  content_hash: string;
+  cached: boolean;
+  parameters: {
+    trials: number;
+    turns: number;
+    going: "first" | "second";
+    seed: number | null;
+  };
+  deck: {
+    main_cards: number;
+    triggers: number;
+    trigger_types: Record<string, number>;
+    grades: Record<string, number>;
+    ride_deck_grades: number[];
+  };
+  opening_hand: {
+    triggers: (SimulatedRate & { count: number })[];
+    grades: (SimulatedRate & { grade: number })[];
+    ride_line: SimulatedRate & { grades: number[] };
+  };
+  after_mulligan: {
+    cards_returned: number;
+    grades: { grade: number; simulated: number }[];
+    ride_line: number;
+  };
+  turns: DeckSimulationTurn[];
+  ride_all_rate: number;
+  drive_trigger_rate: number | null;
+  exact_trigger_rate: number;
+};
+
+export type DeckOptimizePayload = {
+  card_ids: number[];
+  max_copies?: number;
+  main_size?: number;
+  trigger_weight?: number;
+  top?: number;
+  shortlist?: number;
+  trials?: number;
+  going?: "first" | "second";
+  seed?: number;
+};
+
+export type DeckOptimizeOperation = {
+  method: "POST" | "PATCH" | "DELETE";
+  path: string;
+  body?: Record<string, number | string>;
+};
+
+export type DeckOptimizeScore = {
+  score: number;
+  ride_all_rate: number;
+  drive_trigger_rate: number | null;
+};
+
+export type DeckOptimizeAllocation = DeckOptimizeScore & {
+  quantities: Record<string, number>;
+  changes: {
+    card_id: number;
+    card_name: string;
+    grade: number;
+    trigger: string | null;
+    from: number;
+    to: number;
+    delta: number;
+    operations: DeckOptimizeOperation[];
+  }[];
+};
+
+export type DeckOptimizeResponse = {
+  version_id: number;
+  parameters: Required<Omit<DeckOptimizePayload, "top" | "shortlist">>;
+  searched: number;
+  simulated: number;
+  current: {
+    quantities: Record<string, number>;
+    main_cards: number;
+    score: number | null;
+    ride_all_rate: number | null;
+    drive_trigger_rate: number | null;
+  };
+  allocations: DeckOptimizeAllocation[];
+};
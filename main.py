@@ -1,10 +1,13 @@
 import random
+import uuid
+
 import requests
 
 from deck import decks, DeckType
 
 
 API_BASE = "http://127.0.0.1:5000"
+SAVE_ATTEMPTS = 3
 
 
 def pick_decks(mode: str):
@@ -23,6 +26,18 @@ def pick_decks(mode: str):
     return random.sample(pool, 2)
 
 
+def save_match(payload: dict):
+    """Post a match, retrying dropped requests with one idempotency key so it is logged once."""
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+    for attempt in range(SAVE_ATTEMPTS):
+        try:
+            return requests.post(f"{API_BASE}/api/matches", json=payload, headers=headers, timeout=5)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == SAVE_ATTEMPTS - 1:
+                raise
+
+
 def main():
     print("Which format would you like to play?")
     print("1. Standard only")
@@ -82,11 +97,7 @@ def main():
             "notes": notes,
         }
 
-        save_response = requests.post(
-            f"{API_BASE}/api/matches",
-            json=payload,
-            timeout=5,
-        )
+        save_response = save_match(payload)
 
         if save_response.status_code >= 400:
             print(f"Failed to save match: {save_response.text}")
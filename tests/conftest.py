@@ -5,13 +5,25 @@ import pytest
 
 os.environ["DATABASE_URL"] = "sqlite:///:memory:"
 
-from backend.app import app  # noqa: E402
+from backend.app import create_app  # noqa: E402
 from backend.database import db  # noqa: E402
+from backend.services.card_stats import EXTENSION_KEY as CARD_STATS_KEY  # noqa: E402
+from backend.services.match_columns import EXTENSION_KEY  # noqa: E402
+from backend.services.matches import REPLAY_CACHE_KEY  # noqa: E402
+from backend.services.strength import EXTENSION_KEY as STRENGTH_KEY  # noqa: E402
+
+
+app = create_app()
 
 
 @pytest.fixture(autouse=True)
 def clean_database():
     app.config.update(TESTING=True)
+    # Each test starts a new database, so its generation counter restarts too.
+    app.extensions.pop(EXTENSION_KEY, None)
+    app.extensions.pop(STRENGTH_KEY, None)
+    app.extensions.pop(CARD_STATS_KEY, None)
+    app.extensions.pop(REPLAY_CACHE_KEY, None)
 
     with app.app_context():
         db.drop_all()
@@ -21,6 +33,11 @@ def clean_database():
         db.drop_all()
 
 
+@pytest.fixture(name="app")
+def app_fixture():
+    return app
+
+
 @pytest.fixture()
 def app_context():
     with app.app_context():
@@ -30,3 +47,35 @@ def app_context():
 @pytest.fixture()
 def client():
     return app.test_client()
+
+
+@pytest.fixture()
+def create_deck(client):
+    """Create a deck through the API; returns its id."""
+
+    def create(name, deck_type="Standard"):
+        return client.post("/api/decks", json={"name": name, "type": deck_type}).get_json()["id"]
+
+    return create
+
+
+@pytest.fixture()
+def log_match(client):
+    """
+    Log a match through the API; returns the response. ``day`` plays it
+    that evening, ``games`` logs it that many times, and other match fields
+    pass through.
+    """
+
+    def log(deck1_id, deck2_id, winner_id=None, day=None, fmt="Standard", games=1, **fields):
+        payload = {"deck1_id": deck1_id, "deck2_id": deck2_id, "winner_id": winner_id, "format": fmt, **fields}
+
+        if day is not None:
+            payload["date_played"] = f"{day}T20:00:00"
+
+        for _ in range(games):
+            response = client.post("/api/matches", json=payload)
+
+        return response
+
+    return log
@@ -0,0 +1,71 @@
+import pytest
+
+from backend.database import db
+from backend.models import Card, Deck, DeckCard, DeckVersion
+from backend.services import card_stats
+
+
+def _version(name, cards):
+    deck = Deck(name=name, type="Standard")
+    db.session.add(deck)
+    db.session.flush()
+    version = DeckVersion(deck_id=deck.id, version_name="Version 1")
+    db.session.add(version)
+    db.session.flush()
+
+    for card in cards:
+        db.session.add(DeckCard(deck_version_id=version.id, card_id=card.id, quantity=4, zone="main"))
+
+    db.session.commit()
+    return deck.id, version.id
+
+
+def test_card_lift_compares_versions_with_and_without_each_card(client, app_context, monkeypatch, log_match):
+    ace, common, dud = (Card(name=name, grade=1, card_type="Normal Unit") for name in ("Ace", "Common", "Dud"))
+    db.session.add_all([ace, common, dud])
+    db.session.flush()
+    strong = _version("Strong", [ace, common])
+    weak = _version("Weak", [common, dud])
+    log_match(strong[0], weak[0], strong[0], games=15, deck1_version_id=strong[1], deck2_version_id=weak[1])
+    log_match(strong[0], weak[0], weak[0], games=5, deck1_version_id=strong[1], deck2_version_id=weak[1])
+
+    analyses = []
+    analyze = card_stats._analyze
+    monkeypatch.setattr(card_stats, "_analyze", lambda *args: analyses.append(args) or analyze(*args))
+
+    report = client.get("/api/stats/cards?min_games=10").get_json()
+    assert report["summary"] == {
+        "versions": 2,
+        "decided_games": 40,
+        "win_rate": 0.5,
+        "cards": 3,
+        "qualifying_cards": 2,
+    }
+
+    # Common is in every version, so it has nothing to compare against.
+    rows = {row["card_name"]: row for row in report["cards"]}
+    assert list(rows) == ["Ace", "Dud"]
+    assert (rows["Ace"]["win_rate"], rows["Ace"]["without_win_rate"], rows["Ace"]["lift"]) == (0.75, 0.25, 0.5)
+    assert rows["Ace"]["lift_low"] == pytest.approx(0.5 - 1.959964 * (2 * 0.75 * 0.25 / 20) ** 0.5, abs=1e-4)
+    assert rows["Ace"]["average_copies"] == 4
+    assert rows["Dud"]["lift"] == -0.5
+
+    # Served from the cache until a match or a deck list changes.
+    client.get("/api/stats/cards?min_games=10&sort=games")
+    assert len(analyses) == 1
+
+    client.post(f"/api/deck-versions/{weak[1]}/cards", json={"card_id": ace.id, "quantity": 2})
+    assert [row["card_name"] for row in client.get("/api/stats/cards?min_games=10").get_json()["cards"]] == ["Dud"]
+    assert len(analyses) == 2
+
+    log_match(strong[0], weak[0], weak[0], fmt="Stride", deck1_version_id=strong[1], deck2_version_id=weak[1])
+    stride = client.get("/api/stats/cards?format=Stride&min_games=1").get_json()
+    assert stride["summary"]["decided_games"] == 2
+    assert len(analyses) == 3
+
+
+def test_card_lift_validates_filters(client, app_context):
+    assert client.get("/api/stats/cards?format=Premium").status_code == 400
+    assert client.get("/api/stats/cards?min_games=0").status_code == 400
+    assert client.get("/api/stats/cards?sort=name").status_code == 400
+    assert client.get("/api/stats/cards").get_json()["cards"] == []
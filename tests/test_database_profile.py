@@ -0,0 +1,47 @@
+import pytest
+
+from backend.app import create_app
+from backend.database import resolve_database_profile
+
+
+def test_production_profile_applies_wal_pragmas_and_pool_sizing(tmp_path):
+    production_app = create_app(
+        {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'cardfight.db'}",
+            "DATABASE_PROFILE": "production",
+        }
+    )
+
+    database = production_app.test_client().get("/api/health").get_json()["database"]
+
+    assert database["profile"] == "production"
+    assert database["pool"] == {
+        "class": "QueuePool",
+        "pool_size": 8,
+        "max_overflow": 4,
+        "pool_timeout": 30,
+    }
+    assert database["pragmas"] == {
+        "foreign_keys": 1,
+        "journal_mode": "wal",
+        "synchronous": 1,
+        "cache_size": -64_000,
+        "mmap_size": 256 * 1024 * 1024,
+        "busy_timeout": 5_000,
+        "temp_store": 2,
+    }
+
+
+def test_profile_env_overrides(monkeypatch):
+    monkeypatch.setenv("CARDFIGHT_DB_BUSY_TIMEOUT_MS", "250")
+    monkeypatch.setenv("CARDFIGHT_DB_POOL_SIZE", "2")
+
+    profile = resolve_database_profile("production")
+
+    assert profile["pragmas"]["busy_timeout"] == 250
+    assert profile["pool"]["pool_size"] == 2
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError, match="CARDFIGHT_DB_PROFILE"):
+        resolve_database_profile("turbo")
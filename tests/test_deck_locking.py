@@ -0,0 +1,103 @@
+import threading
+
+from sqlalchemy import text
+
+from backend.app import create_app
+from backend.database import db
+from backend.models import Card, Deck, DeckCard, DeckVersion
+from backend.services import deck_builder
+from backend.services.deck_builder import add_card_to_deck_version
+
+
+def _deck_with_main_cards(main_cards):
+    deck = Deck(name="Locking Deck", type="Standard")
+    db.session.add(deck)
+    db.session.flush()
+    version = deck_builder.create_deck_version(deck.id, {})
+    cards = [Card(name=f"Unit {number}", grade=number % 4, card_type="Normal Unit") for number in range(20)]
+    db.session.add_all(cards)
+    db.session.commit()
+
+    if main_cards:
+        add_card_to_deck_version(version.id, {"card_id": cards[0].id, "quantity": main_cards})
+
+    return version, cards
+
+
+def test_edit_reruns_when_another_writer_took_the_lock_version(app_context):
+    version, cards = _deck_with_main_cards(10)
+    assert version.lock_version == 2
+
+    # Another writer commits after this session read the version.
+    with db.engine.begin() as connection:
+        connection.execute(text("UPDATE deck_version SET lock_version = lock_version + 1 WHERE id = :id"), {"id": version.id})
+
+    entry = add_card_to_deck_version(version.id, {"card_id": cards[1].id, "quantity": 3})
+
+    db.session.expire_all()
+    stored = db.session.get(DeckVersion, version.id)
+    assert stored.lock_version == 4
+    assert stored.summary["totals_by_zone"] == {"main": 13}
+    assert DeckCard.query.filter_by(deck_version_id=version.id, card_id=cards[1].id).one().id == entry.id
+
+
+def test_persistent_conflicts_return_409_without_writing(app_context, client, monkeypatch):
+    version, cards = _deck_with_main_cards(0)
+
+    def always_stale(*versions):
+        raise deck_builder._StaleDeckVersion
+
+    monkeypatch.setattr(deck_builder, "_store_card_change", always_stale)
+    monkeypatch.setattr(deck_builder, "MAX_EDIT_ATTEMPTS", 2)
+
+    response = client.post(f"/api/deck-versions/{version.id}/cards", json={"card_id": cards[0].id})
+
+    assert response.status_code == 409
+    assert DeckCard.query.count() == 0
+
+
+def test_concurrent_adds_never_overfill_the_main_deck(tmp_path):
+    app = create_app(
+        {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'locking.db'}",
+            "DATABASE_PROFILE": "production",
+            "AUTO_MIGRATE": True,
+        }
+    )
+
+    with app.app_context():
+        version, cards = _deck_with_main_cards(44)
+        version_id, card_ids = version.id, [card.id for card in cards[1:]]
+
+    workers = len(card_ids)
+    barrier = threading.Barrier(workers)
+    outcomes = []
+
+    def add_one(card_id):
+        with app.app_context():
+            barrier.wait()
+
+            try:
+                add_card_to_deck_version(version_id, {"card_id": card_id, "quantity": 1})
+                outcomes.append("added")
+            except ValueError as exc:
+                assert "more than 50" in str(exc)
+                outcomes.append("full")
+
+    threads = [threading.Thread(target=add_one, args=(card_id,)) for card_id in card_ids]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert sorted(outcomes) == ["added"] * 6 + ["full"] * (workers - 6)
+
+    with app.app_context():
+        stored = db.session.get(DeckVersion, version_id)
+        assert stored.summary["totals_by_zone"] == {"main": 50}
+        assert db.session.query(db.func.sum(DeckCard.quantity)).scalar() == 50
+        assert stored.lock_version == 2 + 6
+        db.session.remove()
+
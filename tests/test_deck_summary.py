@@ -0,0 +1,100 @@
+from backend.database import db
+from backend.models import Card, Deck, DeckCard, DeckVersion
+from backend.services.cards import update_card
+from backend.services.deck_builder import (
+    add_card_to_deck_version,
+    create_deck_version,
+    remove_deck_card,
+    update_deck_card,
+)
+from backend.services.deck_summary import rebuild_version_summaries
+from backend.services.serializers import serialize_deck_version
+
+
+def _card(name, grade, nation="Brandt Gate"):
+    card = Card(name=name, grade=grade, nation=nation, card_type="Normal Unit")
+    db.session.add(card)
+    db.session.flush()
+    return card
+
+
+def _listed(client, deck_id):
+    response = client.get(f"/api/decks/{deck_id}/versions")
+    assert response.status_code == 200
+    return {version["id"]: version for version in response.get_json()}
+
+
+def _counts(payload):
+    keys = ("card_count", "unique_card_count", "totals_by_zone", "grade_curve", "deck_rules")
+    return {key: payload[key] for key in keys}
+
+
+def test_versions_list_reads_the_summary_kept_by_deck_builder_writes(app_context, client):
+    deck = Deck(name="Summary Deck", type="Standard", nation="Brandt Gate")
+    db.session.add(deck)
+    db.session.commit()
+    version = create_deck_version(deck.id, {"version_name": "Version 1"})
+
+    main_card = _card("Main Unit", 4)
+    ride_cards = [_card(f"Ride Grade {grade}", grade, "Brandt Gate / Keter Sanctuary") for grade in range(4)]
+    main_entry = add_card_to_deck_version(version.id, {"card_id": main_card.id, "quantity": 48})
+    add_card_to_deck_version(version.id, {"card_id": main_card.id, "quantity": 2})
+
+    for card in ride_cards:
+        add_card_to_deck_version(version.id, {"card_id": card.id, "quantity": 1, "zone": "ride"})
+
+    listed = _listed(client, deck.id)[version.id]
+    assert listed["cards"] == []
+    assert listed["card_count"] == 54
+    assert listed["grade_curve"] == {"0": 1, "1": 1, "2": 1, "3": 1, "4": 50}
+    assert listed["deck_rules"]["ride_nations"] == ["Brandt Gate", "Keter Sanctuary"]
+    assert listed["deck_rules"]["is_complete"] is True
+    assert _counts(listed) == _counts(serialize_deck_version(db.session.get(DeckVersion, version.id)))
+
+    clone = create_deck_version(deck.id, {"version_name": "Version 2", "source_version_id": version.id})
+    update_deck_card(main_entry.id, {"quantity": 45})
+    remove_deck_card(version.cards.filter(DeckCard.zone == "ride").first().id)
+
+    listed = _listed(client, deck.id)
+    assert listed[clone.id]["deck_rules"]["is_complete"] is True
+    assert listed[version.id]["totals_by_zone"] == {"main": 45, "ride": 3}
+    assert listed[version.id]["deck_rules"]["issues"] == [
+        "Add 5 cards to the main deck",
+        "Add 1 cards to the ride deck",
+        "Ride deck is missing grade 0",
+    ]
+
+
+def test_card_edits_and_rebuilds_refresh_stored_summaries(app_context, client):
+    deck = Deck(name="Rebuild Deck", type="Standard")
+    db.session.add(deck)
+    db.session.commit()
+    version = create_deck_version(deck.id, {})
+    card = _card("Shared Unit", 1)
+    add_card_to_deck_version(version.id, {"card_id": card.id, "quantity": 1, "zone": "ride"})
+
+    update_card(card.id, {"grade": 2, "nation": "Stoicheia"})
+
+    listed = _listed(client, deck.id)[version.id]
+    assert listed["deck_rules"]["ride_grades"] == [2]
+    assert listed["deck_rules"]["ride_nations"] == ["Stoicheia"]
+
+    # Rows written directly, as by an import, get a computed summary on read
+    # and a stored one from the rebuild.
+    db.session.add(DeckCard(deck_version_id=version.id, card_id=_card("Filler", 3).id, quantity=4, zone="main"))
+    stale = DeckVersion(deck_id=deck.id, version_name="Imported", is_active=False)
+    db.session.add(stale)
+    db.session.flush()
+    db.session.add(DeckCard(deck_version_id=stale.id, card_id=card.id, quantity=2, zone="main"))
+    db.session.commit()
+
+    assert _listed(client, deck.id)[stale.id]["totals_by_zone"] == {"main": 2}
+    db.session.expire_all()
+    assert db.session.get(DeckVersion, stale.id).summary is None
+
+    with db.engine.begin() as connection:
+        rebuild_version_summaries(connection)
+
+    db.session.expire_all()
+    assert db.session.get(DeckVersion, stale.id).summary["grade_curve"] == {"2": 2}
+    assert db.session.get(DeckVersion, version.id).summary["totals_by_zone"] == {"main": 4, "ride": 1}
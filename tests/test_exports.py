@@ -0,0 +1,107 @@
+import pyarrow as pa
+import pytest
+
+from backend.export_tables import EXPORT_TABLES
+from backend.exports import EXPORT_TABLE_NAMES, read_export, run_export
+from backend.models import DeckVersion
+
+
+@pytest.mark.parametrize("export_format", ["parquet", "arrow"])
+def test_export_writes_typed_tables_and_joins_cards(
+    client, app_context, tmp_path, export_format, create_deck, log_match
+):
+    first, second = create_deck("First"), create_deck("Second")
+    version_id = client.post(f"/api/decks/{first}/versions", json={"version_name": "Main"}).get_json()["id"]
+    card_id = client.post(
+        "/api/cards",
+        json={"name": "Export Unit", "grade": 2, "card_type": "Normal Unit", "set_code": "DZ-BT01", "card_number": "1"},
+    ).get_json()["id"]
+    client.post(f"/api/deck-versions/{version_id}/cards", json={"card_id": card_id, "quantity": 4})
+    match_id = log_match(first, second, None, fmt=None).get_json()["id"]
+
+    manifest = run_export(tmp_path, export_format)
+    assert {name: state["rows"] for name, state in manifest["tables"].items()} == {
+        "match": 1,
+        "deck": 2,
+        "deck_version": 1,
+        "deck_card": 1,
+    }
+
+    matches = read_export(tmp_path, "match")
+    assert matches.schema.field("date_played").type == pa.timestamp("us")
+    assert matches.to_pylist()[0]["id"] == match_id
+    assert matches.column("winner_id").null_count == 1
+
+    [deck_card] = read_export(tmp_path, "deck_card").to_pylist()
+    assert (deck_card["card_name"], deck_card["grade"], deck_card["quantity"]) == ("Export Unit", 2, 4)
+    assert read_export(tmp_path, "deck").column("active").to_pylist() == [True, True]
+
+
+def test_incremental_exports_append_changes_and_rewrite_after_deletes(
+    client, app_context, tmp_path, create_deck, log_match
+):
+    first, second = create_deck("First"), create_deck("Second")
+    edited = log_match(first, second, first).get_json()["id"]
+    removed = log_match(first, second, second).get_json()["id"]
+    run_export(tmp_path, "arrow", tables=["match"])
+
+    # Nothing changed: no new part.
+    assert run_export(tmp_path, "arrow", tables=["match"])["tables"]["match"]["parts"] == ["part-00001.arrow"]
+
+    added = log_match(second, first, None).get_json()["id"]
+    client.patch(f"/api/matches/{edited}", json={"winner_id": second})
+    state = run_export(tmp_path, "arrow", tables=["match"])["tables"]["match"]
+    assert state["parts"] == ["part-00001.arrow", "part-00002.arrow"]
+    assert state["rows"] == 3
+
+    rows = {row["id"]: row["winner_id"] for row in read_export(tmp_path, "match").to_pylist()}
+    assert rows == {edited: second, removed: second, added: None}
+
+    client.delete(f"/api/matches/{removed}")
+    state = run_export(tmp_path, "arrow", tables=["match"])["tables"]["match"]
+    assert state["parts"] == ["part-00001.arrow"]
+    assert read_export(tmp_path, "match").column("id").to_pylist() == [edited, added]
+
+
+def test_incremental_export_after_an_empty_first_export(client, app_context, tmp_path, create_deck, log_match):
+    run_export(tmp_path, "arrow")
+
+    first, second = create_deck("First"), create_deck("Second")
+    version_id = client.post(f"/api/decks/{first}/versions", json={"version_name": "Main"}).get_json()["id"]
+    match_id = log_match(first, second, first).get_json()["id"]
+
+    manifest = run_export(tmp_path, "arrow")
+    assert manifest["tables"]["match"]["rows"] == 1
+    assert read_export(tmp_path, "match").column("id").to_pylist() == [match_id]
+    assert read_export(tmp_path, "deck_version").column("id").to_pylist() == [version_id]
+
+
+def test_incremental_exports_pick_up_version_ratings(client, app_context, tmp_path, create_deck, log_match):
+    first, second = create_deck("First"), create_deck("Second")
+    versions = [
+        client.post(f"/api/decks/{deck_id}/versions", json={"version_name": "Main"}).get_json()["id"]
+        for deck_id in (first, second)
+    ]
+    run_export(tmp_path, "arrow", tables=["deck_version"])
+
+    log_match(first, second, first)
+    state = run_export(tmp_path, "arrow", tables=["deck_version"])["tables"]["deck_version"]
+    assert len(state["parts"]) == 2
+
+    exported = {row["id"]: row["rating"] for row in read_export(tmp_path, "deck_version").to_pylist()}
+    stored = {version.id: version.rating for version in DeckVersion.query.all()}
+    assert exported == stored
+    assert exported[versions[0]] > exported[versions[1]]
+
+
+def test_export_validates_arguments(app_context, tmp_path):
+    assert tuple(EXPORT_TABLES) == EXPORT_TABLE_NAMES
+
+    with pytest.raises(ValueError):
+        run_export(tmp_path, "csv")
+
+    with pytest.raises(ValueError):
+        run_export(tmp_path, tables=["player"])
+
+    with pytest.raises(LookupError):
+        read_export(tmp_path, "match")
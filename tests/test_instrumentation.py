@@ -0,0 +1,97 @@
+import logging
+import sqlite3
+
+from backend.app import create_app
+
+from backend.database import db
+from backend.instrumentation import (
+    DURATION_BUCKETS,
+    RESPONSE_BYTE_BUCKETS,
+    Histogram,
+    record_queries,
+)
+from backend.models import Deck
+
+
+def test_metrics_endpoint_reports_per_route_histograms(client, app_context):
+    db.session.add_all([Deck(name="First", type="Standard"), Deck(name="Second", type="Stride")])
+    db.session.commit()
+
+    assert client.get("/api/decks").status_code == 200
+    assert client.get("/api/decks/999").status_code == 404
+
+    response = client.get("/api/admin/metrics")
+    body = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    assert 'cardfight_http_responses_total{route="/api/decks",method="GET",status="200"} 1' in body
+    assert 'cardfight_http_responses_total{route="/api/decks/<int:deck_id>",method="GET",status="404"} 1' in body
+    assert 'cardfight_http_request_duration_seconds_count{route="/api/decks",method="GET"} 1' in body
+    assert 'cardfight_http_request_sql_statements_bucket{route="/api/decks",method="GET",le="0"} 0' in body
+    assert 'cardfight_http_response_bytes_sum{route="/api/decks",method="GET"}' in body
+
+
+def test_histogram_buckets_render_their_exact_bounds():
+    sizes = Histogram("response_bytes", "Body size.", RESPONSE_BYTE_BUCKETS)
+    sizes.observe(("/api/matches",), 2_000_000)
+    durations = Histogram("duration_seconds", "Wall time.", DURATION_BUCKETS)
+    durations.observe(("/api/matches",), 0.02)
+
+    rendered = sizes.render(("route",)) + durations.render(("route",))
+
+    assert 'response_bytes_bucket{route="/api/matches",le="1048576"} 0' in rendered
+    assert 'response_bytes_bucket{route="/api/matches",le="4194304"} 1' in rendered
+    assert 'duration_seconds_bucket{route="/api/matches",le="0.025"} 1' in rendered
+    assert 'duration_seconds_bucket{route="/api/matches",le="10.0"} 1' in rendered
+    assert not any("e+" in line for line in rendered)
+
+
+def test_slow_requests_are_logged_with_top_queries(app, client, app_context, caplog):
+    app.config["SLOW_REQUEST_MS"] = 0
+
+    try:
+        with caplog.at_level(logging.WARNING, logger=app.logger.name):
+            client.get("/api/decks")
+    finally:
+        app.config["SLOW_REQUEST_MS"] = 500
+
+    assert "Slow request GET /api/decks" in caplog.text
+    assert "FROM deck" in caplog.text
+
+
+def test_record_queries_counts_statements_in_block(app_context):
+    with record_queries() as outer:
+        Deck.query.all()
+
+        with record_queries() as inner:
+            Deck.query.count()
+
+    assert inner.count == 1
+    assert outer.count == 2
+    assert outer.total_seconds >= 0
+
+
+def test_sqlite_lock_errors_are_counted_per_route(tmp_path):
+    database = tmp_path / "locked.db"
+    locked_app = create_app(
+        {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{database}",
+            "SQLALCHEMY_ENGINE_OPTIONS": {"connect_args": {"timeout": 0}},
+        }
+    )
+    holder = sqlite3.connect(database)
+
+    try:
+        holder.execute("BEGIN EXCLUSIVE")
+        response = locked_app.test_client().get("/api/decks")
+        holder.rollback()
+
+        metrics = locked_app.test_client().get("/api/admin/metrics").get_data(as_text=True)
+    finally:
+        holder.close()
+        with locked_app.app_context():
+            db.engine.dispose()
+
+    assert response.status_code == 500
+    assert 'cardfight_sqlite_lock_errors_total{route="/api/decks"} 1' in metrics
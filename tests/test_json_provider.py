@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from backend.database import db
+from backend.json_provider import JSON_PROVIDERS, get_json_provider_class
+from backend.models import Deck, Match
+from backend.services.serializers import format_display_datetime
+
+
+@dataclass
+class _Point:
+    label: str
+    played_at: datetime
+
+
+@pytest.mark.parametrize("provider_name", sorted(JSON_PROVIDERS))
+def test_providers_encode_datetimes_and_dataclasses_as_iso(app, provider_name):
+    provider = get_json_provider_class(provider_name)(app)
+    played_at = datetime(2026, 6, 9, 19, 30, 5, 250, tzinfo=ZoneInfo("America/Chicago"))
+
+    payload = provider.loads(
+        provider.dumps({"point": _Point("game", played_at), "naive": datetime(2026, 1, 2, 3, 4)})
+    )
+
+    assert payload == {
+        "point": {"label": "game", "played_at": played_at.isoformat()},
+        "naive": "2026-01-02T03:04:00",
+    }
+
+
+def test_unknown_provider_is_rejected():
+    with pytest.raises(ValueError, match="JSON provider must be one of"):
+        get_json_provider_class("ujson")
+
+
+@pytest.mark.parametrize("hour", range(24))
+def test_display_datetime_matches_strftime(hour):
+    value = datetime(2026, 6, 9, hour, 7)
+
+    assert format_display_datetime(value) == value.strftime("%m/%d/%Y %I:%M %p")
+
+
+def test_match_response_keeps_string_dates(client, app_context):
+    first = Deck(name="First", type="Standard")
+    second = Deck(name="Second", type="Standard")
+    db.session.add_all([first, second])
+    db.session.flush()
+    match = Match(deck1_id=first.id, deck2_id=second.id, date_played=datetime(2026, 6, 9, 19, 30))
+    db.session.add(match)
+    db.session.commit()
+
+    payload = client.get(f"/api/matches/{match.id}").get_json()
+
+    assert payload["date_played"] == "06/09/2026 07:30 PM"
+    assert payload["date_played_iso"] == "2026-06-09T19:30:00"
+    assert payload["deck1"]["created_at"] == first.created_at.isoformat()
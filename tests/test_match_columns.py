@@ -0,0 +1,85 @@
+import numpy as np
+
+from backend.database import db
+from backend.services.aggregates import rebuild_match_aggregates
+from backend.services.match_columns import MISSING, match_columns
+
+
+def test_columns_append_inserts_and_reload_after_other_changes(client, app_context, create_deck, log_match):
+    first, second = create_deck("First"), create_deck("Second")
+    kept = log_match(first, second, first).get_json()["id"]
+
+    loaded = match_columns()
+    assert list(loaded.column("id")) == [kept]
+
+    # A committed insert is appended to a new snapshot sharing the buffer,
+    # without a reload; the snapshot a reader already holds stays the same.
+    winner = loaded.column("winner_id")
+    added = log_match(first, second, None, fmt=None).get_json()["id"]
+    appended = match_columns()
+    assert appended is not loaded and np.shares_memory(appended.column("id"), loaded.column("id"))
+    assert list(appended.column("winner_id")) == [first, MISSING]
+    assert list(appended.column("format")) == [1, 0]
+    assert len(loaded) == len(loaded.column("deck1_id")[winner != MISSING]) == 1
+    loaded = appended
+
+    client.patch(f"/api/matches/{added}", json={"winner_id": second})
+    reloaded = match_columns()
+    assert reloaded is not loaded
+    assert list(reloaded.column("winner_id")) == [first, second]
+
+    client.delete(f"/api/matches/{kept}")
+    assert list(match_columns().column("id")) == [added]
+
+    current = match_columns()
+    rebuild_match_aggregates()
+    db.session.commit()
+    assert match_columns() is not current
+
+
+def test_dashboard_counts_come_from_the_columns(client, app_context, create_deck, log_match):
+    first, second = create_deck("First"), create_deck("Second")
+    log_match(first, second, first)
+    log_match(first, second, second)
+    log_match(second, first, None)
+
+    summary = client.get("/api/dashboard").get_json()["summary"]
+    assert (summary["total_matches"], summary["decided_matches"], summary["undecided_matches"]) == (3, 2, 1)
+
+    log_match(first, second, first)
+    dashboard = client.get("/api/dashboard").get_json()
+    best = dashboard["best_win_rate_deck"]
+    assert best["deck"]["id"] == first
+    assert (best["wins"], best["losses"], best["undecided"], best["logged_games"]) == (2, 1, 1, 4)
+    assert dashboard["most_played_deck"]["logged_games"] == 4
+
+def test_rivalries_rank_pairs_and_apply_filters(client, app_context, create_deck, log_match):
+    subject = create_deck("Subject")
+    rival = create_deck("Rival")
+    stride = create_deck("Stride Rival", "Stride")
+
+    log_match(subject, rival, subject, day="2026-01-01")
+    log_match(rival, subject, rival, day="2026-01-05")
+    latest = log_match(subject, rival, None, day="2026-02-01").get_json()["id"]
+    log_match(stride, subject, stride, fmt="Stride", day="2026-03-01")
+
+    response = client.get("/api/stats/rivalries")
+    assert response.status_code == 200
+    report = response.get_json()
+    assert report["summary"] == {"pairings": 2, "qualifying": 2, "logged_matches": 4}
+
+    top, other = report["rivalries"]
+    assert (top["deck_a"]["id"], top["deck_b"]["id"]) == (subject, rival)
+    assert (top["deck_a_wins"], top["deck_b_wins"], top["undecided"], top["total"]) == (1, 1, 1, 3)
+    assert top["formats"] == ["Standard"]
+    assert top["last_match"]["id"] == latest
+    assert (other["deck_a"]["id"], other["deck_b_wins"]) == (subject, 1)
+
+    stride_only = client.get("/api/stats/rivalries?format=Stride").get_json()
+    assert [row["deck_b"]["id"] for row in stride_only["rivalries"]] == [stride]
+
+    busy = client.get("/api/stats/rivalries?min_games=2").get_json()
+    assert [row["total"] for row in busy["rivalries"]] == [3]
+
+    assert client.get("/api/stats/rivalries?min_games=0").status_code == 400
+    assert client.get("/api/stats/rivalries?format=Premium").status_code == 400
@@ -0,0 +1,98 @@
+import threading
+
+from backend.app import create_app
+from backend.database import db
+from backend.models import Deck, Match
+from backend.services.matches import create_match, delete_match, update_match
+
+
+WRITERS = 4
+MATCHES_PER_WRITER = 15
+
+
+def _stored_and_recounted(deck_ids):
+    stored = {deck.id: (deck.wins, deck.losses) for deck in Deck.query.filter(Deck.id.in_(deck_ids))}
+    recounted = {deck_id: [0, 0] for deck_id in deck_ids}
+
+    for match in Match.query.filter(Match.winner_id.isnot(None)):
+        loser_id = match.deck2_id if match.winner_id == match.deck1_id else match.deck1_id
+        recounted[match.winner_id][0] += 1
+        recounted[loser_id][1] += 1
+
+    return stored, {deck_id: tuple(counts) for deck_id, counts in recounted.items()}
+
+
+def test_counters_follow_creates_edits_and_deletes(app_context):
+    first, second = Deck(name="First", type="Standard"), Deck(name="Second", type="Standard")
+    db.session.add_all([first, second])
+    db.session.commit()
+
+    match = create_match({"deck1_id": first.id, "deck2_id": second.id, "winner_id": first.id})
+    assert (first.wins, second.losses) == (1, 1)
+
+    update_match(match["id"], {"winner_id": second.id})
+    assert (first.wins, first.losses, second.wins, second.losses) == (0, 1, 1, 0)
+
+    delete_match(match["id"])
+    assert (first.wins, first.losses, second.wins, second.losses) == (0, 0, 0, 0)
+
+
+def test_parallel_match_writers_do_not_lose_counter_updates(tmp_path):
+    app = create_app(
+        {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'counters.db'}",
+            "DATABASE_PROFILE": "production",
+            "AUTO_MIGRATE": True,
+        }
+    )
+
+    with app.app_context():
+        decks = [Deck(name=f"Deck {number}", type="Standard") for number in range(3)]
+        db.session.add_all(decks)
+        db.session.commit()
+        deck_ids = [deck.id for deck in decks]
+        # Creates today's per-deck rows up front, so writers only update them.
+        for low, high in ((0, 1), (0, 2), (1, 2)):
+            create_match({"deck1_id": deck_ids[low], "deck2_id": deck_ids[high]})
+        db.session.remove()
+
+    barrier = threading.Barrier(WRITERS)
+    errors = []
+
+    def write(writer):
+        with app.app_context():
+            barrier.wait()
+
+            try:
+                for number in range(MATCHES_PER_WRITER):
+                    deck1_id, deck2_id = deck_ids[number % 3], deck_ids[(number + 1 + writer) % 3]
+
+                    if deck1_id == deck2_id:
+                        deck2_id = deck_ids[(number + 2) % 3]
+
+                    match = create_match({"deck1_id": deck1_id, "deck2_id": deck2_id, "winner_id": deck1_id})
+
+                    if number % 5 == 0:
+                        update_match(match["id"], {"winner_id": deck2_id})
+                    elif number % 7 == 0:
+                        delete_match(match["id"])
+            except Exception as exc:  # noqa: BLE001 - reported below
+                errors.append(exc)
+            finally:
+                db.session.remove()
+
+    threads = [threading.Thread(target=write, args=(writer,)) for writer in range(WRITERS)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+
+    with app.app_context():
+        stored, recounted = _stored_and_recounted(deck_ids)
+        assert sum(wins for wins, _ in stored.values()) > 0
+        assert stored == recounted
+        db.session.remove()
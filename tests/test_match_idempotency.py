@@ -0,0 +1,125 @@
+import threading
+
+from backend.app import create_app
+from backend.database import db
+from backend.models import Deck, Match
+from backend.services.matches import REPLAY_CACHE_KEY, record_match
+
+
+def _decks():
+    first, second = Deck(name="First", type="Standard"), Deck(name="Second", type="Standard")
+    db.session.add_all([first, second])
+    db.session.commit()
+    return first, second
+
+
+def test_repeated_key_replays_the_stored_match(app, app_context, client):
+    first, second = _decks()
+    payload = {"deck1_id": first.id, "deck2_id": second.id, "winner_id": first.id}
+    headers = {"Idempotency-Key": "table-3-round-2"}
+
+    created = client.post("/api/matches", json=payload, headers=headers)
+    replayed = client.post("/api/matches", json=payload, headers=headers)
+
+    assert created.status_code == replayed.status_code == 201
+    assert "Idempotent-Replayed" not in created.headers
+    assert replayed.headers["Idempotent-Replayed"] == "true"
+    assert replayed.get_json()["id"] == created.get_json()["id"]
+    assert created.get_json()["client_match_id"] == "table-3-round-2"
+    assert Match.query.count() == 1
+    assert db.session.get(Deck, first.id).wins == 1
+
+    # Without the response cache the unique index still finds it.
+    app.extensions.pop(REPLAY_CACHE_KEY)
+    assert client.post("/api/matches", json=payload, headers=headers).get_json()["id"] == created.get_json()["id"]
+
+    reused = client.post("/api/matches", json={**payload, "winner_id": second.id}, headers=headers)
+    assert reused.status_code == 409
+
+    mismatched = client.post("/api/matches", json={**payload, "client_match_id": "other"}, headers=headers)
+    assert mismatched.status_code == 400
+
+    # Deleting the match frees its key.
+    client.delete(f"/api/matches/{created.get_json()['id']}")
+    assert db.session.get(Deck, first.id).wins == 0
+    again = client.post("/api/matches", json=payload, headers=headers)
+    assert again.headers.get("Idempotent-Replayed") is None
+    assert db.session.get(Deck, first.id).wins == 1
+
+
+def test_bulk_batches_are_atomic_and_replay_as_a_whole(app_context, client):
+    first, second = _decks()
+    batch = {
+        "matches": [
+            {"deck1_id": first.id, "deck2_id": second.id, "winner_id": first.id},
+            {"deck1_id": second.id, "deck2_id": first.id, "winner_id": first.id, "client_match_id": "own-key"},
+            {"deck1_id": first.id, "deck2_id": second.id},
+        ]
+    }
+    headers = {"Idempotency-Key": "import-7"}
+
+    created = client.post("/api/matches/bulk", json=batch, headers=headers)
+    assert created.status_code == 201
+    assert (created.get_json()["created"], created.get_json()["replayed"]) == (3, 0)
+    assert [row["client_match_id"] for row in created.get_json()["matches"]] == ["import-7:0", "own-key", "import-7:2"]
+
+    replayed = client.post("/api/matches/bulk", json=batch, headers=headers)
+    assert (replayed.get_json()["created"], replayed.get_json()["replayed"]) == (0, 3)
+    assert replayed.headers["Idempotent-Replayed"] == "true"
+    assert Match.query.count() == 3
+    assert db.session.get(Deck, first.id).wins == 2
+
+    broken = client.post(
+        "/api/matches/bulk",
+        json={"matches": [{"deck1_id": first.id, "deck2_id": second.id}, {"deck1_id": first.id, "deck2_id": first.id}]},
+    )
+    assert broken.status_code == 400
+    assert broken.get_json()["error"].startswith("matches[1]: ")
+    assert Match.query.count() == 3
+
+    twice = {"deck1_id": first.id, "deck2_id": second.id, "client_match_id": "twice"}
+    doubled = client.post("/api/matches/bulk", json={"matches": [twice, twice]})
+    assert doubled.status_code == 400
+    assert doubled.get_json()["error"].startswith("matches[1]: ")
+    assert Match.query.count() == 3
+
+
+def test_concurrent_submissions_with_one_key_log_one_match(tmp_path):
+    app = create_app(
+        {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'idempotency.db'}",
+            "DATABASE_PROFILE": "production",
+            "AUTO_MIGRATE": True,
+        }
+    )
+
+    with app.app_context():
+        first, second = _decks()
+        payload = {"deck1_id": first.id, "deck2_id": second.id, "winner_id": first.id}
+        db.session.remove()
+
+    workers = 6
+    barrier = threading.Barrier(workers)
+    results = []
+
+    def submit():
+        with app.app_context():
+            barrier.wait()
+            results.append(record_match(payload, "retry-storm"))
+            db.session.remove()
+
+    threads = [threading.Thread(target=submit) for _ in range(workers)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert len({response["id"] for response, _ in results}) == 1
+    assert sorted(replayed for _, replayed in results) == [False] + [True] * (workers - 1)
+
+    with app.app_context():
+        assert Match.query.count() == 1
+        assert Deck.query.filter_by(name="First").one().wins == 1
+        db.session.remove()
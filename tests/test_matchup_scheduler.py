@@ -0,0 +1,114 @@
+from collections import Counter
+
+from backend.database import db
+from backend.models import Deck, DeckPairStat, Match
+from backend.seed import seed_decks
+from backend.services.aggregates import rebuild_match_aggregates
+from backend.services.pair_stats import pair_uncertainty
+
+
+def _pair_rows():
+    return {
+        (row.deck_low_id, row.deck_high_id): (row.games, row.low_wins, row.high_wins)
+        for row in DeckPairStat.query.all()
+    }
+
+
+def test_pair_stats_follow_match_writes_and_match_a_rebuild(client, app_context, create_deck):
+    first, second, third = [create_deck(f"Standard {index}") for index in range(3)]
+
+    assert _pair_rows() == {
+        (first, second): (0, 0, 0),
+        (first, third): (0, 0, 0),
+        (second, third): (0, 0, 0),
+    }
+
+    created = client.post("/api/matches", json={"deck1_id": second, "deck2_id": first, "winner_id": second})
+    match_id = created.get_json()["id"]
+    client.post("/api/matches", json={"deck1_id": first, "deck2_id": third, "winner_id": None})
+    client.patch(f"/api/matches/{match_id}", json={"deck2_id": third, "winner_id": third})
+    client.post("/api/matches", json={"deck1_id": first, "deck2_id": second, "winner_id": first})
+
+    incremental = _pair_rows()
+    assert incremental == {
+        (first, second): (1, 1, 0),
+        (first, third): (1, 0, 0),
+        (second, third): (1, 0, 1),
+    }
+    assert db.session.get(DeckPairStat, (second, third)).uncertainty == pair_uncertainty(0, 1)
+
+    rebuild_match_aggregates()
+    db.session.commit()
+    assert _pair_rows() == incremental
+
+    client.delete(f"/api/matches/{match_id}")
+    assert _pair_rows()[(second, third)] == (0, 0, 0)
+
+
+def test_scheduled_matchups_prefer_least_played_and_uncertain_pairs(client, app_context, create_deck):
+    first, second, third = [create_deck(f"Standard {index}") for index in range(3)]
+    create_deck("Stride 0", "Stride")
+
+    for _ in range(3):
+        client.post("/api/matches", json={"deck1_id": first, "deck2_id": second, "winner_id": first})
+    client.post("/api/matches", json={"deck1_id": first, "deck2_id": third, "winner_id": third})
+    client.post("/api/matches", json={"deck1_id": second, "deck2_id": third, "winner_id": second})
+    client.post("/api/matches", json={"deck1_id": second, "deck2_id": third, "winner_id": third})
+
+    least_played = client.get("/api/play/random?schedule=least_played&format=Standard").get_json()
+    assert {least_played["deck1"]["id"], least_played["deck2"]["id"]} == {first, third}
+    assert least_played["pair"]["games"] == 1
+    assert least_played["schedule"] == "least_played"
+
+    # One game says less than two split games, which says less than a 3-0 sweep.
+    uncertain = client.get("/api/play/random?schedule=uncertain&format=Standard").get_json()
+    assert {uncertain["deck1"]["id"], uncertain["deck2"]["id"]} == {first, third}
+
+    response = client.get("/api/play/random?schedule=sometimes")
+    assert response.status_code == 400
+    assert "schedule must be one of" in response.get_json()["error"]
+
+
+def test_decks_added_outside_the_api_are_scheduled(client, app_context):
+    seeded = seed_decks()
+    standard = Deck.query.filter_by(type="Standard").count()
+
+    assert len(_pair_rows()) == seeded * (seeded - 1) // 2
+    assert client.get("/api/play/random?schedule=least_played&format=Standard").status_code == 200
+    assert client.get("/api/play/random?schedule=uncertain&format=Standard").status_code == 200
+    queue = client.get("/api/play/queue?size=4&format=Standard").get_json()
+    assert len(queue["matchups"]) == min(4, standard * (standard - 1) // 2)
+
+
+def test_round_robin_queue_covers_every_pair_before_repeating(client, app_context, create_deck):
+    deck_ids = [create_deck(f"Standard {index}") for index in range(4)]
+    client.post("/api/matches", json={"deck1_id": deck_ids[0], "deck2_id": deck_ids[1], "winner_id": deck_ids[0]})
+
+    queue = client.get("/api/play/queue?size=11&strategy=round_robin").get_json()
+    pairs = [frozenset((item["deck1"]["id"], item["deck2"]["id"])) for item in queue["matchups"]]
+
+    assert len(pairs) == 11
+    # The already played pair waits until the other five have been queued once.
+    played_pair = frozenset(deck_ids[:2])
+    counts = Counter(pairs)
+    assert played_pair not in pairs[:5]
+    assert counts.pop(played_pair) == 1
+    assert set(counts.values()) == {2}
+    assert Match.query.count() == 1
+
+
+def test_weighted_queue_only_uses_active_decks_in_format(client, app_context, create_deck):
+    standard_ids = [create_deck(f"Standard {index}") for index in range(3)]
+    stride_ids = [create_deck(f"Stride {index}", "Stride") for index in range(2)]
+    client.patch(f"/api/decks/{standard_ids[2]}", json={"active": False})
+
+    queue = client.get("/api/play/queue?size=5&strategy=weighted&format=Standard").get_json()
+    assert {frozenset((item["deck1"]["id"], item["deck2"]["id"])) for item in queue["matchups"]} == {
+        frozenset(standard_ids[:2])
+    }
+
+    stride_queue = client.get("/api/play/queue?size=1&format=Stride").get_json()
+    assert {stride_queue["matchups"][0]["deck1"]["id"], stride_queue["matchups"][0]["deck2"]["id"]} == set(stride_ids)
+
+    assert client.get("/api/play/queue?size=0").status_code == 400
+    assert client.get("/api/play/queue?strategy=swiss").status_code == 400
@@ -0,0 +1,80 @@
+from sqlalchemy import event, inspect, text
+
+from backend.app import create_app
+from backend.database import db
+from backend.migrations import (
+    current_version,
+    ensure_schema_current,
+    head_version,
+    upgrade_database,
+)
+
+
+def _file_app(tmp_path, **config):
+    return create_app(
+        {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'cardfight.db'}",
+            **config,
+        }
+    )
+
+
+def test_fresh_database_is_created_and_stamped_at_head(tmp_path):
+    app = _file_app(tmp_path)
+
+    with app.app_context():
+        assert current_version() == head_version()
+        assert inspect(db.engine).has_table("deck_card")
+
+
+def test_legacy_database_gains_missing_columns(tmp_path):
+    app = _file_app(tmp_path, AUTO_MIGRATE=False)
+
+    with app.app_context():
+        with db.engine.begin() as connection:
+            connection.execute(
+                text(
+                    "CREATE TABLE deck (id INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL, "
+                    "type VARCHAR(20) NOT NULL, wins INTEGER NOT NULL, losses INTEGER NOT NULL, "
+                    "active BOOLEAN NOT NULL, created_at DATETIME NOT NULL)"
+                )
+            )
+        assert current_version() == 0
+
+        applied = upgrade_database()
+
+        assert [item.version for item in applied][0] == 1
+        assert current_version() == head_version()
+        deck_columns = {column["name"] for column in inspect(db.engine).get_columns("deck")}
+        assert {"nation", "nation_icon", "rating", "rated_games"} <= deck_columns
+
+
+def test_startup_on_current_schema_runs_a_single_version_query(tmp_path):
+    _file_app(tmp_path)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not statement.startswith("PRAGMA"):
+            statements.append(statement)
+
+    app = _file_app(tmp_path, AUTO_MIGRATE=False)
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            assert ensure_schema_current(app) == head_version()
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+
+    assert statements == ["SELECT MAX(version) FROM schema_version"]
+
+
+def test_cli_upgrade_reports_current_schema(tmp_path):
+    app = _file_app(tmp_path)
+
+    # The autouse database fixture already has an app context active, and the
+    # CLI reuses whichever context is current.
+    with app.app_context():
+        result = app.test_cli_runner().invoke(args=["db", "upgrade"])
+
+    assert result.exit_code == 0
+    assert "already at version" in result.output
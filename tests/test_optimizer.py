@@ -0,0 +1,127 @@
+from backend.database import db
+from backend.models import Card, Deck, DeckCard, DeckVersion
+from backend.services.workers import EXTENSION_KEY
+
+
+def _card(name, grade, trigger_type=None):
+    card = Card(
+        name=name,
+        grade=grade,
+        card_type="Trigger Unit" if trigger_type else "Normal Unit",
+        trigger_type=trigger_type,
+    )
+    db.session.add(card)
+    db.session.flush()
+    return card
+
+
+def _version():
+    """A 50-card main deck that is short on grade 1 and heavy on grade 2."""
+    deck = Deck(name="Tuning", type="Standard")
+    db.session.add(deck)
+    db.session.flush()
+    version = DeckVersion(deck_id=deck.id, version_name="Version 1")
+    db.session.add(version)
+    db.session.flush()
+
+    cards = {
+        "critical": _card("Critical", 0, "Critical"),
+        "draw": _card("Draw", 0, "Draw"),
+        "starter": _card("Starter", 1),
+        "wall": _card("Wall", 2),
+        "boss": _card("Boss", 3),
+        "fresh": _card("Fresh", 1),
+    }
+
+    for key, quantity in (("critical", 8), ("draw", 8), ("starter", 4), ("wall", 22), ("boss", 8)):
+        db.session.add(DeckCard(deck_version_id=version.id, card_id=cards[key].id, quantity=quantity, zone="main"))
+
+    db.session.commit()
+    return version.id, {key: card.id for key, card in cards.items()}
+
+
+def _main_quantities(version_id):
+    totals = {}
+    for entry in DeckCard.query.filter_by(deck_version_id=version_id, zone="main"):
+        totals[entry.card_id] = totals.get(entry.card_id, 0) + entry.quantity
+    return totals
+
+
+def _optimize(client, version_id, **body):
+    return client.post(f"/api/deck-versions/{version_id}/optimize", json=body)
+
+
+def test_optimizer_ranks_allocations_and_returns_applicable_operations(client, app_context):
+    version_id, cards = _version()
+    candidates = [cards["starter"], cards["wall"], cards["fresh"]]
+
+    response = _optimize(client, version_id, card_ids=candidates, max_copies=22, trials=4000, shortlist=12, top=3)
+    assert response.status_code == 200
+    report = response.get_json()
+
+    assert report["searched"] > report["simulated"] == 13
+    assert report["current"]["quantities"] == {str(cards["starter"]): 4, str(cards["wall"]): 22, str(cards["fresh"]): 0}
+    assert report["current"]["main_cards"] == 50
+
+    allocations = report["allocations"]
+    assert len(allocations) == 3
+    assert [row["score"] for row in allocations] == sorted((row["score"] for row in allocations), reverse=True)
+    assert all(sum(row["quantities"].values()) == 22 + 4 for row in allocations)
+
+    best = allocations[0]
+    assert best["score"] > report["current"]["score"]
+    assert best["ride_all_rate"] > report["current"]["ride_all_rate"]
+    assert best["quantities"][str(cards["starter"])] + best["quantities"][str(cards["fresh"])] > 4
+
+    # Cuts come first, and applying every operation in order reaches the allocation.
+    assert [change["delta"] for change in best["changes"]] == sorted(change["delta"] for change in best["changes"])
+    for change in best["changes"]:
+        for operation in change["operations"]:
+            method = getattr(client, operation["method"].lower())
+            assert method(operation["path"], json=operation.get("body")).status_code in (200, 201, 204)
+
+    db.session.expire_all()
+    applied = _main_quantities(version_id)
+    for card_id, quantity in best["quantities"].items():
+        assert applied.get(int(card_id), 0) == quantity
+
+
+def test_process_pool_gives_the_same_ranking_as_inline_runs(app, client, app_context):
+    version_id, cards = _version()
+    body = {"card_ids": [cards["starter"], cards["wall"]], "max_copies": 22, "trials": 2000, "shortlist": 4}
+
+    workers = app.config["SIMULATION_WORKERS"]
+    app.config["SIMULATION_WORKERS"] = 1
+    inline = _optimize(client, version_id, **body).get_json()
+
+    app.config["SIMULATION_WORKERS"] = 2
+    try:
+        pooled = _optimize(client, version_id, **body).get_json()
+        assert app.extensions[EXTENSION_KEY] is not None
+    finally:
+        app.config["SIMULATION_WORKERS"] = workers
+        executor = app.extensions.pop(EXTENSION_KEY, None)
+        if executor is not None:
+            executor.shutdown()
+
+    assert pooled["allocations"] == inline["allocations"]
+    assert pooled["current"] == inline["current"]
+
+
+def test_optimizer_validates_input(client, app_context):
+    version_id, cards = _version()
+
+    assert _optimize(client, 9999, card_ids=[cards["starter"]]).status_code == 404
+    assert _optimize(client, version_id, card_ids=[9999]).status_code == 404
+    assert _optimize(client, version_id, card_ids=[]).status_code == 400
+    assert _optimize(client, version_id, card_ids=list(range(1, 10))).status_code == 400
+    assert _optimize(client, version_id, card_ids=[cards["starter"]], going="third").status_code == 400
+
+    # Four copies of the starter cannot make up the 22 wall cards' slots plus its own.
+    response = _optimize(client, version_id, card_ids=[cards["starter"], cards["wall"]], max_copies=4)
+    assert response.status_code == 400
+    assert "cannot fill" in response.get_json()["error"]
+
+    response = _optimize(client, version_id, card_ids=[cards["starter"]], main_size=40)
+    assert response.status_code == 400
+    assert "exceed main_size" in response.get_json()["error"]
@@ -0,0 +1,259 @@
+import logging
+from io import BytesIO
+
+import pytest
+
+from backend.database import db
+from backend.instrumentation import record_queries
+from backend.models import Card, CardPrinting, Deck, DeckCard, DeckVersion, Match
+from backend.query_budget import QueryBudgetExceeded, query_budget
+from backend.routes import ROUTE_QUERY_BUDGETS
+from backend.services.aggregates import rebuild_match_aggregates
+
+
+@pytest.fixture()
+def seeded(app_context):
+    """A small but non-trivial dataset, so per-row query patterns show up."""
+    decks = [
+        Deck(name=f"Deck {index}", type="Standard" if index % 2 else "Stride")
+        for index in range(6)
+    ]
+    spare_deck = Deck(name="Spare Deck", type="Standard")
+    cards = [
+        Card(name=f"Unit {grade}-{index}", grade=grade, nation="Brandt Gate", card_type="Normal Unit")
+        for grade in range(4)
+        for index in range(3)
+    ]
+    db.session.add_all(decks + cards + [spare_deck])
+    db.session.flush()
+
+    for card in cards:
+        db.session.add_all(
+            [
+                CardPrinting(card_id=card.id, set_code="DZ-BT01", card_number=f"{card.id:03d}", rarity="C"),
+                CardPrinting(card_id=card.id, set_code="DZ-BT02", card_number=f"{card.id:03d}", rarity="R"),
+            ]
+        )
+
+    versions = []
+    for deck in decks:
+        for number in (1, 2):
+            version = DeckVersion(deck_id=deck.id, version_name=f"Version {number}", is_active=number == 2)
+            db.session.add(version)
+            db.session.flush()
+            versions.append(version)
+
+            for grade in range(4):
+                db.session.add(
+                    DeckCard(deck_version_id=version.id, card_id=cards[grade * 3].id, quantity=1, zone="ride")
+                )
+            for card in cards[1:6]:
+                db.session.add(
+                    DeckCard(deck_version_id=version.id, card_id=card.id, quantity=4, zone="main")
+                )
+
+    for index in range(30):
+        deck1, deck2 = decks[index % 6], decks[(index + 1 + index // 6) % 6]
+        if deck1.id == deck2.id:
+            continue
+        db.session.add(
+            Match(
+                deck1_id=deck1.id,
+                deck2_id=deck2.id,
+                deck1_version_id=versions[(deck1.id - decks[0].id) * 2].id,
+                winner_id=[deck1.id, deck2.id, None][index % 3],
+                first_player_id=deck1.id,
+                format="Standard",
+            )
+        )
+
+    # Unused by any match, so the delete request can remove it.
+    spare_version = DeckVersion(deck_id=spare_deck.id, version_name="Spare")
+    db.session.add(spare_version)
+
+    rebuild_match_aggregates()
+    db.session.commit()
+
+    return {
+        "deck_id": decks[0].id,
+        "other_deck_id": decks[1].id,
+        "spare_deck_id": spare_deck.id,
+        "card_id": cards[4].id,
+        "printing_id": CardPrinting.query.filter_by(card_id=cards[4].id).first().id,
+        "version_id": versions[1].id,
+        "spare_version_id": spare_version.id,
+        "deck_card_id": DeckCard.query.filter_by(deck_version_id=versions[1].id, zone="main").first().id,
+        "match_id": Match.query.first().id,
+    }
+
+
+def _requests(ids):
+    """One request per endpoint. Mutating requests run last so reads see the full dataset."""
+    return [
+        ("decks.list_decks", "get", "/api/decks?include_inactive=true", None),
+        ("decks.deck_options", "get", "/api/decks/options", None),
+        ("decks.get_deck", "get", f"/api/decks/{ids['deck_id']}", None),
+        ("matches.list_matches_route", "get", "/api/matches", None),
+        ("matches.list_matches_route", "get", "/api/matches?page=1&page_size=10", None),
+        ("matches.get_match_route", "get", f"/api/matches/{ids['match_id']}", None),
+        ("play.random_matchup", "get", "/api/play/random", None),
+        ("play.random_matchup", "get", "/api/play/random?schedule=least_played", None),
+        ("play.random_matchup", "get", "/api/play/random?schedule=uncertain&format=Standard", None),
+        ("play.matchup_queue", "get", "/api/play/queue?size=8", None),
+        ("play.matchup_queue", "get", "/api/play/queue?size=8&strategy=weighted", None),
+        ("play.predict_matchup", "get", f"/api/play/predict?deck1_id={ids['deck_id']}&deck2_id={ids['other_deck_id']}", None),
+        (
+            "play.tournament_route",
+            "post",
+            "/api/play/tournament",
+            {"deck_ids": [ids["deck_id"], ids["other_deck_id"]], "bracket": "swiss", "rounds": 2, "trials": 1000},
+        ),
+        ("stats.stats_table_route", "get", "/api/stats/table", None),
+        ("stats.versus_route", "get", f"/api/stats/versus/{ids['deck_id']}", None),
+        ("stats.versus_route", "get", f"/api/stats/versus/{ids['deck_id']}?format=Standard&since=2020-01&active_only=true", None),
+        ("stats.matrix_route", "get", "/api/stats/matrix", None),
+        ("stats.matrix_route", "get", "/api/stats/matrix?format=Standard&until=2099-12&active_only=true", None),
+        ("stats.stats_table_route", "get", "/api/stats/table?format=Standard&since=2020-01&active_only=true", None),
+        ("stats.trends_route", "get", f"/api/stats/trends/{ids['deck_id']}?days=365", None),
+        ("stats.versions_route", "get", f"/api/stats/versions/{ids['deck_id']}", None),
+        ("stats.turn_order_route", "get", "/api/stats/turn-order?active_only=true", None),
+        ("stats.turn_order_route", "get", f"/api/stats/turn-order?deck_id={ids['deck_id']}&format=Standard", None),
+        ("stats.rivalries_route", "get", "/api/stats/rivalries?format=Standard&min_games=2", None),
+        ("stats.cards_route", "get", "/api/stats/cards?min_games=1", None),
+        ("dashboard.dashboard_route", "get", "/api/dashboard", None),
+        ("cards.card_form_options_route", "get", "/api/cards/options", None),
+        ("cards.search_cards_route", "get", "/api/cards/search?q=Unit", None),
+        ("cards.card_library_route", "get", "/api/cards/library", None),
+        ("cards.get_card_route", "get", f"/api/cards/{ids['card_id']}", None),
+        ("deck_builder.list_deck_versions_route", "get", f"/api/decks/{ids['deck_id']}/versions", None),
+        ("deck_builder.get_deck_version_route", "get", f"/api/deck-versions/{ids['version_id']}", None),
+        ("deck_builder.simulate_deck_version_route", "get", f"/api/deck-versions/{ids['version_id']}/simulate?trials=1000&turns=1", None),
+        # The fixture deck has 20 main cards; growing it to 30 lets the simulator run.
+        (
+            "deck_builder.optimize_deck_version_route",
+            "post",
+            f"/api/deck-versions/{ids['version_id']}/optimize",
+            {"card_ids": [ids["card_id"]], "main_size": 30, "max_copies": 14, "trials": 1000},
+        ),
+        ("admin.admin_metrics", "get", "/api/admin/metrics", None),
+        ("decks.create_deck", "post", "/api/decks", {"name": "New Deck", "type": "Standard"}),
+        ("decks.update_deck", "patch", f"/api/decks/{ids['deck_id']}", {"name": "Renamed", "type": "Standard", "nation": "Stoicheia"}),
+        (
+            "matches.create_match_route",
+            "post",
+            "/api/matches",
+            {"deck1_id": ids["deck_id"], "deck2_id": ids["other_deck_id"], "winner_id": ids["deck_id"]},
+        ),
+        (
+            "matches.create_match_route",
+            "post",
+            "/api/matches",
+            {"deck1_id": ids["deck_id"], "deck2_id": ids["other_deck_id"], "client_match_id": "budget-1"},
+        ),
+        # A replay of the same key is answered from the response cache.
+        (
+            "matches.create_match_route",
+            "post",
+            "/api/matches",
+            {"deck1_id": ids["deck_id"], "deck2_id": ids["other_deck_id"], "client_match_id": "budget-1"},
+        ),
+        (
+            "matches.bulk_create_matches_route",
+            "post",
+            "/api/matches/bulk",
+            {
+                "matches": [
+                    {"deck1_id": ids["deck_id"], "deck2_id": ids["other_deck_id"], "winner_id": ids["deck_id"], "client_match_id": "bulk-1"},
+                    {"deck1_id": ids["other_deck_id"], "deck2_id": ids["deck_id"], "winner_id": ids["other_deck_id"], "client_match_id": "bulk-2"},
+                ]
+            },
+        ),
+        ("matches.update_match_route", "patch", f"/api/matches/{ids['match_id']}", {"winner_id": None}),
+        # The edit leaves the ratings stale, so this read includes a full replay.
+        ("stats.stats_table_route", "get", "/api/stats/table", None),
+        ("cards.create_card_route", "post", "/api/cards", {"name": "Fresh", "grade": 1, "card_type": "Normal Unit", "set_code": "DZ-BT03", "card_number": "900"}),
+        ("cards.update_card_route", "patch", f"/api/cards/{ids['card_id']}", {"power": 9000}),
+        ("cards.add_card_printing_route", "post", f"/api/cards/{ids['card_id']}/printings", {"set_code": "DZ-BT04", "card_number": "77"}),
+        ("cards.update_card_printing_route", "patch", f"/api/cards/printings/{ids['printing_id']}", {"rarity": "RR"}),
+        ("deck_builder.create_deck_version_route", "post", f"/api/decks/{ids['deck_id']}/versions", {"source_version_id": ids["version_id"]}),
+        ("deck_builder.update_deck_version_route", "patch", f"/api/deck-versions/{ids['version_id']}", {"notes": "Tuned", "is_active": True}),
+        ("deck_builder.add_card_to_deck_version_route", "post", f"/api/deck-versions/{ids['version_id']}/cards", {"card_id": ids["card_id"], "quantity": 1}),
+        ("deck_builder.update_deck_card_route", "patch", f"/api/deck-cards/{ids['deck_card_id']}", {"quantity": 3}),
+        ("deck_builder.remove_deck_card_route", "delete", f"/api/deck-cards/{ids['deck_card_id']}", None),
+        ("deck_builder.delete_deck_version_route", "delete", f"/api/deck-versions/{ids['spare_version_id']}", None),
+        ("matches.delete_match_route", "delete", f"/api/matches/{ids['match_id']}", None),
+        ("decks.delete_deck", "delete", f"/api/decks/{ids['spare_deck_id']}", None),
+        ("admin.admin_recount", "post", "/api/admin/recount", None),
+    ]
+
+
+def test_every_route_declares_a_query_budget(app):
+    endpoints = {endpoint for endpoint in app.view_functions if endpoint != "static"}
+
+    assert endpoints - set(ROUTE_QUERY_BUDGETS) == set()
+
+
+def test_seeded_requests_stay_within_route_budgets(client, seeded):
+    exercised = set()
+
+    for endpoint, method, path, payload in _requests(seeded):
+        response = getattr(client, method)(path, json=payload)
+
+        assert response.status_code < 500, (endpoint, response.get_data(as_text=True))
+        exercised.add(endpoint)
+
+    response = client.post(
+        "/api/cards/analyze-image",
+        data={"image": (BytesIO(b"not an image"), "card.txt", "text/plain")},
+    )
+    assert response.status_code == 400
+    exercised.add("cards.analyze_card_image_route")
+
+    assert set(ROUTE_QUERY_BUDGETS) - exercised == {"health"}
+
+
+def test_bulk_match_statements_do_not_grow_with_the_batch(client, seeded):
+    deck_ids = [deck.id for deck in Deck.query.order_by(Deck.id).limit(6)]
+    counts = []
+
+    for size in (2, 200):
+        batch = [
+            {
+                "deck1_id": deck_ids[index % 6],
+                "deck2_id": deck_ids[(index + 1) % 6],
+                "winner_id": deck_ids[index % 6] if index % 3 else None,
+                "first_player_id": deck_ids[(index + 1) % 6],
+                "format": "Standard",
+                "client_match_id": f"batch-{size}-{index}",
+            }
+            for index in range(size)
+        ]
+
+        with record_queries() as recorder:
+            response = client.post("/api/matches/bulk", json={"matches": batch})
+
+        assert response.status_code == 201
+        assert response.get_json()["created"] == size
+        counts.append(recorder.count)
+
+    assert counts[0] == counts[1] <= ROUTE_QUERY_BUDGETS["matches.bulk_create_matches_route"]
+
+
+def test_budget_overrun_raises_in_testing(app_context):
+    with pytest.raises(QueryBudgetExceeded, match="issued 2 SQL statements"):
+        with query_budget(1, label="two counts"):
+            Deck.query.count()
+            Deck.query.count()
+
+
+def test_budget_overrun_only_warns_outside_testing(app, app_context, caplog):
+    app.config["TESTING"] = False
+
+    try:
+        with caplog.at_level(logging.WARNING, logger=app.logger.name):
+            with query_budget(0, label="one count"):
+                Deck.query.count()
+    finally:
+        app.config["TESTING"] = True
+
+    assert "one count issued 1 SQL statements (budget 0)" in caplog.text
@@ -0,0 +1,137 @@
+from datetime import datetime
+
+import pytest
+
+from backend.database import db
+from backend.models import AggregateState, Deck, DeckVersion, Match
+from backend.services.aggregates import rebuild_match_aggregates
+from backend.services.matches import create_match
+from backend.services.ratings import INITIAL_RATING, RATINGS_STATE
+
+
+def _ratings():
+    return {deck.id: (deck.rating, deck.rated_games) for deck in Deck.query.all()}
+
+
+def _state():
+    return db.session.get(AggregateState, RATINGS_STATE)
+
+
+def test_incremental_ratings_match_a_full_replay(client, app_context, create_deck):
+    first, second, third = (create_deck(f"Rated {index}") for index in range(3))
+    results = [(first, second, first), (second, third, third), (first, third, None), (third, first, third)]
+
+    for deck1_id, deck2_id, winner_id in results:
+        client.post("/api/matches", json={"deck1_id": deck1_id, "deck2_id": deck2_id, "winner_id": winner_id})
+
+    assert _state().stale is False
+    incremental = _ratings()
+    assert incremental[third][1] == 2
+    assert incremental[third][0] > INITIAL_RATING > incremental[first][0]
+
+    rebuild_match_aggregates()
+    db.session.commit()
+
+    assert _ratings() == pytest.approx(incremental)
+
+
+def test_edits_deletes_and_backdated_matches_trigger_a_replay(client, app_context, create_deck):
+    first, second = (create_deck(f"Rated {index}") for index in range(2))
+    match_id = client.post(
+        "/api/matches", json={"deck1_id": first, "deck2_id": second, "winner_id": first}
+    ).get_json()["id"]
+    client.post("/api/matches", json={"deck1_id": first, "deck2_id": second, "winner_id": first})
+
+    client.patch(f"/api/matches/{match_id}", json={"winner_id": second})
+    assert _state().stale is True
+
+    rows = {row["id"]: row for row in client.get("/api/stats/table").get_json()}
+    assert _state().stale is False
+    # One win each, but the replay applies the later win last.
+    assert rows[first]["rating"] + rows[second]["rating"] == pytest.approx(2 * INITIAL_RATING, abs=0.2)
+    assert rows[first]["rating"] > INITIAL_RATING > rows[second]["rating"]
+    assert rows[first]["rated_games"] == 2
+
+    client.delete(f"/api/matches/{match_id}")
+    assert _state().stale is True
+    client.get("/api/stats/table")
+    assert _ratings()[first][1] == 1
+
+    client.post(
+        "/api/matches",
+        json={"deck1_id": first, "deck2_id": second, "winner_id": second, "date_played": "2020-01-01"},
+    )
+    assert _state().stale is True
+
+
+def test_version_ratings_follow_recorded_versions(app_context):
+    decks = [Deck(name=f"Versioned {index}", type="Standard") for index in range(2)]
+    db.session.add_all(decks)
+    db.session.flush()
+    versions = [DeckVersion(deck_id=deck.id, version_name="v1") for deck in decks]
+    db.session.add_all(versions)
+    db.session.flush()
+    db.session.add_all(
+        [
+            Match(
+                deck1_id=decks[0].id,
+                deck2_id=decks[1].id,
+                deck1_version_id=versions[0].id,
+                deck2_version_id=versions[1].id,
+                winner_id=decks[0].id,
+            ),
+            Match(deck1_id=decks[0].id, deck2_id=decks[1].id, deck1_version_id=versions[0].id, winner_id=decks[1].id),
+        ]
+    )
+
+    rebuild_match_aggregates()
+    db.session.commit()
+
+    assert [version.rated_games for version in versions] == [1, 1]
+    assert versions[0].rating > INITIAL_RATING > versions[1].rating
+    assert [deck.rated_games for deck in decks] == [2, 2]
+
+
+def test_rating_versions_keeps_their_edit_time(app_context):
+    decks = [Deck(name=f"Edited {index}", type="Standard") for index in range(2)]
+    db.session.add_all(decks)
+    db.session.flush()
+    edited_at = datetime(2026, 1, 2, 3, 4, 5)
+    versions = [
+        DeckVersion(deck_id=deck.id, version_name="v1", is_active=True, updated_at=edited_at) for deck in decks
+    ]
+    db.session.add_all(versions)
+    db.session.commit()
+
+    create_match({"deck1_id": decks[0].id, "deck2_id": decks[1].id, "winner_id": decks[0].id})
+    db.session.expire_all()
+    assert [version.rated_games for version in versions] == [1, 1]
+    assert [version.updated_at for version in versions] == [edited_at, edited_at]
+    assert all(version.rated_at > edited_at for version in versions)
+
+    rebuild_match_aggregates()
+    db.session.commit()
+    db.session.expire_all()
+    assert [version.updated_at for version in versions] == [edited_at, edited_at]
+
+
+def test_play_lab_predictions_show_ratings_and_model_odds(client, app_context, create_deck):
+    first, second = (create_deck(f"Rated {index}") for index in range(2))
+
+    for _ in range(3):
+        client.post("/api/matches", json={"deck1_id": first, "deck2_id": second, "winner_id": first})
+
+    predicted = client.get(f"/api/play/predict?deck1_id={first}&deck2_id={second}").get_json()
+    prediction = predicted["prediction"]
+    assert prediction["deck1_win_probability"] > 0.5
+    assert prediction["deck1_win_probability"] + prediction["deck2_win_probability"] == pytest.approx(1.0)
+    assert prediction["model"] == "bradley_terry"
+    assert prediction["deck1_win_probability"] == round(
+        prediction["deck1_strength"] / (prediction["deck1_strength"] + prediction["deck2_strength"]), 3
+    )
+
+    matchup = client.get("/api/play/random").get_json()
+    assert matchup["prediction"]["deck1_rating"] == matchup["deck1"]["rating"]
+
+    assert client.get(f"/api/play/predict?deck1_id={first}&deck2_id=9999").status_code == 404
+    assert client.get(f"/api/play/predict?deck1_id={first}&deck2_id={first}").status_code == 400
@@ -0,0 +1,98 @@
+from backend.database import db
+from backend.models import Card, Deck, DeckCard, DeckVersion
+
+
+MAIN_DECK = [
+    # (grade, card type, trigger type, copies)
+    (0, "Trigger Unit", "Critical", 8),
+    (0, "Trigger Unit", "Draw", 4),
+    (0, "Trigger Unit", "Front", 3),
+    (0, "Trigger Unit", "Heal", 1),
+    (1, "Normal Unit", None, 13),
+    (2, "Normal Unit", None, 14),
+    (3, "Normal Unit", None, 7),
+]
+
+
+def _version(name="Sim Deck", ride_grades=()):
+    deck = Deck(name=name, type="Standard")
+    db.session.add(deck)
+    db.session.flush()
+    version = DeckVersion(deck_id=deck.id, version_name="Version 1")
+    db.session.add(version)
+    db.session.flush()
+
+    for index, (grade, card_type, trigger_type, copies) in enumerate(MAIN_DECK):
+        card = Card(name=f"{name} {index}", grade=grade, card_type=card_type, trigger_type=trigger_type)
+        db.session.add(card)
+        db.session.flush()
+        db.session.add(DeckCard(deck_version_id=version.id, card_id=card.id, quantity=copies, zone="main"))
+
+        if grade in ride_grades:
+            db.session.add(DeckCard(deck_version_id=version.id, card_id=card.id, quantity=1, zone="ride"))
+
+    db.session.commit()
+    return version.id
+
+
+def test_simulation_matches_exact_odds_and_is_cached_by_content(client, app_context):
+    version_id = _version()
+    url = f"/api/deck-versions/{version_id}/simulate?trials=20000&seed=7"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    report = response.get_json()
+    assert report["cached"] is False
+    assert report["deck"]["main_cards"] == 50
+    assert report["deck"]["trigger_types"] == {"Critical": 8, "Draw": 4, "Front": 3, "Heal": 1}
+
+    opening = report["opening_hand"]
+    for row in opening["triggers"] + opening["grades"] + [opening["ride_line"]]:
+        assert abs(row["simulated"] - row["exact"]) < 0.015
+
+    assert opening["triggers"][0]["exact"] == 0.1313
+    assert report["after_mulligan"]["ride_line"] > opening["ride_line"]["exact"]
+
+    turns = {row["turn"]: row for row in report["turns"]}
+    assert turns[1]["drive_checks"] == 0
+    assert turns[2]["drive_checks"] == 1
+    assert 1 < turns[4]["drive_checks"] <= 2
+    assert 0 < turns[3]["assist_hit_rate"] < 1
+    assert abs(turns[2]["drive_triggers"] - report["exact_trigger_rate"]) < 0.03
+
+    # Same parameters, or another version with the same contents, reuse the result.
+    assert client.get(url).get_json()["cached"] is True
+    twin = client.get(f"/api/deck-versions/{_version('Twin Deck')}/simulate?trials=20000&seed=7").get_json()
+    assert (twin["cached"], twin["content_hash"]) == (True, report["content_hash"])
+
+    entry = DeckCard.query.filter_by(deck_version_id=version_id, quantity=7).one()
+    entry.quantity = 6
+    db.session.commit()
+    changed = client.get(url).get_json()
+    assert changed["cached"] is False
+    assert changed["content_hash"] != report["content_hash"]
+
+
+def test_ride_deck_grades_always_ride_and_skip_the_mulligan(client, app_context):
+    version_id = _version(ride_grades=(1, 2, 3))
+
+    report = client.get(f"/api/deck-versions/{version_id}/simulate?trials=5000&going=second").get_json()
+    assert report["deck"]["ride_deck_grades"] == [1, 2, 3]
+    assert report["after_mulligan"]["cards_returned"] == 0
+    assert report["opening_hand"]["ride_line"] == {"grades": [], "simulated": 1.0, "exact": 1.0}
+    assert [row["ride_rate"] for row in report["turns"][:3]] == [1.0, 1.0, 1.0]
+    assert report["turns"][0]["drive_checks"] == 1
+
+
+def test_simulation_validates_input(client, app_context):
+    version_id = _version()
+    small = DeckVersion(deck_id=Deck.query.first().id, version_name="Empty")
+    db.session.add(small)
+    db.session.commit()
+
+    assert client.get("/api/deck-versions/9999/simulate").status_code == 404
+    assert client.get(f"/api/deck-versions/{version_id}/simulate?going=third").status_code == 400
+    assert client.get(f"/api/deck-versions/{version_id}/simulate?trials=10").status_code == 400
+    response = client.get(f"/api/deck-versions/{small.id}/simulate")
+    assert response.status_code == 400
+    assert "needs at least" in response.get_json()["error"]
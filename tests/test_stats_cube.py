@@ -0,0 +1,89 @@
+from datetime import date
+
+from backend.database import db
+from backend.models import MatchupMonthStat
+from backend.services.aggregates import rebuild_match_aggregates
+
+
+def _cells():
+    return {
+        (cell.deck_id, cell.opponent_deck_id, cell.format, cell.month): (cell.wins, cell.losses, cell.undecided)
+        for cell in MatchupMonthStat.query.all()
+        if cell.wins or cell.losses or cell.undecided
+    }
+
+
+def test_cube_cells_follow_match_writes_and_match_a_rebuild(client, app_context, create_deck, log_match):
+    first, second = create_deck("First"), create_deck("Second")
+
+    log_match(first, second, first, "2026-01-15")
+    moved = log_match(first, second, second, "2026-01-20").get_json()["id"]
+    log_match(second, first, None, "2026-02-01", fmt=None)
+    client.patch(f"/api/matches/{moved}", json={"date_played": "2026-02-03T12:00:00"})
+
+    incremental = _cells()
+    assert incremental == {
+        (first, second, "Standard", date(2026, 1, 1)): (1, 0, 0),
+        (second, first, "Standard", date(2026, 1, 1)): (0, 1, 0),
+        (first, second, "Standard", date(2026, 2, 1)): (0, 1, 0),
+        (second, first, "Standard", date(2026, 2, 1)): (1, 0, 0),
+        (first, second, "", date(2026, 2, 1)): (0, 0, 1),
+        (second, first, "", date(2026, 2, 1)): (0, 0, 1),
+    }
+
+    rebuild_match_aggregates()
+    db.session.commit()
+    assert _cells() == incremental
+
+    client.delete(f"/api/matches/{moved}")
+    assert (first, second, "Standard", date(2026, 2, 1)) not in _cells()
+
+
+def test_stats_endpoints_answer_filtered_slices(client, app_context, create_deck, log_match):
+    subject = create_deck("Subject")
+    rival = create_deck("Rival")
+    retired = create_deck("Retired", "Stride")
+
+    log_match(subject, rival, subject, "2026-01-10")
+    log_match(subject, rival, rival, "2026-03-05")
+    log_match(subject, retired, subject, "2026-03-20", fmt="Stride")
+    client.patch(f"/api/decks/{retired}", json={"active": False})
+
+    rows = {row["id"]: row for row in client.get("/api/stats/table").get_json()}
+    assert rows[subject]["wins"] == 2
+    assert rows[subject]["logged_games"] == 3
+
+    standard = {row["id"]: row for row in client.get("/api/stats/table?format=Standard").get_json()}
+    assert (standard[subject]["wins"], standard[subject]["losses"]) == (1, 1)
+    assert standard[retired]["logged_games"] == 0
+
+    # A full date selects its whole month.
+    march = {row["id"]: row for row in client.get("/api/stats/table?since=2026-03-31").get_json()}
+    assert (march[subject]["wins"], march[subject]["losses"]) == (1, 1)
+
+    active = client.get("/api/stats/table?active_only=true").get_json()
+    assert {row["id"] for row in active} == {subject, rival}
+    assert next(row for row in active if row["id"] == subject)["logged_games"] == 2
+
+    versus = client.get(f"/api/stats/versus/{subject}?until=2026-02").get_json()
+    assert versus["filters"] == {"format": None, "since": None, "until": "2026-02", "active_only": False}
+    assert [(row["opponent_id"], row["wins"]) for row in versus["versus"]] == [(rival, 1)]
+    assert [match["opponent_id"] for match in versus["recent"]] == [rival]
+
+    stride_only = client.get(f"/api/stats/versus/{subject}?format=Stride").get_json()
+    assert [row["opponent_id"] for row in stride_only["versus"]] == [retired]
+    assert len(stride_only["recent"]) == 1
+
+    matrix = client.get("/api/stats/matrix?since=2026-03&active_only=true").get_json()
+    assert [deck["id"] for deck in matrix["decks"]] == [subject, rival]
+    cells = {row["deck_id"]: row for row in matrix["matrix"]}
+    assert cells[subject][str(rival)] == 0.0
+    assert cells[rival][str(subject)] == 1.0
+
+
+def test_stats_filters_are_validated(client, app_context, create_deck):
+    subject = create_deck("Subject")
+
+    assert client.get("/api/stats/table?format=Premium").status_code == 400
+    assert client.get("/api/stats/matrix?since=March").status_code == 400
+    assert client.get(f"/api/stats/versus/{subject}?since=2026-05&until=2026-01").status_code == 400
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from backend.services.strength import PRIOR_GAMES, fit_strengths, strength_fit
+
+
+def test_fit_matches_the_bradley_terry_fixed_point():
+    rng = np.random.default_rng(4)
+    true_strengths = np.exp(rng.normal(0, 1, 40))
+    first, second = rng.integers(0, 40, (2, 4000))
+    first, second = first[first != second], second[first != second]
+    first_wins = rng.random(len(first)) < true_strengths[first] / (true_strengths[first] + true_strengths[second])
+    winners, losers = np.where(first_wins, first, second), np.where(first_wins, second, first)
+
+    strengths, steps = fit_strengths(winners, losers, 41)
+    assert steps < 15
+    assert strengths[40] == pytest.approx(1.0)
+    assert np.corrcoef(np.log(strengths[:40]), np.log(true_strengths))[0, 1] > 0.9
+
+    # Hunter's MM update leaves a maximum-likelihood fit where it is.
+    games = np.zeros((41, 41))
+    np.add.at(games, (winners, losers), 1)
+    games += games.T
+    wins = np.bincount(winners, minlength=41) + PRIOR_GAMES
+    expected = (games / (strengths[:, None] + strengths[None, :])).sum(axis=1) + 2 * PRIOR_GAMES / (strengths + 1)
+    np.testing.assert_allclose(wins / expected, strengths, rtol=1e-6)
+
+    refit, warm_steps = fit_strengths(winners[:-5], losers[:-5], 41, start=strengths)
+    assert warm_steps < steps
+    assert np.abs(np.log(refit / strengths)).max() < 0.1
+
+
+def test_fit_fills_the_matrix_and_refits_after_new_matches(client, app_context, create_deck, log_match):
+    strong, middle, weak, newcomer = (create_deck(name) for name in ("Strong", "Middle", "Weak", "New"))
+    log_match(strong, middle, strong, games=4)
+    log_match(middle, weak, middle, games=4)
+
+    fit = strength_fit()
+    assert fit.decided_games == 8
+    assert fit.strength(strong) > fit.strength(middle) > fit.strength(weak)
+    assert fit.strength(newcomer) == pytest.approx(1.0)
+    assert strength_fit() is fit
+
+    report = client.get("/api/stats/matrix").get_json()
+    observed = {row["deck_id"]: row for row in report["matrix"]}
+    predicted = {row["deck_id"]: row for row in report["predicted"]}
+    assert observed[strong][str(weak)] is None
+    assert predicted[strong][str(weak)] > predicted[strong][str(middle)] > 0.5
+    assert predicted[strong][str(strong)] is None
+    for row_id in predicted:
+        for col_id in predicted:
+            if row_id != col_id:
+                assert predicted[row_id][str(col_id)] + predicted[col_id][str(row_id)] == pytest.approx(1.0, abs=2e-3)
+
+    log_match(weak, strong, weak, games=6)
+    refit = strength_fit()
+    assert refit.generation > fit.generation
+    assert refit.decided_games == 14
+    assert refit.strength(weak) > fit.strength(weak)
+
+    odds = client.get(f"/api/play/predict?deck1_id={weak}&deck2_id={strong}").get_json()["prediction"]
+    assert odds["deck1_win_probability"] == round(refit.probability(weak, strong), 3)
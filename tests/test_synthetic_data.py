@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from sqlalchemy import func
+
+from backend.database import db
+from backend.models import Card, CardPrinting, Deck, DeckCard, DeckVersion, Match
+from backend.synthetic import DatasetSize, generate_dataset
+from benchmarks.services import service_cases, time_case
+
+
+TINY = DatasetSize(decks=6, versions_per_deck=2, cards=60, printings_per_card=2, matches=300, days=30)
+
+
+def test_generator_inserts_requested_volumes_with_consistent_records(app_context):
+    counts = generate_dataset(TINY, seed=5, now=datetime(2026, 6, 1))
+
+    assert counts == {
+        "decks": 6,
+        "deck_versions": 12,
+        "cards": 60,
+        "card_printings": 120,
+        "matches": 300,
+    }
+    assert Card.query.count() == 60
+    assert CardPrinting.query.count() == 120
+    assert DeckVersion.query.filter_by(is_active=True).count() == 6
+
+    ride_per_version = (
+        db.session.query(func.count(DeckCard.id))
+        .filter(DeckCard.zone == "ride")
+        .group_by(DeckCard.deck_version_id)
+        .all()
+    )
+    assert {count for (count,) in ride_per_version} == {4}
+
+    decided = Match.query.filter(Match.winner_id.isnot(None)).count()
+    assert db.session.query(func.sum(Deck.wins)).scalar() == decided
+    assert db.session.query(func.sum(Deck.losses)).scalar() == decided
+
+
+def test_every_benchmark_case_runs_against_generated_data(app_context):
+    generate_dataset(TINY, seed=5, now=datetime(2026, 6, 1))
+    deck_id = Deck.query.first().id
+    version_id = DeckVersion.query.first().id
+
+    for name, callback in service_cases(deck_id, version_id).items():
+        result = time_case(callback, repeat=1)
+
+        assert result["runs"] == 1, name
+        assert result["sql_statements"] >= 1, name
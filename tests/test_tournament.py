@@ -0,0 +1,88 @@
+import pytest
+
+from backend.services import tournament
+from backend.services.strength import strength_fit
+from backend.services.tournament import series_probability
+from backend.services.workers import EXTENSION_KEY
+
+
+def _simulate(client, **body):
+    return client.post("/api/play/tournament", json=body)
+
+
+def test_single_elimination_favours_the_deck_that_wins_its_matchups(client, app_context, create_deck, log_match):
+    decks = [create_deck(name) for name in ("Ace", "Bravo", "Charlie")]
+    log_match(decks[0], decks[1], decks[0], games=12)
+    log_match(decks[0], decks[2], decks[0], games=12)
+    log_match(decks[1], decks[2], decks[1], games=2)
+    spare = create_deck("Unplayed")
+
+    response = _simulate(client, deck_ids=decks + [spare], trials=5000, seed=3)
+    assert response.status_code == 200
+    report = response.get_json()
+
+    rows = {row["deck_id"]: row for row in report["decks"]}
+    assert report["decks"][0]["deck_id"] == decks[0]
+    assert rows[decks[0]]["champion"] > 0.6
+    assert sum(row["champion"] for row in rows.values()) == pytest.approx(1.0, abs=1e-3)
+    assert sum(row["reached"]["2"] for row in rows.values()) == pytest.approx(2.0, abs=1e-3)
+    assert rows[decks[0]]["decided_games_in_field"] == 24
+
+    # A pairing with no games falls back to the Bradley-Terry prediction.
+    matrix = {row["deck_id"]: row for row in report["matrix"]}
+    assert matrix[decks[0]][str(spare)] == pytest.approx(strength_fit().probability(decks[0], spare), abs=1e-3)
+    assert 12 / 16 < matrix[decks[0]][str(decks[1])] < 1
+
+    assert _simulate(client, deck_ids=decks + [spare], trials=5000, seed=3).get_json() == report
+
+
+def test_swiss_with_a_top_cut_and_a_bye(client, app_context, create_deck, log_match):
+    decks = [create_deck(f"Deck {index}") for index in range(5)]
+    log_match(decks[0], decks[1], decks[0], games=3)
+
+    report = _simulate(
+        client, deck_ids=decks, bracket="swiss", rounds=3, top_cut=4, best_of=3, trials=4000, seed=1
+    ).get_json()
+    assert report["parameters"]["rounds"] == 3
+
+    rows = report["decks"]
+    # Two games and one bye win per round.
+    assert sum(row["expected_wins"] for row in rows) == pytest.approx(9.0, abs=0.01)
+    assert sum(row["top_cut"] for row in rows) == pytest.approx(4.0, abs=1e-3)
+    assert sum(row["champion"] for row in rows) == pytest.approx(1.0, abs=1e-3)
+    assert set(rows[0]["reached"]) == {"2"}
+
+
+def test_pooled_chunks_match_inline_results(app, client, app_context, monkeypatch, create_deck, log_match):
+    decks = [create_deck(f"Deck {index}") for index in range(6)]
+    log_match(decks[0], decks[1], decks[0], games=2)
+    body = {"deck_ids": decks, "trials": 25_000, "seed": 11}
+
+    workers = app.config["SIMULATION_WORKERS"]
+    app.config["SIMULATION_WORKERS"] = 1
+    inline = _simulate(client, **body).get_json()
+
+    monkeypatch.setattr(tournament, "PARALLEL_MIN_WORK", 0)
+    app.config["SIMULATION_WORKERS"] = 2
+    try:
+        pooled = _simulate(client, **body).get_json()
+        assert app.extensions[EXTENSION_KEY] is not None
+    finally:
+        app.config["SIMULATION_WORKERS"] = workers
+        executor = app.extensions.pop(EXTENSION_KEY, None)
+        if executor is not None:
+            executor.shutdown()
+
+    assert pooled == inline
+
+
+def test_tournament_input_is_validated(client, app_context, create_deck):
+    decks = [create_deck(name) for name in ("One", "Two", "Three")]
+
+    assert series_probability(0.6, 3) == pytest.approx(0.648)
+    assert _simulate(client, deck_ids=decks[:2] + [9999]).status_code == 404
+    assert _simulate(client, deck_ids=decks[:1]).status_code == 400
+    assert _simulate(client, deck_ids=decks, bracket="double_elimination").status_code == 400
+    assert _simulate(client, deck_ids=decks, bracket="swiss", top_cut=3).status_code == 400
+    assert _simulate(client, deck_ids=decks, best_of=2).status_code == 400
+    assert _simulate(client, deck_ids=decks, format="Premium").status_code == 400
@@ -0,0 +1,115 @@
+from datetime import date
+
+from backend.database import db
+from backend.models import DeckDailyResult
+from backend.services.aggregates import rebuild_match_aggregates
+
+
+def _daily_rows():
+    return {
+        (row.deck_id, row.day, row.opponent_type, row.format): (row.wins, row.losses, row.undecided)
+        for row in DeckDailyResult.query.all()
+        if row.wins or row.losses or row.undecided
+    }
+
+
+def test_daily_rows_follow_match_writes_and_match_a_rebuild(client, app_context, create_deck, log_match):
+    subject = create_deck("Subject")
+    standard = create_deck("Standard Rival")
+    stride = create_deck("Stride Rival", "Stride")
+
+    log_match(subject, standard, subject, "2026-03-01")
+    moved = log_match(standard, subject, standard, "2026-03-01").get_json()["id"]
+    log_match(subject, stride, None, "2026-03-02", fmt=None)
+    client.patch(f"/api/matches/{moved}", json={"deck1_id": stride, "winner_id": subject})
+
+    incremental = _daily_rows()
+    assert incremental == {
+        (subject, date(2026, 3, 1), "Standard", "Standard"): (1, 0, 0),
+        (standard, date(2026, 3, 1), "Standard", "Standard"): (0, 1, 0),
+        (subject, date(2026, 3, 1), "Stride", "Standard"): (1, 0, 0),
+        (stride, date(2026, 3, 1), "Standard", "Standard"): (0, 1, 0),
+        (subject, date(2026, 3, 2), "Stride", ""): (0, 0, 1),
+        (stride, date(2026, 3, 2), "Standard", ""): (0, 0, 1),
+    }
+
+    rebuild_match_aggregates()
+    db.session.commit()
+    assert _daily_rows() == incremental
+
+    client.delete(f"/api/matches/{moved}")
+    assert (subject, date(2026, 3, 1), "Stride", "Standard") not in _daily_rows()
+
+
+def test_changing_a_deck_type_moves_its_opponents_rows(client, app_context, create_deck, log_match):
+    subject = create_deck("Subject")
+    rival = create_deck("Rival")
+    bystander = create_deck("Bystander")
+    match_id = log_match(subject, rival, subject, "2026-03-01").get_json()["id"]
+    log_match(subject, bystander, None, "2026-03-01")
+
+    client.patch(f"/api/decks/{rival}", json={"type": "Stride"})
+    assert (subject, date(2026, 3, 1), "Stride", "Standard") in _daily_rows()
+
+    rebuilt = _daily_rows()
+    rebuild_match_aggregates()
+    db.session.commit()
+    assert _daily_rows() == rebuilt
+
+    client.delete(f"/api/matches/{match_id}")
+    assert _daily_rows() == {
+        (subject, date(2026, 3, 1), "Standard", "Standard"): (0, 0, 1),
+        (bystander, date(2026, 3, 1), "Standard", "Standard"): (0, 0, 1),
+    }
+
+
+def test_trends_return_rolling_windows_from_daily_rows(client, app_context, create_deck, log_match):
+    subject = create_deck("Subject")
+    rival = create_deck("Rival")
+    stride = create_deck("Stride Rival", "Stride")
+
+    log_match(subject, rival, subject, "2026-01-01")
+    log_match(subject, rival, rival, "2026-01-20")
+    log_match(subject, stride, subject, "2026-01-25")
+    log_match(subject, rival, None, "2026-01-30")
+
+    response = client.get(f"/api/stats/trends/{subject}?windows=7,30&days=10&until=2026-01-30")
+    assert response.status_code == 200
+    trends = response.get_json()
+
+    assert trends["since"] == "2026-01-21"
+    assert len(trends["series"]) == 10
+    assert trends["summary"]["7"] == {
+        "wins": 1,
+        "losses": 0,
+        "undecided": 1,
+        "decided_games": 1,
+        "logged_games": 2,
+        "win_pct": 1.0,
+    }
+    # The 30-day window still reaches back to the January 1 win.
+    assert trends["summary"]["30"]["wins"] == 2
+    assert trends["summary"]["30"]["win_pct"] == 0.667
+
+    by_day = {point["day"]: point for point in trends["series"]}
+    assert by_day["2026-01-21"]["rolling_win_pct"] == {"7": 0.0, "30": 0.5}
+    assert by_day["2026-01-28"]["rolling_win_pct"]["7"] == 1.0
+
+    filtered = client.get(
+        f"/api/stats/trends/{subject}?windows=30&days=1&until=2026-01-30&opponent_type=Stride"
+    ).get_json()
+    assert filtered["summary"]["30"]["wins"] == 1
+    assert filtered["summary"]["30"]["losses"] == 0
+
+    empty = client.get(f"/api/stats/trends/{subject}?windows=7&days=1&until=2025-06-01").get_json()
+    assert empty["summary"]["7"]["win_pct"] is None
+
+
+def test_trends_validate_parameters(client, app_context, create_deck):
+    subject = create_deck("Subject")
+
+    assert client.get("/api/stats/trends/9999").status_code == 404
+    assert client.get(f"/api/stats/trends/{subject}?windows=0").status_code == 400
+    assert client.get(f"/api/stats/trends/{subject}?days=abc").status_code == 400
+    assert client.get(f"/api/stats/trends/{subject}?until=yesterday").status_code == 400
+    assert client.get(f"/api/stats/trends/{subject}?opponent_type=Premium").status_code == 400
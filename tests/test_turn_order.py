@@ -0,0 +1,84 @@
+from backend.database import db
+from backend.models import DeckTurnStat
+from backend.services.aggregates import rebuild_match_aggregates
+
+
+def _turn_rows():
+    return {
+        (row.deck_id, row.opponent_deck_id, row.format, row.turn_order): (row.wins, row.losses, row.undecided)
+        for row in DeckTurnStat.query.all()
+        if row.wins or row.losses or row.undecided
+    }
+
+
+def test_turn_rows_follow_match_writes_and_match_a_rebuild(client, app_context, create_deck, log_match):
+    first, second = create_deck("First"), create_deck("Second")
+
+    log_match(first, second, first, first_player_id=first)
+    edited = log_match(first, second, second, first_player_id=second, fmt=None).get_json()["id"]
+    log_match(first, second, first)
+    client.patch(f"/api/matches/{edited}", json={"first_player_id": first})
+
+    incremental = _turn_rows()
+    assert incremental == {
+        (first, second, "Standard", "first"): (1, 0, 0),
+        (second, first, "Standard", "second"): (0, 1, 0),
+        (first, second, "", "first"): (0, 1, 0),
+        (second, first, "", "second"): (1, 0, 0),
+    }
+
+    rebuild_match_aggregates()
+    db.session.commit()
+    assert _turn_rows() == incremental
+
+    client.delete(f"/api/matches/{edited}")
+    assert (first, second, "", "first") not in _turn_rows()
+
+
+def test_turn_order_reports_deck_format_and_matchup_splits(client, app_context, create_deck, log_match):
+    subject = create_deck("Subject")
+    rival = create_deck("Rival")
+    stride = create_deck("Stride Rival", "Stride")
+
+    log_match(subject, rival, subject, first_player_id=subject)
+    log_match(subject, rival, subject, first_player_id=subject)
+    log_match(subject, rival, rival, first_player_id=rival)
+    log_match(subject, stride, stride, first_player_id=subject, fmt="Stride")
+    log_match(subject, stride, None, first_player_id=stride, fmt="Stride")
+
+    response = client.get("/api/stats/turn-order")
+    assert response.status_code == 200
+    report = response.get_json()
+
+    # Five games, four decided, three won by the player going first.
+    assert report["overall"]["logged_games"] == 5
+    assert report["overall"]["win_pct"] == 0.75
+
+    decks = {row["deck_id"]: row for row in report["decks"]}
+    assert decks[subject]["first"]["win_pct"] == 0.667
+    assert decks[subject]["second"]["win_pct"] == 0.0
+    assert decks[subject]["advantage"] == 0.667
+    assert decks[stride]["second"]["wins"] == 1
+    assert decks[stride]["advantage"] is None
+    assert report["matchups"] == []
+
+    formats = {row["format"]: row for row in report["formats"]}
+    assert formats["Standard"]["first"]["win_pct"] == 1.0
+    assert formats["Stride"]["first"]["undecided"] == 1
+
+    filtered = client.get(f"/api/stats/turn-order?deck_id={subject}&opponent_type=Stride").get_json()
+    assert [row["deck_id"] for row in filtered["decks"]] == [subject]
+    [matchup] = filtered["matchups"]
+    assert matchup["opponent_id"] == stride
+    assert matchup["first"]["losses"] == 1
+    assert matchup["second"]["undecided"] == 1
+
+    client.patch(f"/api/decks/{stride}", json={"active": False})
+    active = client.get("/api/stats/turn-order?active_only=true").get_json()
+    assert {row["deck_id"] for row in active["decks"]} == {subject, rival}
+
+
+def test_turn_order_validates_filters(client, app_context):
+    assert client.get("/api/stats/turn-order?deck_id=9999").status_code == 404
+    assert client.get("/api/stats/turn-order?deck_id=abc").status_code == 400
+    assert client.get("/api/stats/turn-order?format=Premium").status_code == 400
@@ -0,0 +1,116 @@
+from backend.database import db
+from backend.models import DeckVersionStat
+from backend.services.aggregates import rebuild_match_aggregates
+
+
+def _create_version(client, deck_id, name):
+    return client.post(f"/api/decks/{deck_id}/versions", json={"version_name": name}).get_json()["id"]
+
+
+def _version_rows():
+    return {
+        (row.version_id, row.opponent_deck_id, row.turn_order): (row.wins, row.losses, row.undecided)
+        for row in DeckVersionStat.query.all()
+        if row.wins or row.losses or row.undecided
+    }
+
+
+def test_matches_default_to_the_active_version_and_validate_explicit_ones(client, app_context, create_deck, log_match):
+    subject = create_deck("Subject")
+    rival = create_deck("Rival")
+    old = _create_version(client, subject, "Old")
+    new = _create_version(client, subject, "New")
+    client.patch(f"/api/deck-versions/{old}", json={"is_active": False})
+
+    match = log_match(subject, rival, subject).get_json()
+    assert match["deck1_version_id"] == new
+    assert match["deck2_version_id"] is None
+
+    explicit = log_match(subject, rival, subject, deck1_version_id=old).get_json()
+    assert explicit["deck1_version_id"] == old
+
+    # Editing the winner keeps the recorded versions.
+    edited = client.patch(f"/api/matches/{explicit['id']}", json={"winner_id": rival}).get_json()
+    assert edited["deck1_version_id"] == old
+
+    rival_version = _create_version(client, rival, "Rival v1")
+    assert log_match(subject, rival, None, deck1_version_id=rival_version).status_code == 400
+    assert log_match(subject, rival, None, deck1_version_id=9999).status_code == 404
+
+    # Versions with recorded matches are kept for history.
+    assert client.delete(f"/api/deck-versions/{old}").status_code == 409
+    unused = _create_version(client, subject, "Unused")
+    assert client.delete(f"/api/deck-versions/{unused}").status_code == 200
+
+
+def test_version_rows_follow_match_writes_and_match_a_rebuild(client, app_context, create_deck, log_match):
+    subject = create_deck("Subject")
+    rival = create_deck("Rival")
+    third = create_deck("Third")
+    version = _create_version(client, subject, "v1")
+
+    log_match(subject, rival, subject, first_player_id=subject)
+    moved = log_match(rival, subject, rival, first_player_id=rival).get_json()["id"]
+    log_match(subject, third, None)
+    client.patch(
+        f"/api/matches/{moved}",
+        json={"deck1_id": third, "winner_id": third, "first_player_id": None},
+    )
+
+    incremental = _version_rows()
+    assert incremental == {
+        (version, rival, "first"): (1, 0, 0),
+        (version, third, "unknown"): (0, 1, 1),
+    }
+
+    rebuild_match_aggregates()
+    db.session.commit()
+    assert _version_rows() == incremental
+
+    client.delete(f"/api/matches/{moved}")
+    assert _version_rows()[(version, third, "unknown")] == (0, 0, 1)
+
+
+def test_version_comparison_puts_versions_side_by_side(client, app_context, create_deck, log_match):
+    subject = create_deck("Subject")
+    rival = create_deck("Rival")
+    first = _create_version(client, subject, "First")
+
+    log_match(subject, rival, subject, first_player_id=subject)
+    log_match(subject, rival, rival, first_player_id=rival)
+
+    second = _create_version(client, subject, "Second")
+    client.patch(f"/api/deck-versions/{first}", json={"is_active": False})
+    log_match(rival, subject, subject, first_player_id=subject)
+
+    response = client.get(f"/api/stats/versions/{subject}")
+    assert response.status_code == 200
+    comparison = response.get_json()
+
+    versions = {version["id"]: version for version in comparison["versions"]}
+    assert [version["version_name"] for version in comparison["versions"]] == ["First", "Second"]
+    assert versions[first]["record"]["win_pct"] == 0.5
+    assert versions[first]["turn_order"]["first"]["wins"] == 1
+    assert versions[first]["turn_order"]["second"]["losses"] == 1
+    assert versions[second]["record"] == {
+        "wins": 1,
+        "losses": 0,
+        "undecided": 0,
+        "decided_games": 1,
+        "logged_games": 1,
+        "win_pct": 1.0,
+    }
+    assert versions[second]["turn_order"]["unknown"]["win_pct"] is None
+
+    [opponent] = comparison["opponents"]
+    assert opponent["opponent_id"] == rival
+    assert opponent["by_version"][str(first)]["logged_games"] == 2
+    assert opponent["by_version"][str(second)]["wins"] == 1
+
+    only_second = client.get(f"/api/stats/versions/{subject}?version_ids={second}").get_json()
+    assert [version["id"] for version in only_second["versions"]] == [second]
+    assert list(only_second["opponents"][0]["by_version"]) == [str(second)]
+
+    assert client.get("/api/stats/versions/9999").status_code == 404
+    assert client.get(f"/api/stats/versions/{subject}?version_ids=abc").status_code == 400
+    assert client.get(f"/api/stats/versions/{rival}?version_ids={first}").status_code == 400